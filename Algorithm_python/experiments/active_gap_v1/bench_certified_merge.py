@@ -0,0 +1,116 @@
+"""Benchmark per-tick merge planning latency on the A0 closed loop.
+
+Runs the A0 rolling simulation once and records every tick's
+``_try_certified_merge`` call.  The recorded (snapshot, TCG) pairs are then
+replayed three ways:
+
+* ``planning``: ``_try_certified_merge`` as the executor calls it (ticks
+  that fail the readiness check stop before certification);
+* ``sequential``: certification alone over the full target stream, one
+  ``solve_tcg_quintics`` + ``build_safety_certificate`` per target until one
+  passes (the pre-batching executor loop);
+* ``batched``: the same certification through ``_first_certified_target``,
+  which screens targets with ``solve_tcg_quintics_batch`` /
+  ``screen_merge_certificates``.
+
+``sequential`` and ``batched`` must pick the same target on every tick.
+
+Usage:
+    python experiments/active_gap_v1/bench_certified_merge.py
+    python experiments/active_gap_v1/bench_certified_merge.py --ticks 200 --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../tests")))
+
+import active_gap_v1.test_a0_rolling_simulation as rolling
+from active_gap_v1.certificate import build_safety_certificate
+from active_gap_v1.executor import _first_certified_target, _try_certified_merge
+from active_gap_v1.merge_target_planner import iter_merge_targets
+from active_gap_v1.quintic import solve_tcg_quintics
+from active_gap_v1.types import SliceKind
+
+
+def _certify_batched(snapshot, tcg):
+    return _first_certified_target(snapshot, tcg, iter_merge_targets(snapshot=snapshot, tcg=tcg))
+
+
+def _certify_sequentially(snapshot, tcg):
+    for target in iter_merge_targets(snapshot=snapshot, tcg=tcg):
+        profiles = solve_tcg_quintics(snapshot=snapshot, tcg=tcg, target=target)
+        cert = build_safety_certificate(
+            snapshot=snapshot, tcg=tcg, slice_kind=SliceKind.MERGE,
+            profiles=profiles, target=target,
+        )
+        if cert.failure_kind is None:
+            return target, profiles, cert
+    return None
+
+
+def _record_ticks(max_ticks: int) -> list:
+    ticks = []
+
+    def recording(snapshot, tcg):
+        ticks.append((snapshot, tcg))
+        return _try_certified_merge(snapshot, tcg)
+
+    rolling._try_certified_merge = recording
+    try:
+        rolling.run_a0_rolling_simulation(max_ticks=max_ticks, verbose=False)
+    finally:
+        rolling._try_certified_merge = _try_certified_merge
+    return ticks
+
+
+def _tick_latencies_ms(fn, ticks: list, repeats: int) -> list[float]:
+    best_ms = [float("inf")] * len(ticks)
+    for _ in range(repeats):
+        for i, (snapshot, tcg) in enumerate(ticks):
+            start = time.perf_counter()
+            fn(snapshot, tcg)
+            best_ms[i] = min(best_ms[i], 1e3 * (time.perf_counter() - start))
+    return best_ms
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-tick certified-merge planning.")
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    ticks = _record_ticks(args.ticks)
+    mismatches = 0
+    for snapshot, tcg in ticks:
+        expected = _certify_sequentially(snapshot, tcg)
+        actual = _certify_batched(snapshot, tcg)
+        if (expected is None) != (actual is None) or (expected is not None and expected[0] != actual[0]):
+            mismatches += 1
+
+    print(f"A0 closed loop: {len(ticks)} ticks, {mismatches} target mismatches")
+    runs = (
+        ("planning", _try_certified_merge),
+        ("sequential", _certify_sequentially),
+        ("batched", _certify_batched),
+    )
+    for name, fn in runs:
+        latencies_ms = _tick_latencies_ms(fn, ticks, args.repeats)
+        print(
+            f"  {name:<10} mean {statistics.fmean(latencies_ms):7.3f} ms/tick  "
+            f"p95 {_p95(latencies_ms):7.3f} ms  max {max(latencies_ms):7.3f} ms"
+        )
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
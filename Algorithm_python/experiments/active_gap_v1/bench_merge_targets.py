@@ -0,0 +1,160 @@
+"""Benchmark merge-target enumeration: candidates/second and time-to-first-target.
+
+For a set of randomized p/m/s layouts this times
+
+* ``scalar``: the per-candidate ``_is_terminal_reachable`` checks over the
+  full (h, v*, x_m*) grid, the checks the scalar loop nest ran (no targets
+  are built, so this is a lower bound on that path);
+* ``full``: ``enumerate_merge_targets`` (every horizon, all targets built);
+* ``first``: ``next(iter_merge_targets(...))``, what the executor pays when
+  the best-ranked target certifies.
+
+Candidates/second is the raw grid size divided by the elapsed time, so the
+three rates are directly comparable.
+
+Usage:
+    python experiments/active_gap_v1/bench_merge_targets.py
+    python experiments/active_gap_v1/bench_merge_targets.py --layouts 200 --mode fixed
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from active_gap_v1.config import default_scenario_config
+from active_gap_v1.merge_target_planner import (
+    _admissible_x_m_values,
+    _float_grid,
+    _is_terminal_reachable,
+    enumerate_merge_targets,
+    iter_merge_targets,
+)
+from active_gap_v1.snapshot import build_coordination_snapshot
+from active_gap_v1.tcg_selector import identify_tcg
+from active_gap_v1.types import AnchorMode, ExecutionState, PlannerTag, VehicleState
+
+
+def _vehicle(veh_id: str, stream: str, lane_id: str, x_pos_m: float, speed_mps: float) -> VehicleState:
+    return VehicleState(
+        veh_id=veh_id,
+        stream=stream,
+        lane_id=lane_id,
+        x_pos_m=x_pos_m,
+        speed_mps=speed_mps,
+        accel_mps2=0.0,
+        length_m=5.0,
+        is_cav=True,
+        execution_state=ExecutionState.PLANNING,
+    )
+
+
+def _layouts(*, count: int, anchor_mode: AnchorMode, seed: int) -> list:
+    rng = random.Random(seed)
+    scenario = default_scenario_config(scenario_id="bench")
+    layouts = []
+    while len(layouts) < count:
+        p_x = rng.uniform(0.0, 150.0)
+        world_state = {
+            "p": _vehicle("p", "mainline", "main_0", p_x, rng.uniform(10.0, 25.0)),
+            "m": _vehicle("m", "ramp", "ramp_0", p_x - rng.uniform(0.0, 10.0), rng.uniform(8.0, 16.7)),
+            "s": _vehicle("s", "mainline", "main_0", p_x - rng.uniform(15.0, 50.0), rng.uniform(10.0, 25.0)),
+        }
+        snapshot = build_coordination_snapshot(
+            sim_time_s=0.0,
+            scenario=scenario,
+            world_state=world_state,
+            locked_tcgs={},
+            planner_tag=PlannerTag.ACTIVE_GAP,
+            anchor_mode=anchor_mode,
+        )
+        tcg = identify_tcg(snapshot=snapshot)
+        if tcg is not None:
+            layouts.append((snapshot, tcg))
+    return layouts
+
+
+def _grid_size(snapshot, tcg) -> int:
+    scenario = snapshot.scenario
+    v_upper_mps = min(scenario.ramp_vmax_mps, scenario.mainline_vmax_mps)
+    return (
+        len(_float_grid(start=1.0, end=10.0, step=0.5))
+        * len(_float_grid(start=5.0, end=v_upper_mps, step=1.0))
+        * len(_admissible_x_m_values(tcg=tcg, snapshot=snapshot))
+    )
+
+
+def _scalar_reachability(snapshot, tcg) -> int:
+    scenario = snapshot.scenario
+    states = snapshot.control_zone_states
+    p_state, m_state, s_state = states[tcg.p_id], states[tcg.m_id], states[tcg.s_id]
+    v_upper_mps = min(scenario.ramp_vmax_mps, scenario.mainline_vmax_mps)
+    limits = {"a_max_mps2": scenario.a_max_mps2, "b_max_mps2": scenario.b_safe_mps2}
+    feasible = 0
+    for horizon_s in _float_grid(start=1.0, end=10.0, step=0.5):
+        for v_star_mps in _float_grid(start=5.0, end=v_upper_mps, step=1.0):
+            d_pm_m = scenario.vehicle_length_m + scenario.min_gap_m + scenario.h_pr_s * v_star_mps
+            d_ms_m = scenario.vehicle_length_m + scenario.min_gap_m + scenario.h_rf_s * v_star_mps
+            for x_m_star_m in _admissible_x_m_values(tcg=tcg, snapshot=snapshot):
+                feasible += (
+                    _is_terminal_reachable(
+                        vehicle=p_state, x_target_m=x_m_star_m + d_pm_m, v_target_mps=v_star_mps,
+                        horizon_s=horizon_s, v_max_mps=scenario.mainline_vmax_mps, **limits,
+                    )
+                    and _is_terminal_reachable(
+                        vehicle=m_state, x_target_m=x_m_star_m, v_target_mps=v_star_mps,
+                        horizon_s=horizon_s, v_max_mps=scenario.ramp_vmax_mps, **limits,
+                    )
+                    and _is_terminal_reachable(
+                        vehicle=s_state, x_target_m=x_m_star_m - d_ms_m, v_target_mps=v_star_mps,
+                        horizon_s=horizon_s, v_max_mps=scenario.mainline_vmax_mps, **limits,
+                    )
+                )
+    return feasible
+
+
+def _time_per_layout(fn, layouts: list, repeats: int) -> float:
+    best_s = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for snapshot, tcg in layouts:
+            fn(snapshot, tcg)
+        best_s = min(best_s, time.perf_counter() - start)
+    return best_s / len(layouts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark merge-target enumeration.")
+    parser.add_argument("--layouts", type=int, default=100)
+    parser.add_argument("--mode", choices=("fixed", "flexible"), default="flexible")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    anchor_mode = AnchorMode.FIXED if args.mode == "fixed" else AnchorMode.FLEXIBLE
+    layouts = _layouts(count=args.layouts, anchor_mode=anchor_mode, seed=args.seed)
+    grid = sum(_grid_size(snapshot, tcg) for snapshot, tcg in layouts) / len(layouts)
+    targets = sum(len(enumerate_merge_targets(snapshot=snapshot, tcg=tcg)) for snapshot, tcg in layouts)
+
+    timings_s = {
+        "scalar": _time_per_layout(_scalar_reachability, layouts, args.repeats),
+        "full": _time_per_layout(
+            lambda snapshot, tcg: enumerate_merge_targets(snapshot=snapshot, tcg=tcg), layouts, args.repeats,
+        ),
+        "first": _time_per_layout(
+            lambda snapshot, tcg: next(iter_merge_targets(snapshot=snapshot, tcg=tcg), None),
+            layouts,
+            args.repeats,
+        ),
+    }
+    print(f"{args.mode}: {len(layouts)} layouts, {grid:.0f} grid candidates and "
+          f"{targets / len(layouts):.1f} targets per layout")
+    for name, seconds in timings_s.items():
+        print(f"  {name:<6} {1e3 * seconds:8.3f} ms/layout  {grid / seconds:12.0f} candidates/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Multi-ego closed-loop scaling sweep for active_gap_v1 (no SUMO).
+
+Runs ``run_multi_ego_closed_loop`` for every (mainline_vph, ramp_vph)
+demand and seed, and writes one ``summary.json`` with the per-seed runs and a
+per-demand aggregate (mean over seeds; latency percentiles are taken over
+the pooled per-tick planning times of all seeds).
+
+``experiments/active_gap_v1/plots/plot_a0_results.py --scaling <summary.json>``
+turns the aggregate into scaling curves.
+
+Usage:
+    python experiments/active_gap_v1/multi_ego_scaling.py
+    python experiments/active_gap_v1/multi_ego_scaling.py --demands 600:200,1800:600 --duration-s 600
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from active_gap_v1.experiment_runner import _percentile, run_multi_ego_closed_loop
+from active_gap_v1.types import AnchorMode
+
+EXPERIMENT_ID = "multi_ego_scaling"
+DEFAULT_SEEDS = (42, 123, 999)
+DEFAULT_DEMANDS = ((400, 150), (800, 300), (1200, 450), (1600, 600))
+OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "outputs", EXPERIMENT_ID, "summary.json")
+
+# Per-seed metrics averaged into the per-demand aggregate.
+_MEAN_KEYS = (
+    "planning_ms_mean",
+    "merge_pass_rate",
+    "coordination_pass_rate",
+    "slice_pass_rate",
+    "completion_rate",
+    "abort_rate",
+    "avg_ramp_delay_s",
+    "merge_throughput_vph",
+    "throughput_vph",
+    "max_concurrent_ramp_egos",
+    "collision_count",
+    "follow_clamps",
+)
+
+
+def _parse_demands(text: str) -> list[tuple[int, int]]:
+    demands = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        mainline_vph, _, ramp_vph = item.partition(":")
+        demands.append((int(mainline_vph), int(ramp_vph or 0)))
+    return demands
+
+
+def _mean(values: list) -> float | None:
+    present = [value for value in values if value is not None]
+    return sum(present) / len(present) if present else None
+
+
+def _aggregate(runs: list[dict], planning_ms: list[float]) -> dict:
+    aggregate = {key: _mean([run[key] for run in runs]) for key in _MEAN_KEYS}
+    aggregate.update({
+        "mainline_vph": runs[0]["mainline_vph"],
+        "ramp_vph": runs[0]["ramp_vph"],
+        "seeds": [run["seed"] for run in runs],
+        "planning_ticks": len(planning_ms),
+        "planning_ms_p50": _percentile(planning_ms, 0.50),
+        "planning_ms_p95": _percentile(planning_ms, 0.95),
+        "planning_ms_p99": _percentile(planning_ms, 0.99),
+        "planning_ms_max": max(planning_ms) if planning_ms else None,
+        "illegal_transition_count": sum(len(run["illegal_transitions"]) for run in runs),
+    })
+    return aggregate
+
+
+def run_sweep(
+    *,
+    demands: list[tuple[int, int]],
+    seeds: tuple[int, ...],
+    duration_s: float,
+    anchor_mode: AnchorMode,
+) -> dict:
+    runs: list[dict] = []
+    aggregates: list[dict] = []
+    for mainline_vph, ramp_vph in demands:
+        cell_runs = []
+        cell_planning_ms: list[float] = []
+        for seed in seeds:
+            start = time.perf_counter()
+            result = run_multi_ego_closed_loop(
+                seed=seed, duration_s=duration_s, mainline_vph=mainline_vph, ramp_vph=ramp_vph,
+                anchor_mode=anchor_mode, record_trace=True,
+            )
+            cell_planning_ms.extend(
+                row["planning_ms"] for row in result.pop("trace") if row["planning_ms"] is not None
+            )
+            result["wall_s"] = time.perf_counter() - start
+            cell_runs.append(result)
+            print(
+                f"  {mainline_vph:>5}:{ramp_vph:<5} seed={seed:<4} "
+                f"ramp={result['ramp_spawned']:<3} merged={result['merged']:<3} "
+                f"aborted={result['aborted']:<3} "
+                f"plan p95={result['planning_ms_p95'] or 0.0:7.3f} ms  "
+                f"wall={result['wall_s']:.1f}s"
+            )
+        runs.extend(cell_runs)
+        aggregates.append(_aggregate(cell_runs, cell_planning_ms))
+    return {
+        "experiment_id": EXPERIMENT_ID,
+        "anchor_mode": anchor_mode.value,
+        "duration_s": duration_s,
+        "seeds": list(seeds),
+        "aggregates": aggregates,
+        "runs": runs,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Multi-ego closed-loop scaling sweep.")
+    parser.add_argument(
+        "--demands",
+        default=",".join(f"{mainline}:{ramp}" for mainline, ramp in DEFAULT_DEMANDS),
+        help="Comma-separated mainline_vph:ramp_vph pairs",
+    )
+    parser.add_argument("--seeds", default=",".join(str(seed) for seed in DEFAULT_SEEDS))
+    parser.add_argument("--duration-s", type=float, default=300.0)
+    parser.add_argument("--anchor-mode", choices=[mode.value for mode in AnchorMode], default=AnchorMode.FLEXIBLE.value)
+    parser.add_argument("--out", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    summary = run_sweep(
+        demands=_parse_demands(args.demands),
+        seeds=tuple(int(seed) for seed in args.seeds.split(",") if seed.strip()),
+        duration_s=args.duration_s,
+        anchor_mode=AnchorMode(args.anchor_mode),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump(summary, handle, ensure_ascii=False, indent=2)
+    print(f"Summary saved to {args.out}")
+    return 0 if all(item["illegal_transition_count"] == 0 for item in summary["aggregates"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
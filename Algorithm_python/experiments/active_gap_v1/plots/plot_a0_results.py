@@ -1,3 +1,5 @@
+import argparse
+import json
 import sys
 import os
 import numpy as np
@@ -24,7 +26,84 @@ def _annotate_events(ax, first_coord_t: float | None, first_merge_t: float | Non
         ax.axvline(first_merge_t, color="black", linestyle="-.", alpha=0.6, label="merge start")
 
 
+def plot_scaling(summary_path: str) -> None:
+    """Scaling curves from ``multi_ego_scaling.py``'s summary.json."""
+    with open(summary_path, encoding="utf-8") as handle:
+        summary = json.load(handle)
+    aggregates = sorted(summary["aggregates"], key=lambda item: (item["ramp_vph"], item["mainline_vph"]))
+    if not aggregates:
+        print("No scaling data in summary.")
+        return
+
+    def column(key):
+        return np.array([np.nan if item[key] is None else item[key] for item in aggregates], dtype=float)
+
+    demand = column("ramp_vph")
+    labels = [f"{item['mainline_vph']}:{item['ramp_vph']}" for item in aggregates]
+    out_dir = os.path.dirname(os.path.abspath(summary_path))
+
+    plt.rcParams["figure.figsize"] = (11, 6)
+    plt.rcParams["font.size"] = 12
+    plt.rcParams["lines.linewidth"] = 2
+
+    panels = (
+        (
+            "scaling_planning_ms.png",
+            "Per-tick Planning Latency vs Demand",
+            "Planning latency (ms)",
+            (("planning_ms_p50", "p50"), ("planning_ms_p95", "p95"), ("planning_ms_p99", "p99")),
+        ),
+        (
+            "scaling_pass_rates.png",
+            "Certificate Pass Rates vs Demand",
+            "Pass rate",
+            (
+                ("merge_pass_rate", "merge"),
+                ("coordination_pass_rate", "coordination"),
+                ("slice_pass_rate", "any slice"),
+                ("completion_rate", "completion"),
+            ),
+        ),
+        (
+            "scaling_throughput.png",
+            "Throughput vs Demand",
+            "Vehicles per hour",
+            (("throughput_vph", "mainline exits"), ("merge_throughput_vph", "ramp merges")),
+        ),
+    )
+    for filename, title, ylabel, series in panels:
+        fig, ax = plt.subplots()
+        for key, label in series:
+            ax.plot(demand, column(key), marker="o", label=label)
+        ax.set_xticks(demand)
+        ax.set_xticklabels(labels)
+        ax.set_title(f"{title} ({summary['anchor_mode']}, {len(summary['seeds'])} seeds)")
+        ax.set_xlabel("Demand (mainline vph : ramp vph)")
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        ax.grid(True, linestyle="--", alpha=0.7)
+        fig.tight_layout()
+        fig.savefig(os.path.join(out_dir, filename), dpi=300)
+        plt.close(fig)
+
+    print(f"Plots saved to {out_dir}:")
+    for filename, _, _, _ in panels:
+        print(f" - {filename}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Plot active_gap_v1 results.")
+    parser.add_argument(
+        "--scaling",
+        metavar="SUMMARY_JSON",
+        default=None,
+        help="Plot scaling curves from multi_ego_scaling.py output instead of the A0 run",
+    )
+    args = parser.parse_args()
+    if args.scaling:
+        plot_scaling(args.scaling)
+        return
+
     print("Running A0 simulation...")
     result = run_a0_rolling_simulation(max_ticks=200, verbose=False)
     trace = result["trace"]
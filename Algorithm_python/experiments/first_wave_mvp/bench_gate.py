@@ -0,0 +1,130 @@
+"""acceptance gate 的 sampled / analytic 口径与批量求值基准。
+
+先跑一遍 ``medium_high_load_competition``（fixed + flexible，全部默认 seed），
+记录执行器每个 planning tick 交给 gate 的 ``(snapshot, candidates)``，再按执行器
+的用法（逐个求值，首个 accepted 即停）回放三种方式：
+
+* ``sequential_sampled``：逐个 ``accept_candidate``，sampled 口径（批量化之前的 gate）；
+* ``batched_sampled``：``accept_candidates``，sampled 口径；
+* ``batched_analytic``：``accept_candidates``，analytic 口径（执行器默认）。
+
+三种方式在每个 tick 上选中的候选必须一致。
+
+Usage:
+    python experiments/first_wave_mvp/bench_gate.py
+    python experiments/first_wave_mvp/bench_gate.py --repeats 5 --out bench_gate.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+
+SRC_ROOT = Path(__file__).resolve().parents[2] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import first_wave_mvp.experiment_runner as experiment_runner
+from first_wave_mvp.gate import accept_candidate, accept_candidates
+from first_wave_mvp.types import GateMode, PlanningSnapshot, PolicyTag
+from medium_high_load_competition import build_experiment_bundle
+
+
+def _record_gate_calls() -> list[tuple[PlanningSnapshot, list]]:
+    calls: list[tuple[PlanningSnapshot, list]] = []
+
+    def recording(*, snapshot, candidates):
+        calls.append((snapshot, list(candidates)))
+        return accept_candidates(snapshot=snapshot, candidates=candidates)
+
+    spec = build_experiment_bundle().spec
+    experiment_runner.accept_candidates = recording
+    try:
+        for policy_tag in (PolicyTag.FIFO_FIXED_ANCHOR, PolicyTag.FIFO_FLEXIBLE_ANCHOR):
+            experiment_runner.run_policy_experiment(
+                experiment_id=spec.experiment_id,
+                policy_tag=policy_tag,
+                seeds=spec.default_seeds,
+                parameters=spec.default_parameters,
+            )
+    finally:
+        experiment_runner.accept_candidates = accept_candidates
+    return calls
+
+
+def _with_mode(snapshot: PlanningSnapshot, gate_mode: GateMode) -> PlanningSnapshot:
+    return replace(snapshot, scenario=replace(snapshot.scenario, gate_mode=gate_mode))
+
+
+def _sequential(snapshot: PlanningSnapshot, candidates: list) -> tuple[int | None, int]:
+    for index, candidate in enumerate(candidates):
+        if accept_candidate(snapshot=snapshot, candidate=candidate).accepted:
+            return index, index + 1
+    return None, len(candidates)
+
+
+def _batched(snapshot: PlanningSnapshot, candidates: list) -> tuple[int | None, int]:
+    for index, result in enumerate(accept_candidates(snapshot=snapshot, candidates=candidates)):
+        if result.accepted:
+            return index, index + 1
+    return None, len(candidates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the acceptance gate modes.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    calls = _record_gate_calls()
+    methods = {
+        "sequential_sampled": (_sequential, GateMode.SAMPLED),
+        "batched_sampled": (_batched, GateMode.SAMPLED),
+        "batched_analytic": (_batched, GateMode.ANALYTIC),
+    }
+    replays = {
+        name: [(_with_mode(snapshot, gate_mode), candidates) for snapshot, candidates in calls]
+        for name, (_, gate_mode) in methods.items()
+    }
+
+    picks: dict[str, list[int | None]] = {}
+    evaluated: dict[str, int] = {}
+    wall_s: dict[str, list[float]] = {name: [] for name in methods}
+    for _ in range(args.repeats):
+        for name, (method, _) in methods.items():
+            start = time.perf_counter()
+            outcomes = [method(snapshot, candidates) for snapshot, candidates in replays[name]]
+            wall_s[name].append(time.perf_counter() - start)
+            picks[name] = [index for index, _ in outcomes]
+            evaluated[name] = sum(count for _, count in outcomes)
+
+    baseline_s = statistics.median(wall_s["sequential_sampled"])
+    rows = []
+    for name in methods:
+        median_s = statistics.median(wall_s[name])
+        rows.append({
+            "method": name,
+            "ticks": len(calls),
+            "candidates_evaluated": evaluated[name],
+            "ms_per_tick": 1e3 * median_s / max(len(calls), 1),
+            "us_per_candidate": 1e6 * median_s / max(evaluated[name], 1),
+            "speedup": baseline_s / median_s if median_s > 0.0 else None,
+            "same_picks": picks[name] == picks["sequential_sampled"],
+        })
+        row = rows[-1]
+        print(
+            f"  {name:<19} ticks={row['ticks']:<5} candidates={row['candidates_evaluated']:<6} "
+            f"{row['ms_per_tick']:7.3f} ms/tick  {row['us_per_candidate']:7.2f} us/candidate  "
+            f"x{row['speedup']:.2f}  same_picks={row['same_picks']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""第一波 MVP 数值执行器的 tick 耗时与峰值内存基准。
+
+对 light / medium / high 三档负荷各跑一次 ``run_seed_experiment``：
+
+* ``tick_ms``：单次运行总耗时 / 实际执行的 tick 数（多次重复取中位数）；
+* ``peak_mib``：单独一次运行在 ``tracemalloc`` 下的峰值分配。
+
+世界状态是 copy-on-write 的 ``PersistentMap``（``first_wave_mvp.world_state``），
+每个 tick 只生成有变化的车辆对象，snapshot 与上一版本共享其余部分。
+
+Usage:
+    python experiments/first_wave_mvp/bench_world_state.py
+    python experiments/first_wave_mvp/bench_world_state.py --loads medium,high --repeats 5 \
+        --out bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[2] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import first_wave_mvp.experiment_runner as experiment_runner
+from first_wave_mvp.experiment_runner import run_seed_experiment
+from first_wave_mvp.metrics_collector import MetricsCollector
+from first_wave_mvp.scenario_initializer import initialize_scenario
+from first_wave_mvp.types import PolicyTag
+
+EXPERIMENT_ID = "bench_world_state"
+LOADS: dict[str, dict[str, float]] = {
+    "light": {"mainline_vph": 600, "ramp_vph": 120, "sim_duration_s": 20.0},
+    "medium": {"mainline_vph": 1500, "ramp_vph": 500, "sim_duration_s": 30.0},
+    "high": {"mainline_vph": 3000, "ramp_vph": 900, "sim_duration_s": 60.0},
+}
+
+
+class _TickCountingCollector(MetricsCollector):
+    """只用于基准：记录 ``run_seed_experiment`` 实际执行的 tick 数。"""
+
+    ticks = 0
+
+    def record_tick(self, world_state) -> None:
+        type(self).ticks += 1
+        super().record_tick(world_state)
+
+
+def _run(parameters: dict[str, float], *, policy_tag: PolicyTag, seed: int) -> dict[str, object]:
+    return run_seed_experiment(
+        experiment_id=EXPERIMENT_ID,
+        policy_tag=policy_tag,
+        seed=seed,
+        parameters=parameters,
+    )
+
+
+def bench_load(name: str, *, policy_tag: PolicyTag, seed: int, repeats: int) -> dict[str, object]:
+    parameters = LOADS[name]
+    initialized = initialize_scenario(experiment_id=EXPERIMENT_ID, seed=seed, parameters=parameters)
+
+    experiment_runner.MetricsCollector = _TickCountingCollector
+    try:
+        _TickCountingCollector.ticks = 0
+        result = _run(parameters, policy_tag=policy_tag, seed=seed)
+        ticks = _TickCountingCollector.ticks
+    finally:
+        experiment_runner.MetricsCollector = MetricsCollector
+
+    wall_s = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _run(parameters, policy_tag=policy_tag, seed=seed)
+        wall_s.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    _run(parameters, policy_tag=policy_tag, seed=seed)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "load": name,
+        **parameters,
+        "vehicles": len(initialized.world_state),
+        "ticks": ticks,
+        "tick_ms": 1e3 * statistics.median(wall_s) / max(ticks, 1),
+        "peak_mib": peak_bytes / 2**20,
+        "completion_rate": result["completion_rate"],
+        "abort_rate": result["abort_rate"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Tick time and peak memory of the numeric executor."
+    )
+    parser.add_argument("--loads", default=",".join(LOADS))
+    parser.add_argument(
+        "--policy",
+        choices=[tag.value for tag in PolicyTag],
+        default=PolicyTag.FIFO_FLEXIBLE_ANCHOR.value,
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    rows = [
+        bench_load(name, policy_tag=PolicyTag(args.policy), seed=args.seed, repeats=args.repeats)
+        for name in args.loads.split(",")
+        if name.strip()
+    ]
+    for row in rows:
+        print(
+            f"  {row['load']:<7} vehicles={row['vehicles']:<4} ticks={row['ticks']:<4} "
+            f"tick={row['tick_ms']:7.3f} ms  peak={row['peak_mib']:7.2f} MiB  "
+            f"completion={row['completion_rate']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
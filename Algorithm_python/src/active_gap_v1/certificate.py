@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from .predictor import predict_optional_free_position
 from .quintic import (
     _accel_coeffs,
     _roots_in_interval,
     _velocity_coeffs,
     check_dynamics,
+    check_dynamics_batch,
     eval_poly,
+    eval_poly_batch,
+    real_roots_batch,
 )
 from .types import (
     CertificateFailureKind,
@@ -67,6 +72,37 @@ def _gap_function_min(
     return min_val, tuple(sorted(set(checked)))
 
 
+def _gap_function_min_batch(
+    leader_pos_coeffs: np.ndarray,
+    follower_pos_coeffs: np.ndarray,
+    follower_vel_coeffs: np.ndarray,
+    L: float,
+    s0: float,
+    headway: float,
+    lo: np.ndarray,
+    hi: np.ndarray,
+) -> np.ndarray:
+    """Row-wise ``_gap_function_min`` margins over stacked coefficient arrays."""
+    n = max(leader_pos_coeffs.shape[1], follower_pos_coeffs.shape[1], follower_vel_coeffs.shape[1] + 1)
+    lead = np.zeros((lo.shape[0], n))
+    lead[:, : leader_pos_coeffs.shape[1]] = leader_pos_coeffs
+    follow = np.zeros((lo.shape[0], n))
+    follow[:, : follower_pos_coeffs.shape[1]] = follower_pos_coeffs
+    g_coeffs = lead - follow
+    g_coeffs[:, 0] -= L + s0
+    g_coeffs[:, : follower_vel_coeffs.shape[1]] -= headway * follower_vel_coeffs
+    g_deriv = g_coeffs[:, 1:] * np.arange(1, n, dtype=float)
+
+    taus = np.concatenate(
+        (np.stack((lo, hi), axis=1), real_roots_batch(g_deriv, lo, hi)), axis=1,
+    )
+    taus = np.clip(taus, lo[:, np.newaxis], hi[:, np.newaxis])
+    x_lead = eval_poly_batch(leader_pos_coeffs, taus)
+    x_follow = eval_poly_batch(follower_pos_coeffs, taus)
+    v_follow = eval_poly_batch(follower_vel_coeffs, taus)
+    return np.nanmin(x_lead - x_follow - (L + s0 + headway * v_follow), axis=1)
+
+
 def _build_gap_poly(
     lead_pos: tuple[float, ...],
     follow_pos: tuple[float, ...],
@@ -234,3 +270,70 @@ def build_safety_certificate(
         failure_kind=failure,
         checked_time_candidates_s=tuple(sorted(set(all_checked))),
     )
+
+
+def screen_merge_certificates(
+    *,
+    snapshot: CoordinationSnapshot,
+    tcg: TCG,
+    targets: list[MergeTarget],
+    coefficients: np.ndarray,
+) -> tuple[list[CertificateFailureKind | None], dict[str, np.ndarray]]:
+    """MERGE-slice certificate outcome for many targets at once.
+
+    ``coefficients`` is the (K, 3, 6) p/m/s stack from
+    ``solve_tcg_quintics_batch``.  Returns each target's failure kind (same
+    precedence as ``build_safety_certificate``) and the per-constraint
+    margins.  Roots come from companion matrices rather than the closed-form
+    cubic, so a target sitting on a threshold may differ; callers build the
+    full certificate for the target they pick.
+    """
+    cfg = snapshot.scenario
+    states = snapshot.control_zone_states
+    L = cfg.vehicle_length_m
+    s0 = cfg.min_gap_m
+
+    H = np.array([target.horizon_s for target in targets])
+    lo = np.maximum(0.0, H - cfg.lane_change_duration_s)
+    zero = np.zeros(H.shape)
+    cp, cm, cs = coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+    velocity = coefficients[:, :, 1:] * np.arange(1, 6, dtype=float)
+    vp, vm, vs = velocity[:, 0], velocity[:, 1], velocity[:, 2]
+
+    v_limits = np.array([cfg.mainline_vmax_mps, cfg.ramp_vmax_mps, cfg.mainline_vmax_mps])
+    dynamics = check_dynamics_batch(
+        coefficients.reshape(-1, 6),
+        np.repeat(H, 3),
+        np.tile(v_limits, len(targets)),
+        cfg.a_max_mps2,
+        cfg.b_safe_mps2,
+    ).reshape(-1, 3).any(axis=1)
+
+    margins: dict[str, np.ndarray] = {
+        "g_pm": _gap_function_min_batch(cp, cm, vm, L, s0, cfg.h_pr_s, lo, H),
+        "g_ms": _gap_function_min_batch(cm, cs, vs, L, s0, cfg.h_rf_s, lo, H),
+    }
+    if tcg.u_id is not None and tcg.u_id in states:
+        u_st = states[tcg.u_id]
+        u_pos = np.tile(_boundary_prediction_coeffs(u_st.x_pos_m, u_st.speed_mps), (len(targets), 1))
+        margins["g_up"] = _gap_function_min_batch(u_pos, cp, vp, L, s0, cfg.time_headway_s, zero, H)
+    if tcg.f_id is not None and tcg.f_id in states:
+        f_st = states[tcg.f_id]
+        f_pos = np.tile(_boundary_prediction_coeffs(f_st.x_pos_m, f_st.speed_mps), (len(targets), 1))
+        f_vel = np.full((len(targets), 1), f_st.speed_mps)
+        margins["g_sf"] = _gap_function_min_batch(cs, f_pos, f_vel, L, s0, cfg.time_headway_s, zero, H)
+
+    kinds = {
+        "g_pm": CertificateFailureKind.SAFETY_PM,
+        "g_ms": CertificateFailureKind.SAFETY_MS,
+        "g_up": CertificateFailureKind.SAFETY_UP,
+        "g_sf": CertificateFailureKind.SAFETY_SF,
+    }
+    failures: list[CertificateFailureKind | None] = []
+    for k in range(len(targets)):
+        failure = CertificateFailureKind.DYNAMICS if dynamics[k] else None
+        for name, margin in margins.items():
+            if failure is None and margin[k] < -_EPS_G:
+                failure = kinds[name]
+        failures.append(failure)
+    return failures, margins
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from .certificate import build_safety_certificate
-from .merge_target_planner import enumerate_merge_targets
+import itertools
+from collections.abc import Iterator
+
+from .certificate import build_safety_certificate, screen_merge_certificates
+from .merge_target_planner import iter_merge_targets
 from .quintic import (
     _accel_coeffs,
     _velocity_coeffs,
     eval_poly,
     solve_tcg_quintics,
+    solve_tcg_quintics_batch,
 )
 from .types import (
     CoordinationSnapshot,
@@ -27,6 +31,8 @@ from .types import (
 )
 
 N_COORD_MAX = 50
+# First batch of merge targets screened together; later batches double in size.
+_CERTIFY_BATCH = 8
 EPS_PROGRESS = 0.01
 N_EMERGENCY_MAX = 3
 _PROGRESS_EPS_M = 1.0
@@ -46,9 +52,9 @@ def _coordination_reference(
     snapshot: CoordinationSnapshot,
     tcg: TCG,
 ) -> tuple[float, float]:
-    targets = enumerate_merge_targets(snapshot=snapshot, tcg=tcg)
-    if targets:
-        return targets[0].x_m_star_m, targets[0].v_star_mps
+    best = next(iter_merge_targets(snapshot=snapshot, tcg=tcg), None)
+    if best is not None:
+        return best.x_m_star_m, best.v_star_mps
 
     cfg = snapshot.scenario
     states = snapshot.control_zone_states
@@ -146,11 +152,13 @@ def _try_certified_merge(
     m_st = states[tcg.m_id]
     s_st = states[tcg.s_id]
 
-    targets = enumerate_merge_targets(snapshot=snapshot, tcg=tcg)
-    if not targets:
+    # Best-first: later horizons are only evaluated if every earlier target fails.
+    targets = iter_merge_targets(snapshot=snapshot, tcg=tcg)
+    best = next(targets, None)
+    if best is None:
         return None
 
-    x_m_expected, v_ref = targets[0].x_m_star_m, targets[0].v_star_mps
+    x_m_expected, v_ref = best.x_m_star_m, best.v_star_mps
     readiness = _coordination_metrics_from_states(
         scenario=snapshot.scenario,
         p_x=p_st.x_pos_m,
@@ -165,14 +173,36 @@ def _try_certified_merge(
     if not readiness["pairwise_gap_ready"] or not readiness["relative_speed_ready"]:
         return None
 
-    for target in targets:
-        profiles = solve_tcg_quintics(snapshot=snapshot, tcg=tcg, target=target)
-        cert = build_safety_certificate(
-            snapshot=snapshot, tcg=tcg, slice_kind=SliceKind.MERGE,
-            profiles=profiles, target=target,
+    return _first_certified_target(snapshot, tcg, itertools.chain((best,), targets))
+
+
+def _first_certified_target(
+    snapshot: CoordinationSnapshot,
+    tcg: TCG,
+    targets: Iterator[MergeTarget],
+) -> tuple[MergeTarget, tuple[QuinticLongitudinalProfile, ...], SafetyCertificate] | None:
+    """First target, in iteration order, whose MERGE certificate passes.
+
+    Targets are screened in batches; only screened-in targets get a full
+    certificate.
+    """
+    batch_size = _CERTIFY_BATCH
+    while batch := list(itertools.islice(targets, batch_size)):
+        coefficients = solve_tcg_quintics_batch(snapshot=snapshot, tcg=tcg, targets=batch)
+        failures, _ = screen_merge_certificates(
+            snapshot=snapshot, tcg=tcg, targets=batch, coefficients=coefficients,
         )
-        if cert.failure_kind is None:
-            return target, profiles, cert
+        for target, failure in zip(batch, failures):
+            if failure is not None:
+                continue
+            profiles = solve_tcg_quintics(snapshot=snapshot, tcg=tcg, target=target)
+            cert = build_safety_certificate(
+                snapshot=snapshot, tcg=tcg, slice_kind=SliceKind.MERGE,
+                profiles=profiles, target=target,
+            )
+            if cert.failure_kind is None:
+                return target, profiles, cert
+        batch_size *= 2
     return None
 
 
@@ -0,0 +1,414 @@
+"""Multi-ego closed-loop runner for active_gap_v1.
+
+Drives a stream of generated mainline traffic and many ramp CAVs through
+the planner and the design.md §6.5 state machine over long horizons:
+
+* arrivals are seeded Poisson streams inserted at ``x = 0`` once the last
+  vehicle of the stream has left an insertion headway;
+* one active ego per tick, as in the single-partition design: the
+  front-most ramp CAV still in ``APPROACHING/PLANNING/COMMITTED`` is
+  planned (certified merge first, then coordination, else safe wait / fail
+  safe), every other ramp CAV keeps ``APPROACHING``;
+* a ``COMMITTED`` ego whose best certified merge target must start its lane
+  change now (``horizon_s <= lane_change_duration_s``) locks that target and
+  goes ``EXECUTING``; p/m/s follow the certified quintics to ``t_m*``, m then
+  joins the mainline and reaches ``POST_MERGE`` after ``post_merge_guard_s``.
+  No other ego is planned while a lane change is in progress;
+* a ``FAIL_SAFE_STOP`` ego brakes at ``fail_safe_brake_mps2`` and is removed
+  as ``ABORTED`` once stopped;
+* every other vehicle keeps constant speed (``rollout_step``), or follows
+  its one-tick slice profile, and is held behind its same-stream leader at
+  ``vehicle_length_m + min_gap_m`` (counted as ``follow_clamps``).  The TCG
+  certificates do not see a ramp ego's own leader or the vehicles ahead of
+  p, so this is the simulation's guard, not the planner's.
+
+The result has the per-run metrics (planning latency percentiles, slice
+pass rates, throughput, completion/abort) and optionally the per-tick trace.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from random import Random
+from typing import Any
+
+from .config import default_scenario_config
+from .executor import (
+    N_COORD_MAX,
+    _try_certified_merge,
+    commit_first_slice,
+    decide_execution,
+    rollout_step,
+    synthesize_coordination_slice,
+)
+from .quintic import _accel_coeffs, _velocity_coeffs, eval_poly
+from .snapshot import build_coordination_snapshot
+from .state_machine import check_tcg_validity, validate_transition
+from .tcg_selector import identify_tcg
+from .types import (
+    TCG,
+    AnchorMode,
+    ExecutionDecisionTag,
+    ExecutionState,
+    PlannerTag,
+    QuinticLongitudinalProfile,
+    ScenarioConfig,
+    SliceKind,
+    VehicleState,
+)
+
+MAINLINE_LANE_ID = "main_0"
+RAMP_LANE_ID = "ramp_0"
+
+_PLANNABLE_STATES = (ExecutionState.APPROACHING, ExecutionState.PLANNING, ExecutionState.COMMITTED)
+_EPS_T = 1e-9
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * q) - 1)]
+
+
+def _arrival_times(rng: Random, *, vph: float, duration_s: float) -> list[float]:
+    if vph <= 0.0:
+        return []
+    times: list[float] = []
+    t = rng.expovariate(vph / 3600.0)
+    while t < duration_s:
+        times.append(t)
+        t += rng.expovariate(vph / 3600.0)
+    return times
+
+
+def _state_on_profile(
+    vehicle: VehicleState, profile: QuinticLongitudinalProfile, tau: float
+) -> VehicleState:
+    coeffs = profile.coefficients
+    return VehicleState(
+        veh_id=vehicle.veh_id,
+        stream=vehicle.stream,
+        lane_id=vehicle.lane_id,
+        x_pos_m=eval_poly(coeffs, tau),
+        speed_mps=max(0.0, eval_poly(_velocity_coeffs(coeffs), tau)),
+        accel_mps2=eval_poly(_accel_coeffs(coeffs), tau),
+        length_m=vehicle.length_m,
+        is_cav=vehicle.is_cav,
+        execution_state=vehicle.execution_state,
+    )
+
+
+class _Transitions:
+    """Applies ego state changes through ``validate_transition``."""
+
+    def __init__(self) -> None:
+        self.illegal: list[str] = []
+
+    def apply(self, vehicle: VehicleState, target: ExecutionState) -> None:
+        error = validate_transition(vehicle.execution_state, target)
+        if error is not None:
+            self.illegal.append(f"{vehicle.veh_id}:{error}")
+        vehicle.execution_state = target
+
+
+def run_multi_ego_closed_loop(
+    *,
+    seed: int,
+    duration_s: float,
+    mainline_vph: float,
+    ramp_vph: float,
+    anchor_mode: AnchorMode = AnchorMode.FLEXIBLE,
+    scenario: ScenarioConfig | None = None,
+    mainline_speed_mps: tuple[float, float] = (15.0, 20.0),
+    ramp_speed_mps: tuple[float, float] = (12.0, 16.7),
+    record_trace: bool = False,
+) -> dict[str, Any]:
+    cfg = scenario or default_scenario_config(scenario_id=f"multi_ego:{seed}")
+    dt = cfg.planning_tick_s
+    rng = Random(f"multi_ego:{seed}")
+    insertion_gap_m = cfg.vehicle_length_m + cfg.min_gap_m
+    follow_gap_m = cfg.vehicle_length_m + cfg.min_gap_m
+    collisions: set[tuple[str, str]] = set()
+    zone_length_m = cfg.control_zone_length_m
+
+    # Per-stream arrival queues of (arrival time, veh_id, speed).
+    pending: dict[str, list[tuple[float, str, float]]] = {}
+    for stream, vph, speeds, prefix in (
+        ("mainline", mainline_vph, mainline_speed_mps, "main"),
+        ("ramp", ramp_vph, ramp_speed_mps, "ramp"),
+    ):
+        pending[stream] = [
+            (t, f"{prefix}_{idx}", rng.uniform(*speeds))
+            for idx, t in enumerate(_arrival_times(rng, vph=vph, duration_s=duration_s))
+        ]
+        pending[stream].reverse()
+
+    world: dict[str, VehicleState] = {}
+    transitions = _Transitions()
+    spawn_time_s: dict[str, float] = {}
+    spawn_speed_mps: dict[str, float] = {}
+    coord_count: dict[str, int] = {}
+    merge_delay_s: list[float] = []
+    # ego -> (t0, tcg, (profile_p, profile_m, profile_s), lane change end time)
+    executing: dict[str, tuple[float, TCG, tuple[QuinticLongitudinalProfile, ...], float]] = {}
+    guard_until_s: dict[str, float] = {}
+
+    planning_ms: list[float] = []
+    counts = {
+        "ramp_spawned": 0,
+        "mainline_spawned": 0,
+        "merged": 0,
+        "aborted": 0,
+        "mainline_exits": 0,
+        "merge_attempts": 0,
+        "merge_certified": 0,
+        "coordination_attempts": 0,
+        "coordination_certified": 0,
+        "safe_wait_ticks": 0,
+        "fail_safe_stops": 0,
+        "follow_clamps": 0,
+    }
+    max_ramp_egos = 0
+    trace: list[dict[str, Any]] = []
+
+    ticks = int(round(duration_s / dt))
+    for tick in range(ticks):
+        sim_time = tick * dt
+
+        # Insert the next arrival of each stream once its entry is clear.
+        for stream, queue in pending.items():
+            if not queue or queue[-1][0] > sim_time + _EPS_T:
+                continue
+            _, veh_id, speed = queue[-1]
+            tail_m = min(
+                (state.x_pos_m for state in world.values() if state.stream == stream),
+                default=math.inf,
+            )
+            if tail_m < insertion_gap_m + cfg.time_headway_s * speed:
+                continue
+            queue.pop()
+            is_ramp = stream == "ramp"
+            world[veh_id] = VehicleState(
+                veh_id=veh_id,
+                stream=stream,
+                lane_id=RAMP_LANE_ID if is_ramp else MAINLINE_LANE_ID,
+                x_pos_m=0.0,
+                speed_mps=speed,
+                accel_mps2=0.0,
+                length_m=cfg.vehicle_length_m,
+                is_cav=True,
+                execution_state=ExecutionState.APPROACHING if is_ramp else ExecutionState.PLANNING,
+            )
+            counts["ramp_spawned" if is_ramp else "mainline_spawned"] += 1
+            spawn_time_s[veh_id] = sim_time
+            spawn_speed_mps[veh_id] = speed
+
+        ramp_egos = [state for state in world.values() if state.stream == "ramp"]
+        max_ramp_egos = max(max_ramp_egos, len(ramp_egos))
+
+        # Plan the active ego unless a lane change is in progress.
+        plan_slice = None
+        active_id: str | None = None
+        decision_tag = "none"
+        tick_planning_ms: float | None = None
+        lane_changing = any(sim_time < end_s - _EPS_T for _, _, _, end_s in executing.values())
+        plannable = [state for state in ramp_egos if state.execution_state in _PLANNABLE_STATES]
+        if plannable and not lane_changing:
+            start = time.perf_counter()
+            planning_world = {
+                veh_id: state
+                for veh_id, state in world.items()
+                if state.stream == "mainline" or state.execution_state in _PLANNABLE_STATES
+            }
+            snap = build_coordination_snapshot(
+                sim_time_s=sim_time, scenario=cfg, world_state=planning_world,
+                locked_tcgs={ego_id: record[1] for ego_id, record in executing.items()},
+                planner_tag=PlannerTag.ACTIVE_GAP, anchor_mode=anchor_mode,
+            )
+            active_id = snap.ego_id
+            ego = world[active_id]
+            if ego.execution_state == ExecutionState.APPROACHING:
+                transitions.apply(ego, ExecutionState.PLANNING)
+            tcg = identify_tcg(snapshot=snap)
+
+            merge_result = None
+            if tcg is not None:
+                counts["merge_attempts"] += 1
+                merge_result = _try_certified_merge(snap, tcg)
+            if merge_result is not None:
+                counts["merge_certified"] += 1
+                target, profiles, cert = merge_result
+                plan_slice = commit_first_slice(
+                    snapshot=snap, tcg=tcg, certificate=cert,
+                    profiles=profiles, target=target, slice_kind=SliceKind.MERGE,
+                )
+                coord_count[active_id] = 0
+            elif tcg is not None and coord_count.get(active_id, 0) < N_COORD_MAX:
+                counts["coordination_attempts"] += 1
+                plan_slice = synthesize_coordination_slice(snapshot=snap, tcg=tcg)
+                if plan_slice is not None:
+                    counts["coordination_certified"] += 1
+                    coord_count[active_id] = coord_count.get(active_id, 0) + 1
+
+            decision = decide_execution(
+                snapshot=snap, tcg=tcg, plan_slice=plan_slice,
+                failure_reason=None if plan_slice else "no_certified_slice",
+            )
+            tick_planning_ms = 1e3 * (time.perf_counter() - start)
+            planning_ms.append(tick_planning_ms)
+            decision_tag = decision.decision_tag.value
+
+            tcg_valid = tcg is not None and check_tcg_validity(
+                world[tcg.p_id].x_pos_m, ego.x_pos_m, world[tcg.s_id].x_pos_m, zone_length_m,
+            )
+            if decision.decision_tag == ExecutionDecisionTag.FAIL_SAFE_STOP or (
+                ego.execution_state == ExecutionState.COMMITTED
+                and tcg is not None
+                and not tcg_valid
+            ):
+                transitions.apply(ego, ExecutionState.FAIL_SAFE_STOP)
+                counts["fail_safe_stops"] += 1
+                plan_slice = None
+            elif decision.decision_tag == ExecutionDecisionTag.SAFE_WAIT:
+                counts["safe_wait_ticks"] += 1
+                # COMMITTED keeps its TCG lock while waiting (design.md §6.5).
+                if ego.execution_state != ExecutionState.COMMITTED:
+                    transitions.apply(ego, ExecutionState.PLANNING)
+            else:
+                was_committed = ego.execution_state == ExecutionState.COMMITTED
+                transitions.apply(ego, ExecutionState.COMMITTED)
+                target = plan_slice.merge_target
+                if (
+                    was_committed
+                    and target is not None
+                    and target.horizon_s <= cfg.lane_change_duration_s + _EPS_T
+                ):
+                    transitions.apply(ego, ExecutionState.EXECUTING)
+                    profiles = (plan_slice.profile_p, plan_slice.profile_m, plan_slice.profile_s)
+                    executing[active_id] = (sim_time, tcg, profiles, sim_time + target.horizon_s)
+                    plan_slice = None
+
+        # Roll the world forward one tick.
+        active_slices = {active_id: plan_slice} if plan_slice is not None else {}
+        next_world = rollout_step(scenario=cfg, world_state=world, active_slices=active_slices)
+        # Vehicles on a locked lane-change profile are not clamped.
+        controlled: set[str] = set()
+        for ego_id, (t0, _, profiles, end_s) in list(executing.items()):
+            tau = min(sim_time + dt - t0, end_s - t0)
+            for profile in profiles:
+                if profile.vehicle_id in next_world:
+                    next_world[profile.vehicle_id] = _state_on_profile(
+                        next_world[profile.vehicle_id], profile, tau,
+                    )
+                    controlled.add(profile.vehicle_id)
+            if sim_time + dt >= end_s - _EPS_T:
+                merged = next_world[ego_id]
+                merged.stream = "mainline"
+                merged.lane_id = MAINLINE_LANE_ID
+                guard_until_s[ego_id] = end_s + cfg.post_merge_guard_s
+                free_flow_s = merged.x_pos_m / max(spawn_speed_mps[ego_id], _EPS_T)
+                merge_delay_s.append(end_s - spawn_time_s[ego_id] - free_flow_s)
+                counts["merged"] += 1
+                del executing[ego_id]
+        for ego_id, until_s in list(guard_until_s.items()):
+            if sim_time + dt >= until_s - _EPS_T:
+                if ego_id in next_world:
+                    transitions.apply(next_world[ego_id], ExecutionState.POST_MERGE)
+                del guard_until_s[ego_id]
+        for veh_id, state in next_world.items():
+            if state.execution_state == ExecutionState.FAIL_SAFE_STOP:
+                previous = world[veh_id]
+                speed = max(0.0, previous.speed_mps - cfg.fail_safe_brake_mps2 * dt)
+                state.x_pos_m = previous.x_pos_m + 0.5 * (previous.speed_mps + speed) * dt
+                state.speed_mps = speed
+                state.accel_mps2 = -cfg.fail_safe_brake_mps2 if speed > 0.0 else 0.0
+
+        # Same-stream car following for everything not on a locked profile.
+        for stream in ("mainline", "ramp"):
+            lane = sorted(
+                (state for state in next_world.values() if state.stream == stream),
+                key=lambda state: (state.x_pos_m, state.veh_id),
+                reverse=True,
+            )
+            for leader, follower in zip(lane, lane[1:]):
+                if leader.x_pos_m - follower.x_pos_m < leader.length_m:
+                    collisions.add((leader.veh_id, follower.veh_id))
+                if follower.veh_id in controlled:
+                    continue
+                limit_m = leader.x_pos_m - follow_gap_m
+                if follower.x_pos_m > limit_m:
+                    follower.x_pos_m = limit_m
+                    follower.speed_mps = min(follower.speed_mps, leader.speed_mps)
+                    counts["follow_clamps"] += 1
+
+        for veh_id, state in list(next_world.items()):
+            if state.execution_state == ExecutionState.FAIL_SAFE_STOP and state.speed_mps <= 0.0:
+                transitions.apply(state, ExecutionState.ABORTED)
+                counts["aborted"] += 1
+                del next_world[veh_id]
+            elif state.stream == "mainline" and state.x_pos_m > zone_length_m:
+                counts["mainline_exits"] += 1
+                del next_world[veh_id]
+        world = next_world
+
+        if record_trace:
+            trace.append({
+                "tick": tick,
+                "time_s": sim_time,
+                "planning_ms": tick_planning_ms,
+                "active_ego": active_id,
+                "decision": decision_tag,
+                "vehicles": len(world),
+                "ramp_egos": len(ramp_egos),
+                "lane_changes": len(executing),
+            })
+
+    hours = duration_s / 3600.0
+    ramp_spawned = counts["ramp_spawned"]
+    planning_attempts = counts["merge_attempts"] + counts["coordination_attempts"]
+    return {
+        "seed": seed,
+        "duration_s": duration_s,
+        "mainline_vph": mainline_vph,
+        "ramp_vph": ramp_vph,
+        "anchor_mode": anchor_mode.value,
+        "ticks": ticks,
+        "planning_ticks": len(planning_ms),
+        "planning_ms_mean": sum(planning_ms) / len(planning_ms) if planning_ms else None,
+        "planning_ms_p50": _percentile(planning_ms, 0.50),
+        "planning_ms_p95": _percentile(planning_ms, 0.95),
+        "planning_ms_p99": _percentile(planning_ms, 0.99),
+        "planning_ms_max": max(planning_ms) if planning_ms else None,
+        **counts,
+        "collision_count": len(collisions),
+        "insertion_backlog": sum(len(queue) for queue in pending.values()),
+        "max_concurrent_ramp_egos": max_ramp_egos,
+        "merge_pass_rate": (
+            counts["merge_certified"] / counts["merge_attempts"]
+            if counts["merge_attempts"] else None
+        ),
+        "coordination_pass_rate": (
+            counts["coordination_certified"] / counts["coordination_attempts"]
+            if counts["coordination_attempts"] else None
+        ),
+        "slice_pass_rate": (
+            (counts["merge_certified"] + counts["coordination_certified"]) / len(planning_ms)
+            if planning_ms and planning_attempts else None
+        ),
+        "completion_rate": counts["merged"] / ramp_spawned if ramp_spawned else None,
+        "abort_rate": counts["aborted"] / ramp_spawned if ramp_spawned else None,
+        "avg_ramp_delay_s": sum(merge_delay_s) / len(merge_delay_s) if merge_delay_s else None,
+        "merge_throughput_vph": counts["merged"] / hours if hours > 0.0 else None,
+        "throughput_vph": counts["mainline_exits"] / hours if hours > 0.0 else None,
+        "illegal_transitions": transitions.illegal,
+        "trace": trace,
+    }
+
+
+__all__ = [
+    "MAINLINE_LANE_ID",
+    "RAMP_LANE_ID",
+    "run_multi_ego_closed_loop",
+]
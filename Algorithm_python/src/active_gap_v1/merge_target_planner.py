@@ -1,10 +1,29 @@
-"""Merge target enumeration and deterministic ranking for active_gap_v1."""
+"""Merge target enumeration and deterministic ranking for active_gap_v1.
+
+Targets are ranked by ``(t_m*, |v* - v_avg|, delta_coop, delta_delay,
+-rho_min, x_m*)`` with ``t_m* = t_now + h``, so every target of a shorter
+horizon ranks before every target of a longer one.  ``iter_merge_targets``
+therefore walks the horizons in ascending order, evaluates one horizon's
+whole (v*, x_m*) grid with NumPy broadcasting, sorts only that horizon's
+survivors and yields them lazily; a caller that stops at the first
+certified target never evaluates the later horizons.
+
+Before the grid is evaluated, a horizon is dropped outright when m cannot
+have finished its lane change inside the legal zone, and v* / x_m* are cut
+to the values the TCG vehicles can reach within ``h`` at all.  The
+remaining checks use the same floating-point expressions as
+``_is_terminal_reachable``, so the yielded sequence equals the fully
+enumerated and sorted list element for element.
+"""
 
 from __future__ import annotations
 
 import math
+from collections.abc import Iterator
 
-from .predictor import predict_free_position, predict_optional_free_position
+import numpy as np
+
+from .predictor import predict_free_position
 from .types import AnchorMode, CoordinationSnapshot, MergeTarget, TCG, VehicleState
 
 _EPS = 1e-9
@@ -67,6 +86,44 @@ def _is_terminal_reachable(
     return True
 
 
+def _speed_reachable(
+    *,
+    vehicle: VehicleState,
+    v_target_mps: np.ndarray,
+    horizon_s: float,
+    a_max_mps2: float,
+    b_max_mps2: float,
+) -> np.ndarray:
+    """Speed half of ``_is_terminal_reachable`` over an array of v*."""
+    dv = v_target_mps - vehicle.speed_mps
+    too_fast = (dv > 0) & (dv > a_max_mps2 * horizon_s + _EPS)
+    too_slow = (dv < 0) & (-dv > b_max_mps2 * horizon_s + _EPS)
+    return ~(too_fast | too_slow)
+
+
+def _position_reachable(
+    *,
+    vehicle: VehicleState,
+    x_target_m: np.ndarray,
+    horizon_s: float,
+    a_max_mps2: float,
+    b_max_mps2: float,
+    v_max_mps: float,
+) -> np.ndarray:
+    """Position half of ``_is_terminal_reachable`` over an array of targets."""
+    x_free_m = predict_free_position(vehicle=vehicle, horizon_s=horizon_s)
+    lower_m = x_free_m - 0.5 * b_max_mps2 * horizon_s * horizon_s
+    upper_m = x_free_m + 0.5 * a_max_mps2 * horizon_s * horizon_s
+    ok = (lower_m - _EPS <= x_target_m) & (x_target_m <= upper_m + _EPS)
+
+    if horizon_s > _EPS:
+        avg_v = (x_target_m - vehicle.x_pos_m) / horizon_s
+    else:
+        avg_v = np.zeros_like(x_target_m)
+    ok &= (avg_v >= -_EPS) & (avg_v <= v_max_mps + 0.5 * a_max_mps2 * horizon_s + _EPS)
+    return ok
+
+
 def _admissible_x_m_values(*, tcg: TCG, snapshot: CoordinationSnapshot) -> list[float]:
     scenario = snapshot.scenario
     if tcg.anchor_mode == AnchorMode.FIXED:
@@ -80,11 +137,12 @@ def _admissible_x_m_values(*, tcg: TCG, snapshot: CoordinationSnapshot) -> list[
     )
 
 
-def enumerate_merge_targets(
+def iter_merge_targets(
     *,
     snapshot: CoordinationSnapshot,
     tcg: TCG,
-) -> list[MergeTarget]:
+) -> Iterator[MergeTarget]:
+    """Yield admissible merge targets best-first, in ``ranking_key`` order."""
     scenario = snapshot.scenario
     states = snapshot.control_zone_states
 
@@ -92,139 +150,143 @@ def enumerate_merge_targets(
     m_state = states.get(tcg.m_id)
     s_state = states.get(tcg.s_id)
     if p_state is None or m_state is None or s_state is None:
-        return []
-
-    # u/f are optional boundaries; keep None semantics as-is.
-    u_state = states.get(tcg.u_id) if tcg.u_id is not None else None
-    f_state = states.get(tcg.f_id) if tcg.f_id is not None else None
+        return
 
+    a_max_mps2 = scenario.a_max_mps2
+    b_max_mps2 = scenario.b_safe_mps2
     v_group_avg_mps = (p_state.speed_mps + m_state.speed_mps + s_state.speed_mps) / 3.0
     v_upper_mps = min(scenario.ramp_vmax_mps, scenario.mainline_vmax_mps)
     horizons_s = _float_grid(start=_H_MIN_S, end=_H_MAX_S, step=_H_STEP_S)
-    v_candidates_mps = _float_grid(start=_V_MIN_STAR_MPS, end=v_upper_mps, step=_V_STEP_MPS)
-    x_m_candidates_m = _admissible_x_m_values(tcg=tcg, snapshot=snapshot)
 
     zone_start_m, zone_end_m = scenario.legal_merge_zone_m
-    targets: list[MergeTarget] = []
+    v_grid = np.array(_float_grid(start=_V_MIN_STAR_MPS, end=v_upper_mps, step=_V_STEP_MPS))
+    v_grid = v_grid[(0.0 <= v_grid) & (v_grid <= v_upper_mps + _EPS)]
+    x_grid = np.array(_admissible_x_m_values(tcg=tcg, snapshot=snapshot))
+    x_grid = x_grid[(x_grid >= zone_start_m - _EPS) & (x_grid <= zone_end_m + _EPS)]
+    if v_grid.size == 0 or x_grid.size == 0:
+        return
+
+    base_m = scenario.vehicle_length_m + scenario.min_gap_m
+    d_pm_grid = base_m + scenario.h_pr_s * v_grid
+    d_ms_grid = base_m + scenario.h_rf_s * v_grid
+    required_gap_grid = d_pm_grid + d_ms_grid
 
     for horizon_s in horizons_s:
         if horizon_s <= 0.0:
             continue
 
-        # Keep optional boundary prediction available for downstream extensions.
-        _ = predict_optional_free_position(vehicle=u_state, horizon_s=horizon_s)
-        _ = predict_optional_free_position(vehicle=f_state, horizon_s=horizon_s)
+        # Horizon-level pruning: independent of v* and x_m*.
+        tau_lc_s = horizon_s - scenario.lane_change_duration_s
+        if tau_lc_s < -_EPS:
+            continue
+        x_lc_star_m = m_state.x_pos_m + m_state.speed_mps * tau_lc_s
+        if x_lc_star_m < zone_start_m - _EPS:
+            continue
+
+        # v* every TCG vehicle can reach; x_m* that m can reach.
+        v_keep = np.ones(v_grid.shape, dtype=bool)
+        for vehicle in (p_state, m_state, s_state):
+            v_keep &= _speed_reachable(
+                vehicle=vehicle,
+                v_target_mps=v_grid,
+                horizon_s=horizon_s,
+                a_max_mps2=a_max_mps2,
+                b_max_mps2=b_max_mps2,
+            )
+        x_keep = _position_reachable(
+            vehicle=m_state,
+            x_target_m=x_grid,
+            horizon_s=horizon_s,
+            a_max_mps2=a_max_mps2,
+            b_max_mps2=b_max_mps2,
+            v_max_mps=scenario.ramp_vmax_mps,
+        )
+        if not v_keep.any() or not x_keep.any():
+            continue
+
+        v_star = v_grid[v_keep]
+        d_pm = d_pm_grid[v_keep]
+        d_ms = d_ms_grid[v_keep]
+        x_m_star = x_grid[x_keep]
+
+        # (v*, x_m*) grid, v-major like the scalar loop nest.
+        x_p_star_grid = x_m_star[np.newaxis, :] + d_pm[:, np.newaxis]
+        x_s_star_grid = x_m_star[np.newaxis, :] - d_ms[:, np.newaxis]
+        feasible = _position_reachable(
+            vehicle=p_state,
+            x_target_m=x_p_star_grid,
+            horizon_s=horizon_s,
+            a_max_mps2=a_max_mps2,
+            b_max_mps2=b_max_mps2,
+            v_max_mps=scenario.mainline_vmax_mps,
+        ) & _position_reachable(
+            vehicle=s_state,
+            x_target_m=x_s_star_grid,
+            horizon_s=horizon_s,
+            a_max_mps2=a_max_mps2,
+            b_max_mps2=b_max_mps2,
+            v_max_mps=scenario.mainline_vmax_mps,
+        )
+        v_idx, x_idx = np.nonzero(feasible)
+        if v_idx.size == 0:
+            continue
+
+        x_m = x_m_star[x_idx]
+        v = v_star[v_idx]
+        x_p = x_p_star_grid[v_idx, x_idx]
+        x_s = x_s_star_grid[v_idx, x_idx]
 
         x_p_free_m = predict_free_position(vehicle=p_state, horizon_s=horizon_s)
         x_s_free_m = predict_free_position(vehicle=s_state, horizon_s=horizon_s)
         natural_gap_m = x_p_free_m - x_s_free_m
-
-        for v_star_mps in v_candidates_mps:
-            if not (0.0 <= v_star_mps <= v_upper_mps + _EPS):
-                continue
-
-            d_pm_m = _terminal_distance_pm(
-                vehicle_length_m=scenario.vehicle_length_m,
-                min_gap_m=scenario.min_gap_m,
-                h_pr_s=scenario.h_pr_s,
-                v_star_mps=v_star_mps,
-            )
-            d_ms_m = _terminal_distance_ms(
-                vehicle_length_m=scenario.vehicle_length_m,
-                min_gap_m=scenario.min_gap_m,
-                h_rf_s=scenario.h_rf_s,
+        open_m = required_gap_grid[v_keep][v_idx] - natural_gap_m
+        delta_open = np.where(open_m > 0.0, open_m, 0.0)
+
+        t_m_star_s = snapshot.sim_time_s + horizon_s
+        if m_state.speed_mps > _EPS:
+            delta_delay = t_m_star_s - (x_m - m_state.x_pos_m) / m_state.speed_mps
+        else:
+            delta_delay = np.full(x_m.shape, math.inf)
+        delta_coop = np.abs(x_p_free_m - x_p) + np.abs(x_s_free_m - x_s)
+        rho_min = np.minimum(x_p - x_m - d_pm[v_idx], x_m - x_s - d_ms[v_idx])
+        rho_min[np.abs(rho_min) < _EPS] = 0.0
+        speed_deviation = np.abs(v - v_group_avg_mps)
+
+        # t_m* is shared within a horizon; lexsort is stable, so exact ties
+        # keep the v-major / x-minor enumeration order.
+        order = np.lexsort((x_m, -rho_min, delta_delay, delta_coop, speed_deviation))
+        columns = zip(
+            x_m[order].tolist(),
+            v[order].tolist(),
+            x_p[order].tolist(),
+            x_s[order].tolist(),
+            delta_open[order].tolist(),
+            delta_coop[order].tolist(),
+            delta_delay[order].tolist(),
+            rho_min[order].tolist(),
+            speed_deviation[order].tolist(),
+        )
+        for x_m_star_m, v_star_mps, x_p_star_m, x_s_star_m, open_gap_m, coop_m, delay_s, rho_m, dev_mps in columns:
+            yield MergeTarget(
+                snapshot_id=snapshot.snapshot_id,
+                m_id=tcg.m_id,
+                x_m_star_m=x_m_star_m,
+                t_m_star_s=t_m_star_s,
+                horizon_s=horizon_s,
                 v_star_mps=v_star_mps,
+                x_p_star_m=x_p_star_m,
+                x_s_star_m=x_s_star_m,
+                delta_open_m=open_gap_m,
+                delta_coop_m=coop_m,
+                delta_delay_s=delay_s,
+                rho_min_m=rho_m,
+                ranking_key=(t_m_star_s, dev_mps, coop_m, delay_s, -rho_m, x_m_star_m),
             )
-            required_gap_m = d_pm_m + d_ms_m
-            delta_open_m = max(0.0, required_gap_m - natural_gap_m)
-
-            for x_m_star_m in x_m_candidates_m:
-                tau_lc_s = horizon_s - scenario.lane_change_duration_s
-                if tau_lc_s < -_EPS:
-                    continue
-
-                if x_m_star_m < zone_start_m - _EPS or x_m_star_m > zone_end_m + _EPS:
-                    continue
-
-                x_lc_star_m = m_state.x_pos_m + m_state.speed_mps * tau_lc_s
-                if x_lc_star_m < zone_start_m - _EPS:
-                    continue
-
-                x_p_star_m = x_m_star_m + d_pm_m
-                x_s_star_m = x_m_star_m - d_ms_m
-
-                if not _is_terminal_reachable(
-                    vehicle=p_state,
-                    x_target_m=x_p_star_m,
-                    v_target_mps=v_star_mps,
-                    horizon_s=horizon_s,
-                    a_max_mps2=scenario.a_max_mps2,
-                    b_max_mps2=scenario.b_safe_mps2,
-                    v_max_mps=scenario.mainline_vmax_mps,
-                ):
-                    continue
-                if not _is_terminal_reachable(
-                    vehicle=m_state,
-                    x_target_m=x_m_star_m,
-                    v_target_mps=v_star_mps,
-                    horizon_s=horizon_s,
-                    a_max_mps2=scenario.a_max_mps2,
-                    b_max_mps2=scenario.b_safe_mps2,
-                    v_max_mps=scenario.ramp_vmax_mps,
-                ):
-                    continue
-                if not _is_terminal_reachable(
-                    vehicle=s_state,
-                    x_target_m=x_s_star_m,
-                    v_target_mps=v_star_mps,
-                    horizon_s=horizon_s,
-                    a_max_mps2=scenario.a_max_mps2,
-                    b_max_mps2=scenario.b_safe_mps2,
-                    v_max_mps=scenario.mainline_vmax_mps,
-                ):
-                    continue
-
-                t_m_star_s = snapshot.sim_time_s + horizon_s
-                if m_state.speed_mps > _EPS:
-                    t_m_free_s = (x_m_star_m - m_state.x_pos_m) / m_state.speed_mps
-                    delta_delay_s = t_m_star_s - t_m_free_s
-                else:
-                    delta_delay_s = math.inf
-
-                delta_coop_m = abs(x_p_free_m - x_p_star_m) + abs(x_s_free_m - x_s_star_m)
-                rho_min_m = min(
-                    x_p_star_m - x_m_star_m - d_pm_m,
-                    x_m_star_m - x_s_star_m - d_ms_m,
-                )
-                if abs(rho_min_m) < _EPS:
-                    rho_min_m = 0.0
-
-                speed_deviation_mps = abs(v_star_mps - v_group_avg_mps)
-                ranking_key = (
-                    t_m_star_s,
-                    speed_deviation_mps,
-                    delta_coop_m,
-                    delta_delay_s,
-                    -rho_min_m,
-                    x_m_star_m,
-                )
-                targets.append(
-                    MergeTarget(
-                        snapshot_id=snapshot.snapshot_id,
-                        m_id=tcg.m_id,
-                        x_m_star_m=x_m_star_m,
-                        t_m_star_s=t_m_star_s,
-                        horizon_s=horizon_s,
-                        v_star_mps=v_star_mps,
-                        x_p_star_m=x_p_star_m,
-                        x_s_star_m=x_s_star_m,
-                        delta_open_m=delta_open_m,
-                        delta_coop_m=delta_coop_m,
-                        delta_delay_s=delta_delay_s,
-                        rho_min_m=rho_min_m,
-                        ranking_key=ranking_key,
-                    )
-                )
-
-    targets.sort(key=lambda target: target.ranking_key)
-    return targets
+
+
+def enumerate_merge_targets(
+    *,
+    snapshot: CoordinationSnapshot,
+    tcg: TCG,
+) -> list[MergeTarget]:
+    return list(iter_merge_targets(snapshot=snapshot, tcg=tcg))
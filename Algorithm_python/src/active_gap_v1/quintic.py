@@ -1,9 +1,16 @@
-"""Three-vehicle quintic longitudinal trajectory solver for active_gap_v1."""
+"""Three-vehicle quintic longitudinal trajectory solver for active_gap_v1.
+
+The ``*_batch`` helpers evaluate the same quantities for a stack of
+candidate targets at once (rows of a coefficient array); polynomial roots
+of degree >= 2 come from the eigenvalues of stacked companion matrices.
+"""
 
 from __future__ import annotations
 
 import math
 
+import numpy as np
+
 from .types import (
     CertificateFailureKind,
     CoordinationSnapshot,
@@ -116,32 +123,53 @@ def _roots_in_interval(coeffs: tuple[float, ...], lo: float, hi: float) -> list[
     elif n == 4:
         raw = _cubic_real_roots(coeffs[3], coeffs[2], coeffs[1], coeffs[0])
     else:
-        raw = _numeric_roots_fallback(coeffs, lo, hi)
+        row = real_roots_batch(np.array([coeffs], dtype=float), np.array([lo]), np.array([hi]))[0]
+        return row[~np.isnan(row)].tolist()
     return [r for r in raw if lo - 1e-9 <= r <= hi + 1e-9]
 
 
-def _numeric_roots_fallback(
-    coeffs: tuple[float, ...], lo: float, hi: float, n_samples: int = 200,
-) -> list[float]:
-    roots: list[float] = []
-    dt = (hi - lo) / n_samples
-    prev = eval_poly(coeffs, lo)
-    for i in range(1, n_samples + 1):
-        t = lo + i * dt
-        cur = eval_poly(coeffs, t)
-        if prev * cur <= 0 and (abs(prev) > 1e-15 or abs(cur) > 1e-15):
-            tl, tr = t - dt, t
-            for _ in range(50):
-                tm = (tl + tr) / 2.0
-                vm = eval_poly(coeffs, tm)
-                if abs(vm) < 1e-12:
-                    break
-                if vm * eval_poly(coeffs, tl) <= 0:
-                    tr = tm
-                else:
-                    tl = tm
-            roots.append((tl + tr) / 2.0)
-        prev = cur
+def eval_poly_batch(coeffs: np.ndarray, tau: np.ndarray) -> np.ndarray:
+    """Evaluate row-wise polynomials ``coeffs`` (N, n) at ``tau`` (N, k)."""
+    result = np.zeros(tau.shape)
+    for i in range(coeffs.shape[1] - 1, -1, -1):
+        result = result * tau + coeffs[:, i:i + 1]
+    return result
+
+
+def real_roots_batch(coeffs: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Real roots in ``[lo, hi]`` of row-wise polynomials, NaN-padded to (N, n - 1).
+
+    Rows whose leading coefficient is below 1e-12 are solved as the next
+    lower degree, matching the closed-form quadratic/cubic solvers.
+    """
+    n_rows, n = coeffs.shape
+    roots = np.full((n_rows, max(n - 1, 0)), np.nan)
+    if n < 2 or n_rows == 0:
+        return roots
+
+    lead = coeffs[:, -1]
+    degenerate = np.abs(lead) < 1e-12
+    if degenerate.any():
+        roots[degenerate, : n - 2] = real_roots_batch(
+            coeffs[degenerate, :-1], lo[degenerate], hi[degenerate],
+        )
+    proper = ~degenerate
+    if not proper.any():
+        return roots
+
+    monic = coeffs[proper] / lead[proper, np.newaxis]
+    degree = n - 1
+    if degree == 1:
+        values = -monic[:, :1]
+    else:
+        companion = np.zeros((monic.shape[0], degree, degree))
+        companion[:, 0, :] = -monic[:, degree - 1::-1]
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+        eig = np.linalg.eigvals(companion)
+        values = np.where(np.abs(eig.imag) <= 1e-6 * (1.0 + np.abs(eig.real)), eig.real, np.nan)
+
+    in_range = (values >= lo[proper, np.newaxis] - 1e-9) & (values <= hi[proper, np.newaxis] + 1e-9)
+    roots[proper] = np.where(in_range, values, np.nan)
     return roots
 
 
@@ -187,6 +215,74 @@ def check_dynamics(
     return None
 
 
+def check_dynamics_batch(
+    coeffs: np.ndarray,
+    H: np.ndarray,
+    v_max: np.ndarray,
+    a_max: float,
+    b_max: float,
+) -> np.ndarray:
+    """Row-wise ``check_dynamics``: True where the quintic in ``coeffs`` (N, 6) fails."""
+    powers = np.arange(6, dtype=float)
+    vc = coeffs[:, 1:] * powers[1:]
+    ac = vc[:, 1:] * powers[1:5]
+    jc = ac[:, 1:] * powers[1:4]
+    lo = np.zeros(H.shape)
+    ends = np.stack((lo, H), axis=1)
+
+    v_taus = np.concatenate((ends, real_roots_batch(ac, lo, H)), axis=1)
+    v = eval_poly_batch(vc, v_taus)
+    v_fail = (v < -0.5) | (v > v_max[:, np.newaxis] + 0.5)
+
+    a_taus = np.concatenate((ends, real_roots_batch(jc, lo, H)), axis=1)
+    a = eval_poly_batch(ac, a_taus)
+    a_fail = (a < -b_max - 0.1) | (a > a_max + 0.1)
+
+    return v_fail.any(axis=1) | a_fail.any(axis=1)
+
+
+def solve_tcg_quintics_batch(
+    *,
+    snapshot: CoordinationSnapshot,
+    tcg: TCG,
+    targets: list[MergeTarget],
+) -> np.ndarray:
+    """Coefficients (K, 3, 6) of the p/m/s quintics for every target.
+
+    Same closed-form boundary solution as ``_solve_one_quintic``, broadcast
+    over targets and vehicles.
+    """
+    states = snapshot.control_zone_states
+    start = np.array([
+        [states[vid].x_pos_m, states[vid].speed_mps, states[vid].accel_mps2]
+        for vid in (tcg.p_id, tcg.m_id, tcg.s_id)
+    ])
+    x0 = start[np.newaxis, :, 0]
+    v0 = start[np.newaxis, :, 1]
+    a0 = start[np.newaxis, :, 2]
+    xf = np.array([[t.x_p_star_m, t.x_m_star_m, t.x_s_star_m] for t in targets])
+    vf = np.array([t.v_star_mps for t in targets])[:, np.newaxis]
+    H = np.array([t.horizon_s for t in targets])[:, np.newaxis]
+
+    dx = xf - (x0 + v0 * H + 0.5 * a0 * H * H)
+    dv = vf - (v0 + a0 * H)
+    da = 0.0 - a0
+
+    H2 = H * H
+    H3 = H2 * H
+    H4 = H3 * H
+    H5 = H4 * H
+
+    coeffs = np.empty((len(targets), 3, 6))
+    coeffs[:, :, 0] = x0
+    coeffs[:, :, 1] = v0
+    coeffs[:, :, 2] = 0.5 * a0
+    coeffs[:, :, 3] = (10.0 * dx - 4.0 * H * dv + 0.5 * H2 * da) / H3
+    coeffs[:, :, 4] = (-15.0 * dx + 7.0 * H * dv - H2 * da) / H4
+    coeffs[:, :, 5] = (6.0 * dx - 3.0 * H * dv + 0.5 * H2 * da) / H5
+    return coeffs
+
+
 def solve_tcg_quintics(
     *,
     snapshot: CoordinationSnapshot,
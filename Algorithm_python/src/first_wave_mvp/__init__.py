@@ -31,6 +31,7 @@ from first_wave_mvp.types import (
     ExecutionState,
     ExperimentResultSummary,
     GapRef,
+    GateMode,
     GateResult,
     PlanningSnapshot,
     PolicyTag,
@@ -56,6 +57,7 @@ __all__ = [
     "FIXED_ANCHOR_M",
     "GATE_SAMPLING_DT_S",
     "GapRef",
+    "GateMode",
     "GateResult",
     "H_PR_S",
     "H_RF_S",
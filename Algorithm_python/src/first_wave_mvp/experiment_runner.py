@@ -2,38 +2,45 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
+from dataclasses import replace
 from pathlib import Path
 from typing import Any
 
 from first_wave_mvp.commit import commit_candidate
-from first_wave_mvp.gate import accept_candidate
+from first_wave_mvp.gate import accept_candidates
 from first_wave_mvp.metrics_collector import MetricsCollector
 from first_wave_mvp.rollout import rollout_step
 from first_wave_mvp.scenario_initializer import initialize_scenario
 from first_wave_mvp.snapshot import build_snapshot, select_planning_ego
 from first_wave_mvp.step2_fifo import generate_candidates
-from first_wave_mvp.types import ExecutionState, PolicyTag, VehicleState
+from first_wave_mvp.types import CommittedPlan, ExecutionState, PolicyTag, VehicleState
+from first_wave_mvp.world_state import PersistentMap
 
 
-def _advance_mainline_states(world_state: dict[str, VehicleState], tick_s: float) -> None:
-    for state in world_state.values():
-        if state.stream != "ramp":
-            state.x_pos_m += state.speed_mps * tick_s
+def _advance_mainline_states(
+    world_state: PersistentMap[str, VehicleState],
+    tick_s: float,
+) -> PersistentMap[str, VehicleState]:
+    return world_state.merged({
+        veh_id: replace(state, x_pos_m=state.x_pos_m + state.speed_mps * tick_s)
+        for veh_id, state in world_state.items()
+        if state.stream != "ramp"
+    })
 
 
-def _active_ramp_state(world_state: dict[str, VehicleState]) -> dict[str, VehicleState]:
-    return {
-        veh_id: state
+def _active_ramp_state(world_state: PersistentMap[str, VehicleState]) -> PersistentMap[str, VehicleState]:
+    return PersistentMap(
+        (veh_id, state)
         for veh_id, state in world_state.items()
         if state.stream == "ramp"
-    }
+    )
 
 
-def _normalize_completed_ramp(world_state: dict[str, VehicleState], veh_id: str) -> None:
-    state = world_state[veh_id]
-    state.stream = "mainline"
-    state.lane_id = "main_0"
+def _normalize_completed_ramp(
+    world_state: PersistentMap[str, VehicleState],
+    veh_id: str,
+) -> PersistentMap[str, VehicleState]:
+    return world_state.set(veh_id, replace(world_state[veh_id], stream="mainline", lane_id="main_0"))
 
 
 def run_seed_experiment(
@@ -48,8 +55,9 @@ def run_seed_experiment(
         seed=seed,
         parameters=parameters,
     )
-    world_state = deepcopy(initialized.world_state)
-    committed_plans = deepcopy(initialized.committed_plans)
+    # 每个 tick 产生新的 world/plan 版本；上一版本保持不变，可直接作为 previous 使用。
+    world_state: PersistentMap[str, VehicleState] = PersistentMap(initialized.world_state)
+    committed_plans: PersistentMap[str, CommittedPlan] = PersistentMap(initialized.committed_plans)
     scenario = initialized.scenario
     ramp_vehicle_ids = {veh_id for veh_id, state in world_state.items() if state.stream == "ramp"}
     collector = MetricsCollector(
@@ -63,7 +71,7 @@ def run_seed_experiment(
     sim_time_s = 0.0
     for tick_index in range(initialized.max_ticks):
         sim_time_s = tick_index * scenario.rollout_tick_s
-        previous_world_state = deepcopy(world_state)
+        previous_world_state = world_state
 
         planning_ego = select_planning_ego(world_state)
         if planning_ego is not None:
@@ -75,32 +83,27 @@ def run_seed_experiment(
                 policy_tag=policy_tag,
             )
             candidates = generate_candidates(snapshot=snapshot)
-            for candidate in candidates:
-                gate_result = accept_candidate(snapshot=snapshot, candidate=candidate)
+            gate_results = accept_candidates(snapshot=snapshot, candidates=candidates)
+            for candidate, gate_result in zip(candidates, gate_results):
                 if gate_result.accepted:
                     committed_plan = commit_candidate(
                         snapshot=snapshot,
                         candidate=candidate,
                         gate_result=gate_result,
                     )
-                    committed_plans[candidate.ego_id] = committed_plan
+                    committed_plans = committed_plans.set(candidate.ego_id, committed_plan)
                     collector.record_commit(candidate.ego_id, committed_plan)
                     break
 
-        _advance_mainline_states(world_state, scenario.rollout_tick_s)
+        world_state = _advance_mainline_states(world_state, scenario.rollout_tick_s)
         ramp_world_state = _active_ramp_state(world_state)
         if ramp_world_state:
-            active_committed_plans = {
-                veh_id: plan
-                for veh_id, plan in committed_plans.items()
-                if veh_id in ramp_world_state
-            }
             next_ramp_state = rollout_step(
                 scenario=scenario,
                 world_state=ramp_world_state,
-                committed_plans=active_committed_plans,
+                committed_plans=committed_plans,
             )
-            world_state.update(next_ramp_state)
+            world_state = world_state.merged(next_ramp_state)
 
         sim_time_after_tick_s = sim_time_s + scenario.rollout_tick_s
         for veh_id in ramp_vehicle_ids:
@@ -116,10 +119,10 @@ def run_seed_experiment(
                 previous_state.execution_state is not ExecutionState.POST_MERGE
                 and current_state.execution_state is ExecutionState.POST_MERGE
             ):
-                _normalize_completed_ramp(world_state, veh_id)
-                committed_plans.pop(veh_id, None)
+                world_state = _normalize_completed_ramp(world_state, veh_id)
+                committed_plans = committed_plans.discard(veh_id)
             if current_state.execution_state is ExecutionState.ABORTED:
-                committed_plans.pop(veh_id, None)
+                committed_plans = committed_plans.discard(veh_id)
 
         collector.record_tick(world_state)
 
@@ -1,15 +1,36 @@
-"""第一波 MVP 的共享 acceptance gate。"""
+"""第一波 MVP 的共享 acceptance gate。
+
+区间安全检查有两种口径（``ScenarioConfig.gate_mode``）：
+
+* ``sampled``：在 ``[tau_lc, t_m]`` 上按 ``gate_sampling_dt_s`` 取网格逐点求 margin；
+* ``analytic``（默认）：gate 对周边车辆做恒速预测，margin 是 t 的分段线性函数，
+  唯一折点是 snapshot 时刻（``max(t - t0, 0)``），所以每段的最小值必在端点或折点上，
+  只需在这几个点上求值，且不会漏掉两个采样点之间的违规。
+
+``accept_candidates`` 对同一 snapshot 的一批候选惰性给出 ``GateResult``，
+partner 集合、动力学检查和每个 anchor 的 target-lane 到达序列在批内只算一次。
+"""
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from math import isfinite
 
 from first_wave_mvp.step2_fifo import (
     _calc_time_window,
     _derive_fifo_gap,
     _estimate_target_lane_arrivals,
+    _OrderedArrival,
+)
+from first_wave_mvp.types import (
+    GapRef,
+    GateMode,
+    GateResult,
+    PlanningSnapshot,
+    RejectReason,
+    VehicleState,
 )
-from first_wave_mvp.types import GateResult, PlanningSnapshot, RejectReason, VehicleState
 
 
 def _make_result(
@@ -33,9 +54,33 @@ def _make_result(
     )
 
 
-def _partner_ids_are_valid(snapshot: PlanningSnapshot, partner_ids: tuple[str, ...]) -> bool:
-    valid_ids = set(snapshot.control_zone_states) | set(snapshot.committed_plans)
-    return all(partner_id in valid_ids for partner_id in partner_ids)
+@dataclass(slots=True)
+class _GateBatch:
+    """同一 snapshot 上各候选共享的检查输入。"""
+
+    snapshot: PlanningSnapshot
+    valid_partner_ids: set[str]
+    dynamic_limits_ok: bool
+    arrivals_by_anchor: dict[int, list[_OrderedArrival]] = field(default_factory=dict)
+
+    @classmethod
+    def for_snapshot(cls, snapshot: PlanningSnapshot) -> _GateBatch:
+        return cls(
+            snapshot=snapshot,
+            valid_partner_ids=set(snapshot.control_zone_states) | set(snapshot.committed_plans),
+            dynamic_limits_ok=_dynamic_limits_are_valid(snapshot),
+        )
+
+    def ordered_arrivals(self, x_anchor_m: int) -> list[_OrderedArrival]:
+        arrivals = self.arrivals_by_anchor.get(x_anchor_m)
+        if arrivals is None:
+            arrivals = _estimate_target_lane_arrivals(self.snapshot, x_anchor_m)
+            self.arrivals_by_anchor[x_anchor_m] = arrivals
+        return arrivals
+
+
+def _partner_ids_are_valid(batch: _GateBatch, partner_ids: tuple[str, ...]) -> bool:
+    return all(partner_id in batch.valid_partner_ids for partner_id in partner_ids)
 
 
 def _zone_is_valid(snapshot: PlanningSnapshot, candidate_x_s_m: float, candidate_x_m_m: int) -> bool:
@@ -43,13 +88,24 @@ def _zone_is_valid(snapshot: PlanningSnapshot, candidate_x_s_m: float, candidate
     return legal_start_m <= candidate_x_s_m <= candidate_x_m_m <= legal_end_m
 
 
-def _timing_is_valid(snapshot: PlanningSnapshot, candidate) -> bool:
-    ordered_arrivals = _estimate_target_lane_arrivals(snapshot, candidate.x_m_m)
-    expected_gap = _derive_fifo_gap(
+def _expected_gap(
+    snapshot: PlanningSnapshot,
+    candidate,
+    ordered_arrivals: list[_OrderedArrival],
+) -> GapRef:
+    return _derive_fifo_gap(
         ramp_arrival_time_s=candidate.t_r_free_s,
         ordered_arrivals=ordered_arrivals,
         epsilon_t_s=snapshot.scenario.epsilon_t_s,
     )
+
+
+def _timing_is_valid(
+    snapshot: PlanningSnapshot,
+    candidate,
+    ordered_arrivals: list[_OrderedArrival],
+    expected_gap: GapRef,
+) -> bool:
     lower_bound_s, upper_bound_s = _calc_time_window(
         ramp_free_time_s=candidate.t_r_free_s,
         gap=expected_gap,
@@ -79,13 +135,7 @@ def _sequence_relation(pred_id: str | None, foll_id: str | None) -> str:
     return "between_pred_and_foll"
 
 
-def _gap_identity_is_valid(snapshot: PlanningSnapshot, candidate) -> bool:
-    ordered_arrivals = _estimate_target_lane_arrivals(snapshot, candidate.x_m_m)
-    expected_gap = _derive_fifo_gap(
-        ramp_arrival_time_s=candidate.t_r_free_s,
-        ordered_arrivals=ordered_arrivals,
-        epsilon_t_s=snapshot.scenario.epsilon_t_s,
-    )
+def _gap_identity_is_valid(candidate, expected_gap: GapRef) -> bool:
     expected_relation = _sequence_relation(expected_gap.pred_id, expected_gap.foll_id)
     return (
         candidate.target_gap.pred_id == expected_gap.pred_id
@@ -117,6 +167,15 @@ def _build_checked_time_grid(snapshot: PlanningSnapshot, candidate) -> tuple[flo
     return tuple(sorted(times))
 
 
+def _segment_breakpoints(
+    snapshot: PlanningSnapshot, start_s: float, end_s: float
+) -> tuple[float, ...]:
+    points = {start_s, end_s}
+    if start_s < snapshot.sim_time_s < end_s:
+        points.add(snapshot.sim_time_s)
+    return tuple(sorted(points))
+
+
 def _position_at_time(state: VehicleState, *, sim_time_s: float, target_time_s: float) -> float:
     delta_t_s = max(target_time_s - sim_time_s, 0.0)
     return state.x_pos_m + state.speed_mps * delta_t_s
@@ -164,77 +223,76 @@ def _calc_min_margin(snapshot: PlanningSnapshot, candidate, checked_time_grid_s:
     return min_margin_m
 
 
-def accept_candidate(*, snapshot: PlanningSnapshot, candidate) -> GateResult:
-    if not _partner_ids_are_valid(snapshot, candidate.partner_ids):
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_PARTNER_INVALID,
-            binding_check="partner_ids",
-        )
+def _reject(
+    snapshot: PlanningSnapshot,
+    candidate,
+    reject_reason: RejectReason,
+    binding_check: str,
+    **kwargs,
+) -> GateResult:
+    return _make_result(
+        snapshot=snapshot,
+        candidate_id=candidate.candidate_id,
+        accepted=False,
+        reject_reason=reject_reason,
+        binding_check=binding_check,
+        **kwargs,
+    )
+
+
+def _accept_in_batch(batch: _GateBatch, candidate) -> GateResult:
+    snapshot = batch.snapshot
+    if not _partner_ids_are_valid(batch, candidate.partner_ids):
+        return _reject(snapshot, candidate, RejectReason.REJECT_PARTNER_INVALID, "partner_ids")
 
     if not _zone_is_valid(snapshot, candidate.x_s_m, candidate.x_m_m):
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_ZONE,
-            binding_check="zone",
-        )
+        return _reject(snapshot, candidate, RejectReason.REJECT_ZONE, "zone")
 
-    if not _timing_is_valid(snapshot, candidate):
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_TIMING,
-            binding_check="timing",
-        )
+    ordered_arrivals = batch.ordered_arrivals(candidate.x_m_m)
+    expected_gap = _expected_gap(snapshot, candidate, ordered_arrivals)
+    if not _timing_is_valid(snapshot, candidate, ordered_arrivals, expected_gap):
+        return _reject(snapshot, candidate, RejectReason.REJECT_TIMING, "timing")
 
-    if not _gap_identity_is_valid(snapshot, candidate):
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_GAP_IDENTITY,
-            binding_check="gap_identity",
-        )
+    if not _gap_identity_is_valid(candidate, expected_gap):
+        return _reject(snapshot, candidate, RejectReason.REJECT_GAP_IDENTITY, "gap_identity")
 
-    if not _dynamic_limits_are_valid(snapshot):
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_DYNAMIC_LIMIT,
-            binding_check="dynamic_limit",
+    if not batch.dynamic_limits_ok:
+        return _reject(snapshot, candidate, RejectReason.REJECT_DYNAMIC_LIMIT, "dynamic_limit")
+
+    post_merge_end_s = candidate.t_m_s + snapshot.scenario.post_merge_guard_s
+    if snapshot.scenario.gate_mode is GateMode.SAMPLED:
+        checked_time_grid_s = _build_checked_time_grid(snapshot, candidate)
+        interval_times_s = tuple(
+            time_s for time_s in checked_time_grid_s if time_s <= candidate.t_m_s
+        )
+        post_merge_times_s = tuple(
+            time_s for time_s in checked_time_grid_s if time_s >= candidate.t_m_s
         )
+    else:
+        interval_times_s = _segment_breakpoints(snapshot, candidate.tau_lc_s, candidate.t_m_s)
+        post_merge_times_s = _segment_breakpoints(snapshot, candidate.t_m_s, post_merge_end_s)
+        checked_time_grid_s = tuple(sorted(set(interval_times_s) | set(post_merge_times_s)))
 
-    checked_time_grid_s = _build_checked_time_grid(snapshot, candidate)
-    interval_times_s = tuple(time_s for time_s in checked_time_grid_s if time_s <= candidate.t_m_s)
     min_margin_m = _calc_min_margin(snapshot, candidate, interval_times_s)
     if isfinite(min_margin_m) and min_margin_m < 0.0:
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_INTERVAL_SAFETY,
+        return _reject(
+            snapshot,
+            candidate,
+            RejectReason.REJECT_INTERVAL_SAFETY,
+            "interval_safety",
             checked_time_grid_s=checked_time_grid_s,
             min_margin_m=min_margin_m,
-            binding_check="interval_safety",
         )
 
-    post_merge_times_s = tuple(time_s for time_s in checked_time_grid_s if time_s >= candidate.t_m_s)
     post_merge_margin_m = _calc_min_margin(snapshot, candidate, post_merge_times_s)
     if isfinite(post_merge_margin_m) and post_merge_margin_m < 0.0:
-        return _make_result(
-            snapshot=snapshot,
-            candidate_id=candidate.candidate_id,
-            accepted=False,
-            reject_reason=RejectReason.REJECT_POST_MERGE_SAFETY,
+        return _reject(
+            snapshot,
+            candidate,
+            RejectReason.REJECT_POST_MERGE_SAFETY,
+            "post_merge_safety",
             checked_time_grid_s=checked_time_grid_s,
             min_margin_m=post_merge_margin_m,
-            binding_check="post_merge_safety",
         )
 
     return _make_result(
@@ -248,4 +306,15 @@ def accept_candidate(*, snapshot: PlanningSnapshot, candidate) -> GateResult:
     )
 
 
-__all__ = ["accept_candidate"]
+def accept_candidate(*, snapshot: PlanningSnapshot, candidate) -> GateResult:
+    return _accept_in_batch(_GateBatch.for_snapshot(snapshot), candidate)
+
+
+def accept_candidates(*, snapshot: PlanningSnapshot, candidates: Iterable) -> Iterator[GateResult]:
+    """按顺序逐个给出 ``accept_candidate`` 的结果；调用方拿到首个 accepted 后即可停止。"""
+    batch = _GateBatch.for_snapshot(snapshot)
+    for candidate in candidates:
+        yield _accept_in_batch(batch, candidate)
+
+
+__all__ = ["accept_candidate", "accept_candidates"]
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from copy import deepcopy
+from dataclasses import replace
 
 from first_wave_mvp.state_machine import (
     PlannerSignal,
@@ -12,100 +14,136 @@ from first_wave_mvp.state_machine import (
     validate_transition,
 )
 from first_wave_mvp.types import CommitState, ExecutionState, ScenarioConfig, VehicleState
+from first_wave_mvp.world_state import PersistentMap
 
 
-def _advance_constant_speed(state: VehicleState, tick_s: float) -> None:
-    state.x_pos_m += state.speed_mps * tick_s
+def _advance_constant_speed(state: VehicleState, tick_s: float, **changes: object) -> VehicleState:
+    return replace(state, x_pos_m=state.x_pos_m + state.speed_mps * tick_s, **changes)
 
 
-def _advance_fail_safe_stop(state: VehicleState, scenario: ScenarioConfig) -> TransitionReason:
+def _advance_fail_safe_stop(
+    state: VehicleState,
+    scenario: ScenarioConfig,
+) -> tuple[VehicleState, TransitionReason]:
     next_speed_mps = max(0.0, state.speed_mps - scenario.fail_safe_brake_mps2 * scenario.rollout_tick_s)
     avg_speed_mps = 0.5 * (state.speed_mps + next_speed_mps)
-    state.x_pos_m += avg_speed_mps * scenario.rollout_tick_s
-    state.speed_mps = next_speed_mps
+    next_x_pos_m = state.x_pos_m + avg_speed_mps * scenario.rollout_tick_s
 
     if next_speed_mps == 0.0:
         validate_transition(state.execution_state, ExecutionState.ABORTED)
-        state.execution_state = ExecutionState.ABORTED
-        return TransitionReason.ABORT_AFTER_FAIL_SAFE_STOP
+        next_state = replace(
+            state,
+            x_pos_m=next_x_pos_m,
+            speed_mps=next_speed_mps,
+            execution_state=ExecutionState.ABORTED,
+        )
+        return next_state, TransitionReason.ABORT_AFTER_FAIL_SAFE_STOP
 
     validate_transition(state.execution_state, ExecutionState.FAIL_SAFE_STOP)
-    return TransitionReason.FAIL_SAFE_EMERGENCY_TAIL
+    next_state = replace(state, x_pos_m=next_x_pos_m, speed_mps=next_speed_mps)
+    return next_state, TransitionReason.FAIL_SAFE_EMERGENCY_TAIL
 
 
-def _require_committed_plan(veh_id: str, committed_plans: dict[str, object]) -> object:
+def _require_committed_plan(veh_id: str, committed_plans: Mapping[str, object]) -> object:
     if veh_id not in committed_plans:
         raise ValueError(f"missing committed plan for vehicle {veh_id!r}")
     return committed_plans[veh_id]
 
 
-def rollout_step(
+def _step_vehicle(
+    veh_id: str,
+    state: VehicleState,
     *,
     scenario: ScenarioConfig,
-    world_state: dict[str, VehicleState],
-    committed_plans: dict[str, object],
-) -> dict[str, VehicleState]:
-    next_world_state = deepcopy(world_state)
-
-    for veh_id, state in next_world_state.items():
-        if state.execution_state is ExecutionState.APPROACHING:
-            validate_transition(state.execution_state, ExecutionState.PLANNING)
-            _advance_constant_speed(state, scenario.rollout_tick_s)
-            state.execution_state = ExecutionState.PLANNING
-            continue
-
-        if state.execution_state is ExecutionState.PLANNING:
-            signal = derive_planner_signal(veh_id, committed_plans)
-            next_state, _ = resolve_planning_transition(
+    committed_plans: Mapping[str, object],
+) -> VehicleState:
+    if state.execution_state is ExecutionState.APPROACHING:
+        validate_transition(state.execution_state, ExecutionState.PLANNING)
+        return _advance_constant_speed(
+            state,
+            scenario.rollout_tick_s,
+            execution_state=ExecutionState.PLANNING,
+        )
+
+    if state.execution_state is ExecutionState.PLANNING:
+        signal = derive_planner_signal(veh_id, committed_plans)
+        next_state, _ = resolve_planning_transition(
+            state,
+            scenario=scenario,
+            signal=signal,
+        )
+        validate_transition(state.execution_state, next_state)
+        if next_state is ExecutionState.COMMITTED:
+            return _advance_constant_speed(
                 state,
-                scenario=scenario,
-                signal=signal,
-            )
-            validate_transition(state.execution_state, next_state)
-            _advance_constant_speed(state, scenario.rollout_tick_s)
-            state.execution_state = next_state
-            if next_state is ExecutionState.COMMITTED:
-                state.commit_state = CommitState.COMMITTED
-            continue
-
-        if state.execution_state is ExecutionState.COMMITTED:
-            _require_committed_plan(veh_id, committed_plans)
-            validate_transition(state.execution_state, ExecutionState.EXECUTING)
-            _advance_constant_speed(state, scenario.rollout_tick_s)
-            state.execution_state = ExecutionState.EXECUTING
-            state.commit_state = CommitState.COMMITTED
-            continue
-
-        if state.execution_state is ExecutionState.EXECUTING:
-            committed_plan = _require_committed_plan(veh_id, committed_plans)
-            _advance_constant_speed(state, scenario.rollout_tick_s)
-            threshold_x_m = (
-                committed_plan.candidate.x_m_m
-                + state.speed_mps * scenario.post_merge_guard_s
+                scenario.rollout_tick_s,
+                execution_state=next_state,
+                commit_state=CommitState.COMMITTED,
             )
-            if state.x_pos_m >= threshold_x_m:
-                validate_transition(state.execution_state, ExecutionState.POST_MERGE)
-                state.execution_state = ExecutionState.POST_MERGE
-            else:
-                validate_transition(state.execution_state, ExecutionState.EXECUTING)
-            continue
-
-        if state.execution_state is ExecutionState.POST_MERGE:
-            _advance_constant_speed(state, scenario.rollout_tick_s)
+        return _advance_constant_speed(state, scenario.rollout_tick_s, execution_state=next_state)
+
+    if state.execution_state is ExecutionState.COMMITTED:
+        _require_committed_plan(veh_id, committed_plans)
+        validate_transition(state.execution_state, ExecutionState.EXECUTING)
+        return _advance_constant_speed(
+            state,
+            scenario.rollout_tick_s,
+            execution_state=ExecutionState.EXECUTING,
+            commit_state=CommitState.COMMITTED,
+        )
+
+    if state.execution_state is ExecutionState.EXECUTING:
+        committed_plan = _require_committed_plan(veh_id, committed_plans)
+        moved = _advance_constant_speed(state, scenario.rollout_tick_s)
+        threshold_x_m = (
+            committed_plan.candidate.x_m_m
+            + moved.speed_mps * scenario.post_merge_guard_s
+        )
+        if moved.x_pos_m >= threshold_x_m:
             validate_transition(state.execution_state, ExecutionState.POST_MERGE)
-            continue
+            moved.execution_state = ExecutionState.POST_MERGE
+        else:
+            validate_transition(state.execution_state, ExecutionState.EXECUTING)
+        return moved
 
-        if state.execution_state is ExecutionState.FAIL_SAFE_STOP:
-            _advance_fail_safe_stop(state, scenario)
-            continue
+    if state.execution_state is ExecutionState.POST_MERGE:
+        validate_transition(state.execution_state, ExecutionState.POST_MERGE)
+        return _advance_constant_speed(state, scenario.rollout_tick_s)
 
-        if state.execution_state is ExecutionState.ABORTED:
-            validate_transition(state.execution_state, ExecutionState.ABORTED)
-            continue
+    if state.execution_state is ExecutionState.FAIL_SAFE_STOP:
+        next_state, _ = _advance_fail_safe_stop(state, scenario)
+        return next_state
 
-        raise ValueError(f"unsupported execution state: {state.execution_state!r}")
+    if state.execution_state is ExecutionState.ABORTED:
+        validate_transition(state.execution_state, ExecutionState.ABORTED)
+        return state
 
-    return next_world_state
+    raise ValueError(f"unsupported execution state: {state.execution_state!r}")
+
+
+def rollout_step(
+    *,
+    scenario: ScenarioConfig,
+    world_state: Mapping[str, VehicleState],
+    committed_plans: Mapping[str, object],
+) -> Mapping[str, VehicleState]:
+    """推进一个 rollout tick，不修改输入。
+
+    输入为 ``PersistentMap`` 时返回新版本：有变化的车辆是新对象，其余车辆
+    （``ABORTED``）与上一版本共享；输入为普通 dict 时返回与输入完全独立的 dict。
+    """
+    next_states = {
+        veh_id: _step_vehicle(veh_id, state, scenario=scenario, committed_plans=committed_plans)
+        for veh_id, state in world_state.items()
+    }
+
+    if isinstance(world_state, PersistentMap):
+        return world_state.merged(next_states)
+
+    return {
+        veh_id: deepcopy(state) if state is world_state[veh_id] else state
+        for veh_id, state in next_states.items()
+    }
 
 
 __all__ = ["rollout_step"]
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from random import Random
 from typing import Any
 
-from first_wave_mvp.types import CommitState, ExecutionState, ScenarioConfig, VehicleState
+from first_wave_mvp.types import CommitState, ExecutionState, GateMode, ScenarioConfig, VehicleState
 
 
 DEFAULT_MAINLINE_LANE_ID = "main_0"
@@ -89,6 +89,7 @@ def initialize_scenario(
 
     scenario = ScenarioConfig(
         scenario_id=f"{experiment_id}:{seed}",
+        gate_mode=GateMode(parameters.get("gate_mode", GateMode.ANALYTIC)),
     )
     max_ticks = int(parameters.get("max_ticks", sim_duration_s / scenario.rollout_tick_s))
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from copy import deepcopy
 
 from first_wave_mvp.types import (
@@ -13,6 +14,7 @@ from first_wave_mvp.types import (
     ScenarioConfig,
     VehicleState,
 )
+from first_wave_mvp.world_state import PersistentMap
 
 
 _INELIGIBLE_EXECUTION_STATES = {
@@ -24,7 +26,7 @@ _INELIGIBLE_EXECUTION_STATES = {
 }
 
 
-def select_planning_ego(world_state: dict[str, VehicleState]) -> VehicleState | None:
+def select_planning_ego(world_state: Mapping[str, VehicleState]) -> VehicleState | None:
     """返回当前 tick 唯一需要被规划的 ramp CAV。"""
     eligible = [
         state
@@ -42,8 +44,8 @@ def select_planning_ego(world_state: dict[str, VehicleState]) -> VehicleState |
 
 
 def _collect_target_lane_object_ids(
-    control_zone_states: dict[str, VehicleState],
-    committed_plans: dict[str, CommittedPlan],
+    control_zone_states: Mapping[str, VehicleState],
+    committed_plans: Mapping[str, CommittedPlan],
     ego_id: str,
 ) -> tuple[str, ...]:
     target_lane_ids = {
@@ -61,20 +63,27 @@ def _collect_target_lane_object_ids(
     return tuple(sorted(target_lane_ids))
 
 
+def _freeze(mapping: Mapping) -> Mapping:
+    """``PersistentMap`` 版本不会被原地修改，直接共享；普通 dict 仍然 deepcopy。"""
+    if isinstance(mapping, PersistentMap):
+        return mapping
+    return deepcopy(mapping)
+
+
 def build_snapshot(
     *,
     sim_time_s: float,
     scenario: ScenarioConfig,
-    world_state: dict[str, VehicleState],
-    committed_plans: dict[str, CommittedPlan],
+    world_state: Mapping[str, VehicleState],
+    committed_plans: Mapping[str, CommittedPlan],
     policy_tag: PolicyTag,
 ) -> PlanningSnapshot:
     ego_state = select_planning_ego(world_state)
     if ego_state is None:
         raise ValueError("No eligible ramp ego in world_state")
 
-    frozen_world_state = deepcopy(world_state)
-    frozen_committed_plans = deepcopy(committed_plans)
+    frozen_world_state = _freeze(world_state)
+    frozen_committed_plans = _freeze(committed_plans)
     frozen_ego_state = frozen_world_state[ego_state.veh_id]
 
     snapshot_id = f"{policy_tag.value}:{sim_time_s:.3f}:{ego_state.veh_id}"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import StrEnum
 
@@ -57,6 +58,11 @@ class RejectReason(StrEnum):
     REJECT_PARTNER_INVALID = "reject_partner_invalid"
 
 
+class GateMode(StrEnum):
+    SAMPLED = "sampled"
+    ANALYTIC = "analytic"
+
+
 class CommitState(StrEnum):
     UNCOMMITTED = "uncommitted"
     COMMITTED = "committed"
@@ -101,6 +107,7 @@ class ScenarioConfig:
     rollout_tick_s: float = ROLLOUT_TICK_S
     planning_tick_s: float = PLANNING_TICK_S
     gate_sampling_dt_s: float = GATE_SAMPLING_DT_S
+    gate_mode: GateMode = GateMode.ANALYTIC
     post_merge_guard_s: float = POST_MERGE_GUARD_S
     epsilon_t_s: float = EPSILON_T_S
     a_max_mps2: float = A_MAX_MPS2
@@ -178,9 +185,9 @@ class PlanningSnapshot:
     policy_tag: PolicyTag
     ego_id: str
     ego_state: VehicleState
-    control_zone_states: dict[str, VehicleState]
+    control_zone_states: Mapping[str, VehicleState]
     target_lane_object_ids: tuple[str, ...]
-    committed_plans: dict[str, "CommittedPlan"]
+    committed_plans: Mapping[str, "CommittedPlan"]
     scenario: ScenarioConfig
 
 
@@ -246,6 +253,7 @@ __all__ = [
     "ExecutionState",
     "ExperimentResultSummary",
     "GapRef",
+    "GateMode",
     "GateResult",
     "PlanningSnapshot",
     "PolicyTag",
@@ -0,0 +1,83 @@
+"""第一波 MVP 的 copy-on-write world state。
+
+``PersistentMap`` 是不可变映射：``set / discard / merged`` 返回新版本，
+旧版本保持不变，未改动的条目（车辆状态、committed plan）在版本之间共享。
+放进 ``PersistentMap`` 的 ``VehicleState`` 约定不再原地修改，变化一律通过
+``dataclasses.replace`` 生成新对象，因此 snapshot 可以直接引用当前版本而不必
+deepcopy。
+"""
+
+from __future__ import annotations
+
+from collections.abc import ItemsView, Iterable, Iterator, KeysView, Mapping, ValuesView
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class PersistentMap(Mapping[K, V]):
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Mapping[K, V] | Iterable[tuple[K, V]] = ()) -> None:
+        self._items: dict[K, V] = dict(items)
+
+    @classmethod
+    def _wrap(cls, items: dict[K, V]) -> PersistentMap[K, V]:
+        version = cls.__new__(cls)
+        version._items = items
+        return version
+
+    def __getitem__(self, key: K) -> V:
+        return self._items[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    # 视图与 get 直接转发给底层 dict，避开 Mapping mixin 的逐项 Python 调用。
+    def get(self, key: K, default: V | None = None) -> V | None:
+        return self._items.get(key, default)
+
+    def keys(self) -> KeysView[K]:
+        return self._items.keys()
+
+    def values(self) -> ValuesView[V]:
+        return self._items.values()
+
+    def items(self) -> ItemsView[K, V]:
+        return self._items.items()
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({self._items!r})"
+
+    def set(self, key: K, value: V) -> PersistentMap[K, V]:
+        if self._items.get(key, _MISSING) is value:
+            return self
+        items = dict(self._items)
+        items[key] = value
+        return self._wrap(items)
+
+    def discard(self, key: K) -> PersistentMap[K, V]:
+        if key not in self._items:
+            return self
+        items = dict(self._items)
+        del items[key]
+        return self._wrap(items)
+
+    def merged(self, updates: Mapping[K, V]) -> PersistentMap[K, V]:
+        if not updates:
+            return self
+        items = dict(self._items)
+        items.update(updates)
+        return self._wrap(items)
+
+
+__all__ = ["PersistentMap"]
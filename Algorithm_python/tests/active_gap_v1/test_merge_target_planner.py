@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import math
 import pathlib
+import random
 import sys
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
@@ -9,11 +11,19 @@ if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 from active_gap_v1.config import default_scenario_config
-from active_gap_v1.merge_target_planner import enumerate_merge_targets
-from active_gap_v1.predictor import predict_optional_free_position
+from active_gap_v1.merge_target_planner import (
+    _admissible_x_m_values,
+    _float_grid,
+    _is_terminal_reachable,
+    _terminal_distance_ms,
+    _terminal_distance_pm,
+    enumerate_merge_targets,
+    iter_merge_targets,
+)
+from active_gap_v1.predictor import predict_free_position, predict_optional_free_position
 from active_gap_v1.snapshot import build_coordination_snapshot
 from active_gap_v1.tcg_selector import identify_tcg
-from active_gap_v1.types import AnchorMode, ExecutionState, PlannerTag, VehicleState
+from active_gap_v1.types import AnchorMode, ExecutionState, MergeTarget, PlannerTag, VehicleState
 
 
 def _make_vehicle(
@@ -46,6 +56,118 @@ def _make_a0_world() -> dict[str, VehicleState]:
     }
 
 
+def _snapshot_and_tcg(*, world_state: dict[str, VehicleState], anchor_mode: AnchorMode, sim_time_s: float = 1.2):
+    snapshot = build_coordination_snapshot(
+        sim_time_s=sim_time_s,
+        scenario=default_scenario_config(scenario_id="a0"),
+        world_state=world_state,
+        locked_tcgs={},
+        planner_tag=PlannerTag.ACTIVE_GAP,
+        anchor_mode=anchor_mode,
+    )
+    return snapshot, identify_tcg(snapshot=snapshot)
+
+
+def _scalar_merge_targets(*, snapshot, tcg) -> list[MergeTarget]:
+    """Reference: the full scalar (h, v*, x_m*) loop nest followed by one sort."""
+    scenario = snapshot.scenario
+    states = snapshot.control_zone_states
+    p_state, m_state, s_state = states[tcg.p_id], states[tcg.m_id], states[tcg.s_id]
+    v_group_avg_mps = (p_state.speed_mps + m_state.speed_mps + s_state.speed_mps) / 3.0
+    v_upper_mps = min(scenario.ramp_vmax_mps, scenario.mainline_vmax_mps)
+    zone_start_m, zone_end_m = scenario.legal_merge_zone_m
+    limits = {"a_max_mps2": scenario.a_max_mps2, "b_max_mps2": scenario.b_safe_mps2}
+    targets = []
+    for horizon_s in _float_grid(start=1.0, end=10.0, step=0.5):
+        x_p_free_m = predict_free_position(vehicle=p_state, horizon_s=horizon_s)
+        x_s_free_m = predict_free_position(vehicle=s_state, horizon_s=horizon_s)
+        for v_star_mps in _float_grid(start=5.0, end=v_upper_mps, step=1.0):
+            d_pm_m = _terminal_distance_pm(
+                vehicle_length_m=scenario.vehicle_length_m, min_gap_m=scenario.min_gap_m,
+                h_pr_s=scenario.h_pr_s, v_star_mps=v_star_mps,
+            )
+            d_ms_m = _terminal_distance_ms(
+                vehicle_length_m=scenario.vehicle_length_m, min_gap_m=scenario.min_gap_m,
+                h_rf_s=scenario.h_rf_s, v_star_mps=v_star_mps,
+            )
+            delta_open_m = max(0.0, d_pm_m + d_ms_m - (x_p_free_m - x_s_free_m))
+            for x_m_star_m in _admissible_x_m_values(tcg=tcg, snapshot=snapshot):
+                tau_lc_s = horizon_s - scenario.lane_change_duration_s
+                if tau_lc_s < -1e-9 or not (zone_start_m - 1e-9 <= x_m_star_m <= zone_end_m + 1e-9):
+                    continue
+                if m_state.x_pos_m + m_state.speed_mps * tau_lc_s < zone_start_m - 1e-9:
+                    continue
+                x_p_star_m = x_m_star_m + d_pm_m
+                x_s_star_m = x_m_star_m - d_ms_m
+                if not (
+                    _is_terminal_reachable(
+                        vehicle=p_state, x_target_m=x_p_star_m, v_target_mps=v_star_mps, horizon_s=horizon_s,
+                        v_max_mps=scenario.mainline_vmax_mps, **limits,
+                    )
+                    and _is_terminal_reachable(
+                        vehicle=m_state, x_target_m=x_m_star_m, v_target_mps=v_star_mps, horizon_s=horizon_s,
+                        v_max_mps=scenario.ramp_vmax_mps, **limits,
+                    )
+                    and _is_terminal_reachable(
+                        vehicle=s_state, x_target_m=x_s_star_m, v_target_mps=v_star_mps, horizon_s=horizon_s,
+                        v_max_mps=scenario.mainline_vmax_mps, **limits,
+                    )
+                ):
+                    continue
+                t_m_star_s = snapshot.sim_time_s + horizon_s
+                if m_state.speed_mps > 1e-9:
+                    delta_delay_s = t_m_star_s - (x_m_star_m - m_state.x_pos_m) / m_state.speed_mps
+                else:
+                    delta_delay_s = math.inf
+                delta_coop_m = abs(x_p_free_m - x_p_star_m) + abs(x_s_free_m - x_s_star_m)
+                rho_min_m = min(x_p_star_m - x_m_star_m - d_pm_m, x_m_star_m - x_s_star_m - d_ms_m)
+                if abs(rho_min_m) < 1e-9:
+                    rho_min_m = 0.0
+                targets.append(
+                    MergeTarget(
+                        snapshot_id=snapshot.snapshot_id,
+                        m_id=tcg.m_id,
+                        x_m_star_m=x_m_star_m,
+                        t_m_star_s=t_m_star_s,
+                        horizon_s=horizon_s,
+                        v_star_mps=v_star_mps,
+                        x_p_star_m=x_p_star_m,
+                        x_s_star_m=x_s_star_m,
+                        delta_open_m=delta_open_m,
+                        delta_coop_m=delta_coop_m,
+                        delta_delay_s=delta_delay_s,
+                        rho_min_m=rho_min_m,
+                        ranking_key=(
+                            t_m_star_s,
+                            abs(v_star_mps - v_group_avg_mps),
+                            delta_coop_m,
+                            delta_delay_s,
+                            -rho_min_m,
+                            x_m_star_m,
+                        ),
+                    )
+                )
+    targets.sort(key=lambda target: target.ranking_key)
+    return targets
+
+
+def _random_world(rng: random.Random) -> dict[str, VehicleState]:
+    p_x = rng.uniform(0.0, 200.0)
+    return {
+        "p": _make_vehicle(
+            veh_id="p", stream="mainline", lane_id="main_0", x_pos_m=p_x, speed_mps=rng.uniform(5.0, 25.0),
+        ),
+        "m": _make_vehicle(
+            veh_id="m", stream="ramp", lane_id="ramp_0", x_pos_m=p_x - rng.uniform(0.0, 12.0),
+            speed_mps=rng.choice([0.0, rng.uniform(5.0, 16.7)]),
+        ),
+        "s": _make_vehicle(
+            veh_id="s", stream="mainline", lane_id="main_0", x_pos_m=p_x - rng.uniform(12.0, 60.0),
+            speed_mps=rng.uniform(5.0, 25.0),
+        ),
+    }
+
+
 def _enumerate_for_mode(anchor_mode: AnchorMode):
     snapshot = build_coordination_snapshot(
         sim_time_s=1.2,
@@ -117,3 +239,29 @@ def test_missing_u_f_does_not_crash_planner() -> None:
 
 def test_predictor_returns_none_for_missing_optional_vehicle() -> None:
     assert predict_optional_free_position(vehicle=None, horizon_s=3.0) is None
+
+
+def test_lazy_targets_match_scalar_enumeration() -> None:
+    rng = random.Random(7)
+    checked = 0
+    for _ in range(60):
+        world_state = _random_world(rng)
+        for anchor_mode in (AnchorMode.FIXED, AnchorMode.FLEXIBLE):
+            snapshot, tcg = _snapshot_and_tcg(
+                world_state=world_state, anchor_mode=anchor_mode, sim_time_s=rng.uniform(0.0, 30.0),
+            )
+            if tcg is None:
+                continue
+            expected = _scalar_merge_targets(snapshot=snapshot, tcg=tcg)
+            assert list(iter_merge_targets(snapshot=snapshot, tcg=tcg)) == expected
+            assert enumerate_merge_targets(snapshot=snapshot, tcg=tcg) == expected
+            checked += bool(expected)
+    assert checked >= 20
+
+
+def test_first_lazy_target_is_best_ranked() -> None:
+    snapshot, tcg = _snapshot_and_tcg(world_state=_make_a0_world(), anchor_mode=AnchorMode.FLEXIBLE)
+    targets = enumerate_merge_targets(snapshot=snapshot, tcg=tcg)
+    assert targets
+    assert next(iter_merge_targets(snapshot=snapshot, tcg=tcg)) == targets[0]
+    assert [target.ranking_key for target in targets] == sorted(target.ranking_key for target in targets)
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import dataclasses
 import sys, os
+
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "src"))
 
 from active_gap_v1.types import (
@@ -19,8 +23,12 @@ from active_gap_v1.types import (
     VehicleState,
 )
 from active_gap_v1.config import default_scenario_config
-from active_gap_v1.quintic import solve_tcg_quintics, eval_poly, check_dynamics, _velocity_coeffs, _accel_coeffs
-from active_gap_v1.certificate import build_safety_certificate
+from active_gap_v1.quintic import (
+    solve_tcg_quintics, solve_tcg_quintics_batch, eval_poly, check_dynamics,
+    _roots_in_interval, _velocity_coeffs, _accel_coeffs,
+)
+from active_gap_v1.certificate import build_safety_certificate, screen_merge_certificates
+from active_gap_v1.merge_target_planner import enumerate_merge_targets
 
 
 def _a0_scenario() -> tuple[CoordinationSnapshot, TCG, MergeTarget]:
@@ -196,3 +204,44 @@ def test_deterministic_results():
             cert.binding_constraint,
         ))
     assert results[0] == results[1] == results[2]
+
+
+def test_quartic_roots_come_from_companion_matrix():
+    # (t - 1)(t - 2)(t - 3)(t - 4), lowest order first.
+    coeffs = (24.0, -50.0, 35.0, -10.0, 1.0)
+    assert sorted(_roots_in_interval(coeffs, 0.0, 5.0)) == pytest.approx([1.0, 2.0, 3.0, 4.0], abs=1e-9)
+    assert sorted(_roots_in_interval(coeffs, 0.0, 2.5)) == pytest.approx([1.0, 2.0], abs=1e-9)
+    # Leading coefficient below 1e-12 falls back to the cubic (t - 1)(t - 2)(t - 3).
+    cubic = (-6.0, 11.0, -6.0, 1.0, 1e-15)
+    assert sorted(_roots_in_interval(cubic, 0.0, 5.0)) == pytest.approx([1.0, 2.0, 3.0], abs=1e-9)
+
+
+def test_batched_certificates_match_scalar():
+    snap, tcg, reasonable_target = _a0_scenario()
+    states = dict(snap.control_zone_states)
+    states["u"] = dataclasses.replace(states["p"], veh_id="u", x_pos_m=300.0)
+    states["f"] = dataclasses.replace(states["s"], veh_id="f", x_pos_m=-200.0)
+    snap = dataclasses.replace(snap, control_zone_states=states, anchor_mode=AnchorMode.FLEXIBLE)
+    tcg = dataclasses.replace(tcg, u_id="u", f_id="f", anchor_mode=AnchorMode.FLEXIBLE)
+    targets = enumerate_merge_targets(snapshot=snap, tcg=tcg)
+    assert len(targets) > 100
+    targets.append(reasonable_target)
+
+    coefficients = solve_tcg_quintics_batch(snapshot=snap, tcg=tcg, targets=targets)
+    failures, margins = screen_merge_certificates(
+        snapshot=snap, tcg=tcg, targets=targets, coefficients=coefficients,
+    )
+    assert set(margins) == {"g_pm", "g_ms", "g_up", "g_sf"}
+    for k, target in enumerate(targets):
+        profiles = solve_tcg_quintics(snapshot=snap, tcg=tcg, target=target)
+        assert [tuple(row) for row in coefficients[k].tolist()] == [prof.coefficients for prof in profiles]
+        cert = build_safety_certificate(
+            snapshot=snap, tcg=tcg, slice_kind=SliceKind.MERGE,
+            profiles=profiles, target=target,
+        )
+        assert failures[k] == cert.failure_kind
+        assert margins["g_pm"][k] == pytest.approx(cert.min_margin_pm_m, abs=1e-6)
+        assert margins["g_ms"][k] == pytest.approx(cert.min_margin_ms_m, abs=1e-6)
+        assert margins["g_up"][k] == pytest.approx(cert.min_margin_up_m, abs=1e-6)
+        assert margins["g_sf"][k] == pytest.approx(cert.min_margin_sf_m, abs=1e-6)
+    assert None in failures and any(failure is not None for failure in failures)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+SRC_ROOT = Path(__file__).resolve().parents[2] / "src"
+EXPERIMENTS_ROOT = Path(__file__).resolve().parents[2] / "experiments" / "first_wave_mvp"
+for path in (SRC_ROOT, EXPERIMENTS_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+import cav_penetration_and_scope_ablation  # noqa: E402
+import light_load_correctness  # noqa: E402
+import medium_high_load_competition  # noqa: E402
+from common import PerSeedResult  # noqa: E402
+from regression_gate import (  # noqa: E402
+    evaluate_cav_penetration_and_scope_ablation,
+    evaluate_light_load_correctness,
+    evaluate_medium_high_load_competition,
+)
+
+from first_wave_mvp.experiment_runner import run_policy_experiment  # noqa: E402
+from first_wave_mvp.gate import accept_candidate, accept_candidates  # noqa: E402
+from first_wave_mvp.snapshot import build_snapshot  # noqa: E402
+from first_wave_mvp.step2_fifo import generate_candidates  # noqa: E402
+from first_wave_mvp.types import (  # noqa: E402
+    CommitState,
+    ExecutionState,
+    GateMode,
+    PolicyTag,
+    ScenarioConfig,
+    VehicleState,
+)
+
+
+def _run(
+    module, policy_tag: PolicyTag, gate_mode: GateMode, overrides: dict | None = None
+) -> tuple[PerSeedResult, ...]:
+    spec = module.build_experiment_bundle().spec
+    raw_results = run_policy_experiment(
+        experiment_id=spec.experiment_id,
+        policy_tag=policy_tag,
+        seeds=spec.default_seeds,
+        parameters={**spec.default_parameters, **(overrides or {}), "gate_mode": gate_mode.value},
+    )
+    return tuple(PerSeedResult(**raw_result) for raw_result in raw_results)
+
+
+def _regression_suite(gate_mode: GateMode) -> dict[str, object]:
+    light = _run(light_load_correctness, PolicyTag.FIFO_FIXED_ANCHOR, gate_mode)
+    fixed = _run(medium_high_load_competition, PolicyTag.FIFO_FIXED_ANCHOR, gate_mode)
+    flexible = _run(medium_high_load_competition, PolicyTag.FIFO_FLEXIBLE_ANCHOR, gate_mode)
+    ablation = {
+        config_key: _run(
+            cav_penetration_and_scope_ablation, PolicyTag.FIFO_FLEXIBLE_ANCHOR, gate_mode, overrides
+        )
+        for config_key, overrides in cav_penetration_and_scope_ablation.CONFIG_VARIANTS.items()
+    }
+    return {
+        "per_seed_results": (light, fixed, flexible, ablation),
+        "light_load_correctness": evaluate_light_load_correctness(light),
+        "medium_high_load_competition": evaluate_medium_high_load_competition(
+            fixed_results=fixed,
+            flexible_results=flexible,
+        ),
+        "cav_penetration_and_scope_ablation": evaluate_cav_penetration_and_scope_ablation(
+            results_by_config=ablation,
+            baseline_config_key="low_penetration_minimal_scope",
+            enhanced_config_key="full_cav_expanded_scope",
+        ),
+    }
+
+
+def _vehicle(veh_id: str, stream: str, x_pos_m: float, speed_mps: float) -> VehicleState:
+    return VehicleState(
+        veh_id=veh_id,
+        stream=stream,
+        lane_id="ramp_0" if stream == "ramp" else "main_0",
+        x_pos_m=x_pos_m,
+        speed_mps=speed_mps,
+        accel_mps2=0.0,
+        length_m=5.0,
+        is_cav=True,
+        execution_state=ExecutionState.PLANNING if stream == "ramp" else ExecutionState.POST_MERGE,
+        commit_state=CommitState.UNCOMMITTED,
+    )
+
+
+def test_analytic_gate_matches_sampled_gate_per_candidate() -> None:
+    world_state = {
+        "r0": _vehicle("r0", "ramp", 60.0, 10.0),
+        "m0": _vehicle("m0", "mainline", 140.0, 9.0),
+        "m1": _vehicle("m1", "mainline", 95.0, 12.0),
+        "m2": _vehicle("m2", "mainline", 40.0, 13.0),
+    }
+    snapshot = build_snapshot(
+        sim_time_s=0.0,
+        scenario=ScenarioConfig(scenario_id="gate_modes", gate_mode=GateMode.ANALYTIC),
+        world_state=world_state,
+        committed_plans={},
+        policy_tag=PolicyTag.FIFO_FLEXIBLE_ANCHOR,
+    )
+    sampled_snapshot = replace(
+        snapshot, scenario=replace(snapshot.scenario, gate_mode=GateMode.SAMPLED)
+    )
+    candidates = generate_candidates(snapshot=snapshot)
+    assert candidates
+
+    analytic = list(accept_candidates(snapshot=snapshot, candidates=candidates))
+    sampled = [
+        accept_candidate(snapshot=sampled_snapshot, candidate=candidate) for candidate in candidates
+    ]
+
+    assert analytic == [
+        accept_candidate(snapshot=snapshot, candidate=candidate) for candidate in candidates
+    ]
+    for analytic_result, sampled_result in zip(analytic, sampled):
+        assert analytic_result.accepted == sampled_result.accepted
+        assert analytic_result.reject_reason == sampled_result.reject_reason
+        assert analytic_result.binding_check == sampled_result.binding_check
+        if sampled_result.min_margin_m is None:
+            assert analytic_result.min_margin_m is None
+        else:
+            assert analytic_result.min_margin_m == pytest.approx(
+                sampled_result.min_margin_m, abs=1e-6
+            )
+        if sampled_result.checked_time_grid_s:
+            analytic_grid = analytic_result.checked_time_grid_s
+            assert len(analytic_grid) <= 3 < len(sampled_result.checked_time_grid_s)
+
+
+def test_regression_gate_suite_agrees_across_gate_modes() -> None:
+    wall_s = {}
+    suites = {}
+    for gate_mode in (GateMode.SAMPLED, GateMode.ANALYTIC):
+        start = time.perf_counter()
+        suites[gate_mode] = _regression_suite(gate_mode)
+        wall_s[gate_mode] = time.perf_counter() - start
+
+    assert suites[GateMode.ANALYTIC] == suites[GateMode.SAMPLED]
+    print(
+        f"regression_gate suite: sampled {wall_s[GateMode.SAMPLED]:.2f}s, "
+        f"analytic {wall_s[GateMode.ANALYTIC]:.2f}s "
+        f"({wall_s[GateMode.SAMPLED] / wall_s[GateMode.ANALYTIC]:.2f}x)"
+    )
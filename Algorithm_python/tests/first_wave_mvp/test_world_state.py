@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[2] / "src"
+EXPERIMENTS_ROOT = Path(__file__).resolve().parents[2] / "experiments" / "first_wave_mvp"
+for path in (SRC_ROOT, EXPERIMENTS_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+import cav_penetration_and_scope_ablation  # noqa: E402
+import light_load_correctness  # noqa: E402
+
+from first_wave_mvp.rollout import rollout_step  # noqa: E402
+from first_wave_mvp.snapshot import build_snapshot  # noqa: E402
+from first_wave_mvp.types import (  # noqa: E402
+    CommitState,
+    ExecutionState,
+    PolicyTag,
+    ScenarioConfig,
+    VehicleState,
+)
+from first_wave_mvp.world_state import PersistentMap  # noqa: E402
+
+
+def _make_vehicle(
+    *,
+    veh_id: str,
+    stream: str,
+    x_pos_m: float,
+    execution_state: ExecutionState,
+) -> VehicleState:
+    return VehicleState(
+        veh_id=veh_id,
+        stream=stream,
+        lane_id=f"{'ramp' if stream == 'ramp' else 'main'}_0",
+        x_pos_m=x_pos_m,
+        speed_mps=10.0,
+        accel_mps2=0.0,
+        length_m=5.0,
+        is_cav=True,
+        execution_state=execution_state,
+        commit_state=CommitState.UNCOMMITTED,
+    )
+
+
+def _world() -> PersistentMap[str, VehicleState]:
+    return PersistentMap({
+        "r0": _make_vehicle(
+            veh_id="r0", stream="ramp", x_pos_m=80.0, execution_state=ExecutionState.PLANNING
+        ),
+        "r1": _make_vehicle(
+            veh_id="r1", stream="ramp", x_pos_m=295.0, execution_state=ExecutionState.ABORTED
+        ),
+        "m0": _make_vehicle(
+            veh_id="m0",
+            stream="mainline",
+            x_pos_m=90.0,
+            execution_state=ExecutionState.POST_MERGE,
+        ),
+    })
+
+
+def test_persistent_map_versions_share_unchanged_entries() -> None:
+    world = _world()
+    moved = replace(world["r0"], x_pos_m=81.0)
+
+    updated = world.set("r0", moved)
+    removed = updated.discard("m0")
+
+    assert world["r0"].x_pos_m == 80.0
+    assert updated["r0"] is moved
+    assert updated["m0"] is world["m0"]
+    assert "m0" in updated and "m0" not in removed
+    assert world.set("m0", world["m0"]) is world
+    assert world.discard("missing") is world
+    assert world.merged({}) is world
+    assert updated == {**world, "r0": moved}
+
+
+def test_snapshot_shares_the_current_version_and_ignores_later_ones() -> None:
+    world = _world()
+    scenario = ScenarioConfig(scenario_id="cow")
+
+    snapshot = build_snapshot(
+        sim_time_s=0.0,
+        scenario=scenario,
+        world_state=world,
+        committed_plans=PersistentMap(),
+        policy_tag=PolicyTag.FIFO_FIXED_ANCHOR,
+    )
+    next_world = rollout_step(scenario=scenario, world_state=world, committed_plans=PersistentMap())
+
+    assert snapshot.control_zone_states is world
+    assert snapshot.ego_state is world["r0"]
+    assert snapshot.ego_state.x_pos_m == 80.0
+    assert next_world["r0"].x_pos_m > 80.0
+    assert next_world["r1"] is world["r1"]
+
+
+def test_rollout_on_plain_dict_returns_independent_states() -> None:
+    world = dict(_world())
+
+    next_world = rollout_step(
+        scenario=ScenarioConfig(scenario_id="dict"), world_state=world, committed_plans={}
+    )
+
+    assert isinstance(next_world, dict)
+    assert all(next_world[veh_id] is not world[veh_id] for veh_id in world)
+    assert world["r0"].x_pos_m == 80.0
+
+
+def test_experiment_outputs_match_committed_summaries(tmp_path) -> None:
+    for module in (light_load_correctness, cav_penetration_and_scope_ablation):
+        summary_path = EXPERIMENTS_ROOT / "outputs" / module.EXPERIMENT_ID / "summary.json"
+        committed = json.loads(summary_path.read_text(encoding="utf-8"))
+        output_path = tmp_path / f"{module.EXPERIMENT_ID}.json"
+        assert module.run_numeric_experiment(output_path=str(output_path)) == committed
@@ -0,0 +1,60 @@
+"""Fixed-capacity append-only log with absolute sequence numbers.
+
+``RingLog`` keeps the most recent ``capacity`` items.  Every append gets the
+next sequence number, so a reader that remembers ``next_seq`` can fetch what
+was appended since (``since``) and learn how many items it missed because
+they were overwritten before it read them.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from itertools import islice
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class RingLog(Generic[T]):
+    __slots__ = ('capacity', '_items', '_appended')
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError('capacity must be >= 1')
+        self.capacity = capacity
+        self._items: deque[T] = deque(maxlen=capacity)
+        self._appended = 0
+
+    def append(self, item: T) -> None:
+        self._items.append(item)
+        self._appended += 1
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended item will get (= items ever appended)."""
+        return self._appended
+
+    @property
+    def dropped_count(self) -> int:
+        """Items overwritten so far because the log was full."""
+        return self._appended - len(self._items)
+
+    def since(self, seq: int) -> tuple[list[T], int]:
+        """Items with sequence number >= ``seq`` still held, and how many were lost."""
+        wanted = self._appended - max(seq, 0)
+        if wanted <= 0:
+            return [], 0
+        held = len(self._items)
+        if wanted > held:
+            return list(self._items), wanted - held
+        return list(islice(self._items, held - wanted, None)), 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __getitem__(self, index: int) -> T:
+        return self._items[index]
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import json
 from collections import defaultdict
 from pathlib import Path
 
+from ramp.experiments.trace_io import read_trace_rows
+
 
 def check_plans(
     plans_path: Path,
@@ -14,9 +15,7 @@ def check_plans(
     delta_2_s: float,
     epsilon_s: float = 1e-9,
 ) -> dict[str, int | float | str]:
-    with plans_path.open('r', newline='', encoding='utf-8') as fp:
-        reader = csv.DictReader(fp)
-        rows = list(reader)
+    rows = list(read_trace_rows(plans_path))
 
     by_time: dict[float, list[dict[str, str]]] = defaultdict(list)
     parse_error_count = 0
@@ -82,7 +81,7 @@ def check_plans(
 
 def main() -> int:
     parser = argparse.ArgumentParser(description='Check safety-gap constraints in plans.csv.')
-    parser.add_argument('--plans', required=True, help='Path to plans.csv')
+    parser.add_argument('--plans', required=True, help='Path to plans.csv (or plans.rtrc)')
     parser.add_argument('--delta-1-s', type=float, default=1.5)
     parser.add_argument('--delta-2-s', type=float, default=2.0)
     parser.add_argument('--epsilon-s', type=float, default=1e-9)
@@ -5,10 +5,11 @@ import csv
 from collections import defaultdict
 from pathlib import Path
 
+from ramp.experiments.trace_io import read_trace_rows, resolve_trace_path
 
-def _read_csv(path: Path) -> list[dict[str, str]]:
-    with path.open("r", newline="", encoding="utf-8") as fp:
-        return list(csv.DictReader(fp))
+
+def _read_trace(path: Path) -> list[dict[str, str]]:
+    return list(read_trace_rows(path))
 
 
 def _first_time_by_vehicle(rows: list[dict[str, str]], event_name: str) -> dict[str, float]:
@@ -73,12 +74,14 @@ def main() -> int:
     events_path = out_dir / "events.csv"
     commands_path = out_dir / "commands.csv"
     for p in (plans_path, events_path, commands_path):
-        if not p.exists():
-            raise FileNotFoundError(f"Missing required file: {p}")
-
-    plans_rows = _read_csv(plans_path)
-    events_rows = _read_csv(events_path)
-    commands_rows = _read_csv(commands_path)
+        try:
+            resolve_trace_path(p)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Missing required file: {p}") from None
+
+    plans_rows = _read_trace(plans_path)
+    events_rows = _read_trace(events_path)
+    commands_rows = _read_trace(commands_path)
 
     snapshots = _plan_snapshots(plans_rows)
     cross = _cross_events(events_rows)
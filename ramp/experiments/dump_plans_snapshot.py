@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import argparse
-import csv
 from pathlib import Path
 
+from ramp.experiments.trace_io import read_trace_rows, resolve_trace_path
+
 
 def _format_row(row: dict[str, str]) -> str:
     return (
@@ -17,23 +18,23 @@ def _format_row(row: dict[str, str]) -> str:
 
 def main() -> int:
     parser = argparse.ArgumentParser(description='Dump one plans.csv snapshot by time.')
-    parser.add_argument('--plans', required=True, help='Path to plans.csv')
+    parser.add_argument('--plans', required=True, help='Path to plans.csv (or plans.rtrc)')
     parser.add_argument('--time', required=True, type=float, help='Snapshot time to print')
     parser.add_argument('--epsilon-s', type=float, default=1e-6, help='Time match tolerance')
     args = parser.parse_args()
 
-    plans_path = Path(args.plans)
-    if not plans_path.exists():
-        raise FileNotFoundError(f'plans.csv not found: {plans_path}')
+    try:
+        plans_path = resolve_trace_path(Path(args.plans))
+    except FileNotFoundError:
+        raise FileNotFoundError(f'plans.csv not found: {args.plans}') from None
 
     matches: list[dict[str, str]] = []
     times_seen: set[float] = set()
-    with plans_path.open('r', newline='', encoding='utf-8') as fp:
-        for row in csv.DictReader(fp):
-            time_s = float(row['time'])
-            times_seen.add(time_s)
-            if abs(time_s - args.time) <= args.epsilon_s:
-                matches.append(row)
+    for row in read_trace_rows(plans_path):
+        time_s = float(row['time'])
+        times_seen.add(time_s)
+        if abs(time_s - args.time) <= args.epsilon_s:
+            matches.append(row)
 
     if not matches:
         if not times_seen:
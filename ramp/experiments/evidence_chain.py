@@ -19,6 +19,8 @@ tracking, but its position error is only calculated when no prior
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
 MERGE_POLICY_FIXED = 'fixed'
 MERGE_POLICY_FLEXIBLE = 'flexible'
@@ -221,53 +223,210 @@ def attach_actual_neighbors(
         row['actual_follower_id'] = next_vehicle_id
 
 
-def build_contract_smoke_summary(
-    *,
-    contract_by_id: dict[str, dict[str, float | str]],
-) -> dict[str, float | int]:
-    """Validate contract completeness and generate Q2 smoke summary.
+_REQUIRED_CONTRACT_SNAPSHOT_KEYS = (
+    'expected_merge_time_s', 'expected_merge_position_m',
+    'merge_window_start_s', 'merge_window_end_s',
+)
 
-    Returns a dict with contract-level quality metrics that must be checked
-    before entering the Zone C execution closed-loop.
+
+@dataclass(slots=True)
+class ContractTally:
+    """Running counters behind ``build_contract_smoke_summary``.
+
+    Lets the runner summarise every issued contract without keeping the
+    superseded ones in ``contract_by_id``.
     """
-    total = len(contract_by_id)
-    if total == 0:
-        return {
-            'total_contracts': 0,
-            'field_completeness_rate': 0.0,
-            'merge_window_validity_rate': 0.0,
-            'target_predecessor_coverage': 0.0,
-            'target_follower_coverage': 0.0,
-        }
-    required_snapshot_keys = (
-        'expected_merge_time_s', 'expected_merge_position_m',
-        'merge_window_start_s', 'merge_window_end_s',
-    )
-    complete_count = 0
-    window_valid_count = 0
-    predecessor_present_count = 0
-    follower_present_count = 0
-    for snapshot in contract_by_id.values():
+
+    total: int = 0
+    complete_count: int = 0
+    window_valid_count: int = 0
+    predecessor_present_count: int = 0
+    follower_present_count: int = 0
+
+    def add(self, snapshot: dict[str, float | str]) -> None:
+        self.total += 1
         all_present = all(
-            str(snapshot.get(k, '')).strip() != '' for k in required_snapshot_keys
+            str(snapshot.get(k, '')).strip() != '' for k in _REQUIRED_CONTRACT_SNAPSHOT_KEYS
         )
         if all_present:
-            complete_count += 1
+            self.complete_count += 1
         start = snapshot.get('merge_window_start_s', '')
         end = snapshot.get('merge_window_end_s', '')
         if start != '' and end != '' and float(end) > float(start):
-            window_valid_count += 1
+            self.window_valid_count += 1
         if str(snapshot.get('target_predecessor_id', '')).strip():
-            predecessor_present_count += 1
+            self.predecessor_present_count += 1
         if str(snapshot.get('target_follower_id', '')).strip():
-            follower_present_count += 1
-    return {
-        'total_contracts': total,
-        'field_completeness_rate': complete_count / total,
-        'merge_window_validity_rate': window_valid_count / total,
-        'target_predecessor_coverage': predecessor_present_count / total,
-        'target_follower_coverage': follower_present_count / total,
-    }
+            self.follower_present_count += 1
+
+    def summary(self) -> dict[str, float | int]:
+        total = self.total
+        if total == 0:
+            return {
+                'total_contracts': 0,
+                'field_completeness_rate': 0.0,
+                'merge_window_validity_rate': 0.0,
+                'target_predecessor_coverage': 0.0,
+                'target_follower_coverage': 0.0,
+            }
+        return {
+            'total_contracts': total,
+            'field_completeness_rate': self.complete_count / total,
+            'merge_window_validity_rate': self.window_valid_count / total,
+            'target_predecessor_coverage': self.predecessor_present_count / total,
+            'target_follower_coverage': self.follower_present_count / total,
+        }
+
+
+def build_contract_smoke_summary(
+    *,
+    contract_by_id: dict[str, dict[str, float | str]],
+) -> dict[str, float | int]:
+    """Validate contract completeness and generate Q2 smoke summary.
+
+    Returns a dict with contract-level quality metrics that must be checked
+    before entering the Zone C execution closed-loop.
+    """
+    tally = ContractTally()
+    for snapshot in contract_by_id.values():
+        tally.add(snapshot)
+    return tally.summary()
+
+
+@dataclass(slots=True)
+class FeedbackTally:
+    """Running counters behind the feedback-row part of ``build_evidence_metrics``.
+
+    ``add`` receives the snapshot of the contract the row refers to (``None``
+    when the row has none), so rows can be tallied as they are written instead
+    of being kept until the end of the run.
+    """
+
+    row_count: int = 0
+    replan_required_count: int = 0
+    fallback_counter: Counter[str] = field(default_factory=Counter)
+    merge_window_checked_count: int = 0
+    merge_window_hit_count: int = 0
+    predecessor_checked_count: int = 0
+    predecessor_match_count: int = 0
+    follower_checked_count: int = 0
+    follower_match_count: int = 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        feedback_rows: list[dict[str, str | float | int]],
+        contract_by_id: dict[str, dict[str, float | str]],
+    ) -> FeedbackTally:
+        tally = cls()
+        for row in feedback_rows:
+            tally.add(row, feedback_contract_snapshot(row, contract_by_id))
+        return tally
+
+    def add(
+        self,
+        row: dict[str, str | float | int],
+        contract_snapshot: dict[str, float | str] | None,
+    ) -> None:
+        self.row_count += 1
+        fallback_reason = str(row['fallback_reason']).strip()
+        if fallback_reason:
+            self.fallback_counter[fallback_reason] += 1
+        if int(row['replan_required']) == 1:
+            self.replan_required_count += 1
+        if contract_snapshot is None:
+            return
+        actual_merge_time_s = row['actual_merge_time_s']
+        if actual_merge_time_s == '':
+            return
+
+        self.merge_window_checked_count += 1
+        merge_window_start_s = float(contract_snapshot['merge_window_start_s'])
+        merge_window_end_s = float(contract_snapshot['merge_window_end_s'])
+        if merge_window_start_s <= float(actual_merge_time_s) <= merge_window_end_s:
+            self.merge_window_hit_count += 1
+
+        if str(row.get('execution_state', '')) == 'merge_cross':
+            target_predecessor_id = str(contract_snapshot.get('target_predecessor_id', ''))
+            if target_predecessor_id:
+                self.predecessor_checked_count += 1
+                if str(row['actual_predecessor_id']) == target_predecessor_id:
+                    self.predecessor_match_count += 1
+            target_follower_id = str(contract_snapshot.get('target_follower_id', ''))
+            if target_follower_id:
+                self.follower_checked_count += 1
+                if str(row['actual_follower_id']) == target_follower_id:
+                    self.follower_match_count += 1
+
+
+def feedback_contract_snapshot(
+    row: dict[str, str | float | int],
+    contract_by_id: dict[str, dict[str, float | str]],
+) -> dict[str, float | str] | None:
+    contract_id = str(row['contract_id']).strip()
+    if not contract_id:
+        return None
+    return contract_by_id.get(contract_id)
+
+
+@dataclass(slots=True)
+class FeedbackLog:
+    """Streams feedback rows to ``sink`` and tallies them on the way out.
+
+    ``merge_cross`` rows take ``actual_predecessor_id`` / ``actual_follower_id``
+    from the neighbouring cross rows exactly like ``attach_actual_neighbors``.
+    The follower is only known once the next vehicle crosses, so rows from the
+    latest cross row onwards are held back until then (or until ``close``);
+    everything before it has already been written.  Contract snapshots are
+    resolved when a row is appended, so ``contract_by_id`` only has to hold
+    the contracts new rows can still refer to.
+    """
+
+    sink: Callable[[dict[str, str | float | int]], object]
+    contract_by_id: dict[str, dict[str, float | str]]
+    tally: FeedbackTally = field(default_factory=FeedbackTally)
+    _pending: list[
+        tuple[dict[str, str | float | int], dict[str, float | str] | None]
+    ] = field(default_factory=list, init=False, repr=False)
+    _last_cross_vehicle_id: str = field(default='', init=False, repr=False)
+
+    def append(self, row: dict[str, str | float | int]) -> None:
+        snapshot = feedback_contract_snapshot(row, self.contract_by_id)
+        if row.get('execution_state') == 'merge_cross':
+            veh_id = str(row['ego_vehicle_id'])
+            if self._pending:
+                # The oldest pending row is the previous cross row.
+                self._pending[0][0]['actual_follower_id'] = veh_id
+                self._flush()
+            row['actual_predecessor_id'] = self._last_cross_vehicle_id
+            row['actual_follower_id'] = ''
+            self._last_cross_vehicle_id = veh_id
+            self._pending.append((row, snapshot))
+        elif self._pending:
+            self._pending.append((row, snapshot))
+        else:
+            self._emit(row, snapshot)
+
+    def close(self) -> None:
+        """Write the rows still held back behind the last cross row."""
+        self._flush()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _flush(self) -> None:
+        for row, snapshot in self._pending:
+            self._emit(row, snapshot)
+        self._pending.clear()
+
+    def _emit(
+        self,
+        row: dict[str, str | float | int],
+        snapshot: dict[str, float | str] | None,
+    ) -> None:
+        self.sink(row)
+        self.tally.add(row, snapshot)
 
 
 def build_evidence_metrics(
@@ -284,8 +443,9 @@ def build_evidence_metrics(
     contract_vehicle_ids: set[str],
     feedback_vehicle_ids: set[str],
     eligible_ramp_cav_ids: set[str] | None = None,
-    feedback_rows: list[dict[str, str | float | int]],
-    contract_by_id: dict[str, dict[str, float | str]],
+    feedback_rows: list[dict[str, str | float | int]] | None = None,
+    contract_by_id: dict[str, dict[str, float | str]] | None = None,
+    feedback_tally: FeedbackTally | None = None,
     planned_actual_time_errors: list[float],
     planned_actual_position_errors: list[float],
 ) -> dict[str, float | int | dict[str, float]]:
@@ -314,54 +474,22 @@ def build_evidence_metrics(
     else:
         eligible_ramp_cav_contract_rate = 0.0
 
-    merge_window_hit_count = 0
-    merge_window_checked_count = 0
-    predecessor_match_count = 0
-    predecessor_checked_count = 0
-    follower_match_count = 0
-    follower_checked_count = 0
-    fallback_counter: Counter[str] = Counter()
-    replan_required_count = 0
-
-    for row in feedback_rows:
-        fallback_reason = str(row['fallback_reason']).strip()
-        if fallback_reason:
-            fallback_counter[fallback_reason] += 1
-        if int(row['replan_required']) == 1:
-            replan_required_count += 1
-        contract_id = str(row['contract_id']).strip()
-        if not contract_id:
-            continue
-        if contract_id not in contract_by_id:
-            continue
-        actual_merge_time_s = row['actual_merge_time_s']
-        if actual_merge_time_s == '':
-            continue
-
-        merge_window_checked_count += 1
-        contract_snapshot = contract_by_id[contract_id]
-        merge_window_start_s = float(contract_snapshot['merge_window_start_s'])
-        merge_window_end_s = float(contract_snapshot['merge_window_end_s'])
-        if merge_window_start_s <= float(actual_merge_time_s) <= merge_window_end_s:
-            merge_window_hit_count += 1
-
-        if str(row.get('execution_state', '')) == 'merge_cross':
-            target_predecessor_id = str(contract_snapshot.get('target_predecessor_id', ''))
-            if target_predecessor_id:
-                predecessor_checked_count += 1
-                if str(row['actual_predecessor_id']) == target_predecessor_id:
-                    predecessor_match_count += 1
-            target_follower_id = str(contract_snapshot.get('target_follower_id', ''))
-            if target_follower_id:
-                follower_checked_count += 1
-                if str(row['actual_follower_id']) == target_follower_id:
-                    follower_match_count += 1
+    if feedback_tally is None:
+        feedback_tally = FeedbackTally.from_rows(feedback_rows or [], contract_by_id or {})
+    feedback_row_count = feedback_tally.row_count
+    fallback_counter = feedback_tally.fallback_counter
+    replan_required_count = feedback_tally.replan_required_count
+    merge_window_checked_count = feedback_tally.merge_window_checked_count
 
     merge_window_hit_rate = (
-        merge_window_hit_count / merge_window_checked_count if merge_window_checked_count else 0.0
+        feedback_tally.merge_window_hit_count / merge_window_checked_count
+        if merge_window_checked_count
+        else 0.0
+    )
+    pf_total_checked = (
+        feedback_tally.predecessor_checked_count + feedback_tally.follower_checked_count
     )
-    pf_total_checked = predecessor_checked_count + follower_checked_count
-    pf_total_matched = predecessor_match_count + follower_match_count
+    pf_total_matched = feedback_tally.predecessor_match_count + feedback_tally.follower_match_count
     if pf_total_checked == 0:
         predecessor_follower_match_rate = 1.0
     else:
@@ -369,11 +497,11 @@ def build_evidence_metrics(
 
     fallback_rate_by_reason: dict[str, float] = {}
     for reason, count in sorted(fallback_counter.items()):
-        fallback_rate_by_reason[reason] = count / len(feedback_rows) if feedback_rows else 0.0
+        fallback_rate_by_reason[reason] = count / feedback_row_count if feedback_row_count else 0.0
     fallback_total_count = sum(fallback_counter.values())
-    fallback_rate = fallback_total_count / len(feedback_rows) if feedback_rows else 0.0
+    fallback_rate = fallback_total_count / feedback_row_count if feedback_row_count else 0.0
 
-    replan_rate = replan_required_count / len(feedback_rows) if feedback_rows else 0.0
+    replan_rate = replan_required_count / feedback_row_count if feedback_row_count else 0.0
     zone_a_event_rate = zone_a_event_count / duration_s if duration_s > 0 else 0.0
     zone_c_event_rate = zone_c_event_count / duration_s if duration_s > 0 else 0.0
 
@@ -0,0 +1,99 @@
+"""Online plan-consistency metrics for ``ramp.experiments.run``.
+
+The runner used to keep a ``(time, order, targets)`` snapshot of every plan
+and, after the run, scan all snapshots once per crossed vehicle.  Both the
+memory and the final scan grew with the simulated duration.  The metrics only
+ever look at
+
+* the head of the latest plan emitted before a vehicle crosses
+  (``consistency_merge_order_mismatch_count``);
+* the target crossing time of the latest plan that still contained the
+  vehicle (``consistency_cross_time_error_*``);
+* position changes between consecutive plans (``consistency_plan_churn_rate``),
+
+so ``PlanConsistencyTracker`` keeps just that: the previous plan's positions
+and the latest target of each vehicle that has not crossed yet.  Results are
+bit-identical to the batch computation as long as, within a step, crossings
+are observed before that step's plan (which is how the runner is ordered) and
+crossings are observed in ``(cross_time, veh_id)`` order.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Container, Mapping, Sequence
+from dataclasses import dataclass, field
+
+from ramp.experiments.evidence_chain import percentile
+
+
+@dataclass(slots=True)
+class PlanConsistencyTracker:
+    merge_order_mismatch_count: int = 0
+    # |actual - planned| crossing time, in crossing order.
+    abs_cross_time_errors: list[float] = field(default_factory=list)
+    _plan_head: str | None = field(default=None, init=False, repr=False)
+    _target_by_vehicle: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _prev_position: dict[str, int] | None = field(default=None, init=False, repr=False)
+    # Neumaier running sum, matching ``sum()`` of floats on Python >= 3.12.
+    _churn_sum: float = field(default=0.0, init=False, repr=False)
+    _churn_comp: float = field(default=0.0, init=False, repr=False)
+    _churn_count: int = field(default=0, init=False, repr=False)
+
+    def observe_plan(
+        self, *, order: Sequence[str], target_cross_time_s: Mapping[str, float]
+    ) -> None:
+        """Record a plan emitted this step (after this step's crossings)."""
+        position = {veh_id: idx for idx, veh_id in enumerate(order)}
+        prev_position = self._prev_position
+        if prev_position is not None:
+            shared = prev_position.keys() & position.keys()
+            if shared:
+                changed = sum(1 for veh_id in shared if prev_position[veh_id] != position[veh_id])
+                self._add_churn(changed / len(shared))
+        self._prev_position = position
+        self._plan_head = order[0] if order else None
+        self._target_by_vehicle.update(target_cross_time_s)
+
+    def _add_churn(self, value: float) -> None:
+        total = self._churn_sum + value
+        if abs(self._churn_sum) >= abs(value):
+            self._churn_comp += (self._churn_sum - total) + value
+        else:
+            self._churn_comp += (value - total) + self._churn_sum
+        self._churn_sum = total
+        self._churn_count += 1
+
+    def observe_cross(self, *, veh_id: str, cross_time_s: float) -> None:
+        """Score a crossing against the plans observed so far."""
+        if self._plan_head is not None and self._plan_head != veh_id:
+            self.merge_order_mismatch_count += 1
+        target_s = self._target_by_vehicle.pop(veh_id, None)
+        if target_s is not None:
+            self.abs_cross_time_errors.append(abs(float(cross_time_s) - target_s))
+
+    def retain(self, alive_vehicle_ids: Container[str]) -> None:
+        """Forget targets of vehicles that left the network without crossing."""
+        gone = [veh_id for veh_id in self._target_by_vehicle if veh_id not in alive_vehicle_ids]
+        for veh_id in gone:
+            del self._target_by_vehicle[veh_id]
+
+    @property
+    def tracked_vehicle_count(self) -> int:
+        return len(self._target_by_vehicle)
+
+    def cross_time_error_mean_s(self) -> float:
+        errors = self.abs_cross_time_errors
+        return sum(errors) / len(errors) if errors else 0.0
+
+    def cross_time_error_p95_s(self) -> float:
+        errors = self.abs_cross_time_errors
+        return percentile(errors, 0.95) if errors else 0.0
+
+    def plan_churn_rate(self) -> float:
+        if not self._churn_count:
+            return 0.0
+        total = self._churn_sum
+        if self._churn_comp and math.isfinite(self._churn_comp):
+            total += self._churn_comp
+        return total / self._churn_count
@@ -1,5 +1,4 @@
 import argparse
-import csv
 import json
 import logging
 import os
@@ -28,9 +27,9 @@ from ramp.experiments.evidence_chain import (
     FEEDBACK_FIELDS,
     MERGE_POLICY_FLEXIBLE,
     SPEED_MISMATCH_THRESHOLD_MPS,
-    attach_actual_neighbors,
+    ContractTally,
+    FeedbackLog,
     build_contract_row,
-    build_contract_smoke_summary,
     build_evidence_metrics,
     expected_merge_position_m,
     merge_window_half_span_s,
@@ -38,16 +37,50 @@ from ramp.experiments.evidence_chain import (
     resolve_anchor_event_type,
     resolve_merge_policy,
 )
+from ramp.experiments.plan_consistency import PlanConsistencyTracker
+from ramp.experiments.trace_io import (
+    TRACE_FORMAT_CSV,
+    TRACE_FORMATS,
+    TRACE_WRITER_ASYNC,
+    TRACE_WRITERS,
+    TraceSinks,
+)
 from ramp.runtime.controller import Controller
-from ramp.runtime.simulation_driver import SimulationDriver
+from ramp.runtime.fake_traci import FAKE_SUMO_BINARY
+from ramp.runtime.simulation_driver import (
+    SIMULATION_BACKENDS,
+    SUMO_BACKEND_FAKE,
+    SUMO_BACKEND_LIBSUMO,
+    SimulationDriver,
+    import_sumo_backend,
+)
 from ramp.runtime.state_collector import StateCollector
+from ramp.runtime.step_profiler import (
+    STAGE_COLLECT,
+    STAGE_COMMAND,
+    STAGE_CONTROLLER,
+    STAGE_EVIDENCE,
+    STAGE_SIM_STEP,
+    STAGE_TRACE_IO,
+    STAGE_TTC,
+    STAGE_ZONE_B,
+    StepProfiler,
+)
 from ramp.runtime.takeover import (
-    TakeoverMode,
     log_mode_warning,
     parse_takeover_mode,
 )
-from ramp.runtime.ttc import build_ttc_metrics, collect_ttc_samples
-from ramp.common.vehicle_defs import VEH_TYPE_HDV, is_hdv, validate_rou_vtypes
+from ramp.runtime.traci_counter import CountingTraci
+from ramp.runtime.ttc import TTCSketch, build_ttc_metrics_from_sketches, collect_ttc_sample_arrays
+from ramp.runtime.vehicle_registry import VehicleRegistry
+from ramp.runtime.vehicle_table import VehicleTable, VehicleTableView
+from ramp.scheduler.dp_array import DP_ENGINE_REFERENCE, DP_ENGINES
+from ramp.scheduler.replan_trigger import (
+    DEFAULT_ETA_DRIFT_S,
+    REPLAN_TRIGGER_TIMER,
+    REPLAN_TRIGGERS,
+)
+from ramp.common.vehicle_defs import is_hdv, validate_rou_vtypes
 
 
 def _ensure_sumo_tools_on_path() -> None:
@@ -139,6 +172,28 @@ def _distance_to_merge(veh_id: str, merge_edge: str, traci) -> float | None:
     return dist
 
 
+def _latency_summary_ms(samples_s: list[float]) -> dict[str, float | int]:
+    samples_ms = [1000.0 * value for value in samples_s]
+    return {
+        'count': len(samples_ms),
+        'p50': _percentile(samples_ms, 0.50),
+        'p95': _percentile(samples_ms, 0.95),
+        'p99': _percentile(samples_ms, 0.99),
+        'max': max(samples_ms) if samples_ms else 0.0,
+    }
+
+
+def _command_row_state(
+    control_zone_state: VehicleTableView,
+    vehicle_table: VehicleTable,
+    veh_id: str,
+) -> tuple[str, float | str]:
+    if veh_id not in control_zone_state:
+        return '', ''
+    row = vehicle_table.row(veh_id)
+    return vehicle_table.stream(row), vehicle_table.d_to_merge.item(row)
+
+
 def _collision_to_row(sim_time: float, collision) -> dict[str, str | float]:
     row: dict[str, str | float] = {'time': sim_time}
     for key in (
@@ -194,6 +249,18 @@ def run_experiment(
     use_profiles: bool = False,
     hdv_profile_weights: dict[str, float] | None = None,
     gui_settings_file: str | None = None,
+    collector_backend: str = 'polling',
+    sumo_backend: str = 'traci',
+    count_traci_calls: bool = False,
+    dp_engine: str = DP_ENGINE_REFERENCE,
+    trace_format: str = TRACE_FORMAT_CSV,
+    trace_writer_mode: str = TRACE_WRITER_ASYNC,
+    controller_resync_steps: int = 0,
+    replan_trigger: str = REPLAN_TRIGGER_TIMER,
+    replan_eta_drift_s: float = DEFAULT_ETA_DRIFT_S,
+    profile_steps: bool = False,
+    profile_timeline: bool = False,
+    replay_trace: str | None = None,
 ) -> int:
     if duration_s <= 0:
         raise ValueError('duration-s must be > 0')
@@ -213,17 +280,44 @@ def run_experiment(
         raise ValueError('ttc-warmup-s must be >= 0')
     if policy not in {'no_control', 'fifo', 'dp', 'hierarchical'}:
         raise ValueError(f'Unsupported policy: {policy}')
+    if sumo_backend not in SIMULATION_BACKENDS:
+        raise ValueError(f'Unsupported sumo backend: {sumo_backend}')
+    if dp_engine not in DP_ENGINES:
+        raise ValueError(f'Unsupported dp engine: {dp_engine}')
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f'Unsupported trace format: {trace_format}')
+    if trace_writer_mode not in TRACE_WRITERS:
+        raise ValueError(f'Unsupported trace writer: {trace_writer_mode}')
+    if controller_resync_steps < 0:
+        raise ValueError('controller-resync-steps must be >= 0')
+    if replan_trigger not in REPLAN_TRIGGERS:
+        raise ValueError(f'Unsupported replan trigger: {replan_trigger}')
+    if replan_eta_drift_s <= 0:
+        raise ValueError('replan-eta-drift-s must be > 0')
+    if gui and sumo_backend == SUMO_BACKEND_LIBSUMO:
+        raise ValueError('libsumo backend cannot drive sumo-gui; use --sumo-backend traci')
+    if gui and sumo_backend == SUMO_BACKEND_FAKE:
+        raise ValueError('fake backend has no GUI; use --sumo-backend traci')
+    if replay_trace is not None and sumo_backend != SUMO_BACKEND_FAKE:
+        raise ValueError('--replay-trace needs --sumo-backend fake')
 
     takeover_mode_enum = parse_takeover_mode(takeover_mode)
     log_mode_warning(takeover_mode_enum)
 
     _ensure_sumo_tools_on_path()
 
-    import traci
+    traci = import_sumo_backend(sumo_backend)
+    traci_counter: CountingTraci | None = None
+    profile_steps = profile_steps or profile_timeline
+    if count_traci_calls or profile_steps:
+        # The profiler charges TraCI calls to stages from the same tally.
+        traci_counter = CountingTraci(traci)
+        traci = traci_counter
+    profiler = StepProfiler(traci_counter=traci_counter) if profile_steps else None
 
     repo_root = Path(__file__).resolve().parents[2]
     sumocfg = _resolve_sumocfg(repo_root, scenario)
-    sumo_binary = _pick_sumo_binary(gui)
+    sumo_binary = FAKE_SUMO_BINARY if sumo_backend == SUMO_BACKEND_FAKE else _pick_sumo_binary(gui)
     resolved_gui_settings = _resolve_gui_settings_file(repo_root, gui_settings_file)
     out_path = Path(out_dir).resolve() if out_dir else _default_out_dir(repo_root, scenario, policy)
     if out_path.exists():
@@ -286,6 +380,9 @@ def run_experiment(
         cmd += ['--seed', str(seed)]
     if gui and resolved_gui_settings is not None:
         cmd += ['--gui-settings-file', str(resolved_gui_settings)]
+    if replay_trace is not None:
+        # Understood by the fake backend only (validated above).
+        cmd += ['--replay-trace', str(Path(replay_trace).resolve())]
 
     max_steps = int(round(duration_s / step_length))
 
@@ -326,16 +423,13 @@ def run_experiment(
     contract_fields = CONTRACT_FIELDS
     feedback_fields = FEEDBACK_FIELDS
 
-    trace_path = out_path / 'control_zone_trace.csv'
-    collisions_path = out_path / 'collisions.csv'
-    plans_path = out_path / 'plans.csv'
-    commands_path = out_path / 'commands.csv'
-    events_path = out_path / 'events.csv'
-    control_evidence_path = out_path / 'control_evidence.csv'
-    contract_evidence_path = out_path / 'contract_evidence.csv'
-    feedback_evidence_path = out_path / 'feedback_evidence.csv'
     metrics_path = out_path / 'metrics.json'
     config_path = out_path / 'config.json'
+    traci_calls_path = out_path / 'traci_calls.json'
+    controller_writes_path = out_path / 'controller_writes.json'
+    profile_path = out_path / 'profile.json'
+    scheduler_timing_path = out_path / 'scheduler_timing.json'
+    profile_timeline_path = out_path / 'profile_timeline.csv'
     plan_fields = [
         'time',
         'entry_rank',
@@ -356,12 +450,14 @@ def run_experiment(
     prev_control_zone_ids: set[str] = set()
     prev_crossed_merge: set[str] = set()
     prev_lane_id_by_vehicle: dict[str, str] = {}
-    plan_snapshots: list[tuple[float, list[str], dict[str, float]]] = []
+    plan_consistency = PlanConsistencyTracker()
     speed_tracking_abs_errors: list[float] = []
+    # Thread CPU seconds spent computing/projecting plans (trace writer excluded).
+    scheduler_cpu_s = 0.0
     planned_actual_time_errors: list[float] = []
     planned_actual_position_errors: list[float] = []
-    ttc_longitudinal_samples: list[float] = []
-    ttc_merge_conflict_samples: list[float] = []
+    ttc_longitudinal_sketch = TTCSketch()
+    ttc_merge_conflict_sketch = TTCSketch()
     control_event_index = 0
     contract_index = 0
     feedback_event_index = 0
@@ -378,9 +474,9 @@ def run_experiment(
     eligible_ramp_cav_ids: set[str] = set()
     lc_complete_vehicle_ids: set[str] = set()
     latest_contract_by_vehicle: dict[str, str] = {}
+    # Only the latest contract per vehicle; superseded ones are summarised in contract_tally.
     contract_by_id: dict[str, dict[str, float | str]] = {}
-    feedback_rows: list[dict[str, str | float | int]] = []
-    cross_feedback_indices: list[int] = []
+    contract_tally = ContractTally()
     policy_variant_name = policy_variant if policy_variant else policy
     merge_policy = resolve_merge_policy(policy=policy, policy_variant=policy_variant_name)
     anchor_event = resolve_anchor_event_type(merge_policy=merge_policy)
@@ -392,6 +488,7 @@ def run_experiment(
         delta_2_s=delta_2_s,
     )
     effective_control_mode = control_mode
+    vehicle_registry = VehicleRegistry(traci=traci)
     state_collector = StateCollector(
         control_zone_length_m=control_zone_length_m,
         merge_edge=merge_edge,
@@ -401,6 +498,8 @@ def run_experiment(
         fifo_gap_s=fifo_gap_s,
         control_mode=effective_control_mode,
         aux_vmax_mps=aux_vmax_mps,
+        backend=collector_backend,
+        vehicle_registry=vehicle_registry,
     )
     dp_scheduler: DPScheduler | None = None
     hier_collector: HierarchicalStateCollector | None = None
@@ -415,6 +514,11 @@ def run_experiment(
             ramp_vmax_mps=ramp_vmax_mps,
             replan_interval_s=dp_replan_interval_s,
             aux_vmax_mps=aux_vmax_mps,
+            engine=dp_engine,
+            vehicle_registry=vehicle_registry,
+            replan_trigger=replan_trigger,
+            replan_eta_drift_s=replan_eta_drift_s,
+            profiler=profiler,
         )
     elif policy == 'hierarchical':
         hier_scheduler = HierarchicalScheduler(
@@ -425,6 +529,11 @@ def run_experiment(
             merge_policy=merge_policy,
             replan_interval_s=dp_replan_interval_s,
             aux_vmax_mps=aux_vmax_mps,
+            vehicle_registry=vehicle_registry,
+            dp_engine=dp_engine,
+            replan_trigger=replan_trigger,
+            replan_eta_drift_s=replan_eta_drift_s,
+            profiler=profiler,
         )
 
     sim_driver = SimulationDriver(traci=traci, cmd=cmd)
@@ -432,46 +541,48 @@ def run_experiment(
         traci=traci,
         takeover_mode=takeover_mode_enum,
         ramp_lc_target_lane=ramp_lc_target_lane,
+        vehicle_registry=vehicle_registry,
+        resync_every_steps=controller_resync_steps,
     )
     sim_driver.start()
+    if traci_counter is not None:
+        traci_counter.counts.clear()
     if policy == 'hierarchical':
         hier_collector = HierarchicalStateCollector(
             base_collector=state_collector,
             traci=traci,
         )
-    with trace_path.open('w', newline='', encoding='utf-8') as trace_fp, collisions_path.open(
-        'w', newline='', encoding='utf-8'
-    ) as collision_fp, plans_path.open('w', newline='', encoding='utf-8') as plan_fp, commands_path.open(
-        'w', newline='', encoding='utf-8'
-    ) as command_fp, events_path.open('w', newline='', encoding='utf-8') as event_fp, control_evidence_path.open(
-        'w', newline='', encoding='utf-8'
-    ) as control_fp, contract_evidence_path.open('w', newline='', encoding='utf-8') as contract_fp, feedback_evidence_path.open(
-        'w', newline='', encoding='utf-8'
-    ) as feedback_fp:
-        trace_writer = csv.DictWriter(trace_fp, fieldnames=trace_fields, lineterminator='\n')
-        collision_writer = csv.DictWriter(
-            collision_fp, fieldnames=collision_fields, lineterminator='\n'
-        )
-        plan_writer = csv.DictWriter(plan_fp, fieldnames=plan_fields, lineterminator='\n')
-        command_writer = csv.DictWriter(command_fp, fieldnames=command_fields, lineterminator='\n')
-        event_writer = csv.DictWriter(event_fp, fieldnames=event_fields, lineterminator='\n')
-        control_writer = csv.DictWriter(control_fp, fieldnames=control_fields, lineterminator='\n')
-        contract_writer = csv.DictWriter(contract_fp, fieldnames=contract_fields, lineterminator='\n')
-        feedback_writer = csv.DictWriter(feedback_fp, fieldnames=feedback_fields, lineterminator='\n')
-        trace_writer.writeheader()
-        collision_writer.writeheader()
-        plan_writer.writeheader()
-        command_writer.writeheader()
-        event_writer.writeheader()
-        control_writer.writeheader()
-        contract_writer.writeheader()
-        feedback_writer.writeheader()
+    trace_tables = {
+        'control_zone_trace': trace_fields,
+        'collisions': collision_fields,
+        'plans': plan_fields,
+        'commands': command_fields,
+        'events': event_fields,
+        'control_evidence': control_fields,
+        'contract_evidence': contract_fields,
+        'feedback_evidence': feedback_fields,
+    }
+    with TraceSinks(
+        out_path, trace_tables, trace_format=trace_format, trace_writer=trace_writer_mode
+    ) as trace_sinks:
+        trace_writer = trace_sinks['control_zone_trace']
+        collision_writer = trace_sinks['collisions']
+        plan_writer = trace_sinks['plans']
+        command_writer = trace_sinks['commands']
+        event_writer = trace_sinks['events']
+        control_writer = trace_sinks['control_evidence']
+        contract_writer = trace_sinks['contract_evidence']
+        feedback_writer = trace_sinks['feedback_evidence']
+        feedback_log = FeedbackLog(sink=feedback_writer.writerow, contract_by_id=contract_by_id)
 
         try:
             for _ in range(max_steps):
+                if profiler is not None:
+                    profiler.begin_step()
                 sim_time = sim_driver.step()
+                if profiler is not None:
+                    profiler.lap(STAGE_SIM_STEP)
                 active_vehicle_ids = set(traci.vehicle.getIDList())
-                control_zone_state: dict[str, dict[str, float | str]] = {}
                 desired_speed_by_vehicle: dict[str, float] = {}
 
                 for collision in traci.simulation.getCollisions():
@@ -486,28 +597,40 @@ def run_experiment(
                     collected_state = state_collector.collect(sim_time=sim_time, traci=traci)
                 active_vehicle_ids = collected_state.active_vehicle_ids
                 control_zone_state = collected_state.control_zone_state
+                vehicle_table = collected_state.vehicle_table
 
                 if policy != 'hierarchical' and policy != 'no_control':
                     for vid in control_zone_state:
                         if vid not in hier_vehicle_types:
-                            hier_vehicle_types[vid] = traci.vehicle.getTypeID(vid)
+                            hier_vehicle_types[vid] = vehicle_registry.type_id(vid)
+                if profiler is not None:
+                    profiler.lap(STAGE_COLLECT)
                 if sim_time >= ttc_warmup_s:
-                    longitudinal_samples, merge_conflict_samples = collect_ttc_samples(
-                        ttc_observation_state=collected_state.ttc_observation_state
+                    longitudinal_samples, merge_conflict_samples = collect_ttc_sample_arrays(
+                        collected_state.ttc_observation_state
                     )
-                    ttc_longitudinal_samples.extend(longitudinal_samples)
-                    ttc_merge_conflict_samples.extend(merge_conflict_samples)
+                    ttc_longitudinal_sketch.add(longitudinal_samples)
+                    ttc_merge_conflict_sketch.add(merge_conflict_samples)
+                if profiler is not None:
+                    profiler.lap(STAGE_TTC)
                 controller.apply_lane_change_modes(
                     control_zone_state=control_zone_state,
                     vehicle_types=hier_vehicle_types if hier_vehicle_types else None,
+                    merge_lane_vehicle_ids=(
+                        hier_state.perception.merge_lane.vehicle_ids
+                        if hier_state is not None and hier_state.perception is not None
+                        else None
+                    ),
                 )
+                if profiler is not None:
+                    profiler.lap(STAGE_CONTROLLER)
                 control_zone_ids = set(control_zone_state)
                 entered_this_step = control_zone_ids - prev_control_zone_ids
                 left_this_step = prev_control_zone_ids - control_zone_ids
                 crossed_this_step = state_collector.crossed_merge - prev_crossed_merge
                 lane_changed_by_vehicle: dict[str, bool] = {}
-                for veh_id, vehicle_state in control_zone_state.items():
-                    lane_id = str(vehicle_state['lane_id'])
+                for veh_id in control_zone_state:
+                    lane_id = vehicle_table.lane_id(vehicle_table.row(veh_id))
                     previous_lane_id = prev_lane_id_by_vehicle.get(veh_id, lane_id)
                     lane_changed_by_vehicle[veh_id] = previous_lane_id != lane_id
 
@@ -516,7 +639,7 @@ def run_experiment(
                     if stream == 'ramp' and not is_hdv(hier_vehicle_types.get(veh_id, '')):
                         vtype = hier_vehicle_types.get(veh_id, '')
                         if vtype == '' and veh_id in active_vehicle_ids:
-                            vtype = traci.vehicle.getTypeID(veh_id)
+                            vtype = vehicle_registry.type_id(veh_id)
                             hier_vehicle_types[veh_id] = vtype
                         if not is_hdv(vtype):
                             eligible_ramp_cav_ids.add(veh_id)
@@ -581,7 +704,7 @@ def run_experiment(
                         fallback_reason = 'zone_c_chain_incomplete'
                         zone_c_chain_status[veh_id] = True
                         zone_c_chain_complete_count += 1
-                    feedback_rows.append(
+                    feedback_log.append(
                         {
                             'time': sim_time,
                             'event_id': f'feedback_{feedback_event_index:08d}',
@@ -602,7 +725,10 @@ def run_experiment(
                             'replan_required': int(plan_recomputed),
                         }
                     )
-                    cross_feedback_indices.append(len(feedback_rows) - 1)
+                    if policy in {'fifo', 'dp', 'hierarchical'}:
+                        plan_consistency.observe_cross(
+                            veh_id=veh_id, cross_time_s=state_collector.cross_time[veh_id]
+                        )
                 for veh_id in sorted(left_this_step):
                     stream = str(state_collector.entry_info.get(veh_id, {}).get('stream', 'unknown'))
                     event_writer.writerow(
@@ -614,13 +740,16 @@ def run_experiment(
                         }
                     )
 
+                if profiler is not None:
+                    profiler.lap(STAGE_EVIDENCE)
                 plan = None
                 plan_recomputed = False
+                scheduler_t0 = time.thread_time()
                 if policy == 'fifo':
                     plan = compute_fifo_plan(
                         sim_time_s=sim_time,
                         control_zone_state=control_zone_state,
-                        entry_order=state_collector.entry_order,
+                        entry_order=state_collector.entry_rank,
                         crossed_merge=state_collector.crossed_merge,
                         fifo_target_time=state_collector.fifo_target_time,
                         fifo_natural_eta=state_collector.fifo_natural_eta,
@@ -649,10 +778,14 @@ def run_experiment(
                         traci=traci,
                         zone_a_info=hier_state.zone_a_info if hier_state is not None else None,
                         zone_c_lane1_vehicles=hier_state.zone_c_lane1_vehicles if hier_state is not None else None,
+                        perception=hier_state.perception if hier_state is not None else None,
                     )
                     plan_recomputed = bool(hier_scheduler.replanned_last_call)
                 else:
                     plan = compute_no_control_plan(sim_time_s=sim_time)
+                scheduler_cpu_s += time.thread_time() - scheduler_t0
+                if profiler is not None:
+                    profiler.lap(STAGE_ZONE_B)
 
                 zone_a_action_ids: set[str] = set()
                 zone_c_action_ids: set[str] = set()
@@ -662,8 +795,13 @@ def run_experiment(
                     schedule_order = plan.order
                     schedule_target_time = plan.target_cross_time_s
                     schedule_eta = plan.eta_s
-                    plan_snapshots.append(
-                        (sim_time, list(schedule_order), dict(schedule_target_time))
+                    plan_consistency.retain(vehicle_registry.records)
+                    for veh_id in [
+                        v for v in latest_contract_by_vehicle if v not in vehicle_registry.records
+                    ]:
+                        contract_by_id.pop(latest_contract_by_vehicle.pop(veh_id), None)
+                    plan_consistency.observe_plan(
+                        order=schedule_order, target_cross_time_s=schedule_target_time
                     )
                     if plan_recomputed:
                         event_writer.writerow(
@@ -674,6 +812,8 @@ def run_experiment(
                                 'detail': f'policy={policy}',
                             }
                         )
+                    if profiler is not None:
+                        profiler.lap(STAGE_EVIDENCE)
                     if policy == 'fifo':
                         command = build_fifo_command(
                             sim_time_s=sim_time,
@@ -730,6 +870,8 @@ def run_experiment(
                             aux_vmax_mps=aux_vmax_mps,
                             vehicle_types=hier_vehicle_types if hier_vehicle_types else None,
                         )
+                    if profiler is not None:
+                        profiler.lap(STAGE_COMMAND)
                     zone_a_event_count += len(zone_a_action_ids)
                     zone_c_event_count += len(zone_c_action_ids)
                     for veh_id in sorted(zone_c_action_ids):
@@ -737,7 +879,7 @@ def run_experiment(
                             zone_c_chain_status[veh_id] = False
                         zc_stream = str(state_collector.entry_info.get(veh_id, {}).get('stream', 'unknown'))
                         feedback_event_index += 1
-                        feedback_rows.append(
+                        feedback_log.append(
                             {
                                 'time': sim_time,
                                 'event_id': f'feedback_{feedback_event_index:08d}',
@@ -768,10 +910,10 @@ def run_experiment(
                         )
                     prev_target: float | None = None
                     for order_index, veh_id in enumerate(schedule_order, start=1):
-                        vehicle_state = control_zone_state[veh_id]
-                        d_to_merge = float(vehicle_state['d_to_merge'])
-                        speed = float(vehicle_state['speed'])
-                        stream = str(vehicle_state['stream'])
+                        row = vehicle_table.row(veh_id)
+                        d_to_merge = vehicle_table.d_to_merge.item(row)
+                        speed = vehicle_table.speed.item(row)
+                        stream = vehicle_table.stream(row)
                         natural_eta = schedule_eta[veh_id]
                         target_cross_time = schedule_target_time[veh_id]
                         if prev_target is None:
@@ -817,6 +959,10 @@ def run_experiment(
                                 desired_merge_speed_mps=desired_merge_speed,
                             )
                             contract_writer.writerow(contract_row)
+                            contract_tally.add(contract_snapshot)
+                            superseded_contract_id = latest_contract_by_vehicle.get(veh_id)
+                            if superseded_contract_id is not None:
+                                contract_by_id.pop(superseded_contract_id, None)
                             contract_by_id[contract_id] = contract_snapshot
                             latest_contract_by_vehicle[veh_id] = contract_id
                             contract_vehicle_ids.add(veh_id)
@@ -839,6 +985,8 @@ def run_experiment(
                                 'v_des': v_des,
                             }
                         )
+                    if profiler is not None:
+                        profiler.lap(STAGE_EVIDENCE)
                     controller_result = controller.apply(
                         command=command, active_vehicle_ids=active_vehicle_ids
                     )
@@ -847,48 +995,55 @@ def run_experiment(
                     controller_result = controller.apply(
                         command=command, active_vehicle_ids=active_vehicle_ids
                     )
+                if profiler is not None:
+                    profiler.lap(STAGE_CONTROLLER)
 
                 for veh_id in sorted(command.set_speed_mps):
-                    vehicle_state = control_zone_state.get(veh_id, {})
+                    stream_value, d_to_merge_value = _command_row_state(
+                        control_zone_state, vehicle_table, veh_id,
+                    )
                     command_writer.writerow(
                         {
                             'time': sim_time,
                             'veh_id': veh_id,
-                            'stream': vehicle_state.get('stream', ''),
-                            'd_to_merge_m': vehicle_state.get('d_to_merge', ''),
+                            'stream': stream_value,
+                            'd_to_merge_m': d_to_merge_value,
                             'v_cmd_mps': command.set_speed_mps[veh_id],
                             'release_flag': 0,
                         }
                     )
                 for veh_id in sorted(controller_result.released_ids):
-                    vehicle_state = control_zone_state.get(veh_id, {})
+                    stream_value, d_to_merge_value = _command_row_state(
+                        control_zone_state, vehicle_table, veh_id,
+                    )
                     command_writer.writerow(
                         {
                             'time': sim_time,
                             'veh_id': veh_id,
-                            'stream': vehicle_state.get('stream', ''),
-                            'd_to_merge_m': vehicle_state.get('d_to_merge', ''),
+                            'stream': stream_value,
+                            'd_to_merge_m': d_to_merge_value,
                             'v_cmd_mps': '',
                             'release_flag': 1,
                         }
                     )
+                if profiler is not None:
+                    profiler.lap(STAGE_TRACE_IO)
                 lane_change_command_ids = set(command.lane_change_targets)
                 for veh_id in sorted(command.set_speed_mps):
                     if veh_id not in control_zone_state:
                         continue
-                    vehicle_state = control_zone_state[veh_id]
-                    if is_hdv(traci.vehicle.getTypeID(veh_id)):
+                    if is_hdv(vehicle_registry.type_id(veh_id)):
                         continue
                     controlled_cav_steps += 1
                     covered_control_cav_steps += 1
                     commanded_speed = float(command.set_speed_mps[veh_id])
-                    actual_speed = float(vehicle_state['speed'])
+                    actual_speed = vehicle_table.speed.item(vehicle_table.row(veh_id))
                     speed_error = actual_speed - commanded_speed
-                    speed_mode_applied = controller_result.speed_mode_by_vehicle.get(
-                        veh_id, int(traci.vehicle.getSpeedMode(veh_id))
-                    )
+                    speed_mode_applied = controller_result.speed_mode_by_vehicle.get(veh_id)
+                    if speed_mode_applied is None:
+                        speed_mode_applied = controller.speed_mode(veh_id)
                     lane_change_command_issued = int(veh_id in lane_change_command_ids)
-                    lane_change_mode_applied = int(traci.vehicle.getLaneChangeMode(veh_id))
+                    lane_change_mode_applied = controller.lane_change_mode(veh_id)
                     autonomous_lane_change_detected = int(
                         lane_changed_by_vehicle.get(veh_id, False)
                         and lane_change_command_issued == 0
@@ -937,7 +1092,7 @@ def run_experiment(
                 for veh_id in sorted(lane_change_command_ids - set(command.set_speed_mps)):
                     if veh_id not in control_zone_state:
                         continue
-                    if is_hdv(traci.vehicle.getTypeID(veh_id)):
+                    if is_hdv(vehicle_registry.type_id(veh_id)):
                         continue
                     control_event_index += 1
                     control_writer.writerow(
@@ -947,11 +1102,11 @@ def run_experiment(
                             'contract_id': latest_contract_by_vehicle.get(veh_id, ''),
                             'veh_id': veh_id,
                             'commanded_speed': '',
-                            'actual_speed': float(control_zone_state[veh_id]['speed']),
+                            'actual_speed': vehicle_table.speed.item(vehicle_table.row(veh_id)),
                             'speed_error': '',
-                            'speed_mode_applied': int(traci.vehicle.getSpeedMode(veh_id)),
+                            'speed_mode_applied': controller.speed_mode(veh_id),
                             'lane_change_command_issued': 1,
-                            'lane_change_mode_applied': int(traci.vehicle.getLaneChangeMode(veh_id)),
+                            'lane_change_mode_applied': controller.lane_change_mode(veh_id),
                             'autonomous_lane_change_detected': 0,
                             'controlled_cav_step': 0,
                         }
@@ -998,7 +1153,7 @@ def run_experiment(
                             if mevt.get('is_fallback', False):
                                 lc_fallback_reason = 'position_fallback'
                             feedback_event_index += 1
-                            feedback_rows.append(
+                            feedback_log.append(
                                 {
                                     'time': sim_time,
                                     'event_id': f'feedback_{feedback_event_index:08d}',
@@ -1078,43 +1233,43 @@ def run_experiment(
                         }
                     )
 
-                for veh_id, vehicle_state in control_zone_state.items():
+                if profiler is not None:
+                    profiler.lap(STAGE_EVIDENCE)
+                for veh_id in control_zone_state:
+                    row = vehicle_table.row(veh_id)
+                    lane_id = vehicle_table.lane_id(row)
                     trace_writer.writerow(
                         {
                             'time': sim_time,
                             'veh_id': veh_id,
-                            'stream': vehicle_state['stream'],
-                            'edge_id': vehicle_state['edge_id'],
-                            'lane_id': vehicle_state['lane_id'],
-                            'lane_pos': vehicle_state['lane_pos'],
-                            'D_to_merge': vehicle_state['d_to_merge'],
-                            'speed': vehicle_state['speed'],
-                            'accel': vehicle_state['accel'],
+                            'stream': vehicle_table.stream(row),
+                            'edge_id': vehicle_table.edge_id(row),
+                            'lane_id': lane_id,
+                            'lane_pos': vehicle_table.lane_pos.item(row),
+                            'D_to_merge': vehicle_table.d_to_merge.item(row),
+                            'speed': vehicle_table.speed.item(row),
+                            'accel': vehicle_table.accel.item(row),
                             'v_des': desired_speed_by_vehicle.get(veh_id, ''),
                         }
                     )
+                    prev_lane_id_by_vehicle[veh_id] = lane_id
                 for veh_id, v_des in desired_speed_by_vehicle.items():
                     if veh_id in control_zone_state:
-                        speed_now = float(control_zone_state[veh_id]['speed'])
+                        speed_now = vehicle_table.speed.item(vehicle_table.row(veh_id))
                         speed_tracking_abs_errors.append(abs(speed_now - v_des))
-
-                for veh_id, vehicle_state in control_zone_state.items():
-                    prev_lane_id_by_vehicle[veh_id] = str(vehicle_state['lane_id'])
                 prev_control_zone_ids = control_zone_ids
                 prev_crossed_merge = set(state_collector.crossed_merge)
+                if profiler is not None:
+                    profiler.lap(STAGE_TRACE_IO)
+                controller.close_step()
+                if profiler is not None:
+                    profiler.end_step(STAGE_CONTROLLER, sim_time_s=sim_time)
+                if traci_counter is not None:
+                    traci_counter.close_step()
         finally:
             controller.release_all(active_vehicle_ids=active_vehicle_ids)
             sim_driver.close()
-
-    attach_actual_neighbors(
-        feedback_rows=feedback_rows,
-        cross_feedback_indices=cross_feedback_indices,
-    )
-
-    with feedback_evidence_path.open('a', newline='', encoding='utf-8') as feedback_fp:
-        feedback_writer = csv.DictWriter(feedback_fp, fieldnames=feedback_fields, lineterminator='\n')
-        for row in feedback_rows:
-            feedback_writer.writerow(row)
+        feedback_log.close()
 
     pending_unfinished = {
         veh_id
@@ -1149,64 +1304,16 @@ def run_experiment(
     speed_error_p50_mps = _percentile(speed_tracking_abs_errors, 0.50) if speed_tracking_abs_errors else 0.0
     speed_error_p95_mps = _percentile(speed_tracking_abs_errors, 0.95) if speed_tracking_abs_errors else 0.0
 
-    consistency_merge_order_mismatch_count = 0
-    cross_time_errors: list[float] = []
-    if policy in {'fifo', 'dp', 'hierarchical'} and plan_snapshots:
-        actual_cross_sequence = sorted(
-            state_collector.cross_time.items(),
-            key=lambda item: (float(item[1]), item[0]),
-        )
-        for veh_id, cross_t in actual_cross_sequence:
-            latest_snapshot: tuple[float, list[str], dict[str, float]] | None = None
-            latest_with_vehicle: tuple[float, list[str], dict[str, float]] | None = None
-            for snapshot in plan_snapshots:
-                if snapshot[0] >= cross_t - 1e-9:
-                    break
-                latest_snapshot = snapshot
-                if veh_id in snapshot[2]:
-                    latest_with_vehicle = snapshot
-
-            if latest_snapshot and latest_snapshot[1]:
-                if latest_snapshot[1][0] != veh_id:
-                    consistency_merge_order_mismatch_count += 1
-
-            if latest_with_vehicle is not None:
-                cross_time_errors.append(cross_t - latest_with_vehicle[2][veh_id])
-
-    cross_time_error_mean_s = (
-        sum(abs(err) for err in cross_time_errors) / len(cross_time_errors)
-        if cross_time_errors
-        else 0.0
-    )
-    cross_time_error_p95_s = (
-        _percentile([abs(err) for err in cross_time_errors], 0.95)
-        if cross_time_errors
-        else 0.0
-    )
-
-    churn_samples: list[float] = []
-    if policy in {'fifo', 'dp', 'hierarchical'} and len(plan_snapshots) >= 2:
-        for prev_snapshot, cur_snapshot in zip(plan_snapshots, plan_snapshots[1:]):
-            prev_order = prev_snapshot[1]
-            cur_order = cur_snapshot[1]
-            prev_pos = {veh_id: idx for idx, veh_id in enumerate(prev_order)}
-            cur_pos = {veh_id: idx for idx, veh_id in enumerate(cur_order)}
-            shared = set(prev_pos) & set(cur_pos)
-            if not shared:
-                continue
-            changed = sum(1 for veh_id in shared if prev_pos[veh_id] != cur_pos[veh_id])
-            churn_samples.append(changed / len(shared))
-    consistency_plan_churn_rate = (
-        sum(churn_samples) / len(churn_samples) if churn_samples else 0.0
-    )
-    ttc_metrics = build_ttc_metrics(
-        longitudinal_samples=ttc_longitudinal_samples,
-        merge_conflict_samples=ttc_merge_conflict_samples,
+    consistency_merge_order_mismatch_count = plan_consistency.merge_order_mismatch_count
+    cross_time_error_mean_s = plan_consistency.cross_time_error_mean_s()
+    cross_time_error_p95_s = plan_consistency.cross_time_error_p95_s()
+    consistency_plan_churn_rate = plan_consistency.plan_churn_rate()
+    ttc_metrics = build_ttc_metrics_from_sketches(
+        longitudinal=ttc_longitudinal_sketch,
+        merge_conflict=ttc_merge_conflict_sketch,
         step_length_s=step_length,
     )
-    contract_smoke_summary = build_contract_smoke_summary(
-        contract_by_id=contract_by_id,
-    )
+    contract_smoke_summary = contract_tally.summary()
     evidence_metrics = build_evidence_metrics(
         duration_s=duration_s,
         controlled_cav_steps=controlled_cav_steps,
@@ -1220,8 +1327,7 @@ def run_experiment(
         contract_vehicle_ids=contract_vehicle_ids,
         feedback_vehicle_ids=feedback_vehicle_ids,
         eligible_ramp_cav_ids=eligible_ramp_cav_ids,
-        feedback_rows=feedback_rows,
-        contract_by_id=contract_by_id,
+        feedback_tally=feedback_log.tally,
         planned_actual_time_errors=planned_actual_time_errors,
         planned_actual_position_errors=planned_actual_position_errors,
     )
@@ -1254,6 +1360,18 @@ def run_experiment(
     metrics.update(evidence_metrics)
     metrics['contract_smoke_summary'] = contract_smoke_summary
 
+    zone_b_scheduler: DPScheduler | HierarchicalScheduler | None = dp_scheduler or hier_scheduler
+    # Timings differ between any two runs; kept out of metrics.json.
+    scheduler_timing: dict[str, object] = {'scheduler_cpu_s': scheduler_cpu_s}
+    if zone_b_scheduler is not None:
+        scheduler_timing['scheduler_replan_latency_ms'] = _latency_summary_ms(
+            zone_b_scheduler.replan_latency_s
+        )
+        metrics['scheduler_replan_trigger'] = replan_trigger
+        metrics['scheduler_replan_reasons'] = zone_b_scheduler.replan_reasons
+    if dp_scheduler is not None:
+        metrics['scheduler_replan_count'] = dp_scheduler.replan_count
+
     if hier_scheduler is not None:
         metrics['scheduler_fallback_count'] = hier_scheduler.scheduler_fallback_count
         metrics['scheduler_replan_count'] = hier_scheduler.scheduler_replan_count
@@ -1263,7 +1381,19 @@ def run_experiment(
             else 0.0
         )
 
+    controller_writes = controller.write_summary()
+    metrics['controller_write_calls_per_step'] = controller_writes['write_calls_per_step']
+    metrics['controller_suppressed_writes'] = controller_writes['suppressed_writes']
+
     metrics_path.write_text(json.dumps(metrics, indent=2), encoding='utf-8')
+    controller_writes_path.write_text(json.dumps(controller_writes), encoding='utf-8')
+    scheduler_timing_path.write_text(json.dumps(scheduler_timing, indent=2), encoding='utf-8')
+    if traci_counter is not None:
+        traci_calls_path.write_text(json.dumps(traci_counter.summary(), indent=2), encoding='utf-8')
+    if profiler is not None:
+        profile_path.write_text(json.dumps(profiler.summary(), indent=2), encoding='utf-8')
+        if profile_timeline:
+            profiler.write_timeline(profile_timeline_path)
 
     config = {
         'scenario': scenario,
@@ -1293,6 +1423,18 @@ def run_experiment(
         'hdv_profile_weights': hdv_profile_weights,
         'baseline_role': 'diagnostic_only' if policy == 'no_control' else 'baseline',
         'gui_settings_file': str(resolved_gui_settings) if resolved_gui_settings is not None else None,
+        'collector_backend': collector_backend,
+        'sumo_backend': sumo_backend,
+        'count_traci_calls': count_traci_calls,
+        'profile_steps': profile_steps,
+        'profile_timeline': profile_timeline,
+        'replay_trace': replay_trace,
+        'controller_resync_steps': controller_resync_steps,
+        'dp_engine': dp_engine,
+        'replan_trigger': replan_trigger,
+        'replan_eta_drift_s': replan_eta_drift_s,
+        'trace_format': trace_format,
+        'trace_writer': trace_writer_mode,
         'output_dir': str(out_path),
     }
     if rou_meta is not None:
@@ -1404,6 +1546,87 @@ def main() -> int:
         help='Optional SUMO GUI settings file (*.view.xml). '
              'If omitted and ramp/scenarios/ramp_gui.view.xml exists, it is used automatically.',
     )
+    parser.add_argument(
+        '--collector-backend',
+        choices=['polling', 'subscription'],
+        default='polling',
+        help='Per-vehicle state source: polling (one TraCI getter per field) or '
+             'subscription (fields batched into the simulationStep response).',
+    )
+    parser.add_argument(
+        '--sumo-backend',
+        choices=list(SIMULATION_BACKENDS),
+        default='traci',
+        help='SUMO binding: traci (socket, supports GUI), libsumo (in-process, headless only) '
+             'or fake (in-memory kinematic stand-in, no SUMO needed; for benchmarks).',
+    )
+    parser.add_argument(
+        '--count-traci-calls',
+        action='store_true',
+        help='Count TraCI calls per step and write traci_calls.json.',
+    )
+    parser.add_argument(
+        '--dp-engine',
+        choices=list(DP_ENGINES),
+        default=DP_ENGINE_REFERENCE,
+        help='DP solver: reference (dict frontiers) or array (policy=dp: vectorised '
+             'NumPy tables reused across replans; policy=hierarchical: mixed DP on '
+             'precomputed HDV tables, CAV-only fallback on the array engine).',
+    )
+    parser.add_argument(
+        '--trace-format',
+        choices=list(TRACE_FORMATS),
+        default=TRACE_FORMAT_CSV,
+        help='Per-step trace files: csv, or columnar (<name>.rtrc, typed compressed '
+             'chunks; convert with ramp.tools.export_trace_csv).',
+    )
+    parser.add_argument(
+        '--trace-writer',
+        choices=list(TRACE_WRITERS),
+        default=TRACE_WRITER_ASYNC,
+        help='Write traces on a background thread (async) or inline in the step loop (sync).',
+    )
+    parser.add_argument(
+        '--controller-resync-steps',
+        type=int,
+        default=0,
+        help='The controller only sends speed / mode writes that change; re-send all of '
+             'them every N steps (0 = never, 1 = every step). Per-step write counts go '
+             'to controller_writes.json.',
+    )
+    parser.add_argument(
+        '--replan-trigger',
+        choices=list(REPLAN_TRIGGERS),
+        default=REPLAN_TRIGGER_TIMER,
+        help='policy=dp/hierarchical: replan every --dp-replan-interval-s (timer), or on '
+             'entries, crossings and ETA drift with that interval as the upper bound (event).',
+    )
+    parser.add_argument(
+        '--replan-eta-drift-s',
+        type=float,
+        default=DEFAULT_ETA_DRIFT_S,
+        help='Event trigger: replan when a vehicle\'s constant-speed ETA moved more than '
+             'this since the last replan.',
+    )
+    parser.add_argument(
+        '--profile-steps',
+        action='store_true',
+        help='Time each step stage (sim step, collection, Zone A/B/C, DP, commands, '
+             'controller, TTC, evidence, trace I/O) and count its TraCI calls; writes '
+             'profile.json (implies TraCI call counting).',
+    )
+    parser.add_argument(
+        '--profile-timeline',
+        action='store_true',
+        help='With --profile-steps (implied): also write per-step stage timings to '
+             'profile_timeline.csv.',
+    )
+    parser.add_argument(
+        '--replay-trace',
+        default=None,
+        help='With --sumo-backend fake: move vehicles as recorded in this '
+             'control_zone_trace.csv instead of simulating them.',
+    )
     args = parser.parse_args()
 
     return run_experiment(
@@ -1437,6 +1660,18 @@ def main() -> int:
         use_profiles=_resolve_use_profiles(args),
         hdv_profile_weights=_parse_cli_weights(args),
         gui_settings_file=args.gui_settings_file,
+        collector_backend=args.collector_backend,
+        sumo_backend=args.sumo_backend,
+        count_traci_calls=args.count_traci_calls,
+        dp_engine=args.dp_engine,
+        trace_format=args.trace_format,
+        trace_writer_mode=args.trace_writer,
+        controller_resync_steps=args.controller_resync_steps,
+        replan_trigger=args.replan_trigger,
+        replan_eta_drift_s=args.replan_eta_drift_s,
+        profile_steps=args.profile_steps,
+        profile_timeline=args.profile_timeline,
+        replay_trace=args.replay_trace,
     )
 
 
@@ -0,0 +1,416 @@
+"""Trace sinks for the per-step CSV outputs of ``ramp.experiments.run``.
+
+The runner emits eight row-oriented traces (``plans``, ``commands``,
+``events``, ...).  Writing them through ``csv.DictWriter`` on the simulation
+thread formats every float as text inside the step loop.  This module puts a
+small sink layer in between:
+
+* ``CsvTraceSink`` writes exactly what ``csv.DictWriter`` wrote before
+  (``<name>.csv``);
+* ``ColumnarTraceSink`` buffers rows into column chunks and writes them as
+  typed, zlib-compressed blocks (``<name>.rtrc``, see below);
+* ``AsyncTraceWriter`` moves either sink's work onto one writer thread fed
+  by a bounded queue; the step loop only appends row dicts to a batch.
+
+``read_trace_rows`` is the shared loader for both formats.  It yields the
+same ``dict[str, str]`` rows ``csv.DictReader`` yields for the CSV file, and
+``export_csv`` turns an ``.rtrc`` file back into the byte-identical CSV.
+
+``.rtrc`` layout (little endian)::
+
+    b'RAMPTRC1\\n'  u32 header_len  header_json ({"fields": [...]})
+    repeated:     u32 block_len   zlib(block)
+
+    block := u32 n_rows, then per field in header order:
+             u8 kind  u32 n_bytes  data
+      'f'  float64[n_rows]                      (every value is a float)
+      'g'  u8 present[n_rows] + float64[n_rows] (floats and '' / None)
+      'i'  int64[n_rows]                        (every value is an int)
+      's'  int32 byte_len[n_rows] + utf-8 blob  (anything else, as CSV text)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import queue
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+TRACE_FORMAT_CSV = 'csv'
+TRACE_FORMAT_COLUMNAR = 'columnar'
+TRACE_FORMATS = (TRACE_FORMAT_CSV, TRACE_FORMAT_COLUMNAR)
+TRACE_SUFFIX_BY_FORMAT = {TRACE_FORMAT_CSV: '.csv', TRACE_FORMAT_COLUMNAR: '.rtrc'}
+
+TRACE_WRITER_SYNC = 'sync'
+TRACE_WRITER_ASYNC = 'async'
+TRACE_WRITERS = (TRACE_WRITER_SYNC, TRACE_WRITER_ASYNC)
+
+COLUMNAR_MAGIC = b'RAMPTRC1\n'
+DEFAULT_CHUNK_ROWS = 4096
+DEFAULT_BATCH_ROWS = 256
+
+_U32 = struct.Struct('<I')
+_COLUMN_HEADER = struct.Struct('<cI')
+
+TraceRow = dict[str, Any]
+
+
+class TraceSink(Protocol):
+    def writerow(self, row: TraceRow) -> None: ...
+
+    def writerows(self, rows: Iterable[TraceRow]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def csv_text(value: Any) -> str:
+    """Text ``csv.writer`` produces for ``value`` (floats via ``repr``)."""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _check_fields(row: TraceRow, fieldnames: frozenset[str]) -> None:
+    extra = [key for key in row if key not in fieldnames]
+    if extra:
+        raise ValueError('dict contains fields not in fieldnames: ' + ', '.join(map(repr, extra)))
+
+
+class CsvTraceSink:
+    """``csv.DictWriter`` behind the ``TraceSink`` interface (header on open)."""
+
+    def __init__(self, path: Path, fieldnames: list[str]) -> None:
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self._fp = path.open('w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._fp, fieldnames=self.fieldnames, lineterminator='\n')
+        self._writer.writeheader()
+
+    def writerow(self, row: TraceRow) -> None:
+        self._writer.writerow(row)
+
+    def writerows(self, rows: Iterable[TraceRow]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def _encode_column(values: list[Any]) -> tuple[bytes, bytes]:
+    if all(type(value) is float for value in values):
+        return b'f', np.array(values, dtype='<f8').tobytes()
+    if all(type(value) is float or value == '' or value is None for value in values):
+        present = np.array([type(value) is float for value in values], dtype=np.uint8)
+        floats = np.array(
+            [value if type(value) is float else 0.0 for value in values], dtype='<f8'
+        )
+        return b'g', present.tobytes() + floats.tobytes()
+    if all(type(value) is int for value in values):
+        try:
+            return b'i', np.array(values, dtype='<i8').tobytes()
+        except OverflowError:
+            pass
+    encoded = [csv_text(value).encode('utf-8') for value in values]
+    lengths = np.array([len(item) for item in encoded], dtype='<i4')
+    return b's', lengths.tobytes() + b''.join(encoded)
+
+
+def _decode_column(kind: bytes, data: bytes, n_rows: int) -> list[Any]:
+    if kind == b'f':
+        return np.frombuffer(data, dtype='<f8', count=n_rows).tolist()
+    if kind == b'g':
+        present = np.frombuffer(data, dtype=np.uint8, count=n_rows)
+        floats = np.frombuffer(data, dtype='<f8', count=n_rows, offset=n_rows).tolist()
+        return [value if flag else '' for flag, value in zip(present.tolist(), floats)]
+    if kind == b'i':
+        return np.frombuffer(data, dtype='<i8', count=n_rows).tolist()
+    if kind == b's':
+        lengths = np.frombuffer(data, dtype='<i4', count=n_rows).tolist()
+        out: list[Any] = []
+        offset = 4 * n_rows
+        for length in lengths:
+            out.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+        return out
+    raise ValueError(f'Unknown column kind: {kind!r}')
+
+
+class ColumnarTraceSink:
+    """Chunked, typed column blocks (``.rtrc``); see the module docstring."""
+
+    def __init__(
+        self, path: Path, fieldnames: list[str], *, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> None:
+        if chunk_rows <= 0:
+            raise ValueError('chunk_rows must be > 0')
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.chunk_rows = chunk_rows
+        self._field_set = frozenset(self.fieldnames)
+        self._rows: list[TraceRow] = []
+        self._fp = path.open('wb')
+        header = json.dumps({'fields': self.fieldnames}).encode('utf-8')
+        self._fp.write(COLUMNAR_MAGIC + _U32.pack(len(header)) + header)
+
+    def writerow(self, row: TraceRow) -> None:
+        _check_fields(row, self._field_set)
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_rows:
+            self._flush_chunk()
+
+    def writerows(self, rows: Iterable[TraceRow]) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def close(self) -> None:
+        if self._rows:
+            self._flush_chunk()
+        self._fp.close()
+
+    def _flush_chunk(self) -> None:
+        rows = self._rows
+        self._rows = []
+        parts = [_U32.pack(len(rows))]
+        for name in self.fieldnames:
+            kind, data = _encode_column([row.get(name, '') for row in rows])
+            parts.append(_COLUMN_HEADER.pack(kind, len(data)))
+            parts.append(data)
+        block = zlib.compress(b''.join(parts), 1)
+        self._fp.write(_U32.pack(len(block)) + block)
+
+
+def _read_exact(fp: Any, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise ValueError(f'Truncated columnar trace file: {fp.name}')
+    return data
+
+
+def _read_columnar_header(fp: Any) -> list[str]:
+    if fp.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError(f'Not a columnar trace file: {fp.name}')
+    (header_len,) = _U32.unpack(_read_exact(fp, _U32.size))
+    return list(json.loads(_read_exact(fp, header_len).decode('utf-8'))['fields'])
+
+
+def read_columnar(path: Path) -> tuple[list[str], Iterator[dict[str, list[Any]]]]:
+    """Field names and an iterator of ``{field: values}`` chunks (typed values)."""
+    with path.open('rb') as fp:
+        fieldnames = _read_columnar_header(fp)
+
+    def _chunks() -> Iterator[dict[str, list[Any]]]:
+        with path.open('rb') as fp:
+            _read_columnar_header(fp)
+            while True:
+                prefix = fp.read(_U32.size)
+                if not prefix:
+                    return
+                if len(prefix) != _U32.size:
+                    raise ValueError(f'Truncated columnar trace file: {path}')
+                (block_len,) = _U32.unpack(prefix)
+                block = zlib.decompress(_read_exact(fp, block_len))
+                (n_rows,) = _U32.unpack_from(block, 0)
+                cursor = _U32.size
+                columns: dict[str, list[Any]] = {}
+                for name in fieldnames:
+                    kind, n_bytes = _COLUMN_HEADER.unpack_from(block, cursor)
+                    cursor += _COLUMN_HEADER.size
+                    columns[name] = _decode_column(kind, block[cursor:cursor + n_bytes], n_rows)
+                    cursor += n_bytes
+                yield columns
+
+    return fieldnames, _chunks()
+
+
+def _columnar_rows(path: Path) -> Iterator[dict[str, Any]]:
+    fieldnames, chunks = read_columnar(path)
+    for columns in chunks:
+        for values in zip(*(columns[name] for name in fieldnames)):
+            yield dict(zip(fieldnames, values))
+
+
+def resolve_trace_path(path: Path) -> Path:
+    """``path`` if it exists, else its sibling in the other trace format."""
+    if path.exists():
+        return path
+    for suffix in TRACE_SUFFIX_BY_FORMAT.values():
+        candidate = path.with_suffix(suffix)
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f'Trace not found: {path}')
+
+
+def read_trace_rows(path: Path) -> Iterator[dict[str, str]]:
+    """Rows of a CSV or ``.rtrc`` trace as ``csv.DictReader`` would return them."""
+    resolved = resolve_trace_path(path)
+    with resolved.open('rb') as fp:
+        is_columnar = fp.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC
+    if is_columnar:
+        for row in _columnar_rows(resolved):
+            yield {key: csv_text(value) for key, value in row.items()}
+        return
+    with resolved.open('r', newline='', encoding='utf-8') as fp:
+        yield from csv.DictReader(fp)
+
+
+def export_csv(src: Path, dst: Path) -> int:
+    """Write the CSV the runner would have written for ``src``; returns the row count."""
+    fieldnames, _chunks = read_columnar(src)
+    count = 0
+    with dst.open('w', newline='', encoding='utf-8') as fp:
+        writer = csv.DictWriter(fp, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        for row in _columnar_rows(src):
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+class AsyncTraceWriter:
+    """One background thread draining ``(sink, rows)`` batches in FIFO order.
+
+    A sink error is re-raised on the next ``submit`` or on ``close``; the
+    batches queued after it are dropped.
+    """
+
+    def __init__(self, *, max_pending_batches: int = 64) -> None:
+        self._queue: queue.Queue[tuple[TraceSink, list[TraceRow]] | None] = queue.Queue(
+            maxsize=max_pending_batches
+        )
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name='ramp-trace-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, sink: TraceSink, rows: list[TraceRow]) -> None:
+        self._raise_error()
+        self._queue.put((sink, rows))
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError('trace writer thread failed') from error
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            sink, rows = item
+            try:
+                sink.writerows(rows)
+            except BaseException as exc:  # surfaced on the simulation thread
+                self._error = exc
+
+
+class QueuedTraceSink:
+    """Batches rows on the caller's thread and hands them to an ``AsyncTraceWriter``."""
+
+    def __init__(
+        self, sink: TraceSink, writer: AsyncTraceWriter, *, batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> None:
+        self.sink = sink
+        self.writer = writer
+        self.batch_rows = batch_rows
+        self._batch: list[TraceRow] = []
+
+    def writerow(self, row: TraceRow) -> None:
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_rows:
+            self.flush()
+
+    def writerows(self, rows: Iterable[TraceRow]) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def flush(self) -> None:
+        if self._batch:
+            self.writer.submit(self.sink, self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def trace_path(out_dir: Path, name: str, trace_format: str) -> Path:
+    return out_dir / f'{name}{TRACE_SUFFIX_BY_FORMAT[trace_format]}'
+
+
+class TraceSinks:
+    """Opens one sink per trace table; use as a context manager.
+
+    Row dicts handed to ``writerow`` must not be mutated afterwards when the
+    writer is asynchronous.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        tables: dict[str, list[str]],
+        *,
+        trace_format: str = TRACE_FORMAT_CSV,
+        trace_writer: str = TRACE_WRITER_ASYNC,
+    ) -> None:
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f'Unsupported trace format: {trace_format}')
+        if trace_writer not in TRACE_WRITERS:
+            raise ValueError(f'Unsupported trace writer: {trace_writer}')
+        self.paths = {name: trace_path(out_dir, name, trace_format) for name in tables}
+        self._sinks: dict[str, TraceSink] = {}
+        try:
+            for name, fieldnames in tables.items():
+                if trace_format == TRACE_FORMAT_COLUMNAR:
+                    self._sinks[name] = ColumnarTraceSink(self.paths[name], fieldnames)
+                else:
+                    self._sinks[name] = CsvTraceSink(self.paths[name], fieldnames)
+        except BaseException:
+            for sink in self._sinks.values():
+                sink.close()
+            raise
+        self._writer = AsyncTraceWriter() if trace_writer == TRACE_WRITER_ASYNC else None
+        self._front: dict[str, TraceSink] = (
+            {name: QueuedTraceSink(sink, self._writer) for name, sink in self._sinks.items()}
+            if self._writer is not None
+            else dict(self._sinks)
+        )
+
+    def __getitem__(self, name: str) -> TraceSink:
+        return self._front[name]
+
+    def close(self) -> None:
+        try:
+            if self._writer is not None:
+                for front in self._front.values():
+                    front.close()
+                self._writer.close()
+        finally:
+            for sink in self._sinks.values():
+                sink.close()
+
+    def __enter__(self) -> TraceSinks:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except Exception:
+            pass  # keep the original exception
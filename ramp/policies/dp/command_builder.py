@@ -1,24 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from ramp.common.vehicle_defs import VEH_TYPE_CAV, VEH_TYPE_HDV
+from ramp.policies.speed_command import plan_speed_targets
 from ramp.runtime.types import ControlCommand, Plan
-
-
-def _stream_vmax(
-    stream: str,
-    main_vmax_mps: float,
-    ramp_vmax_mps: float,
-    *,
-    aux_vmax_mps: float | None = None,
-    lane_id: str = '',
-) -> float:
-    if stream == 'main':
-        return main_vmax_mps
-    if stream == 'ramp':
-        if aux_vmax_mps is not None and lane_id.startswith('main_h3_'):
-            return aux_vmax_mps
-        return ramp_vmax_mps
-    return max(main_vmax_mps, ramp_vmax_mps)
+from ramp.runtime.vehicle_table import as_vehicle_table
 
 
 def build_command(
@@ -26,29 +13,28 @@ def build_command(
     sim_time_s: float,
     step_length_s: float,
     plan: Plan,
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     main_vmax_mps: float,
     ramp_vmax_mps: float,
     aux_vmax_mps: float | None = None,
     vehicle_types: dict[str, str] | None = None,
 ) -> ControlCommand:
-    set_speed_mps: dict[str, float] = {}
-    for veh_id in plan.order:
-        if vehicle_types is not None:
-            veh_type = vehicle_types.get(veh_id, VEH_TYPE_HDV)
-            if veh_type != VEH_TYPE_CAV:
-                continue
-        vehicle_state = control_zone_state[veh_id]
-        stream = str(vehicle_state['stream'])
-        lane_id = str(vehicle_state.get('lane_id', ''))
-        d_to_merge = float(vehicle_state['d_to_merge'])
-        target_cross_time = float(plan.target_cross_time_s[veh_id])
-        time_to_target = max(target_cross_time - sim_time_s, step_length_s)
-        stream_vmax = _stream_vmax(
-            stream, main_vmax_mps, ramp_vmax_mps,
-            aux_vmax_mps=aux_vmax_mps, lane_id=lane_id,
-        )
-        v_des = d_to_merge / time_to_target
-        set_speed_mps[veh_id] = max(0.0, min(v_des, stream_vmax))
+    table = as_vehicle_table(control_zone_state)
+    if vehicle_types is None:
+        veh_ids = list(plan.order)
+    else:
+        veh_ids = [
+            veh_id for veh_id in plan.order
+            if vehicle_types.get(veh_id, VEH_TYPE_HDV) == VEH_TYPE_CAV
+        ]
+    set_speed_mps = plan_speed_targets(
+        sim_time_s=sim_time_s,
+        step_length_s=step_length_s,
+        table=table,
+        veh_ids=veh_ids,
+        target_cross_time_s=plan.target_cross_time_s,
+        main_vmax_mps=main_vmax_mps,
+        ramp_vmax_mps=ramp_vmax_mps,
+        aux_vmax_mps=aux_vmax_mps,
+    )
     return ControlCommand(set_speed_mps=set_speed_mps)
-
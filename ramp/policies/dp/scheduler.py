@@ -1,34 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from typing import Any
 
-from ramp.runtime.types import Plan
-from ramp.scheduler.arrival_time import minimum_arrival_time_at_on_ramp
-from ramp.scheduler.dp import dp_schedule
-
+import numpy as np
 
-def _stream_vmax(
-    stream: str,
-    main_vmax_mps: float,
-    ramp_vmax_mps: float,
-    *,
-    aux_vmax_mps: float | None = None,
-    lane_id: str = '',
-) -> float:
-    if stream == 'main':
-        return main_vmax_mps
-    if stream == 'ramp':
-        if aux_vmax_mps is not None and lane_id.startswith('main_h3_'):
-            return aux_vmax_mps
-        return ramp_vmax_mps
-    return max(main_vmax_mps, ramp_vmax_mps)
+from ramp.runtime.step_profiler import STAGE_DP, STAGE_ZONE_B, StepProfiler
+from ramp.runtime.types import Plan
+from ramp.runtime.vehicle_registry import VehicleRegistry, lookup_max_accel
+from ramp.runtime.vehicle_table import STREAM_MAIN, STREAM_RAMP, as_vehicle_table
+from ramp.runtime.vmax import stream_vmax_rows
+from ramp.scheduler.arrival_time import minimum_arrival_times_at_on_ramp
+from ramp.scheduler.dp import ScheduleResult, dp_schedule
+from ramp.scheduler.dp_array import (
+    DP_ENGINE_ARRAY,
+    DP_ENGINE_REFERENCE,
+    DP_ENGINES,
+    ArrayDPScheduler,
+)
+from ramp.scheduler.replan_trigger import (
+    DEFAULT_ETA_DRIFT_S,
+    REPLAN_TRIGGER_TIMER,
+    PlanProjector,
+    ReplanTrigger,
+)
 
 
 def _compute_plan_once(
     *,
     sim_time_s: float,
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     crossed_merge: set[str],
     entry_info: dict[str, dict[str, float | str]],
     traci: Any,
@@ -37,52 +40,45 @@ def _compute_plan_once(
     main_vmax_mps: float,
     ramp_vmax_mps: float,
     aux_vmax_mps: float | None = None,
+    schedule: Callable[..., ScheduleResult] = dp_schedule,
+    vehicle_registry: VehicleRegistry | None = None,
 ) -> Plan:
+    table = as_vehicle_table(control_zone_state)
     dp_candidates = [veh_id for veh_id in control_zone_state if veh_id not in crossed_merge]
+    stream_by_id = {veh_id: table.stream_code[table.row(veh_id)] for veh_id in dp_candidates}
     main_seq = sorted(
-        [
-            veh_id
-            for veh_id in dp_candidates
-            if str(control_zone_state[veh_id]['stream']) == 'main'
-        ],
+        [veh_id for veh_id in dp_candidates if stream_by_id[veh_id] == STREAM_MAIN],
         key=lambda vehicle_id: (
             float(entry_info[vehicle_id]['t_entry']),
             vehicle_id,
         ),
     )
     ramp_seq = sorted(
-        [
-            veh_id
-            for veh_id in dp_candidates
-            if str(control_zone_state[veh_id]['stream']) == 'ramp'
-        ],
+        [veh_id for veh_id in dp_candidates if stream_by_id[veh_id] == STREAM_RAMP],
         key=lambda vehicle_id: (
             float(entry_info[vehicle_id]['t_entry']),
             vehicle_id,
         ),
     )
 
-    t_min_s: dict[str, float] = {}
-    for veh_id in main_seq + ramp_seq:
-        vehicle_state = control_zone_state[veh_id]
-        stream = str(vehicle_state['stream'])
-        d_to_merge = float(vehicle_state['d_to_merge'])
-        speed = float(vehicle_state['speed'])
-        accel = float(traci.vehicle.getAccel(veh_id))
-        lane_id = str(vehicle_state.get('lane_id', ''))
-        stream_vmax = _stream_vmax(
-            stream, main_vmax_mps, ramp_vmax_mps,
-            aux_vmax_mps=aux_vmax_mps, lane_id=lane_id,
-        )
-        t_min_s[veh_id] = minimum_arrival_time_at_on_ramp(
-            t_now_s=sim_time_s,
-            distance_m=d_to_merge,
-            speed_mps=speed,
-            a_max_mps2=accel,
-            v_max_mps=stream_vmax,
-        )
+    scheduled = main_seq + ramp_seq
+    rows = table.rows(scheduled)
+    t_min = minimum_arrival_times_at_on_ramp(
+        t_now_s=sim_time_s,
+        distance_m=table.d_to_merge[rows],
+        speed_mps=table.speed[rows],
+        a_max_mps2=np.fromiter(
+            (lookup_max_accel(veh_id, traci, vehicle_registry) for veh_id in scheduled),
+            dtype=np.float64,
+            count=len(scheduled),
+        ),
+        v_max_mps=stream_vmax_rows(
+            table, rows, main_vmax_mps, ramp_vmax_mps, aux_vmax_mps=aux_vmax_mps,
+        ),
+    )
+    t_min_s: dict[str, float] = dict(zip(scheduled, t_min.tolist()))
 
-    dp_result = dp_schedule(
+    dp_result = schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         t_min_s=t_min_s,
@@ -107,36 +103,67 @@ class DPScheduler:
     ramp_vmax_mps: float
     replan_interval_s: float = 0.5
     aux_vmax_mps: float | None = None
-    _last_replan_time_s: float | None = None
+    engine: str = DP_ENGINE_REFERENCE
+    # 'timer': replan every replan_interval_s; 'event': replan on entries,
+    # crossings and ETA drift, with replan_interval_s as the upper bound.
+    replan_trigger: str = REPLAN_TRIGGER_TIMER
+    replan_eta_drift_s: float = DEFAULT_ETA_DRIFT_S
+    # Caches each vehicle's max acceleration; without it getAccel is queried
+    # on every replan.
+    vehicle_registry: VehicleRegistry | None = None
+    _trigger: ReplanTrigger | None = None
+    _projector: PlanProjector = field(default_factory=lambda: PlanProjector(policy_name='dp'))
     _cached_plan: Plan | None = None
+    _array_engine: ArrayDPScheduler | None = None
     replanned_last_call: bool = False
+    replan_count: int = 0
+    # Wall-clock seconds spent in each replan.
+    replan_latency_s: list[float] = field(default_factory=list)
+    # Set by the runner when --profile-steps is on; laps zone_b / dp.
+    profiler: StepProfiler | None = None
+
+    def __post_init__(self) -> None:
+        if self.engine not in DP_ENGINES:
+            raise ValueError(f'Unsupported dp engine: {self.engine}')
+        if self._trigger is None:
+            self._trigger = ReplanTrigger(
+                mode=self.replan_trigger,
+                interval_s=self.replan_interval_s,
+                eta_drift_s=self.replan_eta_drift_s,
+            )
+
+    @property
+    def replan_reasons(self) -> dict[str, int]:
+        return dict(self._trigger.reason_counts)
+
+    def _schedule_fn(self) -> Callable[..., ScheduleResult]:
+        if self.engine != DP_ENGINE_ARRAY:
+            return dp_schedule
+        # One engine per scheduler so consecutive replans reuse its tables.
+        if self._array_engine is None:
+            self._array_engine = ArrayDPScheduler()
+        return self._array_engine.schedule
 
     def compute_plan(
         self,
         *,
         sim_time_s: float,
-        control_zone_state: dict[str, dict[str, float | str]],
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
         crossed_merge: set[str],
         entry_info: dict[str, dict[str, float | str]],
         traci: Any,
     ) -> Plan:
         self.replanned_last_call = False
-        if self.replan_interval_s <= 0:
-            self._cached_plan = _compute_plan_once(
-                sim_time_s=sim_time_s,
-                control_zone_state=control_zone_state,
-                crossed_merge=crossed_merge,
-                entry_info=entry_info,
-                traci=traci,
-                delta_1_s=self.delta_1_s,
-                delta_2_s=self.delta_2_s,
-                main_vmax_mps=self.main_vmax_mps,
-                ramp_vmax_mps=self.ramp_vmax_mps,
-                aux_vmax_mps=self.aux_vmax_mps,
-            )
-            self._last_replan_time_s = sim_time_s
-            self.replanned_last_call = True
-        elif self._cached_plan is None or self._last_replan_time_s is None:
+        reason = self._trigger.check(
+            sim_time_s=sim_time_s,
+            control_zone_state=control_zone_state,
+            crossed_merge=crossed_merge,
+            has_plan=self._cached_plan is not None,
+        )
+        if reason is not None:
+            if self.profiler is not None:
+                self.profiler.lap(STAGE_ZONE_B)
+            replan_start_s = time.perf_counter()
             self._cached_plan = _compute_plan_once(
                 sim_time_s=sim_time_s,
                 control_zone_state=control_zone_state,
@@ -148,53 +175,24 @@ class DPScheduler:
                 main_vmax_mps=self.main_vmax_mps,
                 ramp_vmax_mps=self.ramp_vmax_mps,
                 aux_vmax_mps=self.aux_vmax_mps,
+                schedule=self._schedule_fn(),
+                vehicle_registry=self.vehicle_registry,
             )
-            self._last_replan_time_s = sim_time_s
-            self.replanned_last_call = True
-        elif sim_time_s - self._last_replan_time_s >= self.replan_interval_s - 1e-9:
-            self._cached_plan = _compute_plan_once(
+            self.replan_latency_s.append(time.perf_counter() - replan_start_s)
+            if self.profiler is not None:
+                self.profiler.lap(STAGE_DP)
+            self._trigger.mark_replanned(
                 sim_time_s=sim_time_s,
                 control_zone_state=control_zone_state,
                 crossed_merge=crossed_merge,
-                entry_info=entry_info,
-                traci=traci,
-                delta_1_s=self.delta_1_s,
-                delta_2_s=self.delta_2_s,
-                main_vmax_mps=self.main_vmax_mps,
-                ramp_vmax_mps=self.ramp_vmax_mps,
-                aux_vmax_mps=self.aux_vmax_mps,
+                reason=reason,
             )
-            self._last_replan_time_s = sim_time_s
             self.replanned_last_call = True
+            self.replan_count += 1
 
-        return self._project_cached_plan(
+        return self._projector.project(
+            cached_plan=self._cached_plan,
             sim_time_s=sim_time_s,
             control_zone_state=control_zone_state,
             crossed_merge=crossed_merge,
         )
-
-    def _project_cached_plan(
-        self,
-        *,
-        sim_time_s: float,
-        control_zone_state: dict[str, dict[str, float | str]],
-        crossed_merge: set[str],
-    ) -> Plan:
-        if self._cached_plan is None:
-            return Plan(plan_time_s=sim_time_s, policy_name='dp')
-
-        active_ids = {
-            veh_id for veh_id in control_zone_state if veh_id not in crossed_merge
-        }
-        order = [veh_id for veh_id in self._cached_plan.order if veh_id in active_ids]
-        target_cross_time_s = {
-            veh_id: self._cached_plan.target_cross_time_s[veh_id] for veh_id in order
-        }
-        eta_s = {veh_id: self._cached_plan.eta_s[veh_id] for veh_id in order}
-        return Plan(
-            plan_time_s=self._cached_plan.plan_time_s,
-            policy_name='dp',
-            order=order,
-            target_cross_time_s=target_cross_time_s,
-            eta_s=eta_s,
-        )
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+
 from ramp.runtime.types import Plan
 
 
 def compute_plan(
     *,
     sim_time_s: float,
-    control_zone_state: dict[str, dict[str, float | str]],
-    entry_order: list[str],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
+    entry_order: Iterable[str],
     crossed_merge: set[str],
-    fifo_target_time: dict[str, float],
-    fifo_natural_eta: dict[str, float],
+    fifo_target_time: Mapping[str, float],
+    fifo_natural_eta: Mapping[str, float],
 ) -> Plan:
+    """FIFO plan over *entry_order*, the collector's queue of admitted vehicles.
+
+    The queue only holds vehicles that have not crossed or left, so this walks
+    the control-zone population rather than every vehicle seen so far.
+    """
     order = [
         veh_id
         for veh_id in entry_order
@@ -1,5 +1,6 @@
 from .command_builder import build_command as build_hierarchical_command
 from .merge_point import (
+    Lane1Index,
     MergeEvalResult,
     MergePointManager,
     MergePointParams,
@@ -7,6 +8,7 @@ from .merge_point import (
     VehicleState,
     evaluate_merge_point,
 )
+from .perception import LanePerception, LaneSnapshot
 from .scheduler import HierarchicalScheduler
 from .state_collector_ext import HierarchicalStateCollector, HierarchicalState, ZoneAInfo
 
@@ -14,6 +16,9 @@ __all__ = [
     'HierarchicalStateCollector',
     'HierarchicalState',
     'HierarchicalScheduler',
+    'Lane1Index',
+    'LanePerception',
+    'LaneSnapshot',
     'MergeEvalResult',
     'MergePointManager',
     'MergePointParams',
@@ -1,23 +1,10 @@
 from __future__ import annotations
 
-from ramp.runtime.types import ControlCommand, Plan
-
+from collections.abc import Mapping
 
-def _stream_vmax(
-    stream: str,
-    main_vmax_mps: float,
-    ramp_vmax_mps: float,
-    *,
-    aux_vmax_mps: float | None = None,
-    lane_id: str = '',
-) -> float:
-    if stream == 'main':
-        return main_vmax_mps
-    if stream == 'ramp':
-        if aux_vmax_mps is not None and lane_id.startswith('main_h3_'):
-            return aux_vmax_mps
-        return ramp_vmax_mps
-    return max(main_vmax_mps, ramp_vmax_mps)
+from ramp.policies.speed_command import plan_speed_targets
+from ramp.runtime.types import ControlCommand, Plan
+from ramp.runtime.vehicle_table import as_vehicle_table
 
 
 def build_command(
@@ -25,7 +12,7 @@ def build_command(
     sim_time_s: float,
     step_length_s: float,
     plan: Plan,
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     vehicle_types: dict[str, str],
     main_vmax_mps: float,
     ramp_vmax_mps: float,
@@ -35,29 +22,19 @@ def build_command(
     zone_c_speed_overrides: dict[str, float] | None = None,
     zone_c_coop_overrides: dict[str, float] | None = None,
 ) -> ControlCommand:
-    set_speed_mps: dict[str, float] = {}
-    for veh_id in plan.order:
-        raw_type = vehicle_types.get(veh_id, 'hdv')
-        veh_type = raw_type if raw_type in ('cav', 'hdv') else 'hdv'
-        if veh_type != 'cav':
-            continue
-
-        vehicle_state = control_zone_state[veh_id]
-        stream = str(vehicle_state['stream'])
-        lane_id = str(vehicle_state.get('lane_id', ''))
-        d_to_merge = float(vehicle_state['d_to_merge'])
-        target_cross_time = float(plan.target_cross_time_s[veh_id])
-        time_to_target = max(target_cross_time - sim_time_s, step_length_s)
-        stream_vmax = _stream_vmax(
-            stream, main_vmax_mps, ramp_vmax_mps,
-            aux_vmax_mps=aux_vmax_mps, lane_id=lane_id,
-        )
-
-        if zone_c_speed_overrides and veh_id in zone_c_speed_overrides:
-            v_des = zone_c_speed_overrides[veh_id]
-        else:
-            v_des = d_to_merge / time_to_target
-        set_speed_mps[veh_id] = max(0.0, min(v_des, stream_vmax))
+    table = as_vehicle_table(control_zone_state)
+    cav_ids = [veh_id for veh_id in plan.order if vehicle_types.get(veh_id, 'hdv') == 'cav']
+    set_speed_mps = plan_speed_targets(
+        sim_time_s=sim_time_s,
+        step_length_s=step_length_s,
+        table=table,
+        veh_ids=cav_ids,
+        target_cross_time_s=plan.target_cross_time_s,
+        main_vmax_mps=main_vmax_mps,
+        ramp_vmax_mps=ramp_vmax_mps,
+        aux_vmax_mps=aux_vmax_mps,
+        v_des_overrides=zone_c_speed_overrides,
+    )
 
     if zone_c_coop_overrides:
         for veh_id, coop_speed in zone_c_coop_overrides.items():
@@ -8,6 +8,17 @@ Mathematical model based on the time-space gap evaluation (Eq.1-6):
 
 Search strategy: forward scan from CAV position, earliest feasible gap wins.
 Fallback: forced merge when CAV position >= lane_length - fallback_buffer.
+
+``MergePointManager.update`` builds one ``Lane1Index`` per step and answers
+every tracker's gap query against it (long forward scans are vectorised).
+With ``incremental_index=True`` the index re-sorts from the previous step's
+order instead of from scratch.
+
+Events and merge history live in fixed-capacity ``RingLog`` buffers, and
+trackers of vehicles gone from Zone C are evicted, so a manager's memory does
+not grow with run length.  Per-event log records are emitted at DEBUG level
+only when enabled, carry the event dict as ``record.merge_event`` and are
+formatted lazily.
 """
 
 from __future__ import annotations
@@ -18,11 +29,19 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from ramp.common.ring_buffer import RingLog
+
 if TYPE_CHECKING:
     from ramp.runtime.types import MergeContract
 
 logger = logging.getLogger(__name__)
 
+# Forward scans covering at least this many gaps evaluate Eq.1-4 for all of
+# them with NumPy; shorter scans stay in the Python loop (lower overhead).
+_VECTOR_SCAN_MIN_GAPS = 16
+
 
 # ---------------------------------------------------------------------------
 # Data structures
@@ -69,6 +88,101 @@ class VehicleState:
     speed_mps: float
 
 
+Lane1Vehicle = tuple[str, float, float]
+
+
+class Lane1Index:
+    """Lane-1 vehicles sorted by position, shared by all gap queries of a step.
+
+    The order equals ``sorted(lane1_vehicles, key=lane_pos)`` (ties keep input
+    order).  With ``incremental`` the sort is seeded with the previous step's
+    order, which Timsort finishes in near-linear time when few vehicles swap.
+    Position/speed arrays for vectorised scans are built on first use.
+    """
+
+    __slots__ = (
+        'vehicles', 'sorted_vehicles', 'positions', 'by_id', 'incremental',
+        '_order_ids', '_pos_array', '_speed_array',
+    )
+
+    def __init__(self, *, incremental: bool = True) -> None:
+        self.incremental = incremental
+        self.vehicles: list[Lane1Vehicle] = []
+        self.sorted_vehicles: list[Lane1Vehicle] = []
+        self.positions: list[float] = []
+        self.by_id: dict[str, Lane1Vehicle] = {}
+        self._order_ids: list[str] = []
+        self._pos_array: np.ndarray | None = None
+        self._speed_array: np.ndarray | None = None
+
+    @classmethod
+    def build(cls, lane1_vehicles: list[Lane1Vehicle]) -> Lane1Index:
+        index = cls(incremental=False)
+        index.rebuild(lane1_vehicles)
+        return index
+
+    def rebuild(self, lane1_vehicles: list[Lane1Vehicle]) -> None:
+        self.vehicles = lane1_vehicles
+        self.by_id = {v[0]: v for v in lane1_vehicles}
+        if self.incremental and self._order_ids and len(self.by_id) == len(lane1_vehicles):
+            input_index = {v[0]: i for i, v in enumerate(lane1_vehicles)}
+            order = [input_index[vid] for vid in self._order_ids if vid in input_index]
+            if len(order) < len(lane1_vehicles):
+                seen = set(order)
+                order.extend(i for i in range(len(lane1_vehicles)) if i not in seen)
+            # (position, input index) reproduces the stable sort's tie order.
+            order.sort(key=lambda i: (lane1_vehicles[i][1], i))
+            self.sorted_vehicles = [lane1_vehicles[i] for i in order]
+        else:
+            self.sorted_vehicles = sorted(lane1_vehicles, key=lambda x: x[1])
+        self.positions = [v[1] for v in self.sorted_vehicles]
+        self._pos_array = None
+        self._speed_array = None
+        if self.incremental:
+            self._order_ids = [v[0] for v in self.sorted_vehicles]
+
+    def __len__(self) -> int:
+        return len(self.sorted_vehicles)
+
+    def scan_gaps(
+        self, cav_pos_m: float, cav_speed_mps: float, start: int, params: MergePointParams,
+    ) -> tuple[int | None, int]:
+        """Vectorised forward scan over gaps ``start..len``.
+
+        Returns (first feasible gap index or None, first gap index with the
+        largest safety margin).  Eq.1-4 are evaluated with the same operation
+        order as ``_evaluate_gap_detail``, so margins are bit-identical.
+        """
+        if self._pos_array is None:
+            self._pos_array = np.asarray(self.positions, dtype=np.float64)
+            self._speed_array = np.asarray([v[2] for v in self.sorted_vehicles], dtype=np.float64)
+        pos = self._pos_array
+        speed = self._speed_array
+        k = pos.size
+        gap_count = k + 1 - start
+
+        # Gap g has lead g (none for g == k) and follower g - 1 (none for g == 0).
+        margin_f = np.full(gap_count, np.inf)
+        lead_pos = pos[start:]
+        lead_speed = speed[start:]
+        g_f = (lead_pos - cav_pos_m - params.L_veh_m) + (lead_speed - cav_speed_mps) * params.t_lc_s
+        margin_f[:k - start] = g_f - (params.phi_s * lead_speed + params.s0_m)
+
+        margin_r = np.full(gap_count, np.inf)
+        follow_pos = pos[max(start - 1, 0):]
+        follow_speed = speed[max(start - 1, 0):]
+        g_r = (
+            (cav_pos_m - follow_pos - params.L_veh_m)
+            + (cav_speed_mps - follow_speed) * params.t_lc_s
+        )
+        margin_r[gap_count - g_r.size:] = g_r - (params.phi_s * cav_speed_mps + params.s0_m)
+
+        feasible = np.flatnonzero((margin_f >= 0.0) & (margin_r >= 0.0))
+        first_feasible = start + int(feasible[0]) if feasible.size else None
+        best_reject = start + int(np.argmax(np.minimum(margin_f, margin_r)))
+        return first_feasible, best_reject
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -76,6 +190,7 @@ class VehicleState:
 @dataclass
 class _MergeTracker:
     state: MergeState = field(default=MergeState.APPROACHING)
+    last_seen_s: float = 0.0
     merge_start_time_s: float | None = None
     merge_start_pos_m: float | None = None
     failure_count: int = 0
@@ -191,7 +306,16 @@ def evaluate_merge_point(
     """
     if params is None:
         params = MergePointParams()
+    return _evaluate_indexed(cav_pos_m, cav_speed_mps, Lane1Index.build(lane1_vehicles), params)
 
+
+def _evaluate_indexed(
+    cav_pos_m: float,
+    cav_speed_mps: float,
+    lane1: Lane1Index,
+    params: MergePointParams,
+) -> MergeEvalResult:
+    """``evaluate_merge_point`` against a prebuilt lane-1 index."""
     fallback_pos = params.lane0_length_m - params.fallback_buffer_m
     merge_pos = cav_pos_m + cav_speed_mps * params.t_lc_s
 
@@ -204,18 +328,39 @@ def evaluate_merge_point(
         )
 
     # ---- Empty L1: always feasible ----
-    if not lane1_vehicles:
+    if not lane1.sorted_vehicles:
         return MergeEvalResult(
             feasible=True,
             merge_position_m=merge_pos,
         )
 
     # ---- Forward scan across gaps ----
-    sorted_vehs = sorted(lane1_vehicles, key=lambda x: x[1])
-    positions = [v[1] for v in sorted_vehs]
-    j = bisect.bisect_right(positions, cav_pos_m)
+    sorted_vehs = lane1.sorted_vehicles
+    j = bisect.bisect_right(lane1.positions, cav_pos_m)
     k = len(sorted_vehs)
 
+    if k + 1 - j >= _VECTOR_SCAN_MIN_GAPS:
+        feasible_idx, reject_idx = lane1.scan_gaps(cav_pos_m, cav_speed_mps, j, params)
+        gap_idx = feasible_idx if feasible_idx is not None else reject_idx
+        detail = _evaluate_gap_detail(
+            cav_pos_m, cav_speed_mps,
+            sorted_vehs[gap_idx] if gap_idx < k else None,
+            sorted_vehs[gap_idx - 1] if gap_idx > 0 else None,
+            params,
+        )
+        if feasible_idx is None:
+            return MergeEvalResult(feasible=False, reject_detail=detail)
+        return MergeEvalResult(
+            feasible=True,
+            merge_position_m=merge_pos,
+            gap_front_m=detail.g_f,
+            gap_rear_m=detail.g_r,
+            lead_id=detail.lead_id,
+            follow_id=detail.follow_id,
+            is_fallback=False,
+            safety_margin=detail.safety_margin,
+        )
+
     best_reject: _GapDetail | None = None
     for gap_idx in range(j, k + 1):
         follow = sorted_vehs[gap_idx - 1] if gap_idx > 0 else None
@@ -247,7 +392,7 @@ def _evaluate_contract_gap(
     cav_pos_m: float,
     cav_speed_mps: float,
     contract: MergeContract,
-    lane1_vehicles: list[tuple[str, float, float]],
+    lane1_vehicles: list[tuple[str, float, float]] | Lane1Index,
     params: MergePointParams,
 ) -> MergeEvalResult:
     """Evaluate only the gap specified by the contract's predecessor/follower.
@@ -256,6 +401,10 @@ def _evaluate_contract_gap(
     predecessor and follower on lane 1 and evaluates that single gap.
     Falls back to standard evaluate_merge_point if neither partner is found.
     """
+    lane1 = (
+        lane1_vehicles if isinstance(lane1_vehicles, Lane1Index)
+        else Lane1Index.build(lane1_vehicles)
+    )
     fallback_pos = params.lane0_length_m - params.fallback_buffer_m
     merge_pos = cav_pos_m + cav_speed_mps * params.t_lc_s
 
@@ -266,25 +415,16 @@ def _evaluate_contract_gap(
             is_fallback=True,
         )
 
-    lane1_by_id: dict[str, tuple[str, float, float]] = {
-        v[0]: v for v in lane1_vehicles
-    }
-
     lead: tuple[str, float, float] | None = None
     follow: tuple[str, float, float] | None = None
 
     if contract.target_predecessor_id is not None:
-        lead = lane1_by_id.get(contract.target_predecessor_id)
+        lead = lane1.by_id.get(contract.target_predecessor_id)
     if contract.target_follower_id is not None:
-        follow = lane1_by_id.get(contract.target_follower_id)
+        follow = lane1.by_id.get(contract.target_follower_id)
 
     if lead is None and follow is None:
-        return evaluate_merge_point(
-            cav_pos_m=cav_pos_m,
-            cav_speed_mps=cav_speed_mps,
-            lane1_vehicles=lane1_vehicles,
-            params=params,
-        )
+        return _evaluate_indexed(cav_pos_m, cav_speed_mps, lane1, params)
 
     detail = _evaluate_gap_detail(cav_pos_m, cav_speed_mps, lead, follow, params)
     if detail.feasible:
@@ -321,13 +461,31 @@ class MergePointManager:
     """
 
     EMERGENCY_BUFFER_M = 10.0
+    EVENT_LOG_CAPACITY = 4096
+    HISTORY_CAPACITY = 1024
+    TRACKER_TTL_S = 30.0
 
-    def __init__(self, params: MergePointParams | None = None):
+    def __init__(
+        self,
+        params: MergePointParams | None = None,
+        *,
+        incremental_index: bool = False,
+        event_log_capacity: int = EVENT_LOG_CAPACITY,
+        history_capacity: int = HISTORY_CAPACITY,
+        tracker_ttl_s: float = TRACKER_TTL_S,
+    ):
         self.params = params or MergePointParams()
         self._trackers: dict[str, _MergeTracker] = {}
-        self.merge_history: list[dict[str, object]] = []
-        self.merge_event_log: list[dict[str, object]] = []
+        self._lane1_index = Lane1Index(incremental=incremental_index)
+        self.merge_history: RingLog[dict[str, object]] = RingLog(history_capacity)
+        self.merge_event_log: RingLog[dict[str, object]] = RingLog(event_log_capacity)
         self._event_cursor: int = 0
+        self.events_missed: int = 0
+        # Trackers of vehicles not reported for this long are dropped; main_h3
+        # is left for good once a vehicle is past it.
+        self.tracker_ttl_s = tracker_ttl_s
+        self._next_eviction_s = tracker_ttl_s
+        self._debug_records = False
 
     @property
     def vehicle_states(self) -> dict[str, MergeState]:
@@ -338,9 +496,14 @@ class MergePointManager:
         return self._trackers.get(veh_id)
 
     def consume_events_since_cursor(self) -> list[dict[str, object]]:
-        """Return events appended since the last consumption, advance cursor."""
-        new_events = self.merge_event_log[self._event_cursor:]
-        self._event_cursor = len(self.merge_event_log)
+        """Return events appended since the last consumption, advance cursor.
+
+        If more than ``event_log_capacity`` events were emitted in between,
+        the oldest are gone; their number is added to ``events_missed``.
+        """
+        new_events, missed = self.merge_event_log.since(self._event_cursor)
+        self._event_cursor = self.merge_event_log.next_seq
+        self.events_missed += missed
         return new_events
 
     def _emit(self, event_type: str, veh_id: str, sim_time_s: float, **kwargs):
@@ -351,6 +514,17 @@ class MergePointManager:
         }
         entry.update(kwargs)
         self.merge_event_log.append(entry)
+        if self._debug_records:
+            logger.debug('[MergePoint] %s', _LazyEvent(entry), extra={'merge_event': entry})
+
+    def _evict_stale_trackers(self, sim_time_s: float) -> None:
+        if sim_time_s < self._next_eviction_s:
+            return
+        self._next_eviction_s = sim_time_s + self.tracker_ttl_s
+        horizon = sim_time_s - self.tracker_ttl_s
+        stale = [vid for vid, t in self._trackers.items() if t.last_seen_s < horizon]
+        for vid in stale:
+            del self._trackers[vid]
 
     def update(
         self,
@@ -370,6 +544,8 @@ class MergePointManager:
         """
         actions: dict[str, tuple[int, float]] = {}
         emergency_pos = self.params.lane0_length_m - self.EMERGENCY_BUFFER_M
+        lane1_index: Lane1Index | None = None  # built on the first gap query
+        self._debug_records = logger.isEnabledFor(logging.DEBUG)
 
         sorted_cavs = sorted(
             cav_states.items(),
@@ -386,6 +562,7 @@ class MergePointManager:
                     continue
                 tracker = _MergeTracker()
                 self._trackers[veh_id] = tracker
+            tracker.last_seen_s = sim_time_s
 
             # Emergency: force merge near edge end to prevent teleportation
             if (
@@ -415,10 +592,6 @@ class MergePointManager:
                         'merge_search_start', veh_id, sim_time_s,
                         pos_m=vs.lane_pos_m, speed_mps=vs.speed_mps,
                     )
-                    logger.info(
-                        '[MergePoint] %s APPROACHING->SEARCHING pos=%.1fm speed=%.1fm/s',
-                        veh_id, vs.lane_pos_m, vs.speed_mps,
-                    )
 
             # Phase 2: MERGING -> completion / timeout
             if tracker.state == MergeState.MERGING:
@@ -431,10 +604,6 @@ class MergePointManager:
                         planned_follow_id=tracker.planned_follow_id,
                         is_fallback=tracker.last_eval.is_fallback if tracker.last_eval else False,
                     )
-                    logger.info(
-                        '[MergePoint] %s MERGED at t=%.1fs pos=%.1fm',
-                        veh_id, sim_time_s, vs.lane_pos_m,
-                    )
                     last_eval = tracker.last_eval
                     self.merge_history.append({
                         'veh_id': veh_id,
@@ -476,21 +645,21 @@ class MergePointManager:
 
             # Phase 3: SEARCHING -> evaluate gap -> potentially MERGING
             if tracker.state == MergeState.SEARCHING:
+                if lane1_index is None:
+                    lane1_index = self._lane1_index
+                    lane1_index.rebuild(lane1_vehicles)
                 contract = contracts.get(veh_id) if contracts else None
                 if contract is not None:
                     result = _evaluate_contract_gap(
                         cav_pos_m=vs.lane_pos_m,
                         cav_speed_mps=vs.speed_mps,
                         contract=contract,
-                        lane1_vehicles=lane1_vehicles,
+                        lane1_vehicles=lane1_index,
                         params=self.params,
                     )
                 else:
-                    result = evaluate_merge_point(
-                        cav_pos_m=vs.lane_pos_m,
-                        cav_speed_mps=vs.speed_mps,
-                        lane1_vehicles=lane1_vehicles,
-                        params=self.params,
+                    result = _evaluate_indexed(
+                        vs.lane_pos_m, vs.speed_mps, lane1_index, self.params,
                     )
                 tracker.last_eval = result
                 if result.feasible:
@@ -511,15 +680,6 @@ class MergePointManager:
                         follow_id=result.follow_id,
                         is_fallback=result.is_fallback,
                     )
-                    logger.info(
-                        '[MergePoint] %s SEARCHING->MERGING feasible gap_f=%.1f gap_r=%.1f '
-                        'margin=%.1f fallback=%s pos=%.1fm',
-                        veh_id,
-                        result.gap_front_m if result.gap_front_m is not None else -1,
-                        result.gap_rear_m if result.gap_rear_m is not None else -1,
-                        result.safety_margin if result.safety_margin is not None else -1,
-                        result.is_fallback, vs.lane_pos_m,
-                    )
                 else:
                     reject_info: dict[str, object] = {
                         'pos_m': vs.lane_pos_m,
@@ -540,4 +700,22 @@ class MergePointManager:
                         })
                     self._emit('gap_reject', veh_id, sim_time_s, **reject_info)
 
+        self._evict_stale_trackers(sim_time_s)
         return actions
+
+
+class _LazyEvent:
+    """Formats a merge event only if a handler actually emits the record."""
+
+    __slots__ = ('entry',)
+
+    def __init__(self, entry: dict[str, object]):
+        self.entry = entry
+
+    def __str__(self) -> str:
+        fields = ' '.join(
+            f'{key}={value:.2f}' if isinstance(value, float) else f'{key}={value}'
+            for key, value in self.entry.items()
+            if key not in ('event_type', 'veh_id')
+        )
+        return f"{self.entry['veh_id']} {self.entry['event_type']} {fields}"
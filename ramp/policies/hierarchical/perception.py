@@ -0,0 +1,148 @@
+"""One per-step read of the lanes the hierarchical policy looks at.
+
+Zone A needs the ``main_h2`` lanes (densities, mean speeds, gap checks),
+Zone C the ``main_h3`` L0/L1 CAV states and the lane-1 gap list, and the
+controller the vehicles on ``main_h3_0`` for its lane-change lock.  Each of
+them used to query TraCI on its own every step.  ``read_lane_perception``
+reads every lane's vehicle IDs once and each vehicle's position and speed at
+most once — from the step's ``VehicleTable`` when the vehicle is in it,
+otherwise through the collector's vehicle reader (a dict lookup under the
+subscription backend) — and returns frozen snapshots all consumers share.
+
+Static topology (lane count and length of ``main_h2``, which ``main_h3``
+lanes exist) is resolved once into a ``LaneLayout``; a scenario without one
+of these lanes simply gets an empty snapshot instead of a swallowed TraCI
+error.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from ramp.common.vehicle_defs import is_hdv
+from ramp.runtime.subscription import PollingVehicleReader, SubscriptionVehicleReader
+from ramp.runtime.vehicle_table import VehicleTableView
+
+ZONE_A_EDGE = 'main_h2'
+MERGE_LANE_ID = 'main_h3_0'
+TARGET_LANE_ID = 'main_h3_1'
+
+
+@dataclass(slots=True, frozen=True)
+class LaneLayout:
+    zone_a_lane_ids: tuple[str, ...]
+    zone_a_edge_length_m: float
+    has_merge_lane: bool
+    has_target_lane: bool
+
+
+def resolve_lane_layout(traci: Any) -> LaneLayout:
+    """Look up the (static) lanes the perception pass reads."""
+    zone_a_lane_ids: tuple[str, ...] = ()
+    edge_length_m = 0.0
+    if ZONE_A_EDGE in set(traci.edge.getIDList()):
+        lane_count = int(traci.edge.getLaneNumber(ZONE_A_EDGE))
+        if lane_count > 0:
+            zone_a_lane_ids = tuple(f'{ZONE_A_EDGE}_{i}' for i in range(lane_count))
+            edge_length_m = float(traci.lane.getLength(zone_a_lane_ids[0]))
+    lane_ids = set(traci.lane.getIDList())
+    return LaneLayout(
+        zone_a_lane_ids=zone_a_lane_ids,
+        zone_a_edge_length_m=edge_length_m,
+        has_merge_lane=MERGE_LANE_ID in lane_ids,
+        has_target_lane=TARGET_LANE_ID in lane_ids,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class LaneSnapshot:
+    lane_id: str
+    # ``lane.getLastStepVehicleIDs`` order.
+    vehicle_ids: tuple[str, ...]
+    type_ids: tuple[str, ...]
+    # veh_id -> (lane_pos_m, speed_mps) for the vehicles the policy reads:
+    # every vehicle, except on the merge lane where only CAVs are read.
+    kinematics: Mapping[str, tuple[float, float]]
+
+    def vehicles(self) -> list[tuple[str, float, float]]:
+        """``(veh_id, lane_pos_m, speed_mps)`` in lane order."""
+        kinematics = self.kinematics
+        return [
+            (veh_id, *kinematics[veh_id]) for veh_id in self.vehicle_ids if veh_id in kinematics
+        ]
+
+
+_EMPTY_KINEMATICS: Mapping[str, tuple[float, float]] = MappingProxyType({})
+
+
+def _empty_lane(lane_id: str) -> LaneSnapshot:
+    return LaneSnapshot(lane_id=lane_id, vehicle_ids=(), type_ids=(), kinematics=_EMPTY_KINEMATICS)
+
+
+@dataclass(slots=True, frozen=True)
+class LanePerception:
+    """Everything the hierarchical policy reads about the lanes, for one step."""
+
+    sim_time_s: float
+    zone_a_lanes: tuple[LaneSnapshot, ...]
+    zone_a_edge_length_m: float
+    merge_lane: LaneSnapshot
+    target_lane: LaneSnapshot
+
+    def zone_a_lane(self, lane_index: int) -> LaneSnapshot | None:
+        if 0 <= lane_index < len(self.zone_a_lanes):
+            return self.zone_a_lanes[lane_index]
+        return None
+
+
+def read_lane_perception(
+    *,
+    sim_time_s: float,
+    traci: Any,
+    layout: LaneLayout,
+    type_id: Callable[[str], str],
+    reader: PollingVehicleReader | SubscriptionVehicleReader,
+    observed: VehicleTableView | None = None,
+) -> LanePerception:
+    """Read the Zone A / Zone C lanes once for this step.
+
+    *observed* is the step's observation view; vehicles in it take their
+    position and speed from the table instead of another TraCI read.
+    """
+    table = observed.table if observed is not None else None
+
+    def read(lane_id: str, *, cav_only: bool) -> LaneSnapshot:
+        vehicle_ids = tuple(traci.lane.getLastStepVehicleIDs(lane_id))
+        type_ids = tuple(type_id(veh_id) for veh_id in vehicle_ids)
+        kinematics: dict[str, tuple[float, float]] = {}
+        for veh_id, vtype in zip(vehicle_ids, type_ids):
+            if cav_only and is_hdv(vtype):
+                continue
+            if table is not None and veh_id in observed:
+                row = table.row(veh_id)
+                kinematics[veh_id] = (table.lane_pos.item(row), table.speed.item(row))
+            else:
+                kinematics[veh_id] = (reader.lane_pos(veh_id), reader.speed(veh_id))
+        return LaneSnapshot(
+            lane_id=lane_id,
+            vehicle_ids=vehicle_ids,
+            type_ids=type_ids,
+            kinematics=MappingProxyType(kinematics),
+        )
+
+    return LanePerception(
+        sim_time_s=sim_time_s,
+        zone_a_lanes=tuple(read(lane_id, cav_only=False) for lane_id in layout.zone_a_lane_ids),
+        zone_a_edge_length_m=layout.zone_a_edge_length_m,
+        merge_lane=(
+            read(MERGE_LANE_ID, cav_only=True) if layout.has_merge_lane
+            else _empty_lane(MERGE_LANE_ID)
+        ),
+        target_lane=(
+            read(TARGET_LANE_ID, cav_only=False) if layout.has_target_lane
+            else _empty_lane(TARGET_LANE_ID)
+        ),
+    )
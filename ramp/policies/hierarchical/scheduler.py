@@ -1,17 +1,51 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
 from ramp.common.vehicle_defs import is_hdv
 from ramp.policies.hierarchical.merge_point import MergePointManager, MergePointParams, VehicleState
+from ramp.policies.hierarchical.perception import (
+    LaneLayout,
+    LanePerception,
+    read_lane_perception,
+    resolve_lane_layout,
+)
 from ramp.policies.hierarchical.state_collector_ext import ZoneAInfo
 from ramp.policies.hierarchical.zone_a import ZoneAEvacuator
+from ramp.runtime.step_profiler import (
+    STAGE_DP,
+    STAGE_ZONE_A,
+    STAGE_ZONE_B,
+    STAGE_ZONE_C,
+    StepProfiler,
+)
+from ramp.runtime.subscription import PollingVehicleReader
 from ramp.runtime.types import MergeContract, Plan
-from ramp.scheduler.arrival_time import minimum_arrival_time_at_on_ramp
-from ramp.scheduler.dp import dp_schedule
+from ramp.runtime.vehicle_registry import VehicleRegistry, lookup_max_accel, lookup_type_id
+from ramp.runtime.vehicle_table import STREAM_MAIN, STREAM_RAMP, as_vehicle_table
+from ramp.runtime.vmax import stream_vmax_rows
+from ramp.scheduler.arrival_time import minimum_arrival_times_at_on_ramp
+from ramp.scheduler.dp import ScheduleResult, dp_schedule
+from ramp.scheduler.dp_array import (
+    DP_ENGINE_ARRAY,
+    DP_ENGINE_REFERENCE,
+    DP_ENGINES,
+    ArrayDPScheduler,
+)
 from ramp.scheduler.dp_mixed import dp_mixed_schedule
+from ramp.scheduler.dp_mixed_fast import build_mixed_tables, dp_mixed_schedule_tables
+from ramp.scheduler.replan_trigger import (
+    DEFAULT_ETA_DRIFT_S,
+    REPLAN_TRIGGER_TIMER,
+    PlanProjector,
+    ReplanTrigger,
+)
 
 MERGE_POLICY_FIXED = 'fixed'
 MERGE_POLICY_FLEXIBLE = 'flexible'
@@ -21,9 +55,8 @@ logger = logging.getLogger(__name__)
 _HDV_MIN_SPEED_MPS = 0.1
 
 
-def _on_conflict_lane(stream: str, edge_id: str, lane_id: str) -> bool:
+def _on_conflict_lane(stream: str, edge_id: str, lane_index: int) -> bool:
     """DP scheduling only considers vehicles on conflict lanes."""
-    lane_index = int(lane_id.rsplit('_', 1)[-1])
     if stream == 'ramp':
         return edge_id in {'ramp_h6', 'main_h3'} and lane_index in {0, 1}
     if stream == 'main':
@@ -34,27 +67,10 @@ def _on_conflict_lane(stream: str, edge_id: str, lane_id: str) -> bool:
     return False
 
 
-def _stream_vmax(
-    stream: str,
-    main_vmax_mps: float,
-    ramp_vmax_mps: float,
-    *,
-    aux_vmax_mps: float | None = None,
-    lane_id: str = '',
-) -> float:
-    if stream == 'main':
-        return main_vmax_mps
-    if stream == 'ramp':
-        if aux_vmax_mps is not None and lane_id.startswith('main_h3_'):
-            return aux_vmax_mps
-        return ramp_vmax_mps
-    return max(main_vmax_mps, ramp_vmax_mps)
-
-
 def _compute_plan_once(
     *,
     sim_time_s: float,
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     crossed_merge: set[str],
     entry_info: dict[str, dict[str, float | str]],
     vehicle_types: dict[str, str],
@@ -64,76 +80,89 @@ def _compute_plan_once(
     main_vmax_mps: float,
     ramp_vmax_mps: float,
     aux_vmax_mps: float | None = None,
+    cav_schedule: Callable[..., ScheduleResult] | None = None,
+    vehicle_registry: VehicleRegistry | None = None,
 ) -> Plan:
+    table = as_vehicle_table(control_zone_state)
     dp_candidates = [
         veh_id for veh_id in control_zone_state if veh_id not in crossed_merge
     ]
+    row_by_id = {veh_id: table.row(veh_id) for veh_id in dp_candidates}
+
+    veh_type_by_id: dict[str, str] = {
+        veh_id: 'cav' if vehicle_types.get(veh_id, 'hdv') == 'cav' else 'hdv'
+        for veh_id in dp_candidates
+    }
+    cav_ids = [veh_id for veh_id in dp_candidates if veh_type_by_id[veh_id] == 'cav']
+    hdv_ids = [veh_id for veh_id in dp_candidates if veh_type_by_id[veh_id] != 'cav']
+
+    cav_rows = table.rows(cav_ids)
+    t_min_cav = minimum_arrival_times_at_on_ramp(
+        t_now_s=sim_time_s,
+        distance_m=table.d_to_merge[cav_rows],
+        speed_mps=table.speed[cav_rows],
+        a_max_mps2=np.fromiter(
+            (lookup_max_accel(veh_id, traci, vehicle_registry) for veh_id in cav_ids),
+            dtype=np.float64,
+            count=len(cav_ids),
+        ),
+        v_max_mps=stream_vmax_rows(
+            table, cav_rows, main_vmax_mps, ramp_vmax_mps, aux_vmax_mps=aux_vmax_mps,
+        ),
+    )
+    t_min_cav_s: dict[str, float] = dict(zip(cav_ids, t_min_cav.tolist()))
 
-    veh_type_by_id: dict[str, str] = {}
-    t_min_cav_s: dict[str, float] = {}
-    hdv_predicted_time_s: dict[str, float] = {}
-    eta_s: dict[str, float] = {}
+    hdv_rows = table.rows(hdv_ids)
+    hdv_predicted = sim_time_s + table.d_to_merge[hdv_rows] / np.maximum(
+        table.speed[hdv_rows], _HDV_MIN_SPEED_MPS
+    )
+    hdv_predicted_time_s: dict[str, float] = dict(zip(hdv_ids, hdv_predicted.tolist()))
 
-    for veh_id in dp_candidates:
-        vehicle_state = control_zone_state[veh_id]
-        stream = str(vehicle_state['stream'])
-        d_to_merge = float(vehicle_state['d_to_merge'])
-        speed = float(vehicle_state['speed'])
-        lane_id = str(vehicle_state.get('lane_id', ''))
-
-        raw_type = vehicle_types.get(veh_id, 'hdv')
-        vtype = 'cav' if raw_type == 'cav' else 'hdv'
-        veh_type_by_id[veh_id] = vtype
-
-        stream_vmax = _stream_vmax(
-            stream, main_vmax_mps, ramp_vmax_mps,
-            aux_vmax_mps=aux_vmax_mps, lane_id=lane_id,
-        )
-
-        if vtype == 'cav':
-            accel = float(traci.vehicle.getAccel(veh_id))
-            t_min = minimum_arrival_time_at_on_ramp(
-                t_now_s=sim_time_s,
-                distance_m=d_to_merge,
-                speed_mps=speed,
-                a_max_mps2=accel,
-                v_max_mps=stream_vmax,
-            )
-            t_min_cav_s[veh_id] = t_min
-            eta_s[veh_id] = t_min
-        else:
-            effective_speed = max(speed, _HDV_MIN_SPEED_MPS)
-            t_pred = sim_time_s + d_to_merge / effective_speed
-            hdv_predicted_time_s[veh_id] = t_pred
-            eta_s[veh_id] = t_pred
+    eta_s: dict[str, float] = {
+        veh_id: t_min_cav_s[veh_id] if veh_id in t_min_cav_s else hdv_predicted_time_s[veh_id]
+        for veh_id in dp_candidates
+    }
 
     main_seq = sorted(
         [v for v in dp_candidates
-         if str(control_zone_state[v]['stream']) == 'main'
+         if table.stream_code[row_by_id[v]] == STREAM_MAIN
          and _on_conflict_lane('main',
-                               str(control_zone_state[v]['edge_id']),
-                               str(control_zone_state[v]['lane_id']))],
+                               table.edge_id(row_by_id[v]),
+                               table.lane_index(row_by_id[v]))],
         key=lambda v: (eta_s[v], v),
     )
     ramp_seq = sorted(
         [v for v in dp_candidates
-         if str(control_zone_state[v]['stream']) == 'ramp'
+         if table.stream_code[row_by_id[v]] == STREAM_RAMP
          and _on_conflict_lane('ramp',
-                               str(control_zone_state[v]['edge_id']),
-                               str(control_zone_state[v]['lane_id']))],
+                               table.edge_id(row_by_id[v]),
+                               table.lane_index(row_by_id[v]))],
         key=lambda v: (eta_s[v], v),
     )
 
-    dp_result, fallback_occurred = _try_dp_mixed_with_fallback(
-        main_seq=main_seq,
-        ramp_seq=ramp_seq,
-        veh_type_by_id=veh_type_by_id,
-        t_min_cav_s=t_min_cav_s,
-        hdv_predicted_time_s=hdv_predicted_time_s,
-        eta_s=eta_s,
-        delta_1_s=delta_1_s,
-        delta_2_s=delta_2_s,
-    )
+    if cav_schedule is None:
+        dp_result, fallback_occurred = _try_dp_mixed_with_fallback(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            veh_type_by_id=veh_type_by_id,
+            t_min_cav_s=t_min_cav_s,
+            hdv_predicted_time_s=hdv_predicted_time_s,
+            eta_s=eta_s,
+            delta_1_s=delta_1_s,
+            delta_2_s=delta_2_s,
+        )
+    else:
+        dp_result, fallback_occurred = _try_dp_mixed_tables_with_fallback(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            veh_type_by_id=veh_type_by_id,
+            t_min_cav_s=t_min_cav_s,
+            hdv_predicted_time_s=hdv_predicted_time_s,
+            eta_s=eta_s,
+            delta_1_s=delta_1_s,
+            delta_2_s=delta_2_s,
+            cav_schedule=cav_schedule,
+        )
 
     plan_eta: dict[str, float] = {}
     for veh_id in dp_result.passing_order:
@@ -199,6 +228,64 @@ def _try_dp_mixed_with_fallback(
         ), True
 
 
+def _try_dp_mixed_tables_with_fallback(
+    *,
+    main_seq: list[str],
+    ramp_seq: list[str],
+    veh_type_by_id: dict[str, str],
+    t_min_cav_s: dict[str, float],
+    hdv_predicted_time_s: dict[str, float],
+    eta_s: dict[str, float],
+    delta_1_s: float,
+    delta_2_s: float,
+    cav_schedule: Callable[..., ScheduleResult],
+) -> tuple[ScheduleResult, bool]:
+    """Table-based variant of ``_try_dp_mixed_with_fallback``.
+
+    Types and times are resolved once into ``MixedDPTables``; when the HDV
+    constraints are infeasible the all-CAV fallback takes its queues and t_min
+    straight from those tables and runs on ``cav_schedule`` (the scheduler's
+    long-lived array engine).
+    """
+    try:
+        tables = build_mixed_tables(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            veh_type_by_id=veh_type_by_id,
+            t_min_cav_s=t_min_cav_s,
+            hdv_predicted_time_s=hdv_predicted_time_s,
+        )
+    except (ValueError, KeyError) as exc:
+        # Inconsistent inputs: keep the reference fallback path.
+        logger.warning('mixed DP tables failed (%s), using reference fallback', exc)
+        return _try_dp_mixed_with_fallback(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            veh_type_by_id=veh_type_by_id,
+            t_min_cav_s=t_min_cav_s,
+            hdv_predicted_time_s=hdv_predicted_time_s,
+            eta_s=eta_s,
+            delta_1_s=delta_1_s,
+            delta_2_s=delta_2_s,
+        )
+    try:
+        return dp_mixed_schedule_tables(tables, delta_1_s=delta_1_s, delta_2_s=delta_2_s), False
+    except ValueError as exc:
+        logger.warning(
+            'dp_mixed_schedule failed (%s), falling back to CAV-only dp_schedule',
+            exc,
+        )
+    if not tables.cav_main and not tables.cav_ramp:
+        return ScheduleResult([], {}, 0.0, 0.0, 0.0), True
+    return cav_schedule(
+        main_seq=list(tables.cav_main),
+        ramp_seq=list(tables.cav_ramp),
+        t_min_s=tables.cav_t_min_s(),
+        delta_1_s=delta_1_s,
+        delta_2_s=delta_2_s,
+    ), True
+
+
 _GAP_ALIGN_KP = 0.15
 _GAP_ALIGN_TARGET_GAP_M = 15.0
 _GAP_ALIGN_MIN_SPEED_MPS = 3.0
@@ -207,7 +294,7 @@ _GAP_ALIGN_MIN_SPEED_MPS = 3.0
 def _compute_zone_c_speed_overrides(
     *,
     contracts: dict[str, MergeContract],
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     zone_c_lane1_vehicles: list[tuple[str, float, float]] | None,
     ramp_vmax_mps: float,
 ) -> dict[str, float]:
@@ -227,17 +314,17 @@ def _compute_zone_c_speed_overrides(
     for vid, pos, spd in zone_c_lane1_vehicles:
         lane1_lookup[vid] = (pos, spd)
 
+    table = as_vehicle_table(control_zone_state)
     overrides: dict[str, float] = {}
     for veh_id, mc in contracts.items():
-        state = control_zone_state.get(veh_id)
-        if state is None:
+        if veh_id not in control_zone_state:
             continue
-        lane_id = str(state.get('lane_id', ''))
-        if not lane_id.startswith('main_h3_0'):
+        row = table.row(veh_id)
+        if not table.lane_id(row).startswith('main_h3_0'):
             continue
 
-        cav_pos = float(state.get('lane_pos', 0.0))
-        cav_speed = float(state.get('speed', 0.0))
+        cav_pos = table.lane_pos.item(row)
+        cav_speed = table.speed.item(row)
 
         pred_id = mc.target_predecessor_id
         if pred_id is not None and pred_id in lane1_lookup:
@@ -265,7 +352,7 @@ _COOP_DELTA_V_MPS = 1.0
 def _compute_zone_c_coop_overrides(
     *,
     contracts: dict[str, MergeContract],
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     vehicle_types: dict[str, str],
     zone_c_lane1_vehicles: list[tuple[str, float, float]] | None,
     main_vmax_mps: float,
@@ -282,15 +369,15 @@ def _compute_zone_c_coop_overrides(
     for vid, pos, spd in zone_c_lane1_vehicles:
         lane1_lookup[vid] = (pos, spd)
 
+    table = as_vehicle_table(control_zone_state)
     overrides: dict[str, float] = {}
     for _veh_id, mc in contracts.items():
-        ego_state = control_zone_state.get(mc.vehicle_id)
-        if ego_state is None:
+        if mc.vehicle_id not in control_zone_state:
             continue
-        ego_lane_id = str(ego_state.get('lane_id', ''))
-        if not ego_lane_id.startswith('main_h3_0'):
+        ego_row = table.row(mc.vehicle_id)
+        if not table.lane_id(ego_row).startswith('main_h3_0'):
             continue
-        ego_pos = float(ego_state.get('lane_pos', 0.0))
+        ego_pos = table.lane_pos.item(ego_row)
 
         foll_id = mc.target_follower_id
         if foll_id is None:
@@ -318,10 +405,153 @@ def _compute_zone_c_coop_overrides(
     return overrides
 
 
+_MERGE_WINDOW_HALF_S = 3.0
+
+# Per-rank roles in a plan order, see ``_contract_roles``.
+_ROLE_PARTNER = 1
+_ROLE_EGO = 2
+
+
+def _contract_roles(
+    order: tuple[str, ...],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
+    vehicle_types: dict[str, str],
+    lane1_ids: set[str] | frozenset[str],
+) -> bytes:
+    """Role bits for each rank of *order*.
+
+    ``_ROLE_PARTNER``: may be a target predecessor/follower (on lane 1 or on
+    the main stream).  ``_ROLE_EGO``: a ramp CAV that gets a contract.
+    """
+    table = as_vehicle_table(control_zone_state)
+    in_zone = [veh_id for veh_id in order if veh_id in control_zone_state]
+    codes = dict(zip(in_zone, table.stream_code[table.rows(in_zone)].tolist()))
+    roles = bytearray(len(order))
+    for rank, veh_id in enumerate(order):
+        role = _ROLE_PARTNER if veh_id in lane1_ids else 0
+        code = codes.get(veh_id)
+        if code == STREAM_MAIN:
+            role |= _ROLE_PARTNER
+        elif code == STREAM_RAMP and vehicle_types.get(veh_id, 'hdv') == 'cav':
+            role |= _ROLE_EGO
+        roles[rank] = role
+    return bytes(roles)
+
+
+def _link_partners(
+    order: tuple[str, ...], roles: bytes,
+) -> list[tuple[int, str | None, str | None]]:
+    """``(rank, predecessor, follower)`` for every ego rank, in rank order.
+
+    One forward sweep carries the nearest earlier partner, one backward sweep
+    the nearest later one.
+    """
+    predecessor: list[str | None] = [None] * len(order)
+    follower: list[str | None] = [None] * len(order)
+    last: str | None = None
+    for rank, veh_id in enumerate(order):
+        if roles[rank] & _ROLE_EGO:
+            predecessor[rank] = last
+        if roles[rank] & _ROLE_PARTNER:
+            last = veh_id
+    last = None
+    for rank in range(len(order) - 1, -1, -1):
+        if roles[rank] & _ROLE_EGO:
+            follower[rank] = last
+        if roles[rank] & _ROLE_PARTNER:
+            last = order[rank]
+    return [
+        (rank, predecessor[rank], follower[rank])
+        for rank in range(len(order))
+        if roles[rank] & _ROLE_EGO
+    ]
+
+
+@dataclass(slots=True)
+class ContractIndex:
+    """Merge contracts kept between replans.
+
+    ``update`` links every ramp CAV in the plan order to its target
+    predecessor and follower with one forward and one backward sweep.  The
+    links are cached: when a replan yields the same order and the same
+    per-rank roles, the sweeps are skipped.  A contract whose rank, partners,
+    target time and fallback flag are unchanged is returned as the same
+    ``MergeContract`` object, so only vehicles that entered, crossed or had a
+    neighbour change get a new one.
+    """
+
+    _order: tuple[str, ...] = ()
+    _roles: bytes = b''
+    _links: list[tuple[int, str | None, str | None]] = field(default_factory=list)
+    _contracts: dict[str, MergeContract] = field(default_factory=dict)
+    relink_count: int = 0
+    contracts_built: int = 0
+    contracts_reused: int = 0
+
+    def update(
+        self,
+        *,
+        plan: Plan,
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
+        vehicle_types: dict[str, str],
+        zone_c_lane1_vehicles: list[tuple[str, float, float]] | None,
+    ) -> dict[str, MergeContract]:
+        order = tuple(plan.order)
+        lane1_ids = (
+            {vid for vid, _pos, _spd in zone_c_lane1_vehicles}
+            if zone_c_lane1_vehicles else frozenset()
+        )
+        roles = _contract_roles(order, control_zone_state, vehicle_types, lane1_ids)
+        if order != self._order or roles != self._roles:
+            self._links = _link_partners(order, roles)
+            self._order = order
+            self._roles = roles
+            self.relink_count += 1
+
+        target_times = plan.target_cross_time_s
+        previous = self._contracts
+        contracts: dict[str, MergeContract] = {}
+        for rank, predecessor_id, follower_id in self._links:
+            veh_id = order[rank]
+            target_time = target_times.get(veh_id)
+            if target_time is None:
+                continue
+            hdv_as_partner = (
+                (predecessor_id is not None and vehicle_types.get(predecessor_id, 'hdv') != 'cav')
+                or (follower_id is not None and vehicle_types.get(follower_id, 'hdv') != 'cav')
+            )
+            cached = previous.get(veh_id)
+            if (
+                cached is not None
+                and cached.sequence_rank == rank
+                and cached.target_predecessor_id == predecessor_id
+                and cached.target_follower_id == follower_id
+                and cached.expected_merge_time_s == target_time
+                and cached.fallback_allowed == hdv_as_partner
+            ):
+                contracts[veh_id] = cached
+                self.contracts_reused += 1
+                continue
+            contracts[veh_id] = MergeContract(
+                vehicle_id=veh_id,
+                sequence_rank=rank,
+                target_predecessor_id=predecessor_id,
+                target_follower_id=follower_id,
+                merge_window_start_s=target_time - _MERGE_WINDOW_HALF_S,
+                merge_window_end_s=target_time + _MERGE_WINDOW_HALF_S,
+                expected_merge_time_s=target_time,
+                fallback_allowed=hdv_as_partner,
+            )
+            self.contracts_built += 1
+        self._contracts = contracts
+        # Callers prune their copy; the cache keeps the full set.
+        return dict(contracts)
+
+
 def _build_contracts(
     *,
     plan: Plan,
-    control_zone_state: dict[str, dict[str, float | str]],
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
     vehicle_types: dict[str, str],
     zone_c_lane1_vehicles: list[tuple[str, float, float]] | None,
 ) -> dict[str, MergeContract]:
@@ -331,6 +561,25 @@ def _build_contracts(
     and after it in the merged sequence as its target predecessor and follower,
     then validate against physical positions on lane 1.
     """
+    return ContractIndex().update(
+        plan=plan,
+        control_zone_state=control_zone_state,
+        vehicle_types=vehicle_types,
+        zone_c_lane1_vehicles=zone_c_lane1_vehicles,
+    )
+
+
+def _build_contracts_reference(
+    *,
+    plan: Plan,
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
+    vehicle_types: dict[str, str],
+    zone_c_lane1_vehicles: list[tuple[str, float, float]] | None,
+) -> dict[str, MergeContract]:
+    """Per-vehicle scan version of ``_build_contracts`` (O(n^2) in the order).
+
+    Kept as the oracle for ``ContractIndex`` tests and benchmarks.
+    """
     order = plan.order
     target_times = plan.target_cross_time_s
     if not order:
@@ -356,12 +605,16 @@ def _build_contracts(
         follower_id: str | None = None
         for j in range(rank - 1, -1, -1):
             candidate = order[j]
-            if candidate in lane1_pos_by_id or str(control_zone_state.get(candidate, {}).get('stream', '')) == 'main':
+            if candidate in lane1_pos_by_id or (
+                str(control_zone_state.get(candidate, {}).get('stream', '')) == 'main'
+            ):
                 predecessor_id = candidate
                 break
         for j in range(rank + 1, len(order)):
             candidate = order[j]
-            if candidate in lane1_pos_by_id or str(control_zone_state.get(candidate, {}).get('stream', '')) == 'main':
+            if candidate in lane1_pos_by_id or (
+                str(control_zone_state.get(candidate, {}).get('stream', '')) == 'main'
+            ):
                 follower_id = candidate
                 break
 
@@ -399,7 +652,13 @@ class HierarchicalScheduler:
     replan_interval_s: float = 0.5
     aux_vmax_mps: float | None = None
     zone_a_interval_s: float = 1.0
-    _last_replan_time_s: float | None = None
+    # See DPScheduler: 'timer' or 'event' (replan_interval_s as upper bound).
+    replan_trigger: str = REPLAN_TRIGGER_TIMER
+    replan_eta_drift_s: float = DEFAULT_ETA_DRIFT_S
+    _trigger: ReplanTrigger | None = None
+    _projector: PlanProjector = field(
+        default_factory=lambda: PlanProjector(policy_name='hierarchical')
+    )
     _cached_plan: Plan | None = None
     replanned_last_call: bool = False
     _merge_point_mgr: MergePointManager | None = None
@@ -412,15 +671,31 @@ class HierarchicalScheduler:
     zone_c_coop_overrides: dict[str, float] = field(default_factory=dict)
     scheduler_fallback_count: int = 0
     scheduler_replan_count: int = 0
+    vehicle_registry: VehicleRegistry | None = None
+    dp_engine: str = DP_ENGINE_REFERENCE
+    _array_engine: ArrayDPScheduler | None = None
+    _contract_index: ContractIndex = field(default_factory=ContractIndex)
+    # Only used when compute_plan is called without a perception snapshot.
+    _lane_layout: LaneLayout | None = None
+    # Wall-clock seconds spent in each Zone B replan.
+    replan_latency_s: list[float] = field(default_factory=list)
+    # Set by the runner when --profile-steps is on; laps zone_a/b/c and dp.
+    profiler: StepProfiler | None = None
 
     def __post_init__(self) -> None:
         if self.merge_policy not in (MERGE_POLICY_FIXED, MERGE_POLICY_FLEXIBLE):
             raise ValueError(f'Unknown merge_policy: {self.merge_policy!r}')
+        if self.dp_engine not in DP_ENGINES:
+            raise ValueError(f'Unsupported dp engine: {self.dp_engine}')
+        if self.dp_engine == DP_ENGINE_ARRAY and self._array_engine is None:
+            self._array_engine = ArrayDPScheduler()
         if self._merge_point_mgr is None:
             if self.merge_policy == MERGE_POLICY_FIXED:
                 default_params = MergePointParams()
                 fixed_params = MergePointParams(
-                    search_start_pos_m=default_params.lane0_length_m - default_params.fallback_buffer_m,
+                    search_start_pos_m=(
+                        default_params.lane0_length_m - default_params.fallback_buffer_m
+                    ),
                 )
                 self._merge_point_mgr = MergePointManager(params=fixed_params)
             else:
@@ -429,18 +704,29 @@ class HierarchicalScheduler:
             self._zone_a_evacuator = ZoneAEvacuator(
                 v_limit_mps=self.main_vmax_mps,
             )
+        if self._trigger is None:
+            self._trigger = ReplanTrigger(
+                mode=self.replan_trigger,
+                interval_s=self.replan_interval_s,
+                eta_drift_s=self.replan_eta_drift_s,
+            )
+
+    @property
+    def replan_reasons(self) -> dict[str, int]:
+        return dict(self._trigger.reason_counts)
 
     def compute_plan(
         self,
         *,
         sim_time_s: float,
-        control_zone_state: dict[str, dict[str, float | str]],
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
         crossed_merge: set[str],
         entry_info: dict[str, dict[str, float | str]],
         vehicle_types: dict[str, str],
         traci: Any,
         zone_a_info: ZoneAInfo | None = None,
         zone_c_lane1_vehicles: list[tuple[str, float, float]] | None = None,
+        perception: LanePerception | None = None,
     ) -> Plan:
         self.replanned_last_call = False
 
@@ -451,23 +737,31 @@ class HierarchicalScheduler:
             >= self.zone_a_interval_s - 1e-9
         )
         if need_zone_a and self._zone_a_evacuator is not None:
+            if perception is None and zone_a_info is not None:
+                perception = self._read_perception(sim_time_s=sim_time_s, traci=traci)
             self.zone_a_actions = self._zone_a_evacuator.evaluate(
                 sim_time_s=sim_time_s,
                 zone_a_info=zone_a_info,
                 vehicle_types=vehicle_types,
-                traci=traci,
+                perception=perception,
             )
             self._last_zone_a_time_s = sim_time_s
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap(STAGE_ZONE_A)
 
-        # --- Zone B: DP scheduling (every replan_interval_s) ---
-        need_replan = (
-            self.replan_interval_s <= 0
-            or self._cached_plan is None
-            or self._last_replan_time_s is None
-            or sim_time_s - self._last_replan_time_s >= self.replan_interval_s - 1e-9
+        # --- Zone B: DP scheduling (timer or event driven, see ReplanTrigger) ---
+        replan_reason = self._trigger.check(
+            sim_time_s=sim_time_s,
+            control_zone_state=control_zone_state,
+            crossed_merge=crossed_merge,
+            has_plan=self._cached_plan is not None,
         )
 
-        if need_replan:
+        if replan_reason is not None:
+            if profiler is not None:
+                profiler.lap(STAGE_ZONE_B)
+            replan_start_s = time.perf_counter()
             self._cached_plan = _compute_plan_once(
                 sim_time_s=sim_time_s,
                 control_zone_state=control_zone_state,
@@ -480,8 +774,20 @@ class HierarchicalScheduler:
                 main_vmax_mps=self.main_vmax_mps,
                 ramp_vmax_mps=self.ramp_vmax_mps,
                 aux_vmax_mps=self.aux_vmax_mps,
+                cav_schedule=(
+                    self._array_engine.schedule if self._array_engine is not None else None
+                ),
+                vehicle_registry=self.vehicle_registry,
+            )
+            self.replan_latency_s.append(time.perf_counter() - replan_start_s)
+            if profiler is not None:
+                profiler.lap(STAGE_DP)
+            self._trigger.mark_replanned(
+                sim_time_s=sim_time_s,
+                control_zone_state=control_zone_state,
+                crossed_merge=crossed_merge,
+                reason=replan_reason,
             )
-            self._last_replan_time_s = sim_time_s
             self.replanned_last_call = True
             self.scheduler_replan_count += 1
             if self._cached_plan is not None and self._cached_plan.scheduler_fallback:
@@ -489,13 +795,15 @@ class HierarchicalScheduler:
 
         # --- Contract generation (runs on replan or when plan changes) ---
         if self._cached_plan is not None and self.replanned_last_call:
-            self.contracts = _build_contracts(
+            self.contracts = self._contract_index.update(
                 plan=self._cached_plan,
                 control_zone_state=control_zone_state,
                 vehicle_types=vehicle_types,
                 zone_c_lane1_vehicles=zone_c_lane1_vehicles,
             )
         self._prune_stale_contracts(control_zone_state, crossed_merge)
+        if profiler is not None:
+            profiler.lap(STAGE_ZONE_B)
 
         # --- Zone C speed overrides (every step) ---
         self.zone_c_speed_overrides = _compute_zone_c_speed_overrides(
@@ -514,32 +822,48 @@ class HierarchicalScheduler:
 
         # --- Zone C: merge point management (every step) ---
         if self._merge_point_mgr is not None and zone_c_lane1_vehicles is not None:
-            cav_states = _collect_zone_c_cav_states(
-                vehicle_types=vehicle_types, traci=traci,
-            )
+            if perception is None:
+                perception = self._read_perception(sim_time_s=sim_time_s, traci=traci)
+            cav_states = _collect_zone_c_cav_states(perception)
             self.zone_c_actions = self._merge_point_mgr.update(
                 sim_time_s=sim_time_s,
                 cav_states=cav_states,
                 lane1_vehicles=zone_c_lane1_vehicles,
                 contracts=self.contracts,
             )
-            if self.zone_c_actions:
+            if self.zone_c_actions and logger.isEnabledFor(logging.INFO):
                 logger.info(
-                    '[ZoneC] t=%.1f actions=%s merge_history_len=%d',
+                    '[ZoneC] t=%.1f actions=%s merges_total=%d',
                     sim_time_s,
                     {vid: f'lane={a[0]},dur={a[1]:.1f}s' for vid, a in self.zone_c_actions.items()},
-                    len(self._merge_point_mgr.merge_history),
+                    self._merge_point_mgr.merge_history.next_seq,
                 )
+        if profiler is not None:
+            profiler.lap(STAGE_ZONE_C)
 
-        return self._project_cached_plan(
+        return self._projector.project(
+            cached_plan=self._cached_plan,
             sim_time_s=sim_time_s,
             control_zone_state=control_zone_state,
             crossed_merge=crossed_merge,
         )
 
+    def _read_perception(self, *, sim_time_s: float, traci: Any) -> LanePerception:
+        """Lane snapshot for callers that do not pass one (polling reads)."""
+        if self._lane_layout is None:
+            self._lane_layout = resolve_lane_layout(traci)
+        registry = self.vehicle_registry
+        return read_lane_perception(
+            sim_time_s=sim_time_s,
+            traci=traci,
+            layout=self._lane_layout,
+            type_id=lambda veh_id: lookup_type_id(veh_id, traci, registry),
+            reader=PollingVehicleReader(traci=traci),
+        )
+
     def _prune_stale_contracts(
         self,
-        control_zone_state: dict[str, dict[str, float | str]],
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
         crossed_merge: set[str],
     ) -> None:
         """Remove contracts for vehicles that have crossed merge or left the zone."""
@@ -550,44 +874,8 @@ class HierarchicalScheduler:
         for vid in stale:
             del self.contracts[vid]
 
-    def _project_cached_plan(
-        self,
-        *,
-        sim_time_s: float,
-        control_zone_state: dict[str, dict[str, float | str]],
-        crossed_merge: set[str],
-    ) -> Plan:
-        if self._cached_plan is None:
-            return Plan(plan_time_s=sim_time_s, policy_name='hierarchical')
-
-        active_ids = {
-            veh_id for veh_id in control_zone_state if veh_id not in crossed_merge
-        }
-        order = [veh_id for veh_id in self._cached_plan.order if veh_id in active_ids]
-        target_cross_time_s = {
-            veh_id: self._cached_plan.target_cross_time_s[veh_id]
-            for veh_id in order
-            if veh_id in self._cached_plan.target_cross_time_s
-        }
-        eta_s = {
-            veh_id: self._cached_plan.eta_s[veh_id]
-            for veh_id in order
-            if veh_id in self._cached_plan.eta_s
-        }
-        return Plan(
-            plan_time_s=self._cached_plan.plan_time_s,
-            policy_name='hierarchical',
-            order=order,
-            target_cross_time_s=target_cross_time_s,
-            eta_s=eta_s,
-        )
 
-
-def _collect_zone_c_cav_states(
-    *,
-    vehicle_types: dict[str, str],
-    traci: Any,
-) -> dict[str, VehicleState]:
+def _collect_zone_c_cav_states(perception: LanePerception) -> dict[str, VehicleState]:
     """Collect CAV states on main_h3 lanes 0 and 1 for Zone C merge evaluation.
 
     Lane 0 vehicles are candidates for new merge tracking.
@@ -595,17 +883,11 @@ def _collect_zone_c_cav_states(
     (vehicles that just changed from L0 to L1).
     """
     cav_states: dict[str, VehicleState] = {}
-    for lane_idx in (0, 1):
-        lane_id = f'main_h3_{lane_idx}'
-        veh_ids = traci.lane.getLastStepVehicleIDs(lane_id)
-        for veh_id in veh_ids:
-            vtype = vehicle_types.get(veh_id, '')
-            if not vtype:
-                vtype = traci.vehicle.getTypeID(veh_id)
+    for lane_idx, lane in ((0, perception.merge_lane), (1, perception.target_lane)):
+        for veh_id, vtype in zip(lane.vehicle_ids, lane.type_ids):
             if is_hdv(vtype):
                 continue
-            pos = float(traci.vehicle.getLanePosition(veh_id))
-            speed = float(traci.vehicle.getSpeed(veh_id))
+            pos, speed = lane.kinematics[veh_id]
             cav_states[veh_id] = VehicleState(
                 edge_id='main_h3',
                 lane_index=lane_idx,
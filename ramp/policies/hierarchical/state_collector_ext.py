@@ -3,6 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from ramp.policies.hierarchical.perception import (
+    LaneLayout,
+    LanePerception,
+    read_lane_perception,
+    resolve_lane_layout,
+)
 from ramp.runtime.state_collector import StateCollector, CollectedState
 
 
@@ -20,82 +26,76 @@ class HierarchicalState:
     vehicle_types: dict[str, str]        # veh_id -> 'cav'|'hdv'
     zone_a_info: ZoneAInfo | None
     zone_c_lane1_vehicles: list[tuple[str, float, float]]  # [(veh_id, pos, speed)]
+    # Lane snapshots shared by Zone A, Zone C and the controller this step.
+    perception: LanePerception | None = None
+
+
+def zone_a_info_from_perception(perception: LanePerception) -> ZoneAInfo | None:
+    """Per-lane density / mean speed / count on main_h2 (``None`` without main_h2)."""
+    if not perception.zone_a_lanes:
+        return None
+    edge_length_m = perception.zone_a_edge_length_m
+    lane_densities: dict[int, float] = {}
+    lane_avg_speeds: dict[int, float] = {}
+    lane_vehicle_counts: dict[int, int] = {}
+    for lane_idx, lane in enumerate(perception.zone_a_lanes):
+        count = len(lane.vehicle_ids)
+        lane_vehicle_counts[lane_idx] = count
+        if edge_length_m > 0:
+            lane_densities[lane_idx] = (count / edge_length_m) * 1000.0
+        else:
+            lane_densities[lane_idx] = 0.0
+        if count > 0:
+            total_speed = sum(lane.kinematics[vid][1] for vid in lane.vehicle_ids)
+            lane_avg_speeds[lane_idx] = total_speed / count
+        else:
+            lane_avg_speeds[lane_idx] = 0.0
+    return ZoneAInfo(
+        lane_densities=lane_densities,
+        lane_avg_speeds=lane_avg_speeds,
+        lane_vehicle_counts=lane_vehicle_counts,
+        edge_length_m=edge_length_m,
+    )
 
 
 @dataclass(slots=True)
 class HierarchicalStateCollector:
     base_collector: StateCollector
     traci: Any
+    _layout: LaneLayout | None = None
 
     def collect(self, *, sim_time: float, traci: Any) -> HierarchicalState:
         # 1. Base collection
         base_state = self.base_collector.collect(sim_time=sim_time, traci=traci)
-        
+        # Type IDs are lifetime attributes: served from the collector's registry
+        # (always set once collect() has run).
+        registry = self.base_collector.vehicle_registry
+
+        # 2. One read of the Zone A / Zone C lanes for every consumer.
+        if self._layout is None:
+            self._layout = resolve_lane_layout(traci)
+        perception = read_lane_perception(
+            sim_time_s=sim_time,
+            traci=traci,
+            layout=self._layout,
+            type_id=registry.type_id,
+            reader=self.base_collector.vehicle_reader,
+            observed=base_state.ttc_observation_state,
+        )
+
+        # 3. Types for the control zone plus the lanes Zone A / Zone C look at
         vehicle_types: dict[str, str] = {}
-        
-        # 3. Annotate base state vehicles with type
         for veh_id in base_state.control_zone_state:
-            vehicle_types[veh_id] = traci.vehicle.getTypeID(veh_id)
-            
-        # 2a. Zone A Info (main_h2)
-        zone_a_info = None
-        try:
-            edge_id = 'main_h2'
-            lane_count = traci.edge.getLaneNumber(edge_id)
-            if lane_count > 0:
-                edge_length_m = traci.lane.getLength(f'{edge_id}_0')
-                lane_densities: dict[int, float] = {}
-                lane_avg_speeds: dict[int, float] = {}
-                lane_vehicle_counts: dict[int, int] = {}
-                
-                for lane_idx in range(lane_count):
-                    lane_id = f'{edge_id}_{lane_idx}'
-                    veh_ids = traci.lane.getLastStepVehicleIDs(lane_id)
-                    count = len(veh_ids)
-                    lane_vehicle_counts[lane_idx] = count
-                    
-                    if edge_length_m > 0:
-                        lane_densities[lane_idx] = (count / edge_length_m) * 1000.0
-                    else:
-                        lane_densities[lane_idx] = 0.0
-                        
-                    if count > 0:
-                        total_speed = sum(traci.vehicle.getSpeed(vid) for vid in veh_ids)
-                        lane_avg_speeds[lane_idx] = total_speed / count
-                    else:
-                        lane_avg_speeds[lane_idx] = 0.0
-                        
-                    # Also collect types for these vehicles if not already collected
-                    for vid in veh_ids:
-                        if vid not in vehicle_types:
-                            vehicle_types[vid] = traci.vehicle.getTypeID(vid)
-                            
-                zone_a_info = ZoneAInfo(
-                    lane_densities=lane_densities,
-                    lane_avg_speeds=lane_avg_speeds,
-                    lane_vehicle_counts=lane_vehicle_counts,
-                    edge_length_m=edge_length_m
-                )
-        except Exception:
-            pass
-
-        # 2b. Zone C Info (main_h3 lane 1)
-        zone_c_lane1_vehicles: list[tuple[str, float, float]] = []
-        try:
-            lane_id = 'main_h3_1'
-            veh_ids = traci.lane.getLastStepVehicleIDs(lane_id)
-            for vid in veh_ids:
-                pos = traci.vehicle.getLanePosition(vid)
-                speed = traci.vehicle.getSpeed(vid)
-                zone_c_lane1_vehicles.append((vid, pos, speed))
+            vehicle_types[veh_id] = registry.type_id(veh_id)
+        for lane in (*perception.zone_a_lanes, perception.target_lane):
+            for vid, vtype in zip(lane.vehicle_ids, lane.type_ids):
                 if vid not in vehicle_types:
-                    vehicle_types[vid] = traci.vehicle.getTypeID(vid)
-        except Exception:
-            pass
+                    vehicle_types[vid] = vtype
 
         return HierarchicalState(
             base_state=base_state,
             vehicle_types=vehicle_types,
-            zone_a_info=zone_a_info,
-            zone_c_lane1_vehicles=zone_c_lane1_vehicles
+            zone_a_info=zone_a_info_from_perception(perception),
+            zone_c_lane1_vehicles=perception.target_lane.vehicles(),
+            perception=perception,
         )
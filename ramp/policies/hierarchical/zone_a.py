@@ -13,14 +13,12 @@ from __future__ import annotations
 import bisect
 import logging
 from dataclasses import dataclass, field
-from typing import Any
 
+from ramp.policies.hierarchical.perception import LanePerception
 from ramp.policies.hierarchical.state_collector_ext import ZoneAInfo
 
 logger = logging.getLogger(__name__)
 
-ZONE_A_EDGE = 'main_h2'
-
 
 @dataclass
 class ZoneAEvacuator:
@@ -40,13 +38,16 @@ class ZoneAEvacuator:
         sim_time_s: float,
         zone_a_info: ZoneAInfo | None,
         vehicle_types: dict[str, str],
-        traci: Any,
+        perception: LanePerception | None,
     ) -> dict[str, tuple[int, float]]:
         """Evaluate which CAVs should change lanes away from the ramp.
 
+        Lane contents, positions and speeds come from this step's
+        ``perception`` snapshot.
+
         Returns: {veh_id: (target_lane_index, duration_s)}
         """
-        if zone_a_info is None:
+        if zone_a_info is None or perception is None:
             return {}
 
         max_lane = max(zone_a_info.lane_densities.keys(), default=-1)
@@ -83,33 +84,23 @@ class ZoneAEvacuator:
             return {}
 
         actions: dict[str, tuple[int, float]] = {}
-        active_vehs = set(traci.vehicle.getIDList())
 
         for src_lane in sorted(feasible_transitions.keys()):
             target_lane = src_lane + 1
-            src_lane_id = f'{ZONE_A_EDGE}_{src_lane}'
-            target_lane_id = f'{ZONE_A_EDGE}_{target_lane}'
-
-            src_vehs = list(traci.lane.getLastStepVehicleIDs(src_lane_id))
-            target_vehs = list(traci.lane.getLastStepVehicleIDs(target_lane_id))
+            src = perception.zone_a_lane(src_lane)
+            target = perception.zone_a_lane(target_lane)
+            if src is None:
+                continue
 
-            target_positions: list[float] = []
-            for vid in target_vehs:
-                if vid in active_vehs:
-                    target_positions.append(
-                        float(traci.vehicle.getLanePosition(vid))
-                    )
-            target_positions.sort()
+            target_positions = sorted(
+                pos for pos, _speed in (target.kinematics.values() if target is not None else ())
+            )
 
-            for veh_id in src_vehs:
-                if veh_id not in active_vehs:
-                    continue
+            for veh_id, lane_type in zip(src.vehicle_ids, src.type_ids):
                 if veh_id in actions:
                     continue
 
-                vtype = vehicle_types.get(veh_id, '')
-                if not vtype:
-                    vtype = traci.vehicle.getTypeID(veh_id)
+                vtype = vehicle_types.get(veh_id, '') or lane_type
                 if vtype != 'cav':
                     continue
 
@@ -117,8 +108,7 @@ class ZoneAEvacuator:
                 if sim_time_s - last_t < self.t_cooldown_s:
                     continue
 
-                veh_pos = float(traci.vehicle.getLanePosition(veh_id))
-                veh_speed = float(traci.vehicle.getSpeed(veh_id))
+                veh_pos, veh_speed = src.kinematics[veh_id]
                 required_gap = veh_speed * self.h_safe_s
 
                 if _check_gap(veh_pos, required_gap, target_positions):
@@ -0,0 +1,66 @@
+"""Speed commands that bring planned vehicles to the merge point on time.
+
+Each planned CAV is asked to cover its remaining distance by its target
+crossing time, ``v_des = d_to_merge / max(target - now, step_length)``,
+clipped to ``[0, stream vmax]``.  ``desired_speed`` is the per-vehicle form;
+``plan_speed_targets`` evaluates the whole population of a plan in one pass
+over the ``VehicleTable`` columns and gives the same floats.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from ramp.runtime.vehicle_table import VehicleTable
+from ramp.runtime.vmax import stream_vmax_rows
+
+
+def desired_speed(
+    *,
+    sim_time_s: float,
+    step_length_s: float,
+    d_to_merge_m: float,
+    target_cross_time_s: float,
+    vmax_mps: float,
+) -> float:
+    time_to_target = max(target_cross_time_s - sim_time_s, step_length_s)
+    v_des = d_to_merge_m / time_to_target
+    return max(0.0, min(v_des, vmax_mps))
+
+
+def plan_speed_targets(
+    *,
+    sim_time_s: float,
+    step_length_s: float,
+    table: VehicleTable,
+    veh_ids: list[str],
+    target_cross_time_s: Mapping[str, float],
+    main_vmax_mps: float,
+    ramp_vmax_mps: float,
+    aux_vmax_mps: float | None = None,
+    v_des_overrides: Mapping[str, float] | None = None,
+) -> dict[str, float]:
+    """``{veh_id: commanded speed}`` for *veh_ids*, in that order.
+
+    *v_des_overrides* replace the on-time speed of some vehicles before the
+    vmax clip (Zone C merge speeds).
+    """
+    if not veh_ids:
+        return {}
+    rows = table.rows(veh_ids)
+    targets = np.fromiter(
+        (target_cross_time_s[veh_id] for veh_id in veh_ids), dtype=np.float64, count=len(veh_ids),
+    )
+    time_to_target = np.maximum(targets - sim_time_s, step_length_s)
+    v_des = table.d_to_merge[rows] / time_to_target
+    if v_des_overrides:
+        for index, veh_id in enumerate(veh_ids):
+            if veh_id in v_des_overrides:
+                v_des[index] = v_des_overrides[veh_id]
+    vmax = stream_vmax_rows(
+        table, rows, main_vmax_mps, ramp_vmax_mps, aux_vmax_mps=aux_vmax_mps,
+    )
+    speeds = np.maximum(0.0, np.minimum(v_des, vmax))
+    return dict(zip(veh_ids, speeds.tolist()))
@@ -1,9 +1,21 @@
+"""Applies policy commands to SUMO.
+
+The controller keeps a per-vehicle shadow of the last speed target, speed
+mode and lane-change mode it wrote, and only sends a TraCI write when the
+value changes (``slowDown`` is time-dependent and always sent; it clears the
+speed shadow).  ``resync`` drops the shadows so the next step re-sends
+everything; ``resync_every_steps`` does that periodically, and ``1`` restores
+the write-every-step behaviour.
+"""
+
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
-from ramp.common.vehicle_defs import VEH_TYPE_HDV, is_hdv
+from ramp.common.vehicle_defs import is_hdv
 from ramp.runtime.takeover import (
     TakeoverConfig,
     TakeoverMode,
@@ -11,6 +23,8 @@ from ramp.runtime.takeover import (
     slowdown_duration_s,
 )
 from ramp.runtime.types import ControlCommand
+from ramp.runtime.vehicle_registry import VehicleRegistry, lookup_type_id
+from ramp.runtime.vehicle_table import STREAM_MAIN, STREAM_RAMP, as_vehicle_table
 
 
 LC_MODE_PROHIBIT_ALL = 0
@@ -36,23 +50,133 @@ class Controller:
     ramp_lc_target_lane: int = 1
     controlled_vehicle_ids: set[str] = field(default_factory=set)
     original_speed_mode_by_vehicle: dict[str, int] = field(default_factory=dict)
+    vehicle_registry: VehicleRegistry | None = None
+    # 0: never resync; N: drop the shadows every N steps (1 = no diffing).
+    resync_every_steps: int = 0
+    _speed_target: dict[str, float] = field(default_factory=dict)
+    _speed_mode: dict[str, int] = field(default_factory=dict)
+    _lane_change_mode: dict[str, int] = field(default_factory=dict)
+    # TraCI writes sent / suppressed, cumulative by call and per closed step.
+    write_counts: Counter = field(default_factory=Counter)
+    suppressed_write_count: int = 0
+    step_write_counts: list[int] = field(default_factory=list)
+    step_suppressed_counts: list[int] = field(default_factory=list)
+    _step_writes: int = 0
+    _step_suppressed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.resync_every_steps < 0:
+            raise ValueError('resync_every_steps must be >= 0')
 
     @property
     def config(self) -> TakeoverConfig:
         return get_takeover_config(self.takeover_mode)
 
+    def _type_id(self, veh_id: str) -> str:
+        return lookup_type_id(veh_id, self.traci, self.vehicle_registry)
+
     def _is_commit_vehicle(self, veh_id: str) -> bool:
         road_id = str(self.traci.vehicle.getRoadID(veh_id))
         return road_id.startswith(':n_merge')
 
+    def _wrote(self, call: str) -> None:
+        self.write_counts[call] += 1
+        self._step_writes += 1
+
+    def _suppressed(self) -> None:
+        self.suppressed_write_count += 1
+        self._step_suppressed += 1
+
+    def _set_speed(self, veh_id: str, speed_mps: float) -> None:
+        if self._speed_target.get(veh_id) == speed_mps:
+            self._suppressed()
+            return
+        self.traci.vehicle.setSpeed(veh_id, speed_mps)
+        self._speed_target[veh_id] = speed_mps
+        self._wrote('setSpeed')
+
+    def _slow_down(self, veh_id: str, speed_mps: float, duration_s: float) -> None:
+        self.traci.vehicle.slowDown(veh_id, speed_mps, duration_s)
+        # The target now follows SUMO's slowDown ramp; the next setSpeed must go out.
+        self._speed_target.pop(veh_id, None)
+        self._wrote('slowDown')
+
+    def _set_speed_mode(self, veh_id: str, mode: int) -> None:
+        if self._speed_mode.get(veh_id) == mode:
+            self._suppressed()
+            return
+        self.traci.vehicle.setSpeedMode(veh_id, mode)
+        self._speed_mode[veh_id] = mode
+        self._wrote('setSpeedMode')
+
+    def _set_lane_change_mode(self, veh_id: str, mode: int) -> None:
+        if self._lane_change_mode.get(veh_id) == mode:
+            self._suppressed()
+            return
+        self.traci.vehicle.setLaneChangeMode(veh_id, mode)
+        self._lane_change_mode[veh_id] = mode
+        self._wrote('setLaneChangeMode')
+
+    def speed_mode(self, veh_id: str) -> int:
+        """Last speed mode written to *veh_id*, read back from SUMO if unknown."""
+        mode = self._speed_mode.get(veh_id)
+        if mode is None:
+            mode = int(self.traci.vehicle.getSpeedMode(veh_id))
+            self._speed_mode[veh_id] = mode
+        return mode
+
+    def lane_change_mode(self, veh_id: str) -> int:
+        """Last lane-change mode written to *veh_id*, read back from SUMO if unknown."""
+        mode = self._lane_change_mode.get(veh_id)
+        if mode is None:
+            mode = int(self.traci.vehicle.getLaneChangeMode(veh_id))
+            self._lane_change_mode[veh_id] = mode
+        return mode
+
+    def resync(self) -> None:
+        """Forget the shadows: the next writes are sent and modes read back."""
+        self._speed_target.clear()
+        self._speed_mode.clear()
+        self._lane_change_mode.clear()
+
+    def _evict(self, active_vehicle_ids: set[str]) -> None:
+        for shadow in (self._speed_target, self._speed_mode, self._lane_change_mode):
+            for veh_id in [v for v in shadow if v not in active_vehicle_ids]:
+                del shadow[veh_id]
+
+    def close_step(self) -> int:
+        """Record this step's write counts; returns the number of writes sent."""
+        writes = self._step_writes
+        self.step_write_counts.append(writes)
+        self.step_suppressed_counts.append(self._step_suppressed)
+        self._step_writes = 0
+        self._step_suppressed = 0
+        if self.resync_every_steps and len(self.step_write_counts) % self.resync_every_steps == 0:
+            self.resync()
+        return writes
+
+    def write_summary(self) -> dict[str, Any]:
+        steps = len(self.step_write_counts)
+        total = sum(self.step_write_counts)
+        return {
+            'steps': steps,
+            'resync_every_steps': self.resync_every_steps,
+            'write_calls': total,
+            'write_calls_per_step': total / steps if steps else 0.0,
+            'suppressed_writes': sum(self.step_suppressed_counts),
+            'by_call': dict(sorted(self.write_counts.items())),
+            'writes_per_step': list(self.step_write_counts),
+            'suppressed_per_step': list(self.step_suppressed_counts),
+        }
+
     def _takeover(self, veh_id: str) -> bool:
         if veh_id in self.original_speed_mode_by_vehicle:
             return False
-        if is_hdv(self.traci.vehicle.getTypeID(veh_id)):
+        if is_hdv(self._type_id(veh_id)):
             return False
-        original = int(self.traci.vehicle.getSpeedMode(veh_id))
+        original = self.speed_mode(veh_id)
         self.original_speed_mode_by_vehicle[veh_id] = original
-        self.traci.vehicle.setSpeedMode(veh_id, self.config.speed_mode)
+        self._set_speed_mode(veh_id, self.config.speed_mode)
         return True
 
     def _restore(self, veh_id: str, active_vehicle_ids: set[str]) -> bool:
@@ -60,7 +184,7 @@ class Controller:
         if original is None:
             return False
         if veh_id in active_vehicle_ids:
-            self.traci.vehicle.setSpeedMode(veh_id, int(original))
+            self._set_speed_mode(veh_id, int(original))
         return True
 
     def _execute_lane_changes(
@@ -71,6 +195,7 @@ class Controller:
             if veh_id not in active_vehicle_ids:
                 continue
             self.traci.vehicle.changeLane(veh_id, int(lane_index), float(duration))
+            self._wrote('changeLane')
             executed_ids.add(veh_id)
         return executed_ids
 
@@ -81,7 +206,7 @@ class Controller:
         for veh_id, mode in command.lane_change_mode_overrides.items():
             if veh_id not in active_vehicle_ids:
                 continue
-            self.traci.vehicle.setLaneChangeMode(veh_id, int(mode))
+            self._set_lane_change_mode(veh_id, int(mode))
             applied_ids.add(veh_id)
         return applied_ids
 
@@ -90,6 +215,7 @@ class Controller:
     ) -> ControllerApplyResult:
         cfg = self.config
         result = ControllerApplyResult()
+        self._evict(active_vehicle_ids)
         result.lane_change_mode_override_ids = self._apply_lane_change_mode_overrides(
             command=command, active_vehicle_ids=active_vehicle_ids
         )
@@ -100,30 +226,30 @@ class Controller:
         for veh_id, speed_mps in command.set_speed_mps.items():
             if veh_id not in active_vehicle_ids:
                 continue
-            if is_hdv(self.traci.vehicle.getTypeID(veh_id)):
+            if is_hdv(self._type_id(veh_id)):
                 continue
             if self._takeover(veh_id):
                 result.takeover_ids.add(veh_id)
             result.speed_command_ids.add(veh_id)
             if self._is_commit_vehicle(veh_id):
-                self.traci.vehicle.setSpeed(veh_id, -1)
+                self._set_speed(veh_id, -1)
                 result.commit_ids.add(veh_id)
             elif cfg.use_slow_down_for_decel:
                 actual_speed = float(self.traci.vehicle.getSpeed(veh_id))
                 if speed_mps < actual_speed:
                     dur = slowdown_duration_s(actual_speed, speed_mps)
-                    self.traci.vehicle.slowDown(veh_id, max(0.0, speed_mps), dur)
+                    self._slow_down(veh_id, max(0.0, speed_mps), dur)
                     result.slowdown_ids.add(veh_id)
                 else:
-                    self.traci.vehicle.setSpeed(veh_id, speed_mps)
+                    self._set_speed(veh_id, speed_mps)
             else:
-                self.traci.vehicle.setSpeed(veh_id, speed_mps)
-            result.speed_mode_by_vehicle[veh_id] = int(self.traci.vehicle.getSpeedMode(veh_id))
+                self._set_speed(veh_id, speed_mps)
+            result.speed_mode_by_vehicle[veh_id] = self.speed_mode(veh_id)
 
         to_release = (self.controlled_vehicle_ids - current_controlled) | set(command.release_ids)
         for veh_id in to_release:
             if veh_id in active_vehicle_ids:
-                self.traci.vehicle.setSpeed(veh_id, -1)
+                self._set_speed(veh_id, -1)
                 result.released_ids.add(veh_id)
             if self._restore(veh_id, active_vehicle_ids):
                 result.restored_ids.add(veh_id)
@@ -133,9 +259,16 @@ class Controller:
     def apply_lane_change_modes(
         self,
         *,
-        control_zone_state: dict[str, dict[str, float | str]],
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
         vehicle_types: dict[str, str] | None = None,
+        merge_lane_vehicle_ids: Sequence[str] | None = None,
     ) -> None:
+        """Lock lane changes per the takeover config.
+
+        ``merge_lane_vehicle_ids`` is this step's ``main_h3_0`` content when
+        the caller already read it (hierarchical perception); otherwise the
+        lane is queried here.
+        """
         cfg = self.config
 
         if cfg.prohibit_lc_all_cav_in_control_zone:
@@ -143,43 +276,46 @@ class Controller:
                 vtype = (vehicle_types or {}).get(veh_id, '')
                 if is_hdv(vtype):
                     continue
-                self.traci.vehicle.setLaneChangeMode(veh_id, LC_MODE_PROHIBIT_ALL)
-            self._enforce_merge_lane_lc_mode(vehicle_types=vehicle_types)
+                self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
+            self._enforce_merge_lane_lc_mode(
+                vehicle_types=vehicle_types, veh_ids=merge_lane_vehicle_ids,
+            )
             return
 
-        for veh_id, vehicle_state in control_zone_state.items():
-            stream = str(vehicle_state['stream'])
-            edge_id = str(vehicle_state['edge_id'])
-            lane_id = str(vehicle_state['lane_id'])
-            if edge_id != 'main_h3':
+        table = as_vehicle_table(control_zone_state)
+        for veh_id in control_zone_state:
+            row = table.row(veh_id)
+            if table.edge_id(row) != 'main_h3':
                 continue
 
             if cfg.prohibit_lc_all_cav_on_merge_edge:
                 vtype = (vehicle_types or {}).get(veh_id, '')
                 if not is_hdv(vtype):
-                    self.traci.vehicle.setLaneChangeMode(veh_id, LC_MODE_PROHIBIT_ALL)
+                    self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
                 continue
 
             vtype = (vehicle_types or {}).get(veh_id, '')
-            if stream == 'main':
-                self.traci.vehicle.setLaneChangeMode(veh_id, LC_MODE_PROHIBIT_ALL)
-            elif stream == 'ramp':
-                lane_index = int(lane_id.split('_')[-1]) if '_' in lane_id else -1
+            stream = table.stream_code[row]
+            if stream == STREAM_MAIN:
+                self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
+            elif stream == STREAM_RAMP:
+                lane_index = table.lane_index(row)
                 if lane_index == 0:
                     if not is_hdv(vtype):
-                        self.traci.vehicle.setLaneChangeMode(
-                            veh_id, LC_MODE_PROHIBIT_ALL,
-                        )
+                        self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
                 elif lane_index >= 1 and self.ramp_lc_target_lane != -1:
                     if lane_index >= self.ramp_lc_target_lane:
-                        self.traci.vehicle.setLaneChangeMode(veh_id, LC_MODE_PROHIBIT_ALL)
+                        self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
 
-        self._enforce_merge_lane_lc_mode(vehicle_types=vehicle_types)
+        self._enforce_merge_lane_lc_mode(
+            vehicle_types=vehicle_types, veh_ids=merge_lane_vehicle_ids,
+        )
 
     def _enforce_merge_lane_lc_mode(
         self,
         *,
         vehicle_types: dict[str, str] | None = None,
+        veh_ids: Sequence[str] | None = None,
     ) -> None:
         """Block autonomous lane changes for CAVs on main_h3_0.
 
@@ -188,20 +324,21 @@ class Controller:
         never covers them.  This method queries TraCI directly to ensure
         Zone C's MergePointManager has exclusive control over L0→L1 merges.
         """
-        veh_ids = self.traci.lane.getLastStepVehicleIDs('main_h3_0')
+        if veh_ids is None:
+            veh_ids = self.traci.lane.getLastStepVehicleIDs('main_h3_0')
         for veh_id in veh_ids:
             vtype = (vehicle_types or {}).get(veh_id, '')
             if not vtype:
-                vtype = self.traci.vehicle.getTypeID(veh_id)
+                vtype = self._type_id(veh_id)
             if is_hdv(vtype):
                 continue
-            self.traci.vehicle.setLaneChangeMode(veh_id, LC_MODE_PROHIBIT_ALL)
+            self._set_lane_change_mode(veh_id, LC_MODE_PROHIBIT_ALL)
 
     def release_all(self, *, active_vehicle_ids: set[str]) -> ControllerApplyResult:
         result = ControllerApplyResult()
         for veh_id in self.controlled_vehicle_ids:
             if veh_id in active_vehicle_ids:
-                self.traci.vehicle.setSpeed(veh_id, -1)
+                self._set_speed(veh_id, -1)
                 result.released_ids.add(veh_id)
             if self._restore(veh_id, active_vehicle_ids):
                 result.restored_ids.add(veh_id)
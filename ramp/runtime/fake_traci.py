@@ -0,0 +1,1035 @@
+"""In-memory stand-in for the ``traci`` subset the ramp runtime uses.
+
+``FakeTraci`` replaces the SUMO process for benchmarks and tests that must
+run without SUMO.  It answers the calls ``run_experiment``, both
+``StateCollector`` vehicle readers, ``HierarchicalStateCollector`` (lane
+perception), ``ZoneAEvacuator`` and ``Controller`` make — the ``vehicle``,
+``lane``, ``edge`` and ``simulation`` domains plus ``start``,
+``simulationStep`` and ``close`` — over a ``FakeScenario``: the lanes and
+connections of a ``.net.xml`` (junction internal lanes included, so
+``:n_merge_*`` commits still happen) and the departures of ``.rou.xml``
+files (``<vehicle>`` and ``<flow>``) or of ``generate_mixed_rou`` arrival
+streams.  ``start`` reads the scenario from the usual SUMO command line
+(``--configuration-file``, ``--route-files``, ``--step-length``), so
+``run_experiment(..., sumo_backend='fake')`` needs no other changes.
+
+Vehicles move in one of two ways:
+
+* kinematic (default) — a deterministic Krauss-style step: free speed is the
+  lane / vType limit or the ``setSpeed`` / ``slowDown`` command, bounded by
+  the vType's accel and decel and by the safe speed behind the leader (which
+  may be on the next lane of the route, or the end of a lane with no
+  connection onward).  ``changeLane`` requests and strategic changes off
+  such lanes (unless the lane-change mode forbids them) move one lane per
+  step when both gaps are safe.  Speed-mode bits 1/2/4 (safe speed, max
+  accel, max decel) are honoured for commanded speeds.
+* replay — every step's lanes, positions, speeds and accelerations come from
+  a recorded ``control_zone_trace.csv`` (``TraceReplay``).  Commands are
+  accepted and stored but move nothing, so each run of a trace feeds the
+  policies the same states.
+
+The model is deliberately coarse: no driver imperfection (``sigma``), no
+junction right of way, no teleports, instantaneous lane changes.  It
+reproduces the per-step load the policies see, not SUMO's traffic, and its
+metrics are not comparable with SUMO runs.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import random
+import xml.etree.ElementTree as ET
+from bisect import insort
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ramp.runtime.subscription import (
+    DISTANCE_REQUEST,
+    VAR_ACCELERATION,
+    VAR_LANE_ID,
+    VAR_LANEPOSITION,
+    VAR_ROAD_ID,
+    VAR_SPEED,
+)
+
+# ``traci.constants.INVALID_DOUBLE_VALUE``: returned for unreachable distances.
+INVALID_DOUBLE_VALUE = -1073741824.0
+# SUMO's defaults for vehicles TraCI has not touched.
+DEFAULT_SPEED_MODE = 31
+DEFAULT_LANE_CHANGE_MODE = 1621
+# Placeholder for ``cmd[0]``; the fake backend ignores the binary.
+FAKE_SUMO_BINARY = 'fake-sumo'
+
+_SPEED_MODE_SAFE_SPEED = 1
+_SPEED_MODE_MAX_ACCEL = 2
+_SPEED_MODE_MAX_DECEL = 4
+_LC_MODE_STRATEGIC = 3
+# How far ahead (m) to look for a leader on the lanes further along the route.
+_LEADER_LOOKAHEAD_M = 200.0
+
+
+class FakeTraciError(Exception):
+    """Raised where TraCI would raise ``TraCIException``."""
+
+
+@dataclass(slots=True, frozen=True)
+class FakeLane:
+    lane_id: str
+    edge_id: str
+    index: int
+    length_m: float
+    speed_mps: float
+    internal: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class FakeVType:
+    type_id: str
+    accel: float = 2.6
+    decel: float = 4.5
+    length_m: float = 5.0
+    min_gap_m: float = 2.5
+    tau_s: float = 1.0
+    max_speed_mps: float = 55.55
+
+    @classmethod
+    def from_attrs(cls, attrs: Mapping[str, str]) -> FakeVType:
+        """From ``<vType>`` attributes (or a ``vehicle_defs`` vType dict)."""
+        return cls(
+            type_id=attrs['id'],
+            accel=float(attrs.get('accel', 2.6)),
+            decel=float(attrs.get('decel', 4.5)),
+            length_m=float(attrs.get('length', 5.0)),
+            min_gap_m=float(attrs.get('minGap', 2.5)),
+            tau_s=float(attrs.get('tau', 1.0)),
+            max_speed_mps=float(attrs.get('maxSpeed', 55.55)),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class FakeDeparture:
+    veh_id: str
+    depart_s: float
+    type_id: str
+    route: tuple[str, ...]
+    depart_lane: int = 0
+    # None: ``departSpeed="max"``.
+    depart_speed_mps: float | None = 0.0
+
+
+@dataclass(slots=True, frozen=True)
+class FakeCollision:
+    """Field names of ``traci.simulation.getCollisions()`` entries."""
+
+    collider: str
+    victim: str
+    colliderType: str
+    victimType: str
+    colliderSpeed: float
+    victimSpeed: float
+    collisionType: str
+    lane: str
+    pos: float
+
+
+@dataclass(slots=True)
+class FakeNetwork:
+    lanes: dict[str, FakeLane]
+    # edge_id -> lane ids by lane index (internal edges included).
+    edges: dict[str, tuple[str, ...]]
+    # (from_lane_id, to_edge_id) -> (via internal lane id or '', to_lane_id).
+    links: dict[tuple[str, str], tuple[str, str]]
+    # via internal lane id -> lane it leads onto.
+    via_targets: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_net_xml(cls, path: str | Path) -> FakeNetwork:
+        root = ET.parse(str(path)).getroot()
+        lanes: dict[str, FakeLane] = {}
+        edges: dict[str, tuple[str, ...]] = {}
+        for edge in root.iter('edge'):
+            edge_id = edge.get('id', '')
+            internal = edge.get('function') == 'internal'
+            edge_lanes = sorted(edge.iter('lane'), key=lambda lane: int(lane.get('index', 0)))
+            for lane in edge_lanes:
+                lane_id = lane.get('id', '')
+                lanes[lane_id] = FakeLane(
+                    lane_id=lane_id,
+                    edge_id=edge_id,
+                    index=int(lane.get('index', 0)),
+                    length_m=float(lane.get('length', 0.0)),
+                    speed_mps=float(lane.get('speed', 13.89)),
+                    internal=internal,
+                )
+            edges[edge_id] = tuple(lane.get('id', '') for lane in edge_lanes)
+        links: dict[tuple[str, str], tuple[str, str]] = {}
+        via_targets: dict[str, str] = {}
+        for connection in root.iter('connection'):
+            from_edge = connection.get('from', '')
+            if from_edge.startswith(':') or from_edge not in edges:
+                continue
+            to_edge = connection.get('to', '')
+            from_lane = edges[from_edge][int(connection.get('fromLane', 0))]
+            to_lane = edges[to_edge][int(connection.get('toLane', 0))]
+            via = connection.get('via', '')
+            # The first connection wins, as in SUMO's best-lane choice.
+            links.setdefault((from_lane, to_edge), (via, to_lane))
+            if via:
+                via_targets[via] = to_lane
+        return cls(lanes=lanes, edges=edges, links=links, via_targets=via_targets)
+
+    def edge_length(self, edge_id: str) -> float:
+        lane_ids = self.edges.get(edge_id, ())
+        return self.lanes[lane_ids[0]].length_m if lane_ids else 0.0
+
+    def via_length(self, from_lane_id: str, to_edge: str) -> float:
+        """Junction length between *from_lane_id* and *to_edge* (0 without a link)."""
+        link = self.links.get((from_lane_id, to_edge))
+        if link is None:
+            from_edge = self.lanes[from_lane_id].edge_id
+            link = next(
+                (self.links[(lane_id, to_edge)] for lane_id in self.edges[from_edge]
+                 if (lane_id, to_edge) in self.links),
+                None,
+            )
+        if link is None or not link[0]:
+            return 0.0
+        return self.lanes[link[0]].length_m
+
+
+@dataclass(slots=True)
+class FakeScenario:
+    network: FakeNetwork
+    vtypes: dict[str, FakeVType]
+    # Sorted by departure time (stable for ties).
+    departures: list[FakeDeparture]
+    routes: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    step_length_s: float | None = None
+
+    @classmethod
+    def from_sumocfg(
+        cls, path: str | Path, *, route_files: Sequence[str | Path] | None = None,
+    ) -> FakeScenario:
+        """Net and routes of a ``.sumocfg``; *route_files* replaces its ``route-files``."""
+        cfg_path = Path(path)
+        root = ET.parse(str(cfg_path)).getroot()
+
+        def value(tag: str) -> str | None:
+            node = root.find(f'.//{tag}')
+            return None if node is None else node.get('value')
+
+        net_file = value('net-file')
+        if net_file is None:
+            raise FakeTraciError(f'{cfg_path} has no net-file')
+        network = FakeNetwork.from_net_xml(cfg_path.parent / net_file)
+        if route_files is None:
+            route_files = [
+                cfg_path.parent / name.strip()
+                for name in (value('route-files') or '').split(',') if name.strip()
+            ]
+        vtypes: dict[str, FakeVType] = {}
+        routes: dict[str, tuple[str, ...]] = {}
+        departures: list[FakeDeparture] = []
+        for route_file in route_files:
+            _read_route_file(Path(route_file), vtypes, routes, departures)
+        departures.sort(key=lambda departure: departure.depart_s)
+        step_length = value('step-length')
+        return cls(
+            network=network, vtypes=vtypes, departures=departures, routes=routes,
+            step_length_s=float(step_length) if step_length is not None else None,
+        )
+
+    @classmethod
+    def from_streams(
+        cls,
+        network: FakeNetwork,
+        *,
+        main_vph: int,
+        ramp_vph: int,
+        cav_ratio: float,
+        duration_s: int,
+        seed: int,
+        arrival_mode: str = 'uniform',
+    ) -> FakeScenario:
+        """Departures of the ``generate_mixed_rou`` streams (per main lane and ramp)."""
+        from ramp.common.vehicle_defs import (
+            HDV_PROFILES,
+            ROUTE_MAIN,
+            ROUTE_RAMP,
+            VTYPE_CAV,
+            VTYPE_HDV,
+        )
+        from ramp.tools.generate_mixed_rou import build_vehicles
+
+        routes = {route['id']: tuple(route['edges'].split()) for route in (ROUTE_MAIN, ROUTE_RAMP)}
+        vtypes = {
+            attrs['id']: FakeVType.from_attrs(attrs)
+            for attrs in (VTYPE_CAV, VTYPE_HDV, *HDV_PROFILES)
+        }
+        vehicles = build_vehicles(
+            cav_ratio=cav_ratio, main_vph=main_vph, ramp_vph=ramp_vph, duration=duration_s,
+            arrival_mode=arrival_mode, rng=random.Random(seed),
+        )
+        departures = [_departure(attrs, routes) for attrs in vehicles]
+        return cls(network=network, vtypes=vtypes, departures=departures, routes=routes)
+
+    def route_for(self, *, edge_id: str, stream: str) -> tuple[str, ...]:
+        """A known route through *edge_id*, preferring one that starts on *stream*."""
+        candidates = [route for route in self.routes.values() if edge_id in route]
+        for route in candidates:
+            if route[0].startswith(f'{stream}_'):
+                return route
+        return candidates[0] if candidates else (edge_id,)
+
+
+def _depart_speed(raw: str | None) -> float | None:
+    if raw is None:
+        return 0.0
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def _depart_lane(raw: str | None) -> int:
+    try:
+        return int(raw) if raw is not None else 0
+    except ValueError:
+        return 0
+
+
+def _departure(attrs: Mapping[str, str], routes: Mapping[str, tuple[str, ...]]) -> FakeDeparture:
+    return FakeDeparture(
+        veh_id=attrs['id'],
+        depart_s=float(attrs.get('depart', 0.0)),
+        type_id=attrs.get('type', 'DEFAULT_VEHTYPE'),
+        route=routes[attrs['route']],
+        depart_lane=_depart_lane(attrs.get('departLane')),
+        depart_speed_mps=_depart_speed(attrs.get('departSpeed')),
+    )
+
+
+def _read_route_file(
+    path: Path,
+    vtypes: dict[str, FakeVType],
+    routes: dict[str, tuple[str, ...]],
+    departures: list[FakeDeparture],
+) -> None:
+    root = ET.parse(str(path)).getroot()
+    for vtype in root.iter('vType'):
+        vtypes[vtype.get('id', '')] = FakeVType.from_attrs(vtype.attrib)
+    for route in root.findall('route'):
+        routes[route.get('id', '')] = tuple(route.get('edges', '').split())
+    for vehicle in root.findall('vehicle'):
+        attrs = dict(vehicle.attrib)
+        inline = vehicle.find('route')
+        if inline is not None:
+            attrs['route'] = f"{attrs['id']}!route"
+            routes[attrs['route']] = tuple(inline.get('edges', '').split())
+        departures.append(_departure(attrs, routes))
+    for flow in root.findall('flow'):
+        begin = float(flow.get('begin', 0.0))
+        end = float(flow.get('end', 3600.0))
+        if flow.get('period') is not None:
+            period = float(flow.get('period', 1.0))
+        elif flow.get('vehsPerHour') is not None:
+            vph = float(flow.get('vehsPerHour', 0.0))
+            period = 3600.0 / vph if vph > 0 else math.inf
+        else:
+            number = int(flow.get('number', 0))
+            period = (end - begin) / number if number > 0 else math.inf
+        index = 0
+        while math.isfinite(period) and begin + index * period < end:
+            attrs = dict(flow.attrib)
+            attrs['id'] = f"{flow.get('id')}.{index}"
+            attrs['depart'] = str(begin + index * period)
+            departures.append(_departure(attrs, routes))
+            index += 1
+
+
+@dataclass(slots=True, frozen=True)
+class ReplayRow:
+    veh_id: str
+    stream: str
+    lane_id: str
+    lane_pos: float
+    speed: float
+    accel: float
+
+
+@dataclass(slots=True)
+class TraceReplay:
+    """Per-step vehicle states from a recorded trace, keyed by time in ms."""
+
+    frames: dict[int, list[ReplayRow]]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> TraceReplay:
+        """Rows with the ``control_zone_trace`` columns (``time``, ``veh_id`` ...)."""
+        frames: dict[int, list[ReplayRow]] = {}
+        for row in rows:
+            time_ms = int(round(1000.0 * float(row['time'])))
+            frames.setdefault(time_ms, []).append(ReplayRow(
+                veh_id=str(row['veh_id']),
+                stream=str(row.get('stream', '')),
+                lane_id=str(row['lane_id']),
+                lane_pos=float(row['lane_pos']),
+                speed=float(row['speed']),
+                accel=float(row.get('accel') or 0.0),
+            ))
+        return cls(frames=frames)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> TraceReplay:
+        with Path(path).open(newline='', encoding='utf-8') as fp:
+            return cls.from_rows(csv.DictReader(fp))
+
+    @property
+    def end_ms(self) -> int:
+        return max(self.frames, default=0)
+
+
+class _Vehicle:
+    __slots__ = (
+        'veh_id', 'vtype', 'route', 'route_index', 'lane', 'pos', 'speed', 'accel',
+        'speed_command', 'slow_down', 'speed_mode', 'lane_change_mode', 'lane_change_request',
+    )
+
+    def __init__(
+        self, veh_id: str, vtype: FakeVType, route: tuple[str, ...], lane: FakeLane,
+        pos: float, speed: float,
+    ) -> None:
+        self.veh_id = veh_id
+        self.vtype = vtype
+        self.route = route
+        self.route_index = 0
+        self.lane = lane
+        self.pos = pos
+        self.speed = speed
+        self.accel = 0.0
+        # -1: no setSpeed in force.
+        self.speed_command = -1.0
+        # (start_s, start_speed, target_speed, duration_s) of a running slowDown.
+        self.slow_down: tuple[float, float, float, float] | None = None
+        self.speed_mode = DEFAULT_SPEED_MODE
+        self.lane_change_mode = DEFAULT_LANE_CHANGE_MODE
+        # (lane_index, until_s) of a changeLane request.
+        self.lane_change_request: tuple[int, float] | None = None
+
+    def __lt__(self, other: _Vehicle) -> bool:
+        return self.pos < other.pos
+
+
+def _safe_speed(vtype: FakeVType, speed: float, gap_m: float, leader_speed: float) -> float:
+    """Krauss safe speed behind a leader *gap_m* ahead (minGap already deducted)."""
+    if gap_m <= 0.0:
+        return 0.0
+    denominator = (speed + leader_speed) / (2.0 * vtype.decel) + vtype.tau_s
+    return max(0.0, leader_speed + (gap_m - leader_speed * vtype.tau_s) / denominator)
+
+
+# Results of ``FakeTraci._continuation`` when a lane has no successor.
+_ROUTE_END = 'route_end'
+_DEAD_END = 'dead_end'
+
+
+class FakeTraci:
+    """``traci``-shaped simulator over a ``FakeScenario`` (see the module docstring).
+
+    Without a *scenario* the one named by ``start``'s command line is loaded;
+    with *replay* (or ``--replay-trace <csv>`` on the command line) vehicles
+    follow the recorded trace instead of the kinematic model.
+    """
+
+    def __init__(
+        self, scenario: FakeScenario | None = None, *, replay: TraceReplay | None = None,
+    ) -> None:
+        self.scenario = scenario
+        self.replay = replay
+        self.vehicle = _VehicleDomain(self)
+        self.lane = _LaneDomain(self)
+        self.edge = _EdgeDomain(self)
+        self.simulation = _SimulationDomain(self)
+        self.step_length_s = 1.0
+        self._step_ms = 1000
+        self._time_ms = 0
+        self._vehicles: dict[str, _Vehicle] = {}
+        self._waiting: list[FakeDeparture] = []
+        self._next_departure = 0
+        self._departed: tuple[str, ...] = ()
+        self._arrived: tuple[str, ...] = ()
+        self._collisions: tuple[FakeCollision, ...] = ()
+        self._subscriptions: dict[str, tuple[tuple[int, ...], dict[int, Any]]] = {}
+        # lane_id -> vehicle ids back to front, built on the first lane query of a step.
+        self._lane_vehicle_ids: dict[str, tuple[str, ...]] | None = None
+        self._replay_departures: dict[str, FakeDeparture] | None = None
+        self._started = False
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self, cmd: Sequence[str], **_: Any) -> tuple[int, str]:
+        options = _parse_cmd(cmd)
+        if self.scenario is None:
+            cfg = options.get('--configuration-file') or options.get('-c')
+            if cfg is None:
+                raise FakeTraciError('fake backend needs --configuration-file or a FakeScenario')
+            route_files = options.get('--route-files')
+            self.scenario = FakeScenario.from_sumocfg(
+                cfg, route_files=route_files.split(',') if route_files else None,
+            )
+        if self.replay is None and options.get('--replay-trace'):
+            self.replay = TraceReplay.from_csv(options['--replay-trace'])
+        step_length = options.get('--step-length')
+        if step_length is not None:
+            self.step_length_s = float(step_length)
+        elif self.scenario.step_length_s is not None:
+            self.step_length_s = self.scenario.step_length_s
+        self._step_ms = max(1, int(round(1000.0 * self.step_length_s)))
+        self._time_ms = 0
+        self._vehicles.clear()
+        self._waiting = []
+        self._next_departure = 0
+        self._subscriptions.clear()
+        self._lane_vehicle_ids = None
+        self._replay_departures = None
+        self._started = True
+        return 0, 'fake'
+
+    def close(self, wait: bool = True) -> None:
+        self._started = False
+
+    def simulationStep(self, step: float = 0.0) -> None:
+        if not self._started:
+            raise FakeTraciError('simulationStep before start')
+        target_ms = int(round(1000.0 * step))
+        while True:
+            self._time_ms += self._step_ms
+            if self.replay is not None:
+                self._advance_replay()
+            else:
+                self._advance_kinematic()
+            self._lane_vehicle_ids = None
+            if self._time_ms >= target_ms:
+                return
+
+    @property
+    def time_s(self) -> float:
+        return self._time_ms / 1000.0
+
+    @property
+    def network(self) -> FakeNetwork:
+        if self.scenario is None:
+            raise FakeTraciError('fake backend not started')
+        return self.scenario.network
+
+    def _vehicle(self, veh_id: str) -> _Vehicle:
+        veh = self._vehicles.get(veh_id)
+        if veh is None:
+            raise FakeTraciError(f'Vehicle {veh_id!r} is not known')
+        return veh
+
+    def _remove(self, veh_id: str) -> None:
+        del self._vehicles[veh_id]
+        self._subscriptions.pop(veh_id, None)
+
+    # -- topology along a route -------------------------------------------
+
+    def _continuation(
+        self, lane: FakeLane, route: tuple[str, ...], route_index: int,
+    ) -> tuple[FakeLane, int] | str:
+        """Lane (and route index) a vehicle enters after *lane*."""
+        network = self.network
+        if lane.internal:
+            target = network.via_targets.get(lane.lane_id)
+            if target is None:
+                return _DEAD_END
+            return network.lanes[target], route_index + 1
+        if route_index + 1 >= len(route):
+            return _ROUTE_END
+        link = network.links.get((lane.lane_id, route[route_index + 1]))
+        if link is None:
+            return _DEAD_END
+        via, to_lane = link
+        if via:
+            return network.lanes[via], route_index
+        return network.lanes[to_lane], route_index + 1
+
+    def _driving_distance(self, veh: _Vehicle, edge_id: str, pos: float) -> float:
+        network = self.network
+        lane = veh.lane
+        route = veh.route
+        if not lane.internal and lane.edge_id == edge_id and pos >= veh.pos:
+            return pos - veh.pos
+        dist = lane.length_m - veh.pos
+        next_index = veh.route_index + 1
+        if not lane.internal and next_index < len(route):
+            dist += network.via_length(lane.lane_id, route[next_index])
+        for index in range(next_index, len(route)):
+            if route[index] == edge_id:
+                return dist + pos
+            dist += network.edge_length(route[index])
+            if index + 1 < len(route):
+                dist += network.via_length(network.edges[route[index]][0], route[index + 1])
+        return INVALID_DOUBLE_VALUE
+
+    # -- kinematic model ---------------------------------------------------
+
+    def _lane_queues(self) -> dict[str, list[_Vehicle]]:
+        queues: dict[str, list[_Vehicle]] = {}
+        for veh in self._vehicles.values():
+            queues.setdefault(veh.lane.lane_id, []).append(veh)
+        for queue in queues.values():
+            queue.sort()
+        return queues
+
+    def _leader(
+        self,
+        veh: _Vehicle,
+        queue: list[_Vehicle],
+        index: int,
+        queues: Mapping[str, list[_Vehicle]],
+    ) -> tuple[float, float] | None:
+        """(gap_m, leader_speed) of whatever *veh* must not run into, if anything."""
+        if index + 1 < len(queue):
+            leader = queue[index + 1]
+            return leader.pos - leader.vtype.length_m - veh.pos - veh.vtype.min_gap_m, leader.speed
+        dist = veh.lane.length_m - veh.pos
+        lane = veh.lane
+        route_index = veh.route_index
+        while dist < _LEADER_LOOKAHEAD_M:
+            nxt = self._continuation(lane, veh.route, route_index)
+            if nxt == _ROUTE_END:
+                return None
+            if nxt == _DEAD_END:
+                # Stop at the end of a lane that does not lead on.
+                return dist, 0.0
+            lane, route_index = nxt
+            ahead = queues.get(lane.lane_id)
+            if ahead:
+                rear = ahead[0]
+                return dist + rear.pos - rear.vtype.length_m - veh.vtype.min_gap_m, rear.speed
+            dist += lane.length_m
+        return None
+
+    def _next_speed(self, veh: _Vehicle, leader: tuple[float, float] | None) -> float:
+        vtype = veh.vtype
+        dt = self.step_length_s
+        speed = veh.speed
+        vmax = min(vtype.max_speed_mps, veh.lane.speed_mps)
+        target = vmax
+        mode = DEFAULT_SPEED_MODE
+        if veh.slow_down is not None:
+            start_s, start_speed, target_speed, duration_s = veh.slow_down
+            fraction = (self.time_s - start_s) / duration_s if duration_s > 0 else 1.0
+            if fraction >= 1.0:
+                # slowDown is transient: afterwards the vehicle drives freely again.
+                veh.slow_down = None
+            else:
+                target = start_speed + (target_speed - start_speed) * fraction
+                mode = veh.speed_mode
+        elif veh.speed_command >= 0.0:
+            target = min(veh.speed_command, vmax)
+            mode = veh.speed_mode
+        upper = speed + vtype.accel * dt if mode & _SPEED_MODE_MAX_ACCEL else math.inf
+        lower = speed - vtype.decel * dt if mode & _SPEED_MODE_MAX_DECEL else 0.0
+        next_speed = min(max(target, lower), upper)
+        if leader is not None and mode & _SPEED_MODE_SAFE_SPEED:
+            next_speed = min(next_speed, _safe_speed(vtype, speed, leader[0], leader[1]))
+        return max(0.0, next_speed)
+
+    def _move_on(self, veh: _Vehicle) -> bool:
+        """Carry *veh* over lane ends; False once it has left the network."""
+        while veh.pos > veh.lane.length_m:
+            nxt = self._continuation(veh.lane, veh.route, veh.route_index)
+            if nxt == _ROUTE_END:
+                return False
+            if nxt == _DEAD_END:
+                veh.pos = veh.lane.length_m
+                return True
+            veh.pos -= veh.lane.length_m
+            veh.lane, veh.route_index = nxt
+        return True
+
+    def _lane_change_target(self, veh: _Vehicle) -> int | None:
+        lane = veh.lane
+        request = veh.lane_change_request
+        if request is not None:
+            lane_index, until_s = request
+            if self.time_s > until_s:
+                veh.lane_change_request = None
+            else:
+                # A request also keeps the vehicle on its lane for the duration.
+                return lane_index if lane_index != lane.index else None
+        if not veh.lane_change_mode & _LC_MODE_STRATEGIC:
+            return None
+        next_index = veh.route_index + 1
+        if next_index >= len(veh.route):
+            return None
+        network = self.network
+        next_edge = veh.route[next_index]
+        if (lane.lane_id, next_edge) in network.links:
+            return None
+        usable = [
+            candidate.index for candidate in map(network.lanes.get, network.edges[lane.edge_id])
+            if candidate is not None and (candidate.lane_id, next_edge) in network.links
+        ]
+        if not usable:
+            return None
+        return min(usable, key=lambda index: abs(index - lane.index))
+
+    def _gap_is_safe(self, veh: _Vehicle, queue: list[_Vehicle]) -> bool:
+        dt = self.step_length_s
+        for other in queue:
+            if other.pos > veh.pos:
+                gap = other.pos - other.vtype.length_m - veh.pos - veh.vtype.min_gap_m
+                safe = _safe_speed(veh.vtype, veh.speed, gap, other.speed)
+                if gap < 0.0 or veh.speed - veh.vtype.decel * dt > safe:
+                    return False
+                break
+        for other in reversed(queue):
+            if other.pos <= veh.pos:
+                gap = veh.pos - veh.vtype.length_m - other.pos - other.vtype.min_gap_m
+                safe = _safe_speed(other.vtype, other.speed, gap, veh.speed)
+                if gap < 0.0 or other.speed - other.vtype.decel * dt > safe:
+                    return False
+                break
+        return True
+
+    def _change_lanes(self, queues: dict[str, list[_Vehicle]]) -> None:
+        network = self.network
+        for veh in list(self._vehicles.values()):
+            if veh.lane.internal:
+                continue
+            target_index = self._lane_change_target(veh)
+            edge_lanes = network.edges[veh.lane.edge_id]
+            if target_index is None or not 0 <= target_index < len(edge_lanes):
+                continue
+            step = 1 if target_index > veh.lane.index else -1
+            new_lane = network.lanes[edge_lanes[veh.lane.index + step]]
+            new_queue = queues.setdefault(new_lane.lane_id, [])
+            if veh.pos > new_lane.length_m or not self._gap_is_safe(veh, new_queue):
+                continue
+            queues[veh.lane.lane_id].remove(veh)
+            insort(new_queue, veh)
+            veh.lane = new_lane
+
+    def _insert(self, queues: dict[str, list[_Vehicle]]) -> tuple[str, ...]:
+        scenario = self.scenario
+        assert scenario is not None
+        departures = scenario.departures
+        while (
+            self._next_departure < len(departures)
+            and int(round(1000.0 * departures[self._next_departure].depart_s)) <= self._time_ms
+        ):
+            self._waiting.append(departures[self._next_departure])
+            self._next_departure += 1
+        network = self.network
+        departed: list[str] = []
+        still_waiting: list[FakeDeparture] = []
+        for departure in self._waiting:
+            vtype = scenario.vtypes.get(departure.type_id) or FakeVType(type_id=departure.type_id)
+            edge_lanes = network.edges[departure.route[0]]
+            lane_index = departure.depart_lane if departure.depart_lane < len(edge_lanes) else 0
+            lane = network.lanes[edge_lanes[lane_index]]
+            speed = departure.depart_speed_mps
+            if speed is None:
+                speed = min(vtype.max_speed_mps, lane.speed_mps)
+            pos = vtype.length_m
+            queue = queues.setdefault(lane.lane_id, [])
+            if queue:
+                rear = queue[0]
+                gap = rear.pos - rear.vtype.length_m - pos - vtype.min_gap_m
+                if gap < 0.0:
+                    still_waiting.append(departure)
+                    continue
+                speed = min(speed, _safe_speed(vtype, speed, gap, rear.speed))
+            veh = _Vehicle(departure.veh_id, vtype, departure.route, lane, pos, speed)
+            self._vehicles[veh.veh_id] = veh
+            queue.insert(0, veh)
+            departed.append(veh.veh_id)
+        self._waiting = still_waiting
+        return tuple(departed)
+
+    def _detect_collisions(self, queues: Mapping[str, list[_Vehicle]]) -> tuple[FakeCollision, ...]:
+        collisions: list[FakeCollision] = []
+        for lane_id, queue in queues.items():
+            for follower, leader in zip(queue, queue[1:]):
+                if leader.pos - leader.vtype.length_m < follower.pos:
+                    collisions.append(FakeCollision(
+                        collider=follower.veh_id, victim=leader.veh_id,
+                        colliderType=follower.vtype.type_id, victimType=leader.vtype.type_id,
+                        colliderSpeed=follower.speed, victimSpeed=leader.speed,
+                        collisionType='collision', lane=lane_id, pos=follower.pos,
+                    ))
+        return tuple(collisions)
+
+    def _advance_kinematic(self) -> None:
+        dt = self.step_length_s
+        queues = self._lane_queues()
+        speeds = [
+            (veh, self._next_speed(veh, self._leader(veh, queue, index, queues)))
+            for queue in queues.values()
+            for index, veh in enumerate(queue)
+        ]
+        arrived: list[str] = []
+        for veh, speed in speeds:
+            veh.accel = (speed - veh.speed) / dt
+            veh.speed = speed
+            veh.pos += speed * dt
+            if not self._move_on(veh):
+                arrived.append(veh.veh_id)
+        for veh_id in arrived:
+            self._remove(veh_id)
+        queues = self._lane_queues()
+        self._change_lanes(queues)
+        self._departed = self._insert(queues)
+        self._arrived = tuple(arrived)
+        self._collisions = self._detect_collisions(queues)
+
+    # -- replay ------------------------------------------------------------
+
+    def _advance_replay(self) -> None:
+        assert self.replay is not None and self.scenario is not None
+        scenario = self.scenario
+        network = self.network
+        rows = self.replay.frames.get(self._time_ms, [])
+        departed: list[str] = []
+        present: set[str] = set()
+        for row in rows:
+            lane = network.lanes.get(row.lane_id)
+            if lane is None:
+                continue
+            veh = self._vehicles.get(row.veh_id)
+            if veh is None:
+                departure = self._departure_by_id().get(row.veh_id)
+                if departure is not None:
+                    vtype_id, route = departure.type_id, departure.route
+                else:
+                    vtype_id = next(iter(scenario.vtypes), 'DEFAULT_VEHTYPE')
+                    route = scenario.route_for(edge_id=lane.edge_id, stream=row.stream)
+                vtype = scenario.vtypes.get(vtype_id) or FakeVType(type_id=vtype_id)
+                veh = _Vehicle(row.veh_id, vtype, route, lane, row.lane_pos, row.speed)
+                self._vehicles[row.veh_id] = veh
+                departed.append(row.veh_id)
+            if not lane.internal and lane.edge_id in veh.route[veh.route_index:]:
+                veh.route_index = veh.route.index(lane.edge_id, veh.route_index)
+            veh.lane = lane
+            veh.pos = row.lane_pos
+            veh.speed = row.speed
+            veh.accel = row.accel
+            present.add(row.veh_id)
+        arrived = tuple(veh_id for veh_id in self._vehicles if veh_id not in present)
+        for veh_id in arrived:
+            self._remove(veh_id)
+        self._departed = tuple(departed)
+        self._arrived = arrived
+        self._collisions = ()
+
+    def _departure_by_id(self) -> dict[str, FakeDeparture]:
+        if self._replay_departures is None:
+            assert self.scenario is not None
+            self._replay_departures = {
+                departure.veh_id: departure for departure in self.scenario.departures
+            }
+        return self._replay_departures
+
+    def lane_vehicle_ids(self, lane_id: str) -> tuple[str, ...]:
+        if self._lane_vehicle_ids is None:
+            self._lane_vehicle_ids = {
+                queue_lane_id: tuple(veh.veh_id for veh in queue)
+                for queue_lane_id, queue in self._lane_queues().items()
+            }
+        return self._lane_vehicle_ids.get(lane_id, ())
+
+    # -- subscriptions -----------------------------------------------------
+
+    def _subscription_value(self, veh: _Vehicle, var_id: int, parameters: Mapping[int, Any]) -> Any:
+        if var_id == VAR_ROAD_ID:
+            return veh.lane.edge_id
+        if var_id == VAR_LANE_ID:
+            return veh.lane.lane_id
+        if var_id == VAR_LANEPOSITION:
+            return veh.pos
+        if var_id == VAR_SPEED:
+            return veh.speed
+        if var_id == VAR_ACCELERATION:
+            return veh.accel
+        if var_id == DISTANCE_REQUEST:
+            _, _, (edge_id, pos, _), _ = parameters[DISTANCE_REQUEST]
+            return self._driving_distance(veh, edge_id, float(pos))
+        raise FakeTraciError(f'Unsupported subscription variable 0x{var_id:02x}')
+
+
+def _parse_cmd(cmd: Sequence[str]) -> dict[str, str]:
+    options: dict[str, str] = {}
+    args = list(cmd[1:])
+    for index, arg in enumerate(args):
+        if arg.startswith('-') and index + 1 < len(args):
+            options[arg] = args[index + 1]
+    return options
+
+
+class _Domain:
+    __slots__ = ('_sim',)
+
+    def __init__(self, sim: FakeTraci) -> None:
+        self._sim = sim
+
+
+class _VehicleDomain(_Domain):
+    __slots__ = ()
+
+    def getIDList(self) -> tuple[str, ...]:
+        return tuple(self._sim._vehicles)
+
+    def getIDCount(self) -> int:
+        return len(self._sim._vehicles)
+
+    def getRoadID(self, veh_id: str) -> str:
+        return self._sim._vehicle(veh_id).lane.edge_id
+
+    def getLaneID(self, veh_id: str) -> str:
+        return self._sim._vehicle(veh_id).lane.lane_id
+
+    def getLaneIndex(self, veh_id: str) -> int:
+        return self._sim._vehicle(veh_id).lane.index
+
+    def getLanePosition(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).pos
+
+    def getSpeed(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).speed
+
+    def getAcceleration(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).accel
+
+    def getAccel(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).vtype.accel
+
+    def getDecel(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).vtype.decel
+
+    def getLength(self, veh_id: str) -> float:
+        return self._sim._vehicle(veh_id).vtype.length_m
+
+    def getTypeID(self, veh_id: str) -> str:
+        return self._sim._vehicle(veh_id).vtype.type_id
+
+    def getRoute(self, veh_id: str) -> tuple[str, ...]:
+        return self._sim._vehicle(veh_id).route
+
+    def getRouteIndex(self, veh_id: str) -> int:
+        return self._sim._vehicle(veh_id).route_index
+
+    def getDrivingDistance(
+        self, veh_id: str, edge_id: str, pos: float, laneIndex: int = 0
+    ) -> float:
+        return self._sim._driving_distance(self._sim._vehicle(veh_id), edge_id, float(pos))
+
+    def getSpeedMode(self, veh_id: str) -> int:
+        return self._sim._vehicle(veh_id).speed_mode
+
+    def getLaneChangeMode(self, veh_id: str) -> int:
+        return self._sim._vehicle(veh_id).lane_change_mode
+
+    def setSpeed(self, veh_id: str, speed: float) -> None:
+        veh = self._sim._vehicle(veh_id)
+        veh.speed_command = float(speed)
+        veh.slow_down = None
+
+    def slowDown(self, veh_id: str, speed: float, duration: float) -> None:
+        veh = self._sim._vehicle(veh_id)
+        veh.slow_down = (self._sim.time_s, veh.speed, float(speed), float(duration))
+
+    def setSpeedMode(self, veh_id: str, speedMode: int) -> None:
+        self._sim._vehicle(veh_id).speed_mode = int(speedMode)
+
+    def setLaneChangeMode(self, veh_id: str, laneChangeMode: int) -> None:
+        self._sim._vehicle(veh_id).lane_change_mode = int(laneChangeMode)
+
+    def changeLane(self, veh_id: str, laneIndex: int, duration: float) -> None:
+        veh = self._sim._vehicle(veh_id)
+        veh.lane_change_request = (int(laneIndex), self._sim.time_s + float(duration))
+
+    def subscribe(
+        self,
+        objectID: str,
+        varIDs: Sequence[int] = (VAR_ROAD_ID, VAR_LANEPOSITION),
+        begin: float = -1073741824.0,
+        end: float = -1073741824.0,
+        parameters: Mapping[int, Any] | None = None,
+    ) -> None:
+        self._sim._vehicle(objectID)
+        self._sim._subscriptions[objectID] = (tuple(varIDs), dict(parameters or {}))
+
+    def getAllSubscriptionResults(self) -> dict[str, dict[int, Any]]:
+        sim = self._sim
+        results: dict[str, dict[int, Any]] = {}
+        for veh_id, (var_ids, parameters) in sim._subscriptions.items():
+            veh = sim._vehicles[veh_id]
+            results[veh_id] = {
+                var_id: sim._subscription_value(veh, var_id, parameters) for var_id in var_ids
+            }
+        return results
+
+
+class _LaneDomain(_Domain):
+    __slots__ = ()
+
+    def getIDList(self) -> tuple[str, ...]:
+        return tuple(self._sim.network.lanes)
+
+    def getLength(self, lane_id: str) -> float:
+        lane = self._sim.network.lanes.get(lane_id)
+        if lane is None:
+            raise FakeTraciError(f'Lane {lane_id!r} is not known')
+        return lane.length_m
+
+    def getMaxSpeed(self, lane_id: str) -> float:
+        return self._sim.network.lanes[lane_id].speed_mps
+
+    def getLastStepVehicleIDs(self, lane_id: str) -> tuple[str, ...]:
+        return self._sim.lane_vehicle_ids(lane_id)
+
+
+class _EdgeDomain(_Domain):
+    __slots__ = ()
+
+    def getIDList(self) -> tuple[str, ...]:
+        return tuple(self._sim.network.edges)
+
+    def getLaneNumber(self, edge_id: str) -> int:
+        lanes = self._sim.network.edges.get(edge_id)
+        if lanes is None:
+            raise FakeTraciError(f'Edge {edge_id!r} is not known')
+        return len(lanes)
+
+
+class _SimulationDomain(_Domain):
+    __slots__ = ()
+
+    def getTime(self) -> float:
+        return self._sim.time_s
+
+    def getDeltaT(self) -> float:
+        return self._sim.step_length_s
+
+    def getDepartedIDList(self) -> tuple[str, ...]:
+        return self._sim._departed
+
+    def getArrivedIDList(self) -> tuple[str, ...]:
+        return self._sim._arrived
+
+    def getCollisions(self) -> tuple[FakeCollision, ...]:
+        return self._sim._collisions
+
+    def getMinExpectedNumber(self) -> int:
+        sim = self._sim
+        if sim.replay is not None:
+            return len(sim._vehicles) + int(sim._time_ms < sim.replay.end_ms)
+        scenario = sim.scenario
+        pending = len(scenario.departures) - sim._next_departure if scenario is not None else 0
+        return len(sim._vehicles) + len(sim._waiting) + pending
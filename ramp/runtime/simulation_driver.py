@@ -1,8 +1,35 @@
 from __future__ import annotations
 
+import importlib
 from dataclasses import dataclass
 from typing import Any
 
+SUMO_BACKEND_TRACI = 'traci'
+SUMO_BACKEND_LIBSUMO = 'libsumo'
+SUMO_BACKENDS = (SUMO_BACKEND_TRACI, SUMO_BACKEND_LIBSUMO)
+# In-memory stand-in (``ramp.runtime.fake_traci``); no SUMO process at all.
+SUMO_BACKEND_FAKE = 'fake'
+SIMULATION_BACKENDS = (*SUMO_BACKENDS, SUMO_BACKEND_FAKE)
+
+
+def import_sumo_backend(backend: str) -> Any:
+    """Return the ``traci``-shaped module for *backend*.
+
+    ``traci`` talks to a SUMO process over a socket; ``libsumo`` embeds SUMO
+    in this process and exposes the same domain API (``vehicle``, ``lane``,
+    ``simulation`` ...) without per-call serialization.  ``fake`` returns a
+    fresh ``FakeTraci`` instead of a module.  Callers pass the returned
+    object wherever a ``traci`` argument is expected.
+    """
+    if backend == SUMO_BACKEND_FAKE:
+        from ramp.runtime.fake_traci import FakeTraci
+
+        return FakeTraci()
+    if backend not in SUMO_BACKENDS:
+        valid = ', '.join(SIMULATION_BACKENDS)
+        raise ValueError(f'Unknown SUMO backend {backend!r}. Valid: {valid}')
+    return importlib.import_module(backend)
+
 
 @dataclass(slots=True)
 class SimulationDriver:
@@ -24,4 +51,3 @@ class SimulationDriver:
         if self._started:
             self.traci.close()
             self._started = False
-
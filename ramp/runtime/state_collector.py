@@ -3,33 +3,16 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
-
-def _stream_from_route(route_edges: tuple[str, ...] | list[str]) -> str:
-    if not route_edges:
-        return 'unknown'
-    first = route_edges[0]
-    if first.startswith('main_'):
-        return 'main'
-    if first.startswith('ramp_'):
-        return 'ramp'
-    return 'unknown'
-
-
-def _stream_vmax(
-    stream: str,
-    main_vmax_mps: float,
-    ramp_vmax_mps: float,
-    *,
-    aux_vmax_mps: float | None = None,
-    lane_id: str = '',
-) -> float:
-    if stream == 'main':
-        return main_vmax_mps
-    if stream == 'ramp':
-        if aux_vmax_mps is not None and lane_id.startswith('main_h3_'):
-            return aux_vmax_mps
-        return ramp_vmax_mps
-    return max(main_vmax_mps, ramp_vmax_mps)
+from ramp.runtime.subscription import (
+    COLLECTOR_BACKEND_POLLING,
+    COLLECTOR_BACKEND_SUBSCRIPTION,
+    COLLECTOR_BACKENDS,
+    PollingVehicleReader,
+    SubscriptionVehicleReader,
+)
+from ramp.runtime.vehicle_registry import VehicleRegistry
+from ramp.runtime.vehicle_table import VehicleTable, VehicleTableView
+from ramp.runtime.vmax import stream_vmax
 
 
 def _is_conflict_lane(stream: str, edge_id: str, lane_index: int) -> bool:
@@ -55,12 +38,20 @@ def _build_edge_length_cache(route_edges: tuple[str, ...], traci) -> dict[str, f
     return lengths
 
 
-def _distance_to_merge(veh_id: str, merge_edge: str, traci) -> float | None:
+def _distance_to_merge(
+    veh_id: str,
+    merge_edge: str,
+    traci,
+    reader: PollingVehicleReader | SubscriptionVehicleReader | None = None,
+) -> float | None:
     # Prefer TraCI driving distance to avoid internal-edge artifacts (e.g. ":n_merge_*").
     # Our previous implementation mixed `routeIndex` (route edge) with `lanePosition` (current lane),
     # which breaks when SUMO places a vehicle on a junction internal edge not present in the route.
     try:
-        dist = float(traci.vehicle.getDrivingDistance(veh_id, merge_edge, 0.0))
+        if reader is None:
+            dist = float(traci.vehicle.getDrivingDistance(veh_id, merge_edge, 0.0))
+        else:
+            dist = reader.driving_distance(veh_id, merge_edge)
         if dist < 0:
             return None
         return dist
@@ -91,8 +82,10 @@ def _distance_to_merge(veh_id: str, merge_edge: str, traci) -> float | None:
 @dataclass(slots=True)
 class CollectedState:
     active_vehicle_ids: set[str]
-    control_zone_state: dict[str, dict[str, float | str]]
-    ttc_observation_state: dict[str, dict[str, float | str]]
+    # Legacy dict-shaped views over ``vehicle_table`` (rows materialize lazily).
+    control_zone_state: VehicleTableView
+    ttc_observation_state: VehicleTableView
+    vehicle_table: VehicleTable
 
 
 @dataclass(slots=True)
@@ -111,68 +104,116 @@ class StateCollector:
     cross_time: dict[str, float] = field(default_factory=dict)
     prev_stopped: dict[str, bool] = field(default_factory=dict)
     stop_count: int = 0
-    entry_order: list[str] = field(default_factory=list)
+    # Queue of vehicles that entered the control zone and have neither
+    # crossed the merge point nor left the simulation, in entry order (dict
+    # insertion order).  Admission and removal are O(1) and the FIFO
+    # schedule only walks this queue, so its size tracks the control-zone
+    # population rather than the whole run.
     entry_rank: dict[str, int] = field(default_factory=dict)
+    entry_count: int = 0
     fifo_natural_eta: dict[str, float] = field(default_factory=dict)
     fifo_target_time: dict[str, float] = field(default_factory=dict)
     fifo_last_assigned_target: float | None = None
+    # 'polling' issues one TraCI getter per field; 'subscription' batches all
+    # per-vehicle fields into the simulationStep response (same output).
+    backend: str = COLLECTOR_BACKEND_POLLING
+    _reader: PollingVehicleReader | SubscriptionVehicleReader | None = None
+    vehicle_table: VehicleTable = field(default_factory=VehicleTable)
+    # Lifetime attributes (route/stream/length/type); shared with the rest of
+    # the runtime when the caller passes one in, otherwise created on first use.
+    vehicle_registry: VehicleRegistry | None = None
+
+    def __post_init__(self) -> None:
+        if self.backend not in COLLECTOR_BACKENDS:
+            raise ValueError(
+                f'Unknown collector backend {self.backend!r}. Valid: {", ".join(COLLECTOR_BACKENDS)}'
+            )
+
+    def _vehicle_reader(self, traci: Any) -> PollingVehicleReader | SubscriptionVehicleReader:
+        if self._reader is None or self._reader.traci is not traci:
+            if self.backend == COLLECTOR_BACKEND_SUBSCRIPTION:
+                self._reader = SubscriptionVehicleReader(traci=traci, merge_edge=self.merge_edge)
+            else:
+                self._reader = PollingVehicleReader(traci=traci)
+        return self._reader
+
+    @property
+    def vehicle_reader(self) -> PollingVehicleReader | SubscriptionVehicleReader | None:
+        """The reader the last ``collect`` used (``None`` before the first call)."""
+        return self._reader
+
+    def _dequeue(self, veh_id: str) -> None:
+        self.entry_rank.pop(veh_id, None)
+        self.fifo_natural_eta.pop(veh_id, None)
+        self.fifo_target_time.pop(veh_id, None)
+
+    def _registry(self, traci: Any) -> VehicleRegistry:
+        if self.vehicle_registry is None:
+            self.vehicle_registry = VehicleRegistry(traci=traci)
+        return self.vehicle_registry
 
     def collect(self, *, sim_time: float, traci: Any) -> CollectedState:
-        active_vehicle_ids = set(traci.vehicle.getIDList())
-        control_zone_state: dict[str, dict[str, float | str]] = {}
-        ttc_observation_state: dict[str, dict[str, float | str]] = {}
+        registry = self._registry(traci)
+        for veh_id in registry.sync():
+            self._dequeue(veh_id)
+            self.prev_stopped.pop(veh_id, None)
+        reader = self._vehicle_reader(traci)
+        active_vehicle_ids = reader.refresh()
+        table = self.vehicle_table
+        table.begin_step()
 
         for veh_id in sorted(active_vehicle_ids):
-            route_edges = tuple(traci.vehicle.getRoute(veh_id))
-            stream = _stream_from_route(route_edges)
-            road_id = traci.vehicle.getRoadID(veh_id)
+            stream = registry.stream(veh_id)
+            road_id = reader.road_id(veh_id)
 
             if road_id == self.merge_edge and veh_id not in self.crossed_merge:
                 self.crossed_merge.add(veh_id)
                 self.cross_time[veh_id] = sim_time
+                self._dequeue(veh_id)
 
-            d_to_merge = _distance_to_merge(veh_id, self.merge_edge, traci)
+            d_to_merge = _distance_to_merge(veh_id, self.merge_edge, traci, reader)
             if d_to_merge is None or d_to_merge <= 0:
                 continue
             if d_to_merge > self.control_zone_length_m:
                 continue
 
-            lane_id = traci.vehicle.getLaneID(veh_id)
-            lane_pos = float(traci.vehicle.getLanePosition(veh_id))
-            speed = float(traci.vehicle.getSpeed(veh_id))
-            accel = float(traci.vehicle.getAcceleration(veh_id))
-            length = float(traci.vehicle.getLength(veh_id))
-            ttc_observation_state[veh_id] = {
-                'stream': stream,
-                'edge_id': road_id,
-                'lane_id': lane_id,
-                'lane_pos': lane_pos,
-                'd_to_merge': d_to_merge,
-                'speed': speed,
-                'accel': accel,
-                'length': length,
-            }
-
+            lane_id = reader.lane_id(veh_id)
+            speed = reader.speed(veh_id)
+            in_control_zone = True
             if self.control_mode == 'E-ctrl-1' and not road_id.startswith(':'):
                 lane_index = int(lane_id.split('_')[-1]) if '_' in lane_id else -1
-                if not _is_conflict_lane(stream, road_id, lane_index):
-                    continue
+                in_control_zone = _is_conflict_lane(stream, road_id, lane_index)
+
+            table.put(
+                veh_id,
+                stream=stream,
+                edge_id=road_id,
+                lane_id=lane_id,
+                lane_pos=reader.lane_pos(veh_id),
+                d_to_merge=d_to_merge,
+                speed=speed,
+                accel=reader.accel(veh_id),
+                length=registry.length(veh_id),
+                in_control_zone=in_control_zone,
+            )
+            if not in_control_zone:
+                continue
 
             if veh_id not in self.entered_control:
                 self.entered_control.add(veh_id)
-                self.entry_order.append(veh_id)
-                self.entry_rank[veh_id] = len(self.entry_order)
+                self.entry_count += 1
+                self.entry_rank[veh_id] = self.entry_count
                 self.entry_info[veh_id] = {
                     't_entry': sim_time,
                     'd_entry': d_to_merge,
                     'stream': stream,
                 }
                 if self.policy == 'fifo':
-                    stream_vmax = _stream_vmax(
+                    vmax = stream_vmax(
                         stream, self.main_vmax_mps, self.ramp_vmax_mps,
                         aux_vmax_mps=self.aux_vmax_mps, lane_id=lane_id,
                     )
-                    natural_eta_at_entry = sim_time + d_to_merge / stream_vmax
+                    natural_eta_at_entry = sim_time + d_to_merge / vmax
                     if self.fifo_last_assigned_target is None:
                         target_cross_time = max(natural_eta_at_entry, sim_time + self.fifo_gap_s)
                     else:
@@ -189,18 +230,10 @@ class StateCollector:
                 self.stop_count += 1
             self.prev_stopped[veh_id] = is_stopped
 
-            control_zone_state[veh_id] = {
-                'stream': stream,
-                'edge_id': road_id,
-                'lane_id': lane_id,
-                'lane_pos': lane_pos,
-                'd_to_merge': d_to_merge,
-                'speed': speed,
-                'accel': accel,
-            }
-
+        table.end_step(active_vehicle_ids)
         return CollectedState(
             active_vehicle_ids=active_vehicle_ids,
-            control_zone_state=control_zone_state,
-            ttc_observation_state=ttc_observation_state,
+            control_zone_state=table.control_zone_view(),
+            ttc_observation_state=table.observation_view(),
+            vehicle_table=table,
         )
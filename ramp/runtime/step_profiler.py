@@ -0,0 +1,165 @@
+"""Per-stage wall time and TraCI call counts for the ``run_experiment`` step loop.
+
+``StepProfiler`` splits each step into consecutive laps: ``lap(stage)``
+charges the time since the previous lap (or ``begin_step``) to *stage*, so
+the stages of a step add up to its wall time and a stage may be lapped
+several times per step (e.g. ``evidence`` before and after scheduling).
+Each lap reads ``perf_counter`` twice and, when a ``CountingTraci`` is
+attached, sums the current step's tally so the TraCI calls issued during a
+lap are charged to the same stage; that bookkeeping itself falls between
+two laps and is not charged to any stage.
+
+Per-step totals are kept in flat ``array`` columns (one per stage), from
+which ``summary`` builds the ``profile.json`` percentiles and
+``write_timeline`` the optional per-step CSV.  When profiling is off the
+runner holds ``None`` instead of a profiler and pays one ``is not None``
+test per lap site.
+
+The schedulers lap their own sub-stages (``zone_a``, ``dp``, ``zone_b``,
+``zone_c``) through an optional ``profiler`` attribute; the runner laps the
+rest.  With the async trace writer, ``trace_io`` covers building and
+queueing rows on the step thread, not the writer thread's file I/O.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ramp.runtime.traci_counter import CountingTraci
+
+STAGE_SIM_STEP = 'sim_step'
+STAGE_COLLECT = 'collect'
+STAGE_TTC = 'ttc'
+STAGE_ZONE_A = 'zone_a'
+STAGE_DP = 'dp'
+STAGE_ZONE_B = 'zone_b'
+STAGE_ZONE_C = 'zone_c'
+STAGE_COMMAND = 'command'
+STAGE_CONTROLLER = 'controller'
+STAGE_EVIDENCE = 'evidence'
+STAGE_TRACE_IO = 'trace_io'
+STAGES = (
+    STAGE_SIM_STEP,
+    STAGE_COLLECT,
+    STAGE_TTC,
+    STAGE_ZONE_A,
+    STAGE_DP,
+    STAGE_ZONE_B,
+    STAGE_ZONE_C,
+    STAGE_COMMAND,
+    STAGE_CONTROLLER,
+    STAGE_EVIDENCE,
+    STAGE_TRACE_IO,
+)
+
+_PERCENTILES = (50, 95, 99)
+
+
+class StepProfiler:
+    """Lap timer over ``STAGES`` with per-step columns."""
+
+    __slots__ = (
+        'traci_counter', 'step_times_s', 'stage_ms', 'stage_calls',
+        '_index', '_step_ms', '_step_calls', '_last_t', '_last_calls',
+    )
+
+    def __init__(self, *, traci_counter: CountingTraci | None = None) -> None:
+        self.traci_counter = traci_counter
+        self.step_times_s = array('d')
+        self.stage_ms = {stage: array('d') for stage in STAGES}
+        self.stage_calls = {stage: array('q') for stage in STAGES}
+        self._index = {stage: index for index, stage in enumerate(STAGES)}
+        self._step_ms = [0.0] * len(STAGES)
+        self._step_calls = [0] * len(STAGES)
+        self._last_t = 0.0
+        self._last_calls = 0
+
+    def _calls_so_far(self) -> int:
+        counter = self.traci_counter
+        return sum(counter.counts.values()) if counter is not None else 0
+
+    def begin_step(self) -> None:
+        self._step_ms = [0.0] * len(STAGES)
+        self._step_calls = [0] * len(STAGES)
+        self._last_calls = self._calls_so_far()
+        self._last_t = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        index = self._index[stage]
+        self._step_ms[index] += 1000.0 * (now - self._last_t)
+        if self.traci_counter is not None:
+            calls = self._calls_so_far()
+            self._step_calls[index] += calls - self._last_calls
+            self._last_calls = calls
+        self._last_t = time.perf_counter()
+
+    def end_step(self, stage: str, *, sim_time_s: float) -> None:
+        """Lap the step's final *stage* and store the step's totals."""
+        self.lap(stage)
+        self.step_times_s.append(sim_time_s)
+        for index, stage_name in enumerate(STAGES):
+            self.stage_ms[stage_name].append(self._step_ms[index])
+            self.stage_calls[stage_name].append(self._step_calls[index])
+
+    @property
+    def steps(self) -> int:
+        return len(self.stage_ms[STAGE_SIM_STEP])
+
+    def summary(self) -> dict[str, Any]:
+        """``profile.json`` payload: per-stage percentiles, totals and shares."""
+        steps = self.steps
+        step_ms = np.zeros(steps, dtype=np.float64)
+        for stage in STAGES:
+            step_ms += np.frombuffer(self.stage_ms[stage], dtype=np.float64, count=steps)
+        total_ms = float(step_ms.sum())
+
+        def stats(values: np.ndarray) -> dict[str, float]:
+            if not len(values):
+                return {'mean': 0.0, **{f'p{q}': 0.0 for q in _PERCENTILES}, 'max': 0.0}
+            quantiles = np.percentile(values, _PERCENTILES)
+            return {
+                'mean': float(values.mean()),
+                **{f'p{q}': float(value) for q, value in zip(_PERCENTILES, quantiles)},
+                'max': float(values.max()),
+            }
+
+        stages: dict[str, Any] = {}
+        for stage in STAGES:
+            values = np.frombuffer(self.stage_ms[stage], dtype=np.float64, count=steps)
+            calls = np.frombuffer(self.stage_calls[stage], dtype=np.int64, count=steps)
+            stage_total_ms = float(values.sum())
+            stages[stage] = {
+                'total_ms': stage_total_ms,
+                'share': stage_total_ms / total_ms if total_ms > 0 else 0.0,
+                'ms': stats(values),
+                'traci_calls_total': int(calls.sum()),
+                'traci_calls_per_step': float(calls.mean()) if steps else 0.0,
+            }
+        return {
+            'steps': steps,
+            'traci_calls_counted': self.traci_counter is not None,
+            'step_ms': stats(step_ms),
+            'total_ms': total_ms,
+            'stages': stages,
+        }
+
+    def write_timeline(self, path: Path) -> None:
+        """One CSV row per step: ``time`` then ``<stage>_ms`` / ``<stage>_calls``."""
+        fieldnames = ['time']
+        for stage in STAGES:
+            fieldnames.extend((f'{stage}_ms', f'{stage}_calls'))
+        with path.open('w', newline='', encoding='utf-8') as fp:
+            writer = csv.writer(fp)
+            writer.writerow(fieldnames)
+            for step in range(self.steps):
+                row: list[float | int] = [self.step_times_s[step]]
+                for stage in STAGES:
+                    row.extend((self.stage_ms[stage][step], self.stage_calls[stage][step]))
+                writer.writerow(row)
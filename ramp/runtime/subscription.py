@@ -0,0 +1,149 @@
+"""TraCI variable subscriptions for per-step vehicle state.
+
+The polling path in ``StateCollector.collect`` issues one TraCI round-trip per
+field per vehicle.  Subscribing each vehicle once to every field the collector
+reads lets SUMO ship all values inside the ``simulationStep`` response, so the
+per-vehicle reads below are plain dict lookups.
+
+Both readers expose the same accessors and return the same Python types, so
+the collector output is bit-identical whichever one is used.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+# TraCI protocol constants (mirrors ``traci.constants``; kept local so this
+# module imports without SUMO tools on sys.path).
+VAR_SPEED = 0x40
+VAR_ROAD_ID = 0x50
+VAR_LANE_ID = 0x51
+VAR_LANEPOSITION = 0x56
+VAR_ACCELERATION = 0x72
+DISTANCE_REQUEST = 0x83
+REQUEST_DRIVINGDIST = 0x01
+
+COLLECTOR_BACKEND_POLLING = 'polling'
+COLLECTOR_BACKEND_SUBSCRIPTION = 'subscription'
+COLLECTOR_BACKENDS = (COLLECTOR_BACKEND_POLLING, COLLECTOR_BACKEND_SUBSCRIPTION)
+
+# Route and length are lifetime attributes served by ``VehicleRegistry``; only
+# values that change every step are subscribed.
+STATE_VARIABLES: tuple[int, ...] = (
+    VAR_ROAD_ID,
+    DISTANCE_REQUEST,
+    VAR_LANE_ID,
+    VAR_LANEPOSITION,
+    VAR_SPEED,
+    VAR_ACCELERATION,
+)
+
+
+def driving_distance_parameters(merge_edge: str) -> dict[int, tuple]:
+    """Subscription parameters equivalent to ``getDrivingDistance(veh, merge_edge, 0.0)``."""
+    return {
+        DISTANCE_REQUEST: ('tru', 2, (merge_edge, 0.0, 0), REQUEST_DRIVINGDIST),
+    }
+
+
+@dataclass(slots=True)
+class PollingVehicleReader:
+    """Per-call TraCI getters (one round-trip per field)."""
+
+    traci: Any
+
+    def refresh(self) -> set[str]:
+        return set(self.traci.vehicle.getIDList())
+
+    def road_id(self, veh_id: str) -> str:
+        return self.traci.vehicle.getRoadID(veh_id)
+
+    def driving_distance(self, veh_id: str, merge_edge: str) -> float:
+        return float(self.traci.vehicle.getDrivingDistance(veh_id, merge_edge, 0.0))
+
+    def lane_id(self, veh_id: str) -> str:
+        return self.traci.vehicle.getLaneID(veh_id)
+
+    def lane_pos(self, veh_id: str) -> float:
+        return float(self.traci.vehicle.getLanePosition(veh_id))
+
+    def speed(self, veh_id: str) -> float:
+        return float(self.traci.vehicle.getSpeed(veh_id))
+
+    def accel(self, veh_id: str) -> float:
+        return float(self.traci.vehicle.getAcceleration(veh_id))
+
+
+@dataclass(slots=True)
+class SubscriptionVehicleReader:
+    """Batched reader backed by ``traci.vehicle.subscribe``.
+
+    New vehicles are subscribed the first step they appear; SUMO drops the
+    subscription itself on arrival.  Any field missing from the subscription
+    result (SUMO reports per-variable errors by omitting the value) is read
+    through the polling path so behaviour matches ``PollingVehicleReader``.
+    """
+
+    traci: Any
+    merge_edge: str
+    subscribed_ids: set[str] = field(default_factory=set)
+    _results: dict[str, dict[int, Any]] = field(default_factory=dict)
+    _fallback: PollingVehicleReader | None = None
+
+    def refresh(self) -> set[str]:
+        active_vehicle_ids = set(self.traci.vehicle.getIDList())
+        self.subscribed_ids &= active_vehicle_ids
+        parameters = driving_distance_parameters(self.merge_edge)
+        for veh_id in sorted(active_vehicle_ids - self.subscribed_ids):
+            self.traci.vehicle.subscribe(veh_id, STATE_VARIABLES, parameters=parameters)
+            self.subscribed_ids.add(veh_id)
+        self._results = self.traci.vehicle.getAllSubscriptionResults()
+        return active_vehicle_ids
+
+    def _polling(self) -> PollingVehicleReader:
+        if self._fallback is None:
+            self._fallback = PollingVehicleReader(traci=self.traci)
+        return self._fallback
+
+    def _value(self, veh_id: str, var_id: int) -> Any:
+        values = self._results.get(veh_id)
+        if values is None:
+            return None
+        return values.get(var_id)
+
+    def road_id(self, veh_id: str) -> str:
+        value = self._value(veh_id, VAR_ROAD_ID)
+        if value is None:
+            return self._polling().road_id(veh_id)
+        return value
+
+    def driving_distance(self, veh_id: str, merge_edge: str) -> float:
+        value = self._value(veh_id, DISTANCE_REQUEST) if merge_edge == self.merge_edge else None
+        if value is None:
+            return self._polling().driving_distance(veh_id, merge_edge)
+        return float(value)
+
+    def lane_id(self, veh_id: str) -> str:
+        value = self._value(veh_id, VAR_LANE_ID)
+        if value is None:
+            return self._polling().lane_id(veh_id)
+        return value
+
+    def lane_pos(self, veh_id: str) -> float:
+        value = self._value(veh_id, VAR_LANEPOSITION)
+        if value is None:
+            return self._polling().lane_pos(veh_id)
+        return float(value)
+
+    def speed(self, veh_id: str) -> float:
+        value = self._value(veh_id, VAR_SPEED)
+        if value is None:
+            return self._polling().speed(veh_id)
+        return float(value)
+
+    def accel(self, veh_id: str) -> float:
+        value = self._value(veh_id, VAR_ACCELERATION)
+        if value is None:
+            return self._polling().accel(veh_id)
+        return float(value)
@@ -0,0 +1,87 @@
+"""Per-step TraCI call counting.
+
+``CountingTraci`` wraps a ``traci``-shaped module and counts every call made
+through its domains (``vehicle.getSpeed`` -> ``'vehicle.getSpeed'``) and
+top-level functions (``simulationStep``).  ``close_step`` moves the current
+step's counts into ``step_counts`` so reductions in per-step TraCI traffic
+can be asserted in tests or reported after a run.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+TRACI_DOMAINS = frozenset({
+    'vehicle', 'simulation', 'lane', 'edge', 'vehicletype', 'route', 'junction', 'gui',
+})
+
+
+class _CountingDomain:
+    __slots__ = ('_domain', '_name', '_counts')
+
+    def __init__(self, domain: Any, name: str, counts: Counter) -> None:
+        self._domain = domain
+        self._name = name
+        self._counts = counts
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._domain, attr)
+        if not callable(value):
+            return value
+        key = f'{self._name}.{attr}'
+        counts = self._counts
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            counts[key] += 1
+            return value(*args, **kwargs)
+
+        return counted
+
+
+class CountingTraci:
+    """Drop-in ``traci`` proxy that tallies calls per step."""
+
+    def __init__(self, traci: Any) -> None:
+        self._traci = traci
+        self.counts: Counter = Counter()
+        self.step_counts: list[Counter] = []
+        self._domains: dict[str, _CountingDomain] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._traci, name)
+        if name in TRACI_DOMAINS:
+            domain = self._domains.get(name)
+            if domain is None:
+                domain = _CountingDomain(value, name, self.counts)
+                self._domains[name] = domain
+            return domain
+        if not callable(value):
+            return value
+        counts = self.counts
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            counts[name] += 1
+            return value(*args, **kwargs)
+
+        return counted
+
+    def close_step(self) -> Counter:
+        """Finish the current step and return its call counts."""
+        step = Counter(self.counts)
+        self.step_counts.append(step)
+        self.counts.clear()
+        return step
+
+    def summary(self) -> dict[str, Any]:
+        steps = len(self.step_counts)
+        totals: Counter = Counter()
+        for step in self.step_counts:
+            totals.update(step)
+        total_calls = sum(totals.values())
+        return {
+            'steps': steps,
+            'total_calls': total_calls,
+            'calls_per_step': total_calls / steps if steps else 0.0,
+            'by_call': dict(sorted(totals.items())),
+        }
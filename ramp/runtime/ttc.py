@@ -1,7 +1,26 @@
+"""TTC samples and summaries (metric definition ``v1``).
+
+Per step, ``collect_ttc_sample_arrays`` pairs vehicles on the columnar
+``VehicleTable``: longitudinal leader/follower pairs come from one
+lexicographic (lane, position) sort, and each ramp vehicle's merge-conflict
+TTC from a sweep over main vehicles sorted by their merge-zone entry time.
+``collect_ttc_samples_reference`` is the same definition written as plain
+loops and is kept as the oracle for tests and benchmarks.
+
+Over a run, samples go into a fixed-size ``TTCSketch`` instead of a list:
+counts, threshold counts and the minimum stay exact, and quantiles carry a
+bounded relative error (see ``TTCSketch``).
+"""
+
 from __future__ import annotations
 
-from dataclasses import dataclass
-from math import ceil
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from math import ceil, log
+
+import numpy as np
+
+from ramp.runtime.vehicle_table import STREAM_MAIN, STREAM_RAMP, as_vehicle_table
 
 TTC_CALC_VERSION = 'v1'
 TTC_SCOPE = 'longitudinal+merge_conflict'
@@ -12,8 +31,15 @@ DEFAULT_VEHICLE_LENGTH_M = 5.0
 _MIN_APPROACH_SPEED_MPS = 0.1
 _P05_Q = 0.05
 
+DEFAULT_SKETCH_RELATIVE_ACCURACY = 0.001
+DEFAULT_SKETCH_MIN_VALUE_S = 1e-3
+DEFAULT_SKETCH_MAX_VALUE_S = 1e6
 
-ObservationState = dict[str, dict[str, float | str]]
+_RAMP_CONFLICT_EDGES = frozenset({'ramp_h6', 'main_h3'})
+_EMPTY_SAMPLES = np.zeros(0, dtype=np.float64)
+
+
+ObservationState = Mapping[str, Mapping[str, float | str]]
 
 
 @dataclass(slots=True, frozen=True)
@@ -35,8 +61,192 @@ class _MergeCandidate:
     length_m: float
 
 
+@dataclass(slots=True)
+class TTCSketch:
+    """Fixed-memory, mergeable summary of TTC samples.
+
+    Positive samples are counted in logarithmic buckets of ratio
+    ``gamma = (1 + a) / (1 - a)`` with ``a = relative_accuracy``; zeros get
+    their own bucket.  ``quantile`` returns a value within ``a * x`` of the
+    exact nearest-rank sample ``x`` whenever ``x`` is zero or lies in
+    ``[min_value_s, max_value_s]`` (samples outside are clamped to the end
+    buckets).  ``count``, ``min_s``, ``max_s`` and the warning / critical
+    threshold counts are exact.  Memory is ``log(max/min) / log(gamma)``
+    counters (about 10k for the defaults) regardless of run length.
+    """
+
+    relative_accuracy: float = DEFAULT_SKETCH_RELATIVE_ACCURACY
+    min_value_s: float = DEFAULT_SKETCH_MIN_VALUE_S
+    max_value_s: float = DEFAULT_SKETCH_MAX_VALUE_S
+    count: int = 0
+    zero_count: int = 0
+    lt_3_0s_count: int = 0
+    lt_1_5s_count: int = 0
+    min_s: float | None = None
+    max_s: float | None = None
+    _log_gamma: float = field(init=False, repr=False)
+    _key_offset: int = field(init=False, repr=False)
+    _bucket_counts: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError('relative_accuracy must be in (0, 1)')
+        if not 0.0 < self.min_value_s < self.max_value_s:
+            raise ValueError('need 0 < min_value_s < max_value_s')
+        self._log_gamma = log((1.0 + self.relative_accuracy) / (1.0 - self.relative_accuracy))
+        self._key_offset = ceil(log(self.min_value_s) / self._log_gamma)
+        bucket_count = ceil(log(self.max_value_s) / self._log_gamma) - self._key_offset + 1
+        self._bucket_counts = np.zeros(bucket_count, dtype=np.int64)
+
+    @property
+    def bucket_count(self) -> int:
+        return int(self._bucket_counts.size)
+
+    def add(self, samples: Sequence[float] | np.ndarray) -> None:
+        values = np.asarray(samples, dtype=np.float64)
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        self.lt_3_0s_count += int(np.count_nonzero(values < TTC_THRESHOLD_WARNING_S))
+        self.lt_1_5s_count += int(np.count_nonzero(values < TTC_THRESHOLD_CRITICAL_S))
+        low = float(values.min())
+        high = float(values.max())
+        self.min_s = low if self.min_s is None else min(self.min_s, low)
+        self.max_s = high if self.max_s is None else max(self.max_s, high)
+
+        positive = values[values > 0.0]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64) - self._key_offset
+            np.clip(keys, 0, self._bucket_counts.size - 1, out=keys)
+            self._bucket_counts += np.bincount(keys, minlength=self._bucket_counts.size)
+
+    def merge(self, other: TTCSketch) -> None:
+        if (
+            other.relative_accuracy != self.relative_accuracy
+            or other.min_value_s != self.min_value_s
+            or other.max_value_s != self.max_value_s
+        ):
+            raise ValueError('cannot merge TTCSketch instances with different parameters')
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.lt_3_0s_count += other.lt_3_0s_count
+        self.lt_1_5s_count += other.lt_1_5s_count
+        self.min_s = other.min_s if self.min_s is None else min(self.min_s, other.min_s)
+        self.max_s = other.max_s if self.max_s is None else max(self.max_s, other.max_s)
+        self._bucket_counts += other._bucket_counts
+
+    def copy(self) -> TTCSketch:
+        clone = TTCSketch(
+            relative_accuracy=self.relative_accuracy,
+            min_value_s=self.min_value_s,
+            max_value_s=self.max_value_s,
+        )
+        clone.merge(self)
+        return clone
+
+    def quantile(self, q: float) -> float | None:
+        """Nearest-rank quantile estimate (same rank rule as ``summarize_ttc_samples``)."""
+        if self.count == 0:
+            return None
+        assert self.min_s is not None and self.max_s is not None
+        if q <= 0:
+            return self.min_s
+        if q >= 1:
+            return self.max_s
+        rank = max(1, min(int(ceil(q * self.count)), self.count))
+        if rank == 1:
+            return self.min_s
+        if rank == self.count:
+            return self.max_s
+        if rank <= self.zero_count:
+            return 0.0
+        cumulative = np.cumsum(self._bucket_counts)
+        index = int(np.searchsorted(cumulative, rank - self.zero_count, side='left'))
+        gamma_pow = np.exp((index + self._key_offset) * self._log_gamma)
+        estimate = float(2.0 * gamma_pow / (1.0 + np.exp(self._log_gamma)))
+        return min(max(estimate, self.min_s), self.max_s)
+
+    def stats(self, *, step_length_s: float) -> TTCStats:
+        if step_length_s <= 0:
+            raise ValueError('step_length_s must be > 0')
+        if self.count == 0:
+            return _empty_stats()
+        return TTCStats(
+            min_s=self.min_s,
+            p05_s=self.quantile(_P05_Q),
+            sample_count=self.count,
+            sample_exposure_s=float(self.count) * step_length_s,
+            lt_3_0s_count=self.lt_3_0s_count,
+            lt_1_5s_count=self.lt_1_5s_count,
+            lt_3_0s_ratio=self.lt_3_0s_count / self.count,
+            lt_1_5s_ratio=self.lt_1_5s_count / self.count,
+        )
+
+
 def collect_ttc_samples(ttc_observation_state: ObservationState) -> tuple[list[float], list[float]]:
     """Collect per-step TTC samples under the v1 metric definition."""
+    longitudinal, merge_conflict = collect_ttc_sample_arrays(ttc_observation_state)
+    return longitudinal.tolist(), merge_conflict.tolist()
+
+
+def collect_ttc_sample_arrays(
+    ttc_observation_state: ObservationState,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``collect_ttc_samples``; same samples, same order, as arrays.
+
+    A ``VehicleTableView`` (the collector output) is read straight from its
+    table's columns; plain dict input is loaded into a one-step table first.
+    """
+    if len(ttc_observation_state) == 0:
+        return _EMPTY_SAMPLES, _EMPTY_SAMPLES
+    table = as_vehicle_table(ttc_observation_state)
+    rows = table.rows(list(ttc_observation_state))
+    lane_pos = table.lane_pos[rows]
+    speed = table.speed[rows]
+    length = table.length[rows]
+    lane_code = table.lane_code[rows]
+    longitudinal = _longitudinal_samples(
+        lane_code=lane_code, lane_pos=lane_pos, speed=speed, length=length
+    )
+
+    edge_ids = table.edge_ids
+    edge_code = table.edge_code[rows]
+    lane_index = np.asarray(table.lane_index_by_code, dtype=np.int64)[lane_code]
+    stream = table.stream_code[rows]
+    on_ramp_edge = np.array([edge in _RAMP_CONFLICT_EDGES for edge in edge_ids], dtype=bool)
+    on_main_h2 = np.array([edge == 'main_h2' for edge in edge_ids], dtype=bool)
+    on_main_h3 = np.array([edge == 'main_h3' for edge in edge_ids], dtype=bool)
+    d_to_merge = table.d_to_merge[rows]
+    approaching = (speed > 0) & (d_to_merge > 0)
+    ramp_mask = (
+        approaching
+        & (stream == STREAM_RAMP)
+        & on_ramp_edge[edge_code]
+        & ((lane_index == 0) | (lane_index == 1))
+    )
+    main_mask = (
+        approaching
+        & (stream == STREAM_MAIN)
+        & ((on_main_h2[edge_code] & (lane_index == 0)) | (on_main_h3[edge_code] & (lane_index == 1)))
+    )
+    merge_conflict = _merge_conflict_samples(
+        main_d_to_merge=d_to_merge[main_mask],
+        main_speed=speed[main_mask],
+        main_length=length[main_mask],
+        ramp_d_to_merge=d_to_merge[ramp_mask],
+        ramp_speed=speed[ramp_mask],
+        ramp_length=length[ramp_mask],
+    )
+    return longitudinal, merge_conflict
+
+
+def collect_ttc_samples_reference(
+    ttc_observation_state: ObservationState,
+) -> tuple[list[float], list[float]]:
+    """Loop-based v1 definition; oracle for ``collect_ttc_sample_arrays``."""
     longitudinal = _collect_longitudinal_samples(ttc_observation_state=ttc_observation_state)
     merge_conflict = _collect_merge_conflict_samples(ttc_observation_state=ttc_observation_state)
     return longitudinal, merge_conflict
@@ -66,22 +276,40 @@ def build_ttc_metrics(
     return metrics
 
 
+def build_ttc_metrics_from_sketches(
+    *,
+    longitudinal: TTCSketch,
+    merge_conflict: TTCSketch,
+    step_length_s: float,
+) -> dict[str, float | int | str | None]:
+    """``build_ttc_metrics`` for sketched samples (p05 within the sketch bound)."""
+    any_sketch = longitudinal.copy()
+    any_sketch.merge(merge_conflict)
+
+    metrics: dict[str, float | int | str | None] = {
+        'ttc_calc_version': TTC_CALC_VERSION,
+        'ttc_scope': TTC_SCOPE,
+        'ttc_p05_relative_accuracy': longitudinal.relative_accuracy,
+    }
+    metrics.update(_stats_to_metric_fields(
+        prefix='ttc_longitudinal', stats=longitudinal.stats(step_length_s=step_length_s)
+    ))
+    metrics.update(_stats_to_metric_fields(
+        prefix='ttc_merge_conflict', stats=merge_conflict.stats(step_length_s=step_length_s)
+    ))
+    metrics.update(_stats_to_metric_fields(
+        prefix='ttc_any', stats=any_sketch.stats(step_length_s=step_length_s)
+    ))
+    return metrics
+
+
 def summarize_ttc_samples(*, samples: list[float], step_length_s: float) -> TTCStats:
     if step_length_s <= 0:
         raise ValueError('step_length_s must be > 0')
 
     sample_count = len(samples)
     if sample_count == 0:
-        return TTCStats(
-            min_s=None,
-            p05_s=None,
-            sample_count=0,
-            sample_exposure_s=0.0,
-            lt_3_0s_count=0,
-            lt_1_5s_count=0,
-            lt_3_0s_ratio=None,
-            lt_1_5s_ratio=None,
-        )
+        return _empty_stats()
 
     sorted_samples = sorted(samples)
     min_s = sorted_samples[0]
@@ -102,6 +330,84 @@ def summarize_ttc_samples(*, samples: list[float], step_length_s: float) -> TTCS
     )
 
 
+def _empty_stats() -> TTCStats:
+    return TTCStats(
+        min_s=None,
+        p05_s=None,
+        sample_count=0,
+        sample_exposure_s=0.0,
+        lt_3_0s_count=0,
+        lt_1_5s_count=0,
+        lt_3_0s_ratio=None,
+        lt_1_5s_ratio=None,
+    )
+
+
+def _longitudinal_samples(
+    *, lane_code: np.ndarray, lane_pos: np.ndarray, speed: np.ndarray, length: np.ndarray
+) -> np.ndarray:
+    if lane_pos.size < 2:
+        return _EMPTY_SAMPLES
+    # Number lanes by first appearance so samples come out lane by lane in
+    # the same order as the loop version; lexsort is stable, so vehicles at
+    # equal positions keep their visiting order.
+    _, first_index, inverse = np.unique(lane_code, return_index=True, return_inverse=True)
+    lane_rank = np.argsort(np.argsort(first_index, kind='stable'), kind='stable')[inverse]
+    order = np.lexsort((lane_pos, lane_rank))
+    lane_rank = lane_rank[order]
+    lane_pos = lane_pos[order]
+    speed = speed[order]
+    length = length[order]
+
+    same_lane = lane_rank[1:] == lane_rank[:-1]
+    gap_m = lane_pos[1:] - lane_pos[:-1] - length[1:]
+    closing_speed_mps = speed[:-1] - speed[1:]
+    overlapping = same_lane & (gap_m <= 0)
+    closing = same_lane & (gap_m > 0) & (closing_speed_mps > 0)
+    ttc_s = np.zeros(gap_m.size, dtype=np.float64)
+    np.divide(gap_m, closing_speed_mps, out=ttc_s, where=closing)
+    return ttc_s[overlapping | closing]
+
+
+def _merge_conflict_samples(
+    *,
+    main_d_to_merge: np.ndarray,
+    main_speed: np.ndarray,
+    main_length: np.ndarray,
+    ramp_d_to_merge: np.ndarray,
+    ramp_speed: np.ndarray,
+    ramp_length: np.ndarray,
+) -> np.ndarray:
+    """Earliest merge-zone overlap per ramp vehicle, by sweeping main entry times.
+
+    For a ramp occupancy interval ``[r_in, r_out]`` the loop version takes the
+    minimum of ``max(m_in, r_in)`` over main intervals that overlap it.  If a
+    main vehicle entering no later than ``r_in`` is still inside at ``r_in``
+    (prefix maximum of ``m_out``), the answer is ``r_in``; otherwise it is the
+    first main entry after ``r_in``, provided that is no later than ``r_out``.
+    """
+    if main_d_to_merge.size == 0 or ramp_d_to_merge.size == 0:
+        return _EMPTY_SAMPLES
+    main_speed = np.maximum(main_speed, _MIN_APPROACH_SPEED_MPS)
+    ramp_speed = np.maximum(ramp_speed, _MIN_APPROACH_SPEED_MPS)
+    main_enter_s = main_d_to_merge / main_speed
+    main_exit_s = main_enter_s + main_length / main_speed
+    ramp_enter_s = ramp_d_to_merge / ramp_speed
+    ramp_exit_s = ramp_enter_s + ramp_length / ramp_speed
+
+    order = np.argsort(main_enter_s, kind='stable')
+    main_enter_s = main_enter_s[order]
+    main_exit_reach_s = np.maximum.accumulate(main_exit_s[order])
+    main_count = main_enter_s.size
+
+    entered = np.searchsorted(main_enter_s, ramp_enter_s, side='right')
+    occupied = (entered > 0) & (main_exit_reach_s[np.maximum(entered - 1, 0)] >= ramp_enter_s)
+    next_enter_s = main_enter_s[np.minimum(entered, main_count - 1)]
+    later = ~occupied & (entered < main_count) & (next_enter_s <= ramp_exit_s)
+    ttc_s = np.where(occupied, ramp_enter_s, next_enter_s)
+    return np.maximum(ttc_s[occupied | later], 0.0)
+
+
 def _collect_longitudinal_samples(*, ttc_observation_state: ObservationState) -> list[float]:
     lane_groups: dict[str, list[tuple[float, float, float]]] = {}
     for vehicle_state in ttc_observation_state.values():
@@ -0,0 +1,110 @@
+"""Lifetime-scoped cache of per-vehicle attributes that never change en route.
+
+Type ID, length and route (and the stream derived from it) are fixed from
+departure to arrival in our scenarios, yet the runtime used to re-query them
+from TraCI every step in several places.  ``VehicleRegistry`` records them
+once when a vehicle shows up in ``simulation.getDepartedIDList()`` and drops
+them when it appears in ``simulation.getArrivedIDList()``.  Lookups for a
+vehicle the registry has not seen yet (e.g. the registry was created
+mid-run) populate the record on demand, so callers never need a TraCI
+fallback of their own.
+
+The maximum acceleration (``vehicle.getAccel``) is also fixed per vehicle
+but only the DP schedulers need it, so it is read on first use rather than
+at departure.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def stream_from_route(route_edges: tuple[str, ...] | list[str]) -> str:
+    if not route_edges:
+        return 'unknown'
+    first = route_edges[0]
+    if first.startswith('main_'):
+        return 'main'
+    if first.startswith('ramp_'):
+        return 'ramp'
+    return 'unknown'
+
+
+@dataclass(slots=True, frozen=True)
+class VehicleRecord:
+    type_id: str
+    length_m: float
+    route: tuple[str, ...]
+    stream: str
+
+
+@dataclass(slots=True)
+class VehicleRegistry:
+    traci: Any
+    records: dict[str, VehicleRecord] = field(default_factory=dict)
+    max_accel_by_id: dict[str, float] = field(default_factory=dict)
+
+    def sync(self) -> tuple[str, ...]:
+        """Register this step's departures and evict this step's arrivals.
+
+        Returns the arrived IDs so per-vehicle state kept elsewhere can be
+        evicted with them.
+        """
+        simulation = self.traci.simulation
+        for veh_id in simulation.getDepartedIDList():
+            if veh_id not in self.records:
+                self.records[veh_id] = self._load(veh_id)
+        arrived = tuple(simulation.getArrivedIDList())
+        for veh_id in arrived:
+            self.records.pop(veh_id, None)
+            self.max_accel_by_id.pop(veh_id, None)
+        return arrived
+
+    def _load(self, veh_id: str) -> VehicleRecord:
+        vehicle = self.traci.vehicle
+        route = tuple(vehicle.getRoute(veh_id))
+        return VehicleRecord(
+            type_id=vehicle.getTypeID(veh_id),
+            length_m=float(vehicle.getLength(veh_id)),
+            route=route,
+            stream=stream_from_route(route),
+        )
+
+    def record(self, veh_id: str) -> VehicleRecord:
+        record = self.records.get(veh_id)
+        if record is None:
+            record = self._load(veh_id)
+            self.records[veh_id] = record
+        return record
+
+    def type_id(self, veh_id: str) -> str:
+        return self.record(veh_id).type_id
+
+    def length(self, veh_id: str) -> float:
+        return self.record(veh_id).length_m
+
+    def route(self, veh_id: str) -> tuple[str, ...]:
+        return self.record(veh_id).route
+
+    def stream(self, veh_id: str) -> str:
+        return self.record(veh_id).stream
+
+    def max_accel(self, veh_id: str) -> float:
+        value = self.max_accel_by_id.get(veh_id)
+        if value is None:
+            value = float(self.traci.vehicle.getAccel(veh_id))
+            self.max_accel_by_id[veh_id] = value
+        return value
+
+
+def lookup_type_id(veh_id: str, traci: Any, registry: VehicleRegistry | None = None) -> str:
+    if registry is not None:
+        return registry.type_id(veh_id)
+    return traci.vehicle.getTypeID(veh_id)
+
+
+def lookup_max_accel(veh_id: str, traci: Any, registry: VehicleRegistry | None = None) -> float:
+    if registry is not None:
+        return registry.max_accel(veh_id)
+    return float(traci.vehicle.getAccel(veh_id))
@@ -0,0 +1,372 @@
+"""Columnar per-step vehicle store shared by the ramp runtime.
+
+``StateCollector`` fills one ``VehicleTable`` per step instead of building a
+``dict[str, dict[str, float | str]]`` per vehicle.  Numeric fields live in
+preallocated NumPy columns, stream/edge/lane are integer codes, and each
+active vehicle keeps the same row index for as long as it stays in the
+simulation, so downstream modules read fields by index without re-parsing.
+
+``VehicleTableView`` is the migration shim: a read-only ``Mapping`` with the
+legacy ``{veh_id: {'stream': ..., 'speed': ...}}`` shape whose rows are
+materialized lazily (and only when a not-yet-migrated consumer asks).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+
+import numpy as np
+
+STREAM_MAIN = 0
+STREAM_RAMP = 1
+STREAM_UNKNOWN = 2
+STREAM_NAMES: tuple[str, ...] = ('main', 'ramp', 'unknown')
+_STREAM_CODE_BY_NAME = {name: code for code, name in enumerate(STREAM_NAMES)}
+
+DEFAULT_VEHICLE_LENGTH_M = 5.0
+_INITIAL_CAPACITY = 64
+
+
+def stream_code(stream: str) -> int:
+    return _STREAM_CODE_BY_NAME.get(stream, STREAM_UNKNOWN)
+
+
+def lane_index_from_lane_id(lane_id: str) -> int:
+    if '_' not in lane_id:
+        return -1
+    suffix = lane_id.rsplit('_', 1)[1]
+    if not suffix.isdigit():
+        return -1
+    return int(suffix)
+
+
+_STAGED_COLUMNS = (
+    'lane_pos', 'd_to_merge', 'speed', 'accel', 'length', 'stream_code', 'edge_code', 'lane_code',
+)
+
+
+class VehicleTable:
+    """Struct-of-arrays vehicle table with stable row indices.
+
+    Rows are assigned on first ``put`` and released by ``end_step`` once the
+    vehicle is no longer active; freed rows are recycled.  Per step, the
+    ``observed`` mask marks vehicles inside the control-zone distance and
+    ``in_control_zone`` the subset that passed the lane filter.
+
+    Writes made by ``put`` are staged and become visible in the columns when
+    ``end_step`` runs; read the table only after the step is closed.
+    """
+
+    __slots__ = (
+        'capacity',
+        'step_index',
+        'veh_ids',
+        'lane_pos',
+        'd_to_merge',
+        'speed',
+        'accel',
+        'length',
+        'stream_code',
+        'edge_code',
+        'lane_code',
+        'observed',
+        'in_control_zone',
+        'edge_ids',
+        'lane_ids',
+        'lane_index_by_code',
+        '_edge_code_by_id',
+        '_lane_code_by_id',
+        '_row_by_id',
+        '_free_rows',
+        '_observed_ids',
+        '_control_zone_ids',
+        '_staged_rows',
+        '_staged_zone_rows',
+        '_staged_columns',
+    )
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY) -> None:
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.step_index = 0
+        self.veh_ids: list[str | None] = [None] * capacity
+        self.lane_pos = np.zeros(capacity, dtype=np.float64)
+        self.d_to_merge = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.accel = np.zeros(capacity, dtype=np.float64)
+        self.length = np.full(capacity, DEFAULT_VEHICLE_LENGTH_M, dtype=np.float64)
+        self.stream_code = np.full(capacity, STREAM_UNKNOWN, dtype=np.int8)
+        self.edge_code = np.full(capacity, -1, dtype=np.int32)
+        self.lane_code = np.full(capacity, -1, dtype=np.int32)
+        self.observed = np.zeros(capacity, dtype=bool)
+        self.in_control_zone = np.zeros(capacity, dtype=bool)
+        self.edge_ids: list[str] = []
+        self.lane_ids: list[str] = []
+        self.lane_index_by_code: list[int] = []
+        self._edge_code_by_id: dict[str, int] = {}
+        self._lane_code_by_id: dict[str, int] = {}
+        self._row_by_id: dict[str, int] = {}
+        self._free_rows: list[int] = list(range(capacity - 1, -1, -1))
+        self._observed_ids: list[str] = []
+        self._control_zone_ids: list[str] = []
+        # Per-step write staging: one list per column, flushed in end_step with
+        # a single vectorized assignment per column.
+        self._staged_rows: list[int] = []
+        self._staged_zone_rows: list[int] = []
+        self._staged_columns: tuple[list, ...] = tuple([] for _ in _STAGED_COLUMNS)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def begin_step(self) -> None:
+        self.step_index += 1
+        self.observed[:] = False
+        self.in_control_zone[:] = False
+        self._observed_ids = []
+        self._control_zone_ids = []
+
+    def put(
+        self,
+        veh_id: str,
+        *,
+        stream: str,
+        edge_id: str,
+        lane_id: str,
+        lane_pos: float,
+        d_to_merge: float,
+        speed: float,
+        accel: float,
+        length: float = DEFAULT_VEHICLE_LENGTH_M,
+        in_control_zone: bool = False,
+    ) -> int:
+        """Stage one vehicle's fields for this step (at most once per vehicle)."""
+        row = self._row_by_id.get(veh_id)
+        if row is None:
+            row = self._allocate(veh_id)
+        self._staged_rows.append(row)
+        self._observed_ids.append(veh_id)
+        if in_control_zone:
+            self._staged_zone_rows.append(row)
+            self._control_zone_ids.append(veh_id)
+        edge_code = self._edge_code_by_id.get(edge_id)
+        if edge_code is None:
+            edge_code = self._intern_edge(edge_id)
+        lane_code = self._lane_code_by_id.get(lane_id)
+        if lane_code is None:
+            lane_code = self._intern_lane(lane_id)
+        (
+            lane_pos_col, d_to_merge_col, speed_col, accel_col, length_col,
+            stream_col, edge_col, lane_col,
+        ) = self._staged_columns
+        lane_pos_col.append(lane_pos)
+        d_to_merge_col.append(d_to_merge)
+        speed_col.append(speed)
+        accel_col.append(accel)
+        length_col.append(length)
+        stream_col.append(_STREAM_CODE_BY_NAME.get(stream, STREAM_UNKNOWN))
+        edge_col.append(edge_code)
+        lane_col.append(lane_code)
+        return row
+
+    def end_step(self, active_vehicle_ids: set[str]) -> None:
+        """Flush staged writes and release rows of vehicles that left the simulation."""
+        self._flush()
+        departed = [veh_id for veh_id in self._row_by_id if veh_id not in active_vehicle_ids]
+        for veh_id in departed:
+            row = self._row_by_id.pop(veh_id)
+            self.veh_ids[row] = None
+            self._free_rows.append(row)
+
+    def _flush(self) -> None:
+        if self._staged_rows:
+            rows = np.asarray(self._staged_rows, dtype=np.intp)
+            for name, values in zip(_STAGED_COLUMNS, self._staged_columns):
+                getattr(self, name)[rows] = values
+                values.clear()
+            self.observed[rows] = True
+            self._staged_rows.clear()
+        if self._staged_zone_rows:
+            self.in_control_zone[np.asarray(self._staged_zone_rows, dtype=np.intp)] = True
+            self._staged_zone_rows.clear()
+
+    def _allocate(self, veh_id: str) -> int:
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        self._row_by_id[veh_id] = row
+        self.veh_ids[row] = veh_id
+        return row
+
+    def _grow(self) -> None:
+        old = self.capacity
+        new = old * 2
+        for name, fill in (
+            ('lane_pos', 0.0),
+            ('d_to_merge', 0.0),
+            ('speed', 0.0),
+            ('accel', 0.0),
+            ('length', DEFAULT_VEHICLE_LENGTH_M),
+            ('stream_code', STREAM_UNKNOWN),
+            ('edge_code', -1),
+            ('lane_code', -1),
+            ('observed', False),
+            ('in_control_zone', False),
+        ):
+            column = getattr(self, name)
+            grown = np.full(new, fill, dtype=column.dtype)
+            grown[:old] = column
+            setattr(self, name, grown)
+        self.veh_ids.extend([None] * (new - old))
+        self._free_rows.extend(range(new - 1, old - 1, -1))
+        self.capacity = new
+
+    def _intern_edge(self, edge_id: str) -> int:
+        code = self._edge_code_by_id.get(edge_id)
+        if code is None:
+            code = len(self.edge_ids)
+            self.edge_ids.append(edge_id)
+            self._edge_code_by_id[edge_id] = code
+        return code
+
+    def _intern_lane(self, lane_id: str) -> int:
+        code = self._lane_code_by_id.get(lane_id)
+        if code is None:
+            code = len(self.lane_ids)
+            self.lane_ids.append(lane_id)
+            self.lane_index_by_code.append(lane_index_from_lane_id(lane_id))
+            self._lane_code_by_id[lane_id] = code
+        return code
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def observed_ids(self) -> list[str]:
+        return self._observed_ids
+
+    @property
+    def control_zone_ids(self) -> list[str]:
+        return self._control_zone_ids
+
+    def row(self, veh_id: str) -> int:
+        return self._row_by_id[veh_id]
+
+    def get_row(self, veh_id: str) -> int | None:
+        return self._row_by_id.get(veh_id)
+
+    def rows(self, veh_ids: list[str]) -> np.ndarray:
+        return np.fromiter(
+            (self._row_by_id[veh_id] for veh_id in veh_ids), dtype=np.intp, count=len(veh_ids),
+        )
+
+    def stream(self, row: int) -> str:
+        return STREAM_NAMES[self.stream_code[row]]
+
+    def edge_id(self, row: int) -> str:
+        return self.edge_ids[self.edge_code[row]]
+
+    def lane_id(self, row: int) -> str:
+        return self.lane_ids[self.lane_code[row]]
+
+    def lane_index(self, row: int) -> int:
+        return self.lane_index_by_code[self.lane_code[row]]
+
+    def row_dict(self, row: int, *, include_length: bool) -> dict[str, float | str]:
+        """Legacy per-vehicle dict (same keys/types as the old collector output)."""
+        record: dict[str, float | str] = {
+            'stream': self.stream(row),
+            'edge_id': self.edge_id(row),
+            'lane_id': self.lane_id(row),
+            'lane_pos': self.lane_pos.item(row),
+            'd_to_merge': self.d_to_merge.item(row),
+            'speed': self.speed.item(row),
+            'accel': self.accel.item(row),
+        }
+        if include_length:
+            record['length'] = self.length.item(row)
+        return record
+
+    def control_zone_view(self) -> VehicleTableView:
+        return VehicleTableView(self, self._control_zone_ids, include_length=False)
+
+    def observation_view(self) -> VehicleTableView:
+        return VehicleTableView(self, self._observed_ids, include_length=True)
+
+    @classmethod
+    def from_mapping(
+        cls, state: Mapping[str, Mapping[str, float | str]],
+    ) -> VehicleTable:
+        """Build a one-step table from legacy dict rows (tests / external callers)."""
+        table = cls(capacity=max(len(state), 1))
+        table.begin_step()
+        for veh_id, vehicle_state in state.items():
+            table.put(
+                veh_id,
+                stream=str(vehicle_state.get('stream', 'unknown')),
+                edge_id=str(vehicle_state.get('edge_id', '')),
+                lane_id=str(vehicle_state.get('lane_id', '')),
+                lane_pos=float(vehicle_state.get('lane_pos', 0.0)),
+                d_to_merge=float(vehicle_state.get('d_to_merge', 0.0)),
+                speed=float(vehicle_state.get('speed', 0.0)),
+                accel=float(vehicle_state.get('accel', 0.0)),
+                length=float(vehicle_state.get('length', DEFAULT_VEHICLE_LENGTH_M)),
+                in_control_zone=True,
+            )
+        table.end_step(set(state))
+        return table
+
+
+class VehicleTableView(Mapping):
+    """Read-only legacy ``dict[veh_id, dict]`` facade over one step of a table.
+
+    Iteration order matches the order the collector visited vehicles.  Rows
+    are built on first access and cached; accessing an uncached row after the
+    table advanced to a later step raises ``RuntimeError``.
+    """
+
+    __slots__ = ('table', '_ids', '_id_set', '_include_length', '_step_index', '_cache')
+
+    def __init__(self, table: VehicleTable, ids: list[str], *, include_length: bool) -> None:
+        self.table = table
+        self._ids = ids
+        self._id_set = set(ids)
+        self._include_length = include_length
+        self._step_index = table.step_index
+        self._cache: dict[str, dict[str, float | str]] = {}
+
+    def __getitem__(self, veh_id: str) -> dict[str, float | str]:
+        record = self._cache.get(veh_id)
+        if record is not None:
+            return record
+        if veh_id not in self._id_set:
+            raise KeyError(veh_id)
+        if self.table.step_index != self._step_index:
+            raise RuntimeError('VehicleTableView accessed after its table advanced a step')
+        record = self.table.row_dict(self.table.row(veh_id), include_length=self._include_length)
+        self._cache[veh_id] = record
+        return record
+
+    def __contains__(self, veh_id: object) -> bool:
+        return veh_id in self._id_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def rows(self) -> np.ndarray:
+        return self.table.rows(self._ids)
+
+    def to_dict(self) -> dict[str, dict[str, float | str]]:
+        """Materialize every row (for callers that keep state across steps)."""
+        return {veh_id: self[veh_id] for veh_id in self._ids}
+
+
+def as_vehicle_table(state: Mapping[str, Mapping[str, float | str]]) -> VehicleTable:
+    """Return the table behind *state*, building one for plain dict input."""
+    if isinstance(state, VehicleTableView):
+        return state.table
+    return VehicleTable.from_mapping(state)
@@ -0,0 +1,58 @@
+"""Per-stream speed limit used by the schedulers and command builders.
+
+Main-line vehicles are capped at ``main_vmax_mps`` and ramp vehicles at
+``ramp_vmax_mps``, except on the ``main_h3`` auxiliary lanes where the
+optional ``aux_vmax_mps`` applies; vehicles of unknown stream get the larger
+of the two limits.  ``stream_vmax`` is the per-vehicle form and
+``stream_vmax_rows`` the same lookup for many ``VehicleTable`` rows at once,
+driven by the table's stream and lane codes.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from ramp.runtime.vehicle_table import STREAM_MAIN, STREAM_RAMP, VehicleTable
+
+AUX_LANE_PREFIX = 'main_h3_'
+
+
+def stream_vmax(
+    stream: str,
+    main_vmax_mps: float,
+    ramp_vmax_mps: float,
+    *,
+    aux_vmax_mps: float | None = None,
+    lane_id: str = '',
+) -> float:
+    if stream == 'main':
+        return main_vmax_mps
+    if stream == 'ramp':
+        if aux_vmax_mps is not None and lane_id.startswith(AUX_LANE_PREFIX):
+            return aux_vmax_mps
+        return ramp_vmax_mps
+    return max(main_vmax_mps, ramp_vmax_mps)
+
+
+def stream_vmax_rows(
+    table: VehicleTable,
+    rows: np.ndarray,
+    main_vmax_mps: float,
+    ramp_vmax_mps: float,
+    *,
+    aux_vmax_mps: float | None = None,
+) -> np.ndarray:
+    """``stream_vmax`` for each of *rows* (float64, same order)."""
+    stream = table.stream_code[rows]
+    vmax = np.full(len(rows), max(main_vmax_mps, ramp_vmax_mps), dtype=np.float64)
+    vmax[stream == STREAM_MAIN] = main_vmax_mps
+    is_ramp = stream == STREAM_RAMP
+    vmax[is_ramp] = ramp_vmax_mps
+    if aux_vmax_mps is not None and is_ramp.any():
+        on_aux_lane = np.fromiter(
+            (lane_id.startswith(AUX_LANE_PREFIX) for lane_id in table.lane_ids),
+            dtype=bool,
+            count=len(table.lane_ids),
+        )
+        vmax[is_ramp & on_aux_lane[table.lane_code[rows]]] = aux_vmax_mps
+    return vmax
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+
 
 def minimum_arrival_time_at_on_ramp(
     *,
@@ -51,3 +53,54 @@ def minimum_arrival_time_at_on_ramp(
     cruise_time = cruise_distance / v_max_mps
     return float(t_now_s) + max(accel_time, 0.0) + max(cruise_time, 0.0)
 
+
+
+def minimum_arrival_times_at_on_ramp(
+    *,
+    t_now_s: float,
+    distance_m: np.ndarray,
+    speed_mps: np.ndarray,
+    a_max_mps2: np.ndarray,
+    v_max_mps: np.ndarray,
+) -> np.ndarray:
+    """``minimum_arrival_time_at_on_ramp`` for many vehicles in one call.
+
+    Each case is evaluated with the same float operations in the same order
+    as the scalar version, so the results are bit-identical to it.
+    """
+    distance_m = np.asarray(distance_m, dtype=np.float64)
+    v_max_mps = np.asarray(v_max_mps, dtype=np.float64)
+    a_max_mps2 = np.asarray(a_max_mps2, dtype=np.float64)
+    speed_mps = np.maximum(np.asarray(speed_mps, dtype=np.float64), 0.0)
+    t_now_s = float(t_now_s)
+    result = np.full(distance_m.shape, t_now_s, dtype=np.float64)
+
+    moving = (distance_m > 0) & (v_max_mps > 1e-6)
+    no_accel = moving & (a_max_mps2 <= 1e-6)
+    cruising = moving & ~no_accel & (speed_mps >= v_max_mps)
+    accelerating = moving & ~no_accel & ~cruising
+
+    if no_accel.any():
+        effective_speed = np.maximum(np.minimum(speed_mps[no_accel], v_max_mps[no_accel]), 1e-3)
+        result[no_accel] = t_now_s + distance_m[no_accel] / effective_speed
+    if cruising.any():
+        result[cruising] = t_now_s + distance_m[cruising] / v_max_mps[cruising]
+    if accelerating.any():
+        d = distance_m[accelerating]
+        v = speed_mps[accelerating]
+        a = a_max_mps2[accelerating]
+        vmax = v_max_mps[accelerating]
+        dist_to_vmax = (vmax * vmax - v * v) / (2.0 * a)
+        short = dist_to_vmax >= d
+        out = np.empty(d.shape, dtype=np.float64)
+        # Cannot reach vmax within the remaining distance.
+        radicand = np.maximum(v[short] * v[short] + 2.0 * a[short] * d[short], 0.0)
+        dt = (np.sqrt(radicand) - v[short]) / a[short]
+        out[short] = t_now_s + np.maximum(dt, 0.0)
+        # Accelerate to vmax, then cruise.
+        long = ~short
+        accel_time = (vmax[long] - v[long]) / a[long]
+        cruise_time = (d[long] - dist_to_vmax[long]) / vmax[long]
+        out[long] = t_now_s + np.maximum(accel_time, 0.0) + np.maximum(cruise_time, 0.0)
+        result[accelerating] = out
+    return result
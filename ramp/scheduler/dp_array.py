@@ -0,0 +1,285 @@
+"""Array-backed, incremental variant of ``dp_schedule``.
+
+``dp_schedule`` keeps its states in per-layer dicts of ``_StateRecord`` objects,
+which allocates O(M*N) small objects per call.  This engine stores the same
+(m, n, last_lane) states in preallocated ``(2, M+1, N+1)`` NumPy tables and
+relaxes a whole anti-diagonal (layer ``k = m + n``) per vectorised step.
+
+Tie-breaking is the reference one: for every state the candidate coming from a
+lane-1 parent is seen first and a lane-0 parent only replaces it when its
+``(time + delay, time, delay)`` rank is strictly smaller; at the final state
+``last_lane == 0`` wins ties.  Results are therefore identical to
+``dp_schedule``, not just equal in cost.
+
+``ArrayDPScheduler`` keeps its tables between calls.  State (m, n) depends only
+on the first m main and first n ramp t_min values, so when a replan only
+appends vehicles at the tail of either queue (or updates the t_min of tail
+vehicles) every state inside the unchanged prefix rectangle is reused and only
+the remaining cells are relaxed.  A head vehicle crossing the merge shifts the
+DP origin of its stream, so only the states that contain none of that stream
+survive; the rest of the tables are recomputed in place (the buffers are still
+reused, no reallocation).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ramp.scheduler.dp import ScheduleResult
+
+DP_ENGINE_REFERENCE = 'reference'
+DP_ENGINE_ARRAY = 'array'
+DP_ENGINES = (DP_ENGINE_REFERENCE, DP_ENGINE_ARRAY)
+
+_ROOT_PARENT = -1
+
+
+def _tmin_array(seq: list[str], t_min_s: dict[str, float]) -> np.ndarray:
+    values = np.empty(len(seq), dtype=np.float64)
+    for index, veh_id in enumerate(seq):
+        if veh_id not in t_min_s:
+            raise KeyError(f'Missing t_min for vehicle: {veh_id}')
+        values[index] = float(t_min_s[veh_id])
+    return values
+
+
+def _common_prefix(a: np.ndarray, b: np.ndarray) -> int:
+    size = min(a.shape[0], b.shape[0])
+    mismatch = np.flatnonzero(a[:size] != b[:size])
+    return int(mismatch[0]) if mismatch.size else size
+
+
+def _strictly_better(
+    time_a: np.ndarray, delay_a: np.ndarray, time_b: np.ndarray, delay_b: np.ndarray
+) -> np.ndarray:
+    """Elementwise ``(cost, time, delay)`` rank of a < rank of b."""
+    cost_a = time_a + delay_a
+    cost_b = time_b + delay_b
+    return (cost_a < cost_b) | (
+        (cost_a == cost_b)
+        & ((time_a < time_b) | ((time_a == time_b) & (delay_a < delay_b)))
+    )
+
+
+@dataclass(slots=True)
+class ArrayDPScheduler:
+    """Reusable array DP engine; ``schedule`` has the ``dp_schedule`` signature."""
+
+    initial_capacity: int = 16
+    # Cells relaxed / reused by the last ``schedule`` call (for benchmarks and tests).
+    last_computed_states: int = 0
+    last_reused_states: int = 0
+    _time_s: np.ndarray = field(init=False, repr=False)
+    _delay_s: np.ndarray = field(init=False, repr=False)
+    _parent_lane: np.ndarray = field(init=False, repr=False)
+    _main_tmin: np.ndarray = field(init=False, repr=False)
+    _ramp_tmin: np.ndarray = field(init=False, repr=False)
+    _deltas: tuple[float, float] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._allocate(self.initial_capacity, self.initial_capacity)
+        self._main_tmin = np.empty(0, dtype=np.float64)
+        self._ramp_tmin = np.empty(0, dtype=np.float64)
+
+    def _allocate(self, cap_m: int, cap_n: int) -> None:
+        shape = (2, cap_m + 1, cap_n + 1)
+        self._time_s = np.full(shape, np.inf)
+        self._delay_s = np.full(shape, np.inf)
+        self._parent_lane = np.full(shape, _ROOT_PARENT, dtype=np.int8)
+
+    def _ensure_capacity(self, m_total: int, n_total: int, keep_m: int, keep_n: int) -> None:
+        _, rows, cols = self._time_s.shape
+        if m_total < rows and n_total < cols:
+            return
+        old_time, old_delay, old_parent = self._time_s, self._delay_s, self._parent_lane
+        self._allocate(max(m_total, 2 * (rows - 1)), max(n_total, 2 * (cols - 1)))
+        kept = (slice(None), slice(0, keep_m + 1), slice(0, keep_n + 1))
+        self._time_s[kept] = old_time[kept]
+        self._delay_s[kept] = old_delay[kept]
+        self._parent_lane[kept] = old_parent[kept]
+
+    def reset(self) -> None:
+        """Forget cached states (the next call recomputes every cell)."""
+        self._main_tmin = np.empty(0, dtype=np.float64)
+        self._ramp_tmin = np.empty(0, dtype=np.float64)
+        self._deltas = None
+
+    def schedule(
+        self,
+        *,
+        main_seq: list[str],
+        ramp_seq: list[str],
+        t_min_s: dict[str, float],
+        delta_1_s: float,
+        delta_2_s: float,
+    ) -> ScheduleResult:
+        if delta_1_s <= 0 or delta_2_s <= 0:
+            raise ValueError('delta_1_s and delta_2_s must be > 0')
+
+        main_tmin = _tmin_array(main_seq, t_min_s)
+        ramp_tmin = _tmin_array(ramp_seq, t_min_s)
+        m_total = main_tmin.shape[0]
+        n_total = ramp_tmin.shape[0]
+
+        deltas = (float(delta_1_s), float(delta_2_s))
+        if deltas == self._deltas:
+            keep_m = _common_prefix(main_tmin, self._main_tmin)
+            keep_n = _common_prefix(ramp_tmin, self._ramp_tmin)
+        else:
+            keep_m = keep_n = 0
+        self._ensure_capacity(m_total, n_total, keep_m, keep_n)
+        self._relax(main_tmin, ramp_tmin, deltas, keep_m, keep_n)
+        self._main_tmin = main_tmin
+        self._ramp_tmin = ramp_tmin
+        self._deltas = deltas
+        self.last_reused_states = (keep_m + 1) * (keep_n + 1) - 1
+        self.last_computed_states = (m_total + 1) * (n_total + 1) - 1 - self.last_reused_states
+
+        if m_total == 0 and n_total == 0:
+            return ScheduleResult([], {}, 0.0, 0.0, 0.0)
+        return self._backtrack(main_seq, ramp_seq, m_total, n_total)
+
+    def _relax(
+        self,
+        main_tmin: np.ndarray,
+        ramp_tmin: np.ndarray,
+        deltas: tuple[float, float],
+        keep_m: int,
+        keep_n: int,
+    ) -> None:
+        delta_1_s, delta_2_s = deltas
+        time_s, delay_s, parent_lane = self._time_s, self._delay_s, self._parent_lane
+        m_total = main_tmin.shape[0]
+        n_total = ramp_tmin.shape[0]
+
+        # (m, 0, 1) and (0, n, 0) are never written and stay +inf (invalid).
+        # Layer 1: the first vehicle crosses at its own t_min with zero delay.
+        if m_total and keep_m == 0:
+            time_s[0, 1, 0] = main_tmin[0]
+            delay_s[0, 1, 0] = 0.0
+            parent_lane[0, 1, 0] = _ROOT_PARENT
+        if n_total and keep_n == 0:
+            time_s[1, 0, 1] = ramp_tmin[0]
+            delay_s[1, 0, 1] = 0.0
+            parent_lane[1, 0, 1] = _ROOT_PARENT
+
+        # Layers up to min(keep_m, keep_n) lie entirely inside the reused rectangle.
+        for layer in range(max(2, min(keep_m, keep_n) + 1), m_total + n_total + 1):
+            ms = np.arange(max(0, layer - n_total), min(layer, m_total) + 1)
+            ns = layer - ms
+            fresh = (ms > keep_m) | (ns > keep_n)
+            if not fresh.all():
+                ms = ms[fresh]
+                ns = ns[fresh]
+                if ms.size == 0:
+                    continue
+
+            # Target lane 0 (main vehicle m-1 crosses), parents at (m-1, n).
+            on_main = ms >= 1
+            m0 = ms[on_main]
+            n0 = ns[on_main]
+            if m0.size:
+                self._relax_lane(
+                    lane=0, rows=m0, cols=n0, parent_rows=m0 - 1, parent_cols=n0,
+                    tmin=main_tmin[m0 - 1], same_gap_s=delta_1_s, cross_gap_s=delta_2_s,
+                )
+            # Target lane 1 (ramp vehicle n-1 crosses), parents at (m, n-1).
+            on_ramp = ns >= 1
+            m1 = ms[on_ramp]
+            n1 = ns[on_ramp]
+            if m1.size:
+                self._relax_lane(
+                    lane=1, rows=m1, cols=n1, parent_rows=m1, parent_cols=n1 - 1,
+                    tmin=ramp_tmin[n1 - 1], same_gap_s=delta_1_s, cross_gap_s=delta_2_s,
+                )
+
+    def _relax_lane(
+        self,
+        *,
+        lane: int,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        parent_rows: np.ndarray,
+        parent_cols: np.ndarray,
+        tmin: np.ndarray,
+        same_gap_s: float,
+        cross_gap_s: float,
+    ) -> None:
+        time_s, delay_s = self._time_s, self._delay_s
+        gap_from_main = same_gap_s if lane == 0 else cross_gap_s
+        gap_from_ramp = same_gap_s if lane == 1 else cross_gap_s
+
+        time_from_ramp = np.maximum(tmin, time_s[1, parent_rows, parent_cols] + gap_from_ramp)
+        delay_from_ramp = delay_s[1, parent_rows, parent_cols] + (time_from_ramp - tmin)
+        time_from_main = np.maximum(tmin, time_s[0, parent_rows, parent_cols] + gap_from_main)
+        delay_from_main = delay_s[0, parent_rows, parent_cols] + (time_from_main - tmin)
+
+        take_main = _strictly_better(
+            time_from_main, delay_from_main, time_from_ramp, delay_from_ramp
+        )
+        time_s[lane, rows, cols] = np.where(take_main, time_from_main, time_from_ramp)
+        delay_s[lane, rows, cols] = np.where(take_main, delay_from_main, delay_from_ramp)
+        self._parent_lane[lane, rows, cols] = np.where(take_main, 0, 1)
+
+    def _backtrack(
+        self, main_seq: list[str], ramp_seq: list[str], m_total: int, n_total: int
+    ) -> ScheduleResult:
+        time_s, delay_s, parent_lane = self._time_s, self._delay_s, self._parent_lane
+        final_lane = 0
+        if m_total == 0:
+            final_lane = 1
+        elif n_total > 0:
+            better = _strictly_better(
+                time_s[1, m_total, n_total], delay_s[1, m_total, n_total],
+                time_s[0, m_total, n_total], delay_s[0, m_total, n_total],
+            )
+            if better:
+                final_lane = 1
+
+        passing_order_rev: list[str] = []
+        target_cross_time_s: dict[str, float] = {}
+        m, n, lane = m_total, n_total, final_lane
+        while lane != _ROOT_PARENT:
+            if lane == 0:
+                veh_id = main_seq[m - 1]
+            else:
+                veh_id = ramp_seq[n - 1]
+            passing_order_rev.append(veh_id)
+            target_cross_time_s[veh_id] = time_s.item(lane, m, n)
+            next_lane = int(parent_lane[lane, m, n])
+            if lane == 0:
+                m -= 1
+            else:
+                n -= 1
+            lane = next_lane
+
+        final_time_s = time_s.item(final_lane, m_total, n_total)
+        final_delay_s = delay_s.item(final_lane, m_total, n_total)
+        return ScheduleResult(
+            passing_order=list(reversed(passing_order_rev)),
+            target_cross_time_s=target_cross_time_s,
+            cost=final_time_s + final_delay_s,
+            total_delay_s=final_delay_s,
+            last_cross_time_s=final_time_s,
+        )
+
+
+def dp_schedule_array(
+    *,
+    main_seq: list[str],
+    ramp_seq: list[str],
+    t_min_s: dict[str, float],
+    delta_1_s: float,
+    delta_2_s: float,
+) -> ScheduleResult:
+    """Stateless array-engine equivalent of ``dp_schedule``."""
+    size = max(len(main_seq), len(ramp_seq), 1)
+    return ArrayDPScheduler(initial_capacity=size).schedule(
+        main_seq=main_seq,
+        ramp_seq=ramp_seq,
+        t_min_s=t_min_s,
+        delta_1_s=delta_1_s,
+        delta_2_s=delta_2_s,
+    )
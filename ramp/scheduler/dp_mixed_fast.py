@@ -0,0 +1,276 @@
+"""Precomputed-table variant of ``dp_mixed_schedule``.
+
+``dp_mixed_schedule`` resolves vehicle types (``is_hdv``), t_min / predicted
+times and the "previous vehicle is an HDV" flag with dict lookups inside the
+innermost transition loop.  ``MixedDPTables`` resolves all of that once per
+replan into per-lane tuples:
+
+- ``is_hdv[lane][i]`` and ``time_s[lane][i]`` (CAV t_min or HDV fixed time);
+- ``hdv_bound_s[lane][i]``: the earliest fixed HDV crossing time among
+  vehicles ``i..`` of that lane (``inf`` if none).
+
+Crossing times never decrease along a schedule by more than the feasibility
+tolerance per step, so a state whose time already exceeds
+``min(hdv_bound_s[0][m], hdv_bound_s[1][n])`` (plus that slack) can never be
+completed.  Such states are dropped before they are expanded.
+
+Frontier iteration order and the ``(cost, time, delay, last_lane)`` rank are
+the reference ones, so the result is the reference schedule whenever the
+reference never lets a doomed state win a tie-break against a live one.  In
+that corner case the reference may end up infeasible (or on a costlier
+branch) where this version still completes a valid schedule; every returned
+schedule satisfies the same gap and HDV constraints.
+
+The tables also carry the CAV-only subsequences and their t_min
+(``cav_t_min_s``), so the all-CAV fallback reuses them instead of rescanning
+the queues.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from ramp.common.vehicle_defs import is_hdv
+
+from .dp import ScheduleResult
+
+_FEASIBILITY_TOL = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class MixedDPTables:
+    main_seq: tuple[str, ...]
+    ramp_seq: tuple[str, ...]
+    is_hdv: tuple[tuple[bool, ...], tuple[bool, ...]]
+    time_s: tuple[tuple[float, ...], tuple[float, ...]]
+    hdv_bound_s: tuple[tuple[float, ...], tuple[float, ...]]
+    cav_main: tuple[str, ...]
+    cav_ramp: tuple[str, ...]
+    hdv_count: int
+
+    def cav_t_min_s(self) -> dict[str, float]:
+        """t_min of every CAV in queue order (input of the all-CAV fallback)."""
+        t_min_s: dict[str, float] = {}
+        for seq, flags, times in zip(
+            (self.main_seq, self.ramp_seq), self.is_hdv, self.time_s
+        ):
+            for veh_id, hdv, time_s in zip(seq, flags, times):
+                if not hdv:
+                    t_min_s[veh_id] = time_s
+        return t_min_s
+
+
+def _lane_tables(
+    seq: list[str],
+    veh_type_by_id: dict[str, str],
+    t_min_cav_s: dict[str, float],
+    hdv_predicted_time_s: dict[str, float],
+) -> tuple[tuple[bool, ...], tuple[float, ...], tuple[float, ...]]:
+    hdv_flags: list[bool] = []
+    times: list[float] = []
+    for veh_id in seq:
+        vtype = veh_type_by_id.get(veh_id)
+        if vtype == 'cav':
+            if veh_id not in t_min_cav_s:
+                raise KeyError(f'Missing t_min_cav_s for CAV: {veh_id}')
+            hdv_flags.append(False)
+            times.append(float(t_min_cav_s[veh_id]))
+        elif is_hdv(vtype or ''):
+            if veh_id not in hdv_predicted_time_s:
+                raise KeyError(f'Missing hdv_predicted_time_s for HDV: {veh_id}')
+            hdv_flags.append(True)
+            times.append(float(hdv_predicted_time_s[veh_id]))
+        else:
+            raise ValueError(f'Unknown or missing vehicle type for {veh_id}: {vtype}')
+
+    bounds = [math.inf] * (len(seq) + 1)
+    for index in range(len(seq) - 1, -1, -1):
+        bound = bounds[index + 1]
+        if hdv_flags[index] and times[index] < bound:
+            bound = times[index]
+        bounds[index] = bound
+    return tuple(hdv_flags), tuple(times), tuple(bounds)
+
+
+def build_mixed_tables(
+    *,
+    main_seq: list[str],
+    ramp_seq: list[str],
+    veh_type_by_id: dict[str, str],
+    t_min_cav_s: dict[str, float],
+    hdv_predicted_time_s: dict[str, float],
+) -> MixedDPTables:
+    """Resolve types, times and HDV bounds once per replan.
+
+    Raises the same ``ValueError`` / ``KeyError`` as ``dp_mixed_schedule`` for
+    unknown types and missing times.
+    """
+    main_hdv, main_time, main_bound = _lane_tables(
+        main_seq, veh_type_by_id, t_min_cav_s, hdv_predicted_time_s
+    )
+    ramp_hdv, ramp_time, ramp_bound = _lane_tables(
+        ramp_seq, veh_type_by_id, t_min_cav_s, hdv_predicted_time_s
+    )
+    return MixedDPTables(
+        main_seq=tuple(main_seq),
+        ramp_seq=tuple(ramp_seq),
+        is_hdv=(main_hdv, ramp_hdv),
+        time_s=(main_time, ramp_time),
+        hdv_bound_s=(main_bound, ramp_bound),
+        cav_main=tuple(v for v, hdv in zip(main_seq, main_hdv) if not hdv),
+        cav_ramp=tuple(v for v, hdv in zip(ramp_seq, ramp_hdv) if not hdv),
+        hdv_count=sum(main_hdv) + sum(ramp_hdv),
+    )
+
+
+def dp_mixed_schedule_tables(
+    tables: MixedDPTables, *, delta_1_s: float, delta_2_s: float
+) -> ScheduleResult:
+    """Run the mixed DP over prebuilt ``MixedDPTables``."""
+    if delta_1_s <= 0 or delta_2_s <= 0:
+        raise ValueError('delta_1_s and delta_2_s must be > 0')
+
+    m_total = len(tables.main_seq)
+    n_total = len(tables.ramp_seq)
+    if m_total == 0 and n_total == 0:
+        return ScheduleResult([], {}, 0.0, 0.0, 0.0)
+
+    main_hdv, ramp_hdv = tables.is_hdv
+    main_time, ramp_time = tables.time_s
+    main_bound, ramp_bound = tables.hdv_bound_s
+    # Each step may undercut its predecessor by at most the tolerance.
+    slack_s = (m_total + n_total) * _FEASIBILITY_TOL
+    tol = _FEASIBILITY_TOL
+
+    # state key -> (time, delay, parent key); one dict for all layers.
+    best: dict[tuple[int, int, int], tuple[float, float, tuple[int, int, int] | None]] = {
+        (0, 0, -1): (0.0, 0.0, None)
+    }
+    frontier: list[tuple[int, int, int]] = [(0, 0, -1)]
+
+    for _layer in range(m_total + n_total):
+        next_frontier: dict[tuple[int, int, int], tuple[float, float]] = {}
+        for key in frontier:
+            m, n, last_lane = key
+            pre_time_s, pre_delay_s, _parent = best[key]
+            if last_lane == -1:
+                prev_is_hdv = False
+            elif last_lane == 0:
+                prev_is_hdv = main_hdv[m - 1]
+            else:
+                prev_is_hdv = ramp_hdv[n - 1]
+
+            for lane in (0, 1):
+                if lane == 0:
+                    if m >= m_total:
+                        continue
+                    hdv = main_hdv[m]
+                    vehicle_time_s = main_time[m]
+                    next_key = (m + 1, n, 0)
+                else:
+                    if n >= n_total:
+                        continue
+                    hdv = ramp_hdv[n]
+                    vehicle_time_s = ramp_time[n]
+                    next_key = (m, n + 1, 1)
+
+                if last_lane == -1:
+                    gap_s = 0.0
+                else:
+                    gap_s = delta_1_s if last_lane == lane else delta_2_s
+
+                if not hdv:
+                    if last_lane == -1:
+                        time_s = vehicle_time_s
+                    else:
+                        time_s = max(vehicle_time_s, pre_time_s + gap_s)
+                    delay_s = pre_delay_s + (time_s - vehicle_time_s)
+                else:
+                    time_s = vehicle_time_s
+                    if last_lane != -1:
+                        required_s = pre_time_s if prev_is_hdv else pre_time_s + gap_s
+                        if time_s < required_s - tol:
+                            continue
+                    delay_s = pre_delay_s
+
+                existing = next_frontier.get(next_key)
+                if existing is not None:
+                    cost = time_s + delay_s
+                    existing_cost = existing[0] + existing[1]
+                    if not (
+                        cost < existing_cost
+                        or (cost == existing_cost
+                            and (time_s < existing[0]
+                                 or (time_s == existing[0] and delay_s < existing[1])))
+                    ):
+                        continue
+                next_frontier[next_key] = (time_s, delay_s)
+                best[next_key] = (time_s, delay_s, key)
+
+        frontier = []
+        for key, (time_s, _delay_s) in next_frontier.items():
+            bound_s = min(main_bound[key[0]], ramp_bound[key[1]])
+            if time_s > bound_s + slack_s:
+                continue
+            frontier.append(key)
+        if not frontier:
+            break
+
+    candidates = [
+        key for key in ((m_total, n_total, 0), (m_total, n_total, 1))
+        if key in best and key in frontier
+    ]
+    if not candidates:
+        raise ValueError(
+            'No feasible schedule: HDV timing constraints make all orderings infeasible'
+        )
+
+    def _final_rank(key: tuple[int, int, int]) -> tuple[float, float, float, int]:
+        time_s, delay_s, _parent = best[key]
+        return (time_s + delay_s, time_s, delay_s, key[2])
+
+    final_key = min(candidates, key=_final_rank)
+
+    passing_order_rev: list[str] = []
+    target_cross_time_s: dict[str, float] = {}
+    state_key: tuple[int, int, int] | None = final_key
+    while state_key is not None and state_key != (0, 0, -1):
+        time_s, _delay_s, parent = best[state_key]
+        m, n, last_lane = state_key
+        veh_id = tables.main_seq[m - 1] if last_lane == 0 else tables.ramp_seq[n - 1]
+        passing_order_rev.append(veh_id)
+        target_cross_time_s[veh_id] = time_s
+        state_key = parent
+
+    final_time_s, final_delay_s, _parent = best[final_key]
+    return ScheduleResult(
+        passing_order=list(reversed(passing_order_rev)),
+        target_cross_time_s=target_cross_time_s,
+        cost=final_time_s + final_delay_s,
+        total_delay_s=final_delay_s,
+        last_cross_time_s=final_time_s,
+    )
+
+
+def dp_mixed_schedule_fast(
+    *,
+    main_seq: list[str],
+    ramp_seq: list[str],
+    veh_type_by_id: dict[str, str],
+    t_min_cav_s: dict[str, float],
+    hdv_predicted_time_s: dict[str, float],
+    delta_1_s: float,
+    delta_2_s: float,
+) -> ScheduleResult:
+    """Drop-in replacement for ``dp_mixed_schedule`` built on ``MixedDPTables``."""
+    if delta_1_s <= 0 or delta_2_s <= 0:
+        raise ValueError('delta_1_s and delta_2_s must be > 0')
+    tables = build_mixed_tables(
+        main_seq=main_seq,
+        ramp_seq=ramp_seq,
+        veh_type_by_id=veh_type_by_id,
+        t_min_cav_s=t_min_cav_s,
+        hdv_predicted_time_s=hdv_predicted_time_s,
+    )
+    return dp_mixed_schedule_tables(tables, delta_1_s=delta_1_s, delta_2_s=delta_2_s)
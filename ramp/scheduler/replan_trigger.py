@@ -0,0 +1,207 @@
+"""When the Zone B schedulers recompute their plan, and the per-step projection.
+
+``DPScheduler`` and ``HierarchicalScheduler`` used to re-run the DP on a fixed
+``replan_interval_s`` timer whether or not anything had changed.
+``ReplanTrigger`` keeps that behaviour as ``'timer'`` (the default) and adds
+``'event'``: replan as soon as the set of schedulable vehicles changes (a new
+entry, or a crossing / departure), or when some vehicle's arrival estimate
+has drifted more than ``eta_drift_s`` from the one it had at the last replan.
+The timer stays on as an upper bound on the time between two replans.
+
+The arrival estimate used for drift is the constant-speed one,
+``t + d_to_merge / max(speed, 0.1)`` (what the hierarchical DP predicts for
+HDVs); it is evaluated for all planned vehicles at once from the
+``VehicleTable`` columns, so checking costs no TraCI calls.
+
+Between replans the cached plan is projected onto the vehicles still in the
+control zone.  ``PlanProjector`` returns the previous projection as is while
+that subset is unchanged, and otherwise a ``Plan`` whose target/ETA mappings
+are read-only views over the cached plan's dicts (``PlanSubMapping``) rather
+than fresh copies.  Consumers must treat the returned plan as read-only.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ramp.runtime.types import Plan
+from ramp.runtime.vehicle_table import as_vehicle_table
+
+REPLAN_TRIGGER_TIMER = 'timer'
+REPLAN_TRIGGER_EVENT = 'event'
+REPLAN_TRIGGERS = (REPLAN_TRIGGER_TIMER, REPLAN_TRIGGER_EVENT)
+
+REPLAN_REASON_INITIAL = 'initial'
+REPLAN_REASON_TIMER = 'timer'
+REPLAN_REASON_ENTRY = 'entry'
+REPLAN_REASON_EXIT = 'exit'
+REPLAN_REASON_ETA_DRIFT = 'eta_drift'
+
+DEFAULT_ETA_DRIFT_S = 1.0
+
+_ETA_MIN_SPEED_MPS = 0.1
+
+
+def _candidate_ids(
+    control_zone_state: Mapping[str, Mapping[str, float | str]], crossed_merge: set[str],
+) -> list[str]:
+    return [veh_id for veh_id in control_zone_state if veh_id not in crossed_merge]
+
+
+def _constant_speed_eta(
+    control_zone_state: Mapping[str, Mapping[str, float | str]],
+    veh_ids: list[str],
+    sim_time_s: float,
+) -> np.ndarray:
+    table = as_vehicle_table(control_zone_state)
+    rows = table.rows(veh_ids)
+    speed = np.maximum(table.speed[rows], _ETA_MIN_SPEED_MPS)
+    return sim_time_s + table.d_to_merge[rows] / speed
+
+
+@dataclass(slots=True)
+class ReplanTrigger:
+    mode: str = REPLAN_TRIGGER_TIMER
+    # Timer period ('timer') or the longest gap between replans ('event').
+    interval_s: float = 0.5
+    eta_drift_s: float = DEFAULT_ETA_DRIFT_S
+    # Replans by reason (see the REPLAN_REASON_* constants).
+    reason_counts: Counter = field(default_factory=Counter)
+    _last_replan_time_s: float | None = None
+    _baseline_ids: list[str] = field(default_factory=list)
+    _baseline_id_set: frozenset[str] = frozenset()
+    _baseline_eta_s: np.ndarray | None = None
+
+    def __post_init__(self) -> None:
+        if self.mode not in REPLAN_TRIGGERS:
+            raise ValueError(
+                f'Unknown replan trigger {self.mode!r}. Valid: {", ".join(REPLAN_TRIGGERS)}'
+            )
+        if self.eta_drift_s <= 0:
+            raise ValueError('eta_drift_s must be > 0')
+
+    def check(
+        self,
+        *,
+        sim_time_s: float,
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
+        crossed_merge: set[str],
+        has_plan: bool,
+    ) -> str | None:
+        """Return why the scheduler should replan now, or ``None``."""
+        if not has_plan or self._last_replan_time_s is None:
+            return REPLAN_REASON_INITIAL
+        if (
+            self.interval_s <= 0
+            or sim_time_s - self._last_replan_time_s >= self.interval_s - 1e-9
+        ):
+            return REPLAN_REASON_TIMER
+        if self.mode != REPLAN_TRIGGER_EVENT:
+            return None
+
+        candidates = _candidate_ids(control_zone_state, crossed_merge)
+        baseline = self._baseline_id_set
+        if any(veh_id not in baseline for veh_id in candidates):
+            return REPLAN_REASON_ENTRY
+        if len(candidates) != len(baseline):
+            return REPLAN_REASON_EXIT
+        if self._baseline_ids and self._baseline_eta_s is not None:
+            eta_s = _constant_speed_eta(control_zone_state, self._baseline_ids, sim_time_s)
+            if float(np.max(np.abs(eta_s - self._baseline_eta_s))) > self.eta_drift_s:
+                return REPLAN_REASON_ETA_DRIFT
+        return None
+
+    def mark_replanned(
+        self,
+        *,
+        sim_time_s: float,
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
+        crossed_merge: set[str],
+        reason: str,
+    ) -> None:
+        """Record a replan; in event mode, snapshot the state it was based on."""
+        self._last_replan_time_s = sim_time_s
+        self.reason_counts[reason] += 1
+        if self.mode != REPLAN_TRIGGER_EVENT:
+            return
+        candidates = _candidate_ids(control_zone_state, crossed_merge)
+        self._baseline_ids = candidates
+        self._baseline_id_set = frozenset(candidates)
+        self._baseline_eta_s = (
+            _constant_speed_eta(control_zone_state, candidates, sim_time_s)
+            if candidates else None
+        )
+
+
+class PlanSubMapping(Mapping):
+    """Read-only ``{veh_id: value}`` of *source* restricted to *order*.
+
+    Iterates in *order* (skipping IDs *source* lacks), like the dict
+    comprehension it replaces.
+    """
+
+    __slots__ = ('_source', '_keys', '_key_set')
+
+    def __init__(self, source: Mapping[str, float], order: list[str]) -> None:
+        self._source = source
+        self._keys = [veh_id for veh_id in order if veh_id in source]
+        self._key_set = frozenset(self._keys)
+
+    def __getitem__(self, veh_id: str) -> float:
+        if veh_id not in self._key_set:
+            raise KeyError(veh_id)
+        return self._source[veh_id]
+
+    def __contains__(self, veh_id: object) -> bool:
+        return veh_id in self._key_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f'PlanSubMapping({dict(self)!r})'
+
+
+@dataclass(slots=True)
+class PlanProjector:
+    """Project a cached plan onto the vehicles still being scheduled."""
+
+    policy_name: str
+    _source: Plan | None = None
+    _projected: Plan | None = None
+
+    def project(
+        self,
+        *,
+        cached_plan: Plan | None,
+        sim_time_s: float,
+        control_zone_state: Mapping[str, Mapping[str, float | str]],
+        crossed_merge: set[str],
+    ) -> Plan:
+        if cached_plan is None:
+            return Plan(plan_time_s=sim_time_s, policy_name=self.policy_name)
+
+        order = [
+            veh_id for veh_id in cached_plan.order
+            if veh_id in control_zone_state and veh_id not in crossed_merge
+        ]
+        projected = self._projected
+        if projected is not None and self._source is cached_plan and projected.order == order:
+            return projected
+        projected = Plan(
+            plan_time_s=cached_plan.plan_time_s,
+            policy_name=self.policy_name,
+            order=order,
+            target_cross_time_s=PlanSubMapping(cached_plan.target_cross_time_s, order),
+            eta_s=PlanSubMapping(cached_plan.eta_s, order),
+        )
+        self._source = cached_plan
+        self._projected = projected
+        return projected
@@ -0,0 +1,187 @@
+"""Array arrival-time bound and speed commands agree with the scalar versions."""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.dp.command_builder import build_command as build_dp_command
+from ramp.policies.fifo.command_builder import build_command as build_fifo_command
+from ramp.policies.hierarchical.command_builder import build_command as build_hier_command
+from ramp.policies.speed_command import desired_speed, plan_speed_targets
+from ramp.runtime.types import Plan
+from ramp.runtime.vehicle_registry import VehicleRegistry
+from ramp.runtime.vehicle_table import VehicleTable
+from ramp.runtime.vmax import stream_vmax, stream_vmax_rows
+from ramp.scheduler.arrival_time import (
+    minimum_arrival_time_at_on_ramp,
+    minimum_arrival_times_at_on_ramp,
+)
+
+_LANES = {
+    'main': ('main_h2_0', 'main_h2_1', 'main_h3_1'),
+    'ramp': ('ramp_h6_0', 'main_h3_0', 'main_h3_1'),
+    'unknown': ('main_h3_0', 'x_0'),
+}
+
+
+def _random_population(rng: random.Random, n: int) -> tuple[VehicleTable, list[str]]:
+    table = VehicleTable(capacity=max(n, 1))
+    table.begin_step()
+    veh_ids = []
+    for i in range(n):
+        stream = rng.choice(('main', 'main', 'ramp', 'ramp', 'unknown'))
+        lane_id = rng.choice(_LANES[stream])
+        veh_id = f'{stream}_{i}'
+        table.put(
+            veh_id, stream=stream, edge_id=lane_id.rsplit('_', 1)[0], lane_id=lane_id,
+            lane_pos=0.0, d_to_merge=rng.uniform(0.0, 300.0), speed=rng.uniform(0.0, 30.0),
+            accel=0.0,
+        )
+        veh_ids.append(veh_id)
+    table.end_step(set(veh_ids))
+    return table, veh_ids
+
+
+def _random_kinematics(rng: random.Random) -> tuple[float, float, float, float]:
+    distance = rng.choice((0.0, -1.0, rng.uniform(0.0, 1.0), rng.uniform(0.0, 400.0)))
+    speed = rng.choice((-0.5, 0.0, rng.uniform(0.0, 35.0), 25.0))
+    a_max = rng.choice((0.0, 1e-7, rng.uniform(0.1, 4.0)))
+    v_max = rng.choice((0.0, 25.0, rng.uniform(5.0, 30.0)))
+    return distance, speed, a_max, v_max
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_array_arrival_times_match_scalar(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(50):
+        t_now = rng.uniform(0.0, 500.0)
+        samples = [_random_kinematics(rng) for _ in range(rng.randint(0, 40))]
+        distance, speed, a_max, v_max = np.array(samples, dtype=float).reshape(-1, 4).T
+        result = minimum_arrival_times_at_on_ramp(
+            t_now_s=t_now, distance_m=distance, speed_mps=speed,
+            a_max_mps2=a_max, v_max_mps=v_max,
+        )
+        expected = [
+            minimum_arrival_time_at_on_ramp(
+                t_now_s=t_now, distance_m=d, speed_mps=v, a_max_mps2=a, v_max_mps=vmax,
+            )
+            for d, v, a, vmax in samples
+        ]
+        # Bit-identical, not approximately equal.
+        assert result.tolist() == expected
+
+
+@pytest.mark.parametrize('aux_vmax_mps', [None, 12.0])
+def test_vmax_rows_match_scalar_lookup(aux_vmax_mps: float | None) -> None:
+    rng = random.Random(7)
+    table, veh_ids = _random_population(rng, 200)
+    rows = table.rows(veh_ids)
+    expected = [
+        stream_vmax(table.stream(row), 25.0, 16.7, aux_vmax_mps=aux_vmax_mps,
+                    lane_id=table.lane_id(row))
+        for row in rows.tolist()
+    ]
+    vmax = stream_vmax_rows(table, rows, 25.0, 16.7, aux_vmax_mps=aux_vmax_mps)
+    assert vmax.tolist() == expected
+
+
+@pytest.mark.parametrize('seed', [3, 4])
+def test_plan_speed_targets_match_scalar(seed: int) -> None:
+    rng = random.Random(seed)
+    for n in (0, 1, 10, 100):
+        table, veh_ids = _random_population(rng, n)
+        sim_time = rng.uniform(0.0, 100.0)
+        targets = {veh_id: sim_time + rng.uniform(-2.0, 20.0) for veh_id in veh_ids}
+        overrides = {veh_id: rng.uniform(-5.0, 40.0) for veh_id in veh_ids if rng.random() < 0.2}
+        speeds = plan_speed_targets(
+            sim_time_s=sim_time, step_length_s=0.1, table=table, veh_ids=veh_ids,
+            target_cross_time_s=targets, main_vmax_mps=25.0, ramp_vmax_mps=16.7,
+            aux_vmax_mps=20.0, v_des_overrides=overrides,
+        )
+        expected = {}
+        for veh_id in veh_ids:
+            row = table.row(veh_id)
+            vmax = stream_vmax(table.stream(row), 25.0, 16.7, aux_vmax_mps=20.0,
+                               lane_id=table.lane_id(row))
+            if veh_id in overrides:
+                expected[veh_id] = max(0.0, min(overrides[veh_id], vmax))
+            else:
+                expected[veh_id] = desired_speed(
+                    sim_time_s=sim_time, step_length_s=0.1,
+                    d_to_merge_m=table.d_to_merge.item(row),
+                    target_cross_time_s=targets[veh_id], vmax_mps=vmax,
+                )
+        assert list(speeds.items()) == list(expected.items())
+
+
+def test_policy_command_builders_use_the_shared_computation() -> None:
+    rng = random.Random(11)
+    table, veh_ids = _random_population(rng, 60)
+    view = table.control_zone_view()
+    targets = {veh_id: 5.0 + rng.uniform(0.0, 15.0) for veh_id in veh_ids}
+    plan = Plan(plan_time_s=5.0, policy_name='dp', order=list(veh_ids), target_cross_time_s=targets)
+    vehicle_types = {veh_id: rng.choice(('cav', 'hdv')) for veh_id in veh_ids}
+    cav_ids = [veh_id for veh_id in veh_ids if vehicle_types[veh_id] == 'cav']
+    common = dict(sim_time_s=5.0, step_length_s=0.1, main_vmax_mps=25.0, ramp_vmax_mps=16.7)
+    expected_all = plan_speed_targets(
+        table=table, veh_ids=veh_ids, target_cross_time_s=targets, aux_vmax_mps=None, **common,
+    )
+
+    assert build_fifo_command(plan=plan, control_zone_state=view, **common).set_speed_mps == expected_all
+    assert build_dp_command(
+        plan=plan, control_zone_state=view, vehicle_types=vehicle_types, **common,
+    ).set_speed_mps == {veh_id: expected_all[veh_id] for veh_id in cav_ids}
+
+    override_id = cav_ids[0]
+    command = build_hier_command(
+        plan=plan, control_zone_state=view, vehicle_types=vehicle_types,
+        zone_c_speed_overrides={override_id: 99.0}, zone_c_coop_overrides={'coop': -1.0}, **common,
+    )
+    expected = {veh_id: expected_all[veh_id] for veh_id in cav_ids}
+    row = table.row(override_id)
+    expected[override_id] = stream_vmax(table.stream(row), 25.0, 16.7, lane_id=table.lane_id(row))
+    expected['coop'] = 0.0
+    assert command.set_speed_mps == expected
+
+
+class _AccelVehicle:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def getAccel(self, veh_id: str) -> float:
+        self.calls += 1
+        return 2.6
+
+
+class _Simulation:
+    arrived: tuple[str, ...] = ()
+
+    def getDepartedIDList(self) -> tuple[str, ...]:
+        return ()
+
+    def getArrivedIDList(self) -> tuple[str, ...]:
+        return self.arrived
+
+
+class _Traci:
+    def __init__(self) -> None:
+        self.vehicle = _AccelVehicle()
+        self.simulation = _Simulation()
+
+
+def test_registry_caches_max_accel_for_the_vehicle_lifetime() -> None:
+    traci = _Traci()
+    registry = VehicleRegistry(traci=traci)
+    assert [registry.max_accel('a') for _ in range(3)] == [2.6, 2.6, 2.6]
+    assert traci.vehicle.calls == 1
+    traci.simulation.arrived = ('a',)
+    registry.sync()
+    assert registry.max_accel_by_id == {}
@@ -0,0 +1,227 @@
+"""Command diffing in Controller: fewer TraCI writes, same vehicle state."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.experiments.run import run_experiment
+from ramp.runtime.controller import Controller
+from ramp.runtime.takeover import TakeoverMode
+from ramp.runtime.types import ControlCommand
+
+_WRITES = ('setSpeed', 'slowDown', 'setSpeedMode', 'setLaneChangeMode', 'changeLane')
+
+
+class _FakeVehicleDomain:
+    """Keeps the control state SUMO would hold for each vehicle."""
+
+    def __init__(self, types: dict[str, str]) -> None:
+        self.calls: Counter = Counter()
+        self.types = types
+        self.road: dict[str, str] = {veh_id: 'main_h2' for veh_id in types}
+        self.actual_speed: dict[str, float] = {veh_id: 15.0 for veh_id in types}
+        # veh_id -> ('set', v) after setSpeed, ('slow', v, duration) after slowDown
+        self.speed_control: dict[str, tuple] = {}
+        self.speed_mode: dict[str, int] = {veh_id: 31 for veh_id in types}
+        self.lc_mode: dict[str, int] = {veh_id: 1621 for veh_id in types}
+
+    def setSpeed(self, veh_id, speed) -> None:
+        self.calls['setSpeed'] += 1
+        self.speed_control[veh_id] = ('set', float(speed))
+
+    def slowDown(self, veh_id, speed, duration) -> None:
+        self.calls['slowDown'] += 1
+        self.speed_control[veh_id] = ('slow', float(speed), float(duration))
+
+    def setSpeedMode(self, veh_id, mode) -> None:
+        self.calls['setSpeedMode'] += 1
+        self.speed_mode[veh_id] = int(mode)
+
+    def getSpeedMode(self, veh_id) -> int:
+        self.calls['getSpeedMode'] += 1
+        return self.speed_mode[veh_id]
+
+    def setLaneChangeMode(self, veh_id, mode) -> None:
+        self.calls['setLaneChangeMode'] += 1
+        self.lc_mode[veh_id] = int(mode)
+
+    def getLaneChangeMode(self, veh_id) -> int:
+        self.calls['getLaneChangeMode'] += 1
+        return self.lc_mode[veh_id]
+
+    def changeLane(self, veh_id, lane_index, duration) -> None:
+        self.calls['changeLane'] += 1
+
+    def getSpeed(self, veh_id) -> float:
+        return self.actual_speed[veh_id]
+
+    def getRoadID(self, veh_id) -> str:
+        return self.road[veh_id]
+
+    def getTypeID(self, veh_id) -> str:
+        return self.types[veh_id]
+
+
+class _FakeLaneDomain:
+    def getLastStepVehicleIDs(self, lane_id):
+        return ('c3',) if lane_id == 'main_h3_0' else ()
+
+
+class _FakeTraci:
+    def __init__(self, types: dict[str, str]) -> None:
+        self.vehicle = _FakeVehicleDomain(types)
+        self.lane = _FakeLaneDomain()
+
+    def state(self) -> tuple:
+        v = self.vehicle
+        return (dict(v.speed_control), dict(v.speed_mode), dict(v.lc_mode))
+
+    def writes(self) -> int:
+        return sum(self.vehicle.calls[name] for name in _WRITES)
+
+
+_TYPES = {'c0': 'cav', 'c1': 'cav', 'c2': 'cav', 'c3': 'cav', 'h0': 'hdv'}
+_ZONE = {
+    'c0': {'stream': 'main', 'edge_id': 'main_h3', 'lane_id': 'main_h3_1'},
+    'c1': {'stream': 'ramp', 'edge_id': 'main_h3', 'lane_id': 'main_h3_0'},
+    'c2': {'stream': 'ramp', 'edge_id': 'ramp_h6', 'lane_id': 'ramp_h6_0'},
+    'h0': {'stream': 'main', 'edge_id': 'main_h3', 'lane_id': 'main_h3_1'},
+}
+
+
+def _command(step: int) -> ControlCommand:
+    speeds = {'c0': 12.0 if step < 10 else 10.0, 'c1': 14.0 - 0.5 * (step // 4), 'h0': 9.0}
+    if step < 15:
+        speeds['c2'] = 8.0
+    command = ControlCommand(set_speed_mps=speeds)
+    if step == 18:
+        command.release_ids.add('c1')
+        del command.set_speed_mps['c1']
+    if step == 7:
+        command.lane_change_targets['c1'] = (1, 3.0)
+        command.lane_change_mode_overrides['c1'] = 0
+    return command
+
+
+def _drive(takeover_mode: TakeoverMode, resync_every_steps: int, steps: int = 25):
+    traci = _FakeTraci(_TYPES)
+    controller = Controller(
+        traci=traci, takeover_mode=takeover_mode, resync_every_steps=resync_every_steps,
+    )
+    active = set(_TYPES)
+    trace = []
+    for step in range(steps):
+        if step == 12:
+            traci.vehicle.road['c0'] = ':n_merge_0'
+        traci.vehicle.actual_speed['c1'] = 13.0 + 0.2 * (step % 3)
+        controller.apply_lane_change_modes(control_zone_state=_ZONE, vehicle_types=_TYPES)
+        result = controller.apply(command=_command(step), active_vehicle_ids=active)
+        controller.close_step()
+        trace.append((traci.state(), result))
+    return trace, traci, controller
+
+
+@pytest.mark.parametrize('takeover_mode', list(TakeoverMode))
+def test_diffing_keeps_vehicle_state_identical(takeover_mode: TakeoverMode) -> None:
+    every_step, every_step_traci, every_step_ctl = _drive(takeover_mode, resync_every_steps=1)
+    diffed, diffed_traci, diffed_ctl = _drive(takeover_mode, resync_every_steps=0)
+    periodic, _, _ = _drive(takeover_mode, resync_every_steps=5)
+
+    assert diffed == every_step
+    assert periodic == every_step
+    assert diffed_traci.writes() < every_step_traci.writes()
+    assert diffed_traci.vehicle.calls['getSpeedMode'] < every_step_traci.vehicle.calls['getSpeedMode']
+    assert sum(diffed_ctl.step_write_counts) == diffed_traci.writes()
+    assert diffed_ctl.suppressed_write_count > 0
+    assert every_step_ctl.write_summary()['steps'] == 25
+
+
+def test_resync_resends_and_rereads() -> None:
+    traci = _FakeTraci(_TYPES)
+    controller = Controller(traci=traci)
+    command = ControlCommand(set_speed_mps={'c0': 11.0})
+    for _ in range(3):
+        controller.apply(command=command, active_vehicle_ids=set(_TYPES))
+        controller.close_step()
+    assert traci.vehicle.calls['setSpeed'] == 1
+    assert controller.step_write_counts == [2, 0, 0]  # setSpeedMode + setSpeed
+    assert controller.step_suppressed_counts == [0, 1, 1]
+
+    controller.resync()
+    controller.apply(command=command, active_vehicle_ids=set(_TYPES))
+    assert traci.vehicle.calls['setSpeed'] == 2
+    assert controller.lane_change_mode('c0') == 1621
+    assert controller.lane_change_mode('c0') == 1621
+    assert traci.vehicle.calls['getLaneChangeMode'] == 1
+
+
+def test_slow_down_invalidates_speed_shadow() -> None:
+    traci = _FakeTraci(_TYPES)
+    controller = Controller(traci=traci, takeover_mode=TakeoverMode.T2_STRICT)
+    active = set(_TYPES)
+    for target in (10.0, 20.0, 20.0, 10.0, 20.0):
+        controller.apply(command=ControlCommand(set_speed_mps={'c0': target}), active_vehicle_ids=active)
+    # 10 < actual 15 -> slowDown; 20 -> setSpeed; 20 again suppressed; slowDown; setSpeed again.
+    assert traci.vehicle.calls['slowDown'] == 2
+    assert traci.vehicle.calls['setSpeed'] == 2
+    assert traci.vehicle.speed_control['c0'] == ('set', 20.0)
+
+
+def test_shadows_are_dropped_for_departed_vehicles() -> None:
+    traci = _FakeTraci(_TYPES)
+    controller = Controller(traci=traci)
+    controller.apply(command=ControlCommand(set_speed_mps={'c0': 11.0}), active_vehicle_ids={'c0'})
+    controller.apply(command=ControlCommand(), active_vehicle_ids=set())
+    assert controller._speed_target == {}
+    assert controller._speed_mode == {}
+    with pytest.raises(ValueError):
+        Controller(traci=traci, resync_every_steps=-1)
+
+
+def _sumo_available() -> bool:
+    return shutil.which('sumo') is not None and importlib.util.find_spec('traci') is not None
+
+
+@pytest.mark.skipif(not _sumo_available(), reason='SUMO with traci required')
+@pytest.mark.parametrize('policy', ['fifo', 'dp', 'hierarchical'])
+def test_diffed_run_matches_full_writes(tmp_path: Path, policy: str) -> None:
+    run_kwargs = dict(
+        scenario='ramp__mlane_v2_mixed',
+        policy=policy,
+        duration_s=60.0,
+        step_length=0.1,
+        seed=7,
+        gui=False,
+        control_zone_length_m=300.0,
+        merge_edge='main_h3',
+        main_vmax_mps=25.0,
+        ramp_vmax_mps=25.0,
+        fifo_gap_s=2.0,
+        delta_1_s=1.5,
+        delta_2_s=2.0,
+        dp_replan_interval_s=1.0,
+    )
+    outputs = {}
+    for resync_steps in (1, 0):
+        out_dir = tmp_path / f'resync_{resync_steps}'
+        run_experiment(out_dir=str(out_dir), controller_resync_steps=resync_steps, **run_kwargs)
+        metrics = json.loads((out_dir / 'metrics.json').read_text(encoding='utf-8'))
+        writes = json.loads((out_dir / 'controller_writes.json').read_text(encoding='utf-8'))
+        assert len(writes['writes_per_step']) == writes['steps']
+        outputs[resync_steps] = (
+            (out_dir / 'control_zone_trace.csv').read_bytes(),
+            {k: v for k, v in metrics.items() if not k.startswith('controller_')},
+            metrics['controller_write_calls_per_step'],
+        )
+    assert outputs[0][:2] == outputs[1][:2]
+    assert outputs[0][2] <= outputs[1][2]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.scheduler.dp import dp_schedule
+from ramp.scheduler.dp_array import ArrayDPScheduler, dp_schedule_array
+
+
+def _random_tmin(rng: random.Random, vehicles: list[str], mode: str) -> dict[str, float]:
+    if mode == 'ties':
+        # Integer t_min with integer gaps produces many equal-cost predecessors.
+        return {veh: float(rng.randint(0, 6)) for veh in vehicles}
+    if mode == 'dense':
+        return {veh: rng.uniform(0.0, 20.0) for veh in vehicles}
+    return {veh: rng.uniform(0.0, 200.0) for veh in vehicles}
+
+
+@pytest.mark.parametrize(('mode', 'seed'), [('ties', 0), ('dense', 1), ('sparse', 2)])
+def test_array_engine_is_identical_to_reference(mode: str, seed: int) -> None:
+    rng = random.Random(seed)
+    delta_1_s, delta_2_s = (1.0, 2.0) if mode == 'ties' else (1.5, 2.0)
+    for _ in range(700):
+        main_seq = [f'm{i}' for i in range(rng.randint(0, 9))]
+        ramp_seq = [f'r{i}' for i in range(rng.randint(0, 9))]
+        t_min_s = _random_tmin(rng, main_seq + ramp_seq, mode)
+        kwargs = dict(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            t_min_s=t_min_s,
+            delta_1_s=delta_1_s,
+            delta_2_s=delta_2_s,
+        )
+        # Exact equality: same order, same float times, same cost.
+        assert dp_schedule_array(**kwargs) == dp_schedule(**kwargs)
+
+
+def test_incremental_tail_updates_reuse_states() -> None:
+    rng = random.Random(3)
+    engine = ArrayDPScheduler(initial_capacity=2)
+    main_seq: list[str] = []
+    ramp_seq: list[str] = []
+    t_min_s: dict[str, float] = {}
+    for step in range(60):
+        if step % 3 != 2:
+            veh_id = f'm{len(main_seq)}'
+            main_seq.append(veh_id)
+        else:
+            veh_id = f'r{len(ramp_seq)}'
+            ramp_seq.append(veh_id)
+        t_min_s[veh_id] = step * 0.8 + rng.uniform(0.0, 3.0)
+        if step % 5 == 4:
+            # A tail vehicle's t_min moved (e.g. it braked).
+            t_min_s[main_seq[-1]] += 0.5
+
+        kwargs = dict(
+            main_seq=main_seq,
+            ramp_seq=ramp_seq,
+            t_min_s=t_min_s,
+            delta_1_s=1.5,
+            delta_2_s=2.0,
+        )
+        assert engine.schedule(**kwargs) == dp_schedule(**kwargs)
+        if step >= 2 and step % 5 != 4:
+            assert engine.last_reused_states > 0
+            assert engine.last_computed_states < (len(main_seq) + 1) * (len(ramp_seq) + 1) - 1
+
+
+def test_incremental_head_removal_and_delta_change() -> None:
+    engine = ArrayDPScheduler()
+    t_min_s = {f'm{i}': 2.0 * i for i in range(6)} | {f'r{i}': 2.0 * i + 0.7 for i in range(4)}
+    main_seq = [f'm{i}' for i in range(6)]
+    ramp_seq = [f'r{i}' for i in range(4)]
+    engine.schedule(
+        main_seq=main_seq, ramp_seq=ramp_seq, t_min_s=t_min_s, delta_1_s=1.5, delta_2_s=2.0
+    )
+
+    # Main head vehicle crossed: only the ramp-only states (0, n) survive.
+    kwargs = dict(main_seq=main_seq[1:], ramp_seq=ramp_seq, t_min_s=t_min_s)
+    result = engine.schedule(**kwargs, delta_1_s=1.5, delta_2_s=2.0)
+    assert engine.last_reused_states == len(ramp_seq)
+    assert result == dp_schedule(**kwargs, delta_1_s=1.5, delta_2_s=2.0)
+
+    # Same queues, new gaps: cached states are stale.
+    result = engine.schedule(**kwargs, delta_1_s=1.0, delta_2_s=3.0)
+    assert engine.last_reused_states == 0
+    assert result == dp_schedule(**kwargs, delta_1_s=1.0, delta_2_s=3.0)
+
+
+def test_array_engine_validates_inputs() -> None:
+    with pytest.raises(ValueError):
+        dp_schedule_array(main_seq=[], ramp_seq=[], t_min_s={}, delta_1_s=0.0, delta_2_s=1.0)
+    with pytest.raises(KeyError):
+        dp_schedule_array(
+            main_seq=['m0'], ramp_seq=[], t_min_s={}, delta_1_s=1.0, delta_2_s=1.0
+        )
+    empty = dp_schedule_array(main_seq=[], ramp_seq=[], t_min_s={}, delta_1_s=1.0, delta_2_s=1.0)
+    assert empty.passing_order == []
+    assert empty.cost == 0.0
@@ -3,6 +3,7 @@ from __future__ import annotations
 import random
 import sys
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -13,11 +14,19 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from ramp.scheduler.dp import ScheduleResult, dp_schedule
 from ramp.scheduler.dp_mixed import dp_mixed_schedule
+from ramp.scheduler.dp_mixed_fast import dp_mixed_schedule_fast
 
 
 DELTA_1 = 1.5
 DELTA_2 = 2.0
 
+MixedSchedule = Callable[..., ScheduleResult]
+
+
+@pytest.fixture(params=[dp_mixed_schedule, dp_mixed_schedule_fast], ids=['reference', 'fast'])
+def mixed_schedule(request: pytest.FixtureRequest) -> MixedSchedule:
+    return request.param
+
 
 def _lane_of(veh_id: str, main_seq: list[str]) -> int:
     return 0 if veh_id in main_seq else 1
@@ -56,7 +65,7 @@ def _verify_stream_order(result: ScheduleResult, main_seq: list[str], ramp_seq:
 # ---------------------------------------------------------------------------
 # 1. test_all_cav_matches_dp
 # ---------------------------------------------------------------------------
-def test_all_cav_matches_dp() -> None:
+def test_all_cav_matches_dp(mixed_schedule: MixedSchedule) -> None:
     """All-CAV dp_mixed must produce identical cost/total_delay as dp_schedule."""
     rng = random.Random(42)
     for m_total in range(5):
@@ -79,7 +88,7 @@ def test_all_cav_matches_dp() -> None:
                 )
 
                 veh_type_by_id = {v: 'cav' for v in all_vehs}
-                result_mixed = dp_mixed_schedule(
+                result_mixed = mixed_schedule(
                     main_seq=main_seq,
                     ramp_seq=ramp_seq,
                     veh_type_by_id=veh_type_by_id,
@@ -100,7 +109,7 @@ def test_all_cav_matches_dp() -> None:
 # ---------------------------------------------------------------------------
 # 2. test_all_hdv
 # ---------------------------------------------------------------------------
-def test_all_hdv() -> None:
+def test_all_hdv(mixed_schedule: MixedSchedule) -> None:
     """All-HDV: every target_cross_time must equal t_pred exactly."""
     main_seq = ['m0', 'm1', 'm2']
     ramp_seq = ['r0', 'r1']
@@ -110,7 +119,7 @@ def test_all_hdv() -> None:
         'r0': 3.0, 'r1': 8.0,
     }
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -133,7 +142,7 @@ def test_all_hdv() -> None:
 # ---------------------------------------------------------------------------
 # 3. test_single_hdv_main_first
 # ---------------------------------------------------------------------------
-def test_single_hdv_main_first() -> None:
+def test_single_hdv_main_first(mixed_schedule: MixedSchedule) -> None:
     """First main vehicle is HDV; its time is fixed."""
     main_seq = ['m0_hdv', 'm1_cav']
     ramp_seq = ['r0_cav']
@@ -141,7 +150,7 @@ def test_single_hdv_main_first() -> None:
     t_min_cav_s = {'m1_cav': 3.0, 'r0_cav': 2.0}
     hdv_predicted_time_s = {'m0_hdv': 1.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -159,7 +168,7 @@ def test_single_hdv_main_first() -> None:
 # ---------------------------------------------------------------------------
 # 4. test_single_hdv_ramp_last
 # ---------------------------------------------------------------------------
-def test_single_hdv_ramp_last() -> None:
+def test_single_hdv_ramp_last(mixed_schedule: MixedSchedule) -> None:
     """Last ramp vehicle is HDV; its time is fixed."""
     main_seq = ['m0']
     ramp_seq = ['r0', 'r1_hdv']
@@ -167,7 +176,7 @@ def test_single_hdv_ramp_last() -> None:
     t_min_cav_s = {'m0': 1.0, 'r0': 2.0}
     hdv_predicted_time_s = {'r1_hdv': 12.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -185,7 +194,7 @@ def test_single_hdv_ramp_last() -> None:
 # ---------------------------------------------------------------------------
 # 5. test_hdv_infeasible_pruning
 # ---------------------------------------------------------------------------
-def test_hdv_infeasible_pruning() -> None:
+def test_hdv_infeasible_pruning(mixed_schedule: MixedSchedule) -> None:
     """HDV t_pred too early prunes some paths; the DP finds the sole feasible order."""
     main_seq = ['m0', 'm1']
     ramp_seq = ['r0']
@@ -193,7 +202,7 @@ def test_hdv_infeasible_pruning() -> None:
     t_min_cav_s = {'m0': 1.0, 'r0': 2.0}
     hdv_predicted_time_s = {'m1': 3.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -208,7 +217,7 @@ def test_hdv_infeasible_pruning() -> None:
     _verify_stream_order(result, main_seq, ramp_seq)
 
 
-def test_hdv_all_infeasible_raises() -> None:
+def test_hdv_all_infeasible_raises(mixed_schedule: MixedSchedule) -> None:
     """When HDV timing violates monotonicity after a CAV, ValueError is raised."""
     main_seq = ['m0', 'm1']
     ramp_seq = ['r0']
@@ -217,7 +226,7 @@ def test_hdv_all_infeasible_raises() -> None:
     hdv_predicted_time_s = {'m1': 3.0, 'r0': 2.0}
 
     with pytest.raises(ValueError, match='No feasible schedule'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=main_seq,
             ramp_seq=ramp_seq,
             veh_type_by_id=veh_type_by_id,
@@ -228,14 +237,14 @@ def test_hdv_all_infeasible_raises() -> None:
         )
 
 
-def test_hdv_hdv_close_spacing_feasible() -> None:
+def test_hdv_hdv_close_spacing_feasible(mixed_schedule: MixedSchedule) -> None:
     """Two HDVs with close spacing (< delta) should be feasible after relaxation."""
     main_seq = ['m0']
     ramp_seq = ['r0']
     veh_type_by_id = {'m0': 'hdv', 'r0': 'hdv'}
     hdv_predicted_time_s = {'m0': 1.0, 'r0': 1.5}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -250,7 +259,7 @@ def test_hdv_hdv_close_spacing_feasible() -> None:
 # ---------------------------------------------------------------------------
 # 6. test_hdv_forces_cav_delay
 # ---------------------------------------------------------------------------
-def test_hdv_forces_cav_delay() -> None:
+def test_hdv_forces_cav_delay(mixed_schedule: MixedSchedule) -> None:
     """HDV in middle position forces subsequent CAV to wait longer."""
     main_seq = ['m0', 'm1']
     ramp_seq = ['r0']
@@ -258,7 +267,7 @@ def test_hdv_forces_cav_delay() -> None:
     t_min_cav_s = {'m0': 1.0, 'm1': 2.0}
     hdv_predicted_time_s = {'r0': 3.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -285,7 +294,7 @@ def test_hdv_forces_cav_delay() -> None:
 # ---------------------------------------------------------------------------
 # 7. test_mixed_50_50
 # ---------------------------------------------------------------------------
-def test_mixed_50_50() -> None:
+def test_mixed_50_50(mixed_schedule: MixedSchedule) -> None:
     """50% HDV mixed scenario with 4 main + 4 ramp vehicles."""
     main_seq = ['m0', 'm1', 'm2', 'm3']
     ramp_seq = ['r0', 'r1', 'r2', 'r3']
@@ -296,7 +305,7 @@ def test_mixed_50_50() -> None:
     t_min_cav_s = {'m0': 1.0, 'm2': 9.0, 'r1': 7.0, 'r3': 16.0}
     hdv_predicted_time_s = {'m1': 5.0, 'm3': 14.0, 'r0': 3.0, 'r2': 11.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -321,7 +330,7 @@ def test_mixed_50_50() -> None:
 # ---------------------------------------------------------------------------
 # 8. test_empty_main
 # ---------------------------------------------------------------------------
-def test_empty_main() -> None:
+def test_empty_main(mixed_schedule: MixedSchedule) -> None:
     """Main sequence is empty; only ramp vehicles."""
     main_seq: list[str] = []
     ramp_seq = ['r0', 'r1']
@@ -329,7 +338,7 @@ def test_empty_main() -> None:
     t_min_cav_s = {'r0': 1.0}
     hdv_predicted_time_s = {'r1': 5.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -347,7 +356,7 @@ def test_empty_main() -> None:
 # ---------------------------------------------------------------------------
 # 9. test_empty_ramp
 # ---------------------------------------------------------------------------
-def test_empty_ramp() -> None:
+def test_empty_ramp(mixed_schedule: MixedSchedule) -> None:
     """Ramp sequence is empty; only main vehicles."""
     main_seq = ['m0', 'm1']
     ramp_seq: list[str] = []
@@ -355,7 +364,7 @@ def test_empty_ramp() -> None:
     t_min_cav_s = {'m1': 5.0}
     hdv_predicted_time_s = {'m0': 1.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -373,9 +382,9 @@ def test_empty_ramp() -> None:
 # ---------------------------------------------------------------------------
 # 10. test_both_empty
 # ---------------------------------------------------------------------------
-def test_both_empty() -> None:
+def test_both_empty(mixed_schedule: MixedSchedule) -> None:
     """Both sequences empty → trivial result."""
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=[],
         ramp_seq=[],
         veh_type_by_id={},
@@ -395,7 +404,7 @@ def test_both_empty() -> None:
 # ---------------------------------------------------------------------------
 # 11. test_large_scale
 # ---------------------------------------------------------------------------
-def test_large_scale() -> None:
+def test_large_scale(mixed_schedule: MixedSchedule) -> None:
     """M=20, N=10, 50% HDV — verify solve time < 50ms.
 
     Generate globally well-separated times (>= delta_2 apart) so that
@@ -441,7 +450,7 @@ def test_large_scale() -> None:
             t_min_cav_s[veh] = t
 
     t0 = time.perf_counter()
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -461,7 +470,7 @@ def test_large_scale() -> None:
 # ---------------------------------------------------------------------------
 # 12. test_hdv_delay_is_zero
 # ---------------------------------------------------------------------------
-def test_hdv_delay_is_zero() -> None:
+def test_hdv_delay_is_zero(mixed_schedule: MixedSchedule) -> None:
     """HDV vehicles contribute zero delay to total_delay_s."""
     main_seq = ['m0', 'm1']
     ramp_seq = ['r0']
@@ -469,7 +478,7 @@ def test_hdv_delay_is_zero() -> None:
     t_min_cav_s = {'m0': 1.0, 'r0': 2.0}
     hdv_predicted_time_s = {'m1': 4.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -489,7 +498,7 @@ def test_hdv_delay_is_zero() -> None:
 # ---------------------------------------------------------------------------
 # 13. test_same_stream_ordering
 # ---------------------------------------------------------------------------
-def test_same_stream_ordering() -> None:
+def test_same_stream_ordering(mixed_schedule: MixedSchedule) -> None:
     """Within the same stream, HDV cannot be overtaken — internal order preserved."""
     main_seq = ['m0_hdv', 'm1_cav', 'm2_hdv']
     ramp_seq = ['r0_cav']
@@ -499,7 +508,7 @@ def test_same_stream_ordering() -> None:
     t_min_cav_s = {'m1_cav': 3.0, 'r0_cav': 1.0}
     hdv_predicted_time_s = {'m0_hdv': 1.0, 'm2_hdv': 8.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -519,14 +528,14 @@ def test_same_stream_ordering() -> None:
 # ---------------------------------------------------------------------------
 # 14. test_different_stream_gap
 # ---------------------------------------------------------------------------
-def test_different_stream_gap() -> None:
+def test_different_stream_gap(mixed_schedule: MixedSchedule) -> None:
     """Cross-stream gap delta_2 is correctly applied between main and ramp."""
     main_seq = ['m0']
     ramp_seq = ['r0']
     veh_type_by_id = {'m0': 'cav', 'r0': 'cav'}
     t_min_cav_s = {'m0': 1.0, 'r0': 1.0}
 
-    result = dp_mixed_schedule(
+    result = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -546,7 +555,7 @@ def test_different_stream_gap() -> None:
 # ---------------------------------------------------------------------------
 # 15. test_cost_with_hdv_constraint_higher
 # ---------------------------------------------------------------------------
-def test_cost_with_hdv_constraint_higher() -> None:
+def test_cost_with_hdv_constraint_higher(mixed_schedule: MixedSchedule) -> None:
     """Cost with HDV constraints >= unconstrained (all-CAV) cost."""
     main_seq = ['m0', 'm1']
     ramp_seq = ['r0']
@@ -566,7 +575,7 @@ def test_cost_with_hdv_constraint_higher() -> None:
     t_min_cav_s = {'m0': 1.0, 'm1': 4.0}
     hdv_predicted_time_s = {'r0': 2.5}
 
-    result_constrained = dp_mixed_schedule(
+    result_constrained = mixed_schedule(
         main_seq=main_seq,
         ramp_seq=ramp_seq,
         veh_type_by_id=veh_type_by_id,
@@ -585,10 +594,10 @@ def test_cost_with_hdv_constraint_higher() -> None:
 # ---------------------------------------------------------------------------
 # 16. test_invalid_delta_raises
 # ---------------------------------------------------------------------------
-def test_invalid_delta_raises() -> None:
+def test_invalid_delta_raises(mixed_schedule: MixedSchedule) -> None:
     """delta_1_s or delta_2_s <= 0 raises ValueError."""
     with pytest.raises(ValueError, match='must be > 0'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=['m0'],
             ramp_seq=[],
             veh_type_by_id={'m0': 'cav'},
@@ -599,7 +608,7 @@ def test_invalid_delta_raises() -> None:
         )
 
     with pytest.raises(ValueError, match='must be > 0'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=['m0'],
             ramp_seq=[],
             veh_type_by_id={'m0': 'cav'},
@@ -613,10 +622,10 @@ def test_invalid_delta_raises() -> None:
 # ---------------------------------------------------------------------------
 # 17. test_missing_type_raises
 # ---------------------------------------------------------------------------
-def test_missing_type_raises() -> None:
+def test_missing_type_raises(mixed_schedule: MixedSchedule) -> None:
     """Missing or invalid veh_type_by_id entry raises ValueError."""
     with pytest.raises(ValueError, match='Unknown or missing vehicle type'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=['m0'],
             ramp_seq=[],
             veh_type_by_id={},
@@ -630,10 +639,10 @@ def test_missing_type_raises() -> None:
 # ---------------------------------------------------------------------------
 # 18. test_missing_tmin_raises
 # ---------------------------------------------------------------------------
-def test_missing_tmin_raises() -> None:
+def test_missing_tmin_raises(mixed_schedule: MixedSchedule) -> None:
     """Missing t_min_cav_s for a CAV raises KeyError."""
     with pytest.raises(KeyError, match='Missing t_min_cav_s'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=['m0'],
             ramp_seq=[],
             veh_type_by_id={'m0': 'cav'},
@@ -647,10 +656,10 @@ def test_missing_tmin_raises() -> None:
 # ---------------------------------------------------------------------------
 # 19. test_missing_tpred_raises
 # ---------------------------------------------------------------------------
-def test_missing_tpred_raises() -> None:
+def test_missing_tpred_raises(mixed_schedule: MixedSchedule) -> None:
     """Missing hdv_predicted_time_s for an HDV raises KeyError."""
     with pytest.raises(KeyError, match='Missing hdv_predicted_time_s'):
-        dp_mixed_schedule(
+        mixed_schedule(
             main_seq=['m0'],
             ramp_seq=[],
             veh_type_by_id={'m0': 'hdv'},
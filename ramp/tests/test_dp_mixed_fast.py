@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.hierarchical.scheduler import (
+    _try_dp_mixed_tables_with_fallback,
+    _try_dp_mixed_with_fallback,
+)
+from ramp.scheduler.dp_array import ArrayDPScheduler
+from ramp.scheduler.dp_mixed import dp_mixed_schedule
+from ramp.scheduler.dp_mixed_fast import build_mixed_tables, dp_mixed_schedule_fast
+
+
+def _random_case(rng: random.Random, *, integer: bool) -> dict:
+    main_seq = [f'm{i}' for i in range(rng.randint(0, 8))]
+    ramp_seq = [f'r{i}' for i in range(rng.randint(0, 8))]
+    veh_type_by_id = {v: ('hdv' if rng.random() < 0.3 else 'cav') for v in main_seq + ramp_seq}
+    times: dict[str, float] = {}
+    for seq in (main_seq, ramp_seq):
+        t = rng.uniform(0.0, 3.0)
+        for veh_id in seq:
+            # Queues are eta-sorted in the scheduler, so times grow along each lane.
+            t += float(rng.randint(1, 3)) if integer else rng.uniform(0.5, 4.0)
+            times[veh_id] = float(round(t)) if integer else t
+    return dict(
+        main_seq=main_seq,
+        ramp_seq=ramp_seq,
+        veh_type_by_id=veh_type_by_id,
+        t_min_cav_s={v: t for v, t in times.items() if veh_type_by_id[v] == 'cav'},
+        hdv_predicted_time_s={v: t for v, t in times.items() if veh_type_by_id[v] == 'hdv'},
+        delta_1_s=1.0 if integer else 1.5,
+        delta_2_s=2.0,
+    )
+
+
+def _solve(fn, kwargs: dict):
+    try:
+        return fn(**kwargs)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize('integer', [True, False], ids=['ties', 'continuous'])
+def test_fast_mixed_dp_matches_reference(integer: bool) -> None:
+    rng = random.Random(11 if integer else 12)
+    feasible = 0
+    for _ in range(1500):
+        kwargs = _random_case(rng, integer=integer)
+        expected = _solve(dp_mixed_schedule, kwargs)
+        assert _solve(dp_mixed_schedule_fast, kwargs) == expected
+        feasible += expected is not None
+    # Both branches (feasible and HDV-infeasible) must be exercised.
+    assert 100 < feasible < 1400
+
+
+def test_tables_bounds_and_cav_fallback_inputs() -> None:
+    tables = build_mixed_tables(
+        main_seq=['m0', 'm1', 'm2'],
+        ramp_seq=['r0', 'r1'],
+        veh_type_by_id={'m0': 'cav', 'm1': 'hdv', 'm2': 'hdv', 'r0': 'hdv', 'r1': 'cav'},
+        t_min_cav_s={'m0': 1.0, 'r1': 6.0},
+        hdv_predicted_time_s={'m1': 5.0, 'm2': 3.0, 'r0': 2.0},
+    )
+    assert tables.hdv_bound_s[0] == (3.0, 3.0, 3.0, math.inf)
+    assert tables.hdv_bound_s[1] == (2.0, math.inf, math.inf)
+    assert tables.cav_main == ('m0',)
+    assert tables.cav_ramp == ('r1',)
+    assert tables.cav_t_min_s() == {'m0': 1.0, 'r1': 6.0}
+    assert tables.hdv_count == 3
+
+
+def test_table_fallback_matches_reference_fallback() -> None:
+    rng = random.Random(21)
+    engine = ArrayDPScheduler()
+    fallbacks = 0
+    for _ in range(400):
+        kwargs = _random_case(rng, integer=False)
+        eta_s = kwargs['t_min_cav_s'] | kwargs['hdv_predicted_time_s']
+        expected = _try_dp_mixed_with_fallback(**kwargs, eta_s=eta_s)
+        got = _try_dp_mixed_tables_with_fallback(
+            **kwargs, eta_s=eta_s, cav_schedule=engine.schedule
+        )
+        assert got == expected
+        fallbacks += expected[1]
+    assert fallbacks > 0
@@ -3,6 +3,7 @@ from __future__ import annotations
 import itertools
 import random
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -12,7 +13,12 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from ramp.scheduler.arrival_time import minimum_arrival_time_at_on_ramp
-from ramp.scheduler.dp import dp_schedule
+from ramp.scheduler.dp import ScheduleResult, dp_schedule
+from ramp.scheduler.dp_array import dp_schedule_array
+
+_DP_ENGINES = pytest.mark.parametrize(
+    'schedule', [dp_schedule, dp_schedule_array], ids=['reference', 'array']
+)
 
 
 def _calc_next_time(
@@ -129,9 +135,12 @@ def test_arrival_time_boundary_conditions() -> None:
     assert t_min == pytest.approx(t_now + 100.0 / 20.0)
 
 
+@_DP_ENGINES
 @pytest.mark.parametrize('m_total', [0, 1, 2, 3])
 @pytest.mark.parametrize('n_total', [0, 1, 2, 3])
-def test_dp_matches_bruteforce_small(m_total: int, n_total: int) -> None:
+def test_dp_matches_bruteforce_small(
+    m_total: int, n_total: int, schedule: Callable[..., ScheduleResult]
+) -> None:
     rng = random.Random(0)
     delta_1_s = 1.5
     delta_2_s = 2.0
@@ -153,7 +162,7 @@ def test_dp_matches_bruteforce_small(m_total: int, n_total: int) -> None:
             delta_2_s=delta_2_s,
         )
 
-        result = dp_schedule(
+        result = schedule(
             main_seq=main_seq,
             ramp_seq=ramp_seq,
             t_min_s=t_min_s,
@@ -199,9 +208,12 @@ def test_dp_matches_bruteforce_small(m_total: int, n_total: int) -> None:
             pre_lane = lane
 
 
+@_DP_ENGINES
 @pytest.mark.parametrize('m_total', [1, 2, 3])
 @pytest.mark.parametrize('n_total', [1, 2, 3])
-def test_dp_schedule_legality_random_tmin(m_total: int, n_total: int) -> None:
+def test_dp_schedule_legality_random_tmin(
+    m_total: int, n_total: int, schedule: Callable[..., ScheduleResult]
+) -> None:
     rng = random.Random(7)
     delta_1_s = 1.5
     delta_2_s = 2.0
@@ -213,7 +225,7 @@ def test_dp_schedule_legality_random_tmin(m_total: int, n_total: int) -> None:
         for veh in main_seq + ramp_seq:
             t_min_s[veh] = rng.uniform(0.0, 20.0)
 
-        result = dp_schedule(
+        result = schedule(
             main_seq=main_seq,
             ramp_seq=ramp_seq,
             t_min_s=t_min_s,
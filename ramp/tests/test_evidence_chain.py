@@ -17,8 +17,12 @@ from ramp.experiments.evidence_chain import (
     FEEDBACK_FIELDS,
     MERGE_POLICY_FIXED,
     MERGE_POLICY_FLEXIBLE,
+    ContractTally,
+    FeedbackLog,
+    FeedbackTally,
     attach_actual_neighbors,
     build_contract_row,
+    build_contract_smoke_summary,
     build_evidence_metrics,
     expected_merge_position_m,
     merge_window_half_span_s,
@@ -70,6 +74,115 @@ def test_attach_actual_neighbors() -> None:
     assert feedback_rows[2]['actual_follower_id'] == ''
 
 
+def _random_feedback_rows(seed: int) -> tuple[list[dict], dict[str, dict]]:
+    import random
+
+    rng = random.Random(seed)
+    contract_by_id: dict[str, dict] = {}
+    for index in range(12):
+        start = rng.uniform(0.0, 50.0)
+        contract_by_id[f'contract_{index:08d}'] = {
+            'merge_window_start_s': start,
+            'merge_window_end_s': start + rng.uniform(1.0, 6.0),
+            'target_predecessor_id': rng.choice(['', 'v0', 'v1', 'v2']),
+            'target_follower_id': rng.choice(['', 'v1', 'v2', 'v3']),
+        }
+    rows: list[dict] = []
+    for index in range(80):
+        cross = rng.random() < 0.4
+        rows.append({
+            'contract_id': rng.choice(['', 'contract_99999999', *contract_by_id]),
+            'ego_vehicle_id': f'v{rng.randrange(5)}',
+            'execution_state': 'merge_cross' if cross else rng.choice(['lc_complete', 'lc_command_issued']),
+            'actual_merge_time_s': rng.uniform(0.0, 55.0) if cross or rng.random() < 0.5 else '',
+            'actual_predecessor_id': '' if cross else rng.choice(['', 'v1']),
+            'actual_follower_id': '' if cross else rng.choice(['', 'v2']),
+            'fallback_reason': rng.choice(['', '', 'zone_c_chain_incomplete', 'position_fallback']),
+            'replan_required': rng.randrange(2),
+        })
+    return rows, contract_by_id
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_feedback_log_matches_batch_neighbors_and_metrics(seed: int) -> None:
+    rows, contract_by_id = _random_feedback_rows(seed)
+    batch_rows = [dict(row) for row in rows]
+    attach_actual_neighbors(
+        feedback_rows=batch_rows,
+        cross_feedback_indices=[
+            index for index, row in enumerate(batch_rows)
+            if row['execution_state'] == 'merge_cross'
+        ],
+    )
+
+    written: list[dict] = []
+    log = FeedbackLog(sink=written.append, contract_by_id=contract_by_id)
+    for row in rows:
+        log.append(dict(row))
+    log.close()
+    assert written == batch_rows
+    assert log.pending_count == 0
+    assert log.tally == FeedbackTally.from_rows(batch_rows, contract_by_id)
+
+    common = dict(
+        duration_s=60.0,
+        controlled_cav_steps=0,
+        covered_control_cav_steps=0,
+        autonomous_lane_change_detected_count=0,
+        speed_mismatch_detected_count=0,
+        zone_a_event_count=0,
+        zone_c_event_count=0,
+        zone_c_chain_status={},
+        zone_c_chain_complete_count=0,
+        contract_vehicle_ids=set(),
+        feedback_vehicle_ids=set(),
+        planned_actual_time_errors=[],
+        planned_actual_position_errors=[],
+    )
+    assert build_evidence_metrics(**common, feedback_tally=log.tally) == build_evidence_metrics(
+        **common, feedback_rows=batch_rows, contract_by_id=contract_by_id
+    )
+
+
+def test_feedback_log_holds_rows_only_behind_last_cross() -> None:
+    written: list[dict] = []
+    log = FeedbackLog(sink=written.append, contract_by_id={})
+    base = {
+        'contract_id': '', 'actual_merge_time_s': '', 'actual_predecessor_id': '',
+        'actual_follower_id': '', 'fallback_reason': '', 'replan_required': 0,
+    }
+    log.append({**base, 'ego_vehicle_id': 'x', 'execution_state': 'lc_command_issued'})
+    assert len(written) == 1
+    log.append({**base, 'ego_vehicle_id': 'a', 'execution_state': 'merge_cross'})
+    log.append({**base, 'ego_vehicle_id': 'y', 'execution_state': 'lc_complete'})
+    assert len(written) == 1
+    assert log.pending_count == 2
+    log.append({**base, 'ego_vehicle_id': 'b', 'execution_state': 'merge_cross'})
+    assert [row['ego_vehicle_id'] for row in written] == ['x', 'a', 'y']
+    assert written[1]['actual_follower_id'] == 'b'
+    assert log.pending_count == 1
+    log.close()
+    assert written[-1]['actual_predecessor_id'] == 'a'
+    assert log.tally.row_count == 4
+
+
+def test_contract_tally_matches_smoke_summary() -> None:
+    contracts = {
+        'c1': {'expected_merge_time_s': 1.0, 'expected_merge_position_m': 0.0,
+               'merge_window_start_s': 0.5, 'merge_window_end_s': 1.5,
+               'target_predecessor_id': 'a', 'target_follower_id': ''},
+        'c2': {'expected_merge_time_s': 2.0, 'expected_merge_position_m': '',
+               'merge_window_start_s': 2.0, 'merge_window_end_s': 2.0,
+               'target_predecessor_id': '', 'target_follower_id': 'b'},
+    }
+    tally = ContractTally()
+    for snapshot in contracts.values():
+        tally.add(snapshot)
+    assert tally.summary() == build_contract_smoke_summary(contract_by_id=contracts)
+    assert tally.summary()['field_completeness_rate'] == 0.5
+    assert ContractTally().summary()['total_contracts'] == 0
+
+
 def test_build_evidence_metrics_core_rates() -> None:
     feedback_rows = [
         {
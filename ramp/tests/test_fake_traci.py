@@ -0,0 +1,186 @@
+"""Tests for the in-memory fake TraCI backend and the policy step-cost bench."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.runtime.fake_traci import (
+    FAKE_SUMO_BINARY,
+    INVALID_DOUBLE_VALUE,
+    FakeDeparture,
+    FakeNetwork,
+    FakeScenario,
+    FakeTraci,
+    FakeVType,
+    TraceReplay,
+)
+from ramp.runtime.simulation_driver import SUMO_BACKEND_FAKE, import_sumo_backend
+from ramp.runtime.subscription import PollingVehicleReader, SubscriptionVehicleReader
+from ramp.tools.bench_fake_policies import DEFAULT_MAX_POLICY_MS, run_cell
+
+_SCENARIO_DIR = PROJECT_ROOT / 'ramp' / 'scenarios' / 'ramp__mlane_v2_mixed'
+_SUMOCFG = _SCENARIO_DIR / 'ramp__mlane_v2_mixed.sumocfg'
+_CMD = [FAKE_SUMO_BINARY, '--configuration-file', str(_SUMOCFG), '--step-length', '0.1']
+_MAIN_ROUTE = ('main_h1', 'main_h2', 'main_h3', 'main_h4')
+
+
+def _started(scenario: FakeScenario | None = None, **kwargs) -> FakeTraci:
+    traci = FakeTraci(scenario, **kwargs)
+    traci.start(_CMD)
+    return traci
+
+
+def _single_vehicle_scenario(*, depart_lane: int = 0) -> FakeScenario:
+    network = FakeNetwork.from_net_xml(_SCENARIO_DIR / 'ramp__mlane_v2_mixed.net.xml')
+    return FakeScenario(
+        network=network,
+        vtypes={'cav': FakeVType(type_id='cav', max_speed_mps=25.0)},
+        departures=[FakeDeparture(
+            veh_id='v0', depart_s=0.0, type_id='cav', route=_MAIN_ROUTE,
+            depart_lane=depart_lane, depart_speed_mps=None,
+        )],
+        routes={'main_route': _MAIN_ROUTE},
+    )
+
+
+def _snapshot(traci: FakeTraci) -> list[tuple]:
+    vehicle = traci.vehicle
+    return [
+        (veh_id, vehicle.getLaneID(veh_id), vehicle.getLanePosition(veh_id), vehicle.getSpeed(veh_id))
+        for veh_id in vehicle.getIDList()
+    ]
+
+
+def test_import_sumo_backend_returns_a_fresh_fake() -> None:
+    first = import_sumo_backend(SUMO_BACKEND_FAKE)
+    assert isinstance(first, FakeTraci)
+    assert import_sumo_backend(SUMO_BACKEND_FAKE) is not first
+
+
+def test_kinematic_run_is_deterministic() -> None:
+    runs = []
+    for _ in range(2):
+        traci = _started()
+        steps = []
+        departed = arrived = 0
+        for _ in range(600):
+            traci.simulationStep()
+            steps.append(_snapshot(traci))
+            departed += len(traci.simulation.getDepartedIDList())
+            arrived += len(traci.simulation.getArrivedIDList())
+        assert traci.simulation.getTime() == 60.0
+        assert departed > 0 and arrived > 0
+        assert traci.simulation.getCollisions() == ()
+        runs.append(steps)
+    assert runs[0] == runs[1]
+
+
+def test_subscription_reader_matches_polling_reader() -> None:
+    traci = _started()
+    subscribed = SubscriptionVehicleReader(traci=traci, merge_edge='main_h3')
+    polling = PollingVehicleReader(traci=traci)
+    for step in range(400):
+        traci.simulationStep()
+        active = subscribed.refresh()
+        assert active == polling.refresh()
+        if step % 50:
+            continue
+        for veh_id in sorted(active):
+            for name in ('road_id', 'lane_id', 'lane_pos', 'speed', 'accel'):
+                assert getattr(subscribed, name)(veh_id) == getattr(polling, name)(veh_id)
+            assert subscribed.driving_distance(veh_id, 'main_h3') == polling.driving_distance(
+                veh_id, 'main_h3')
+
+
+def test_driving_distance_counts_junction_lanes() -> None:
+    traci = _started(_single_vehicle_scenario())
+    vehicle = traci.vehicle
+    previous = None
+    roads = []
+    while True:
+        traci.simulationStep()
+        if 'v0' not in vehicle.getIDList():
+            break
+        distance = vehicle.getDrivingDistance('v0', 'main_h4', 0.0)
+        roads.append(vehicle.getRoadID('v0'))
+        if distance == INVALID_DOUBLE_VALUE:
+            assert vehicle.getRoadID('v0') == 'main_h4'
+        elif previous is not None:
+            assert previous - distance == pytest.approx(0.1 * vehicle.getSpeed('v0'))
+        previous = distance
+    assert ':n_merge_0' in roads
+    assert traci.simulation.getArrivedIDList() == ('v0',)
+
+
+def test_speed_and_lane_commands_move_the_vehicle() -> None:
+    traci = _started(_single_vehicle_scenario(depart_lane=0))
+    vehicle = traci.vehicle
+    traci.simulationStep()
+    vehicle.setSpeed('v0', 5.0)
+    vehicle.changeLane('v0', 2, 10.0)
+    speeds = []
+    for _ in range(60):
+        traci.simulationStep()
+        speeds.append(vehicle.getSpeed('v0'))
+    assert vehicle.getLaneID('v0') == 'main_h1_2'
+    decel = max(a - b for a, b in zip(speeds, speeds[1:]))
+    assert decel <= 4.5 * 0.1 + 1e-9
+    assert speeds[-1] == 5.0
+    vehicle.setSpeed('v0', -1.0)
+    traci.simulationStep()
+    assert vehicle.getSpeed('v0') == pytest.approx(5.0 + 2.6 * 0.1)
+
+
+def test_replay_follows_the_recorded_trace() -> None:
+    rows = [
+        {'time': 0.1, 'veh_id': 'a', 'stream': 'main', 'lane_id': 'main_h2_0', 'lane_pos': 10.0,
+         'speed': 20.0, 'accel': 0.5},
+        {'time': 0.1, 'veh_id': 'r', 'stream': 'ramp', 'lane_id': 'ramp_h6_1', 'lane_pos': 3.0,
+         'speed': 15.0, 'accel': 0.0},
+        {'time': 0.2, 'veh_id': 'a', 'stream': 'main', 'lane_id': 'main_h2_0', 'lane_pos': 12.0,
+         'speed': 20.05, 'accel': 0.5},
+    ]
+    traci = _started(replay=TraceReplay.from_rows(rows))
+    traci.simulationStep()
+    assert set(traci.simulation.getDepartedIDList()) == {'a', 'r'}
+    assert traci.vehicle.getRoute('r') == ('ramp_h5', 'ramp_h6', 'main_h3', 'main_h4')
+    assert traci.vehicle.getRouteIndex('r') == 1
+    traci.vehicle.setSpeed('a', 0.0)
+    traci.simulationStep()
+    assert traci.simulation.getArrivedIDList() == ('r',)
+    assert traci.vehicle.getLanePosition('a') == 12.0
+    assert traci.vehicle.getSpeed('a') == 20.05
+    assert traci.lane.getLastStepVehicleIDs('main_h2_0') == ('a',)
+
+
+@pytest.mark.parametrize('policy', ['no_control', 'fifo', 'dp', 'hierarchical'])
+def test_policy_step_cost_within_regression_threshold(tmp_path: Path, policy: str) -> None:
+    result = run_cell(
+        policy=policy, main_vph=1200, ramp_vph=500, duration_s=30.0, seed=1, out_dir=tmp_path,
+    )
+    assert result['steps'] == 300
+    assert result['entered_control_count'] > 0
+    assert result['policy_ms_mean'] <= DEFAULT_MAX_POLICY_MS
+
+
+@pytest.mark.parametrize('policy', ['dp', 'hierarchical'])
+def test_metrics_json_is_reproducible_with_timings_kept_apart(
+    tmp_path: Path, policy: str
+) -> None:
+    metrics_bytes = []
+    for run in range(2):
+        out_dir = tmp_path / f'run_{run}'
+        run_cell(
+            policy=policy, main_vph=1200, ramp_vph=500, duration_s=20.0, seed=1, out_dir=out_dir,
+        )
+        metrics_bytes.append((out_dir / 'metrics.json').read_bytes())
+        timing = json.loads((out_dir / 'scheduler_timing.json').read_text(encoding='utf-8'))
+        assert set(timing) == {'scheduler_cpu_s', 'scheduler_replan_latency_ms'}
+    assert metrics_bytes[0] == metrics_bytes[1]
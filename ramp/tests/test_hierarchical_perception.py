@@ -0,0 +1,188 @@
+"""Tests for the shared hierarchical lane perception pass."""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.hierarchical.perception import (
+    LaneLayout,
+    read_lane_perception,
+    resolve_lane_layout,
+)
+from ramp.policies.hierarchical.scheduler import _collect_zone_c_cav_states
+from ramp.policies.hierarchical.state_collector_ext import zone_a_info_from_perception
+from ramp.policies.hierarchical.zone_a import ZoneAEvacuator
+from ramp.runtime.controller import Controller
+from ramp.runtime.subscription import PollingVehicleReader
+from ramp.runtime.vehicle_table import VehicleTable
+
+# lane_id -> [(veh_id, type, pos, speed)]
+_LANES = {
+    'main_h2_0': [('a0', 'cav', 50.0, 8.0), ('a1', 'hdv', 120.0, 9.0), ('a2', 'cav', 200.0, 7.0)],
+    'main_h2_1': [('b0', 'hdv', 45.0, 20.0)],
+    'main_h3_0': [('r0', 'cav', 30.0, 12.0), ('r1', 'hdv', 60.0, 11.0)],
+    'main_h3_1': [('m0', 'hdv', 20.0, 15.0), ('m1', 'cav', 80.0, 16.0)],
+}
+
+
+class _Domain:
+    def __init__(self, calls: Counter, name: str, methods: dict) -> None:
+        self._calls = calls
+        self._name = name
+        self._methods = methods
+
+    def __getattr__(self, attr: str):
+        method = self._methods[attr]
+
+        def call(*args):
+            self._calls[f'{self._name}.{attr}'] += 1
+            return method(*args)
+
+        return call
+
+
+class _FakeTraci:
+    def __init__(self, lanes: dict) -> None:
+        self.calls: Counter = Counter()
+        vehicles = {v[0]: v for lane in lanes.values() for v in lane}
+        edges = {lane_id.rsplit('_', 1)[0] for lane_id in lanes}
+        self.edge = _Domain(self.calls, 'edge', {
+            'getIDList': lambda: tuple(sorted(edges)),
+            'getLaneNumber': lambda edge: sum(1 for lane in lanes if lane.startswith(f'{edge}_')),
+        })
+        self.lane = _Domain(self.calls, 'lane', {
+            'getIDList': lambda: tuple(lanes),
+            'getLength': lambda lane_id: 250.0,
+            'getLastStepVehicleIDs': lambda lane_id: tuple(v[0] for v in lanes[lane_id]),
+        })
+        self.vehicle = _Domain(self.calls, 'vehicle', {
+            'getTypeID': lambda veh_id: vehicles[veh_id][1],
+            'getLanePosition': lambda veh_id: vehicles[veh_id][2],
+            'getSpeed': lambda veh_id: vehicles[veh_id][3],
+        })
+
+
+def _observed(lanes: dict, veh_ids: set[str]):
+    table = VehicleTable()
+    table.begin_step()
+    for lane_id, vehicles in lanes.items():
+        for veh_id, _vtype, pos, speed in vehicles:
+            if veh_id in veh_ids:
+                table.put(
+                    veh_id, stream='main', edge_id=lane_id[:-2], lane_id=lane_id,
+                    lane_pos=pos, d_to_merge=250.0 - pos, speed=speed, accel=0.0,
+                )
+    table.end_step(veh_ids)
+    return table.observation_view()
+
+
+def _perceive(traci: _FakeTraci, *, observed=None, layout: LaneLayout | None = None):
+    return read_lane_perception(
+        sim_time_s=1.0,
+        traci=traci,
+        layout=layout or resolve_lane_layout(traci),
+        type_id=traci.vehicle.getTypeID,
+        reader=PollingVehicleReader(traci=traci),
+        observed=observed,
+    )
+
+
+def test_each_lane_and_vehicle_is_read_once() -> None:
+    traci = _FakeTraci(_LANES)
+    layout = resolve_lane_layout(traci)
+    assert layout.zone_a_lane_ids == ('main_h2_0', 'main_h2_1')
+    traci.calls.clear()
+
+    observed = _observed(_LANES, {'a0', 'a1', 'a2', 'b0'})
+    perception = _perceive(traci, observed=observed, layout=layout)
+    assert traci.calls['lane.getLastStepVehicleIDs'] == 4
+    # main_h2 kinematics come from the table; the HDV on main_h3_0 is not read.
+    assert traci.calls['vehicle.getLanePosition'] == 3
+    assert traci.calls['vehicle.getSpeed'] == 3
+    assert 'edge.getLaneNumber' not in traci.calls
+
+    assert perception.merge_lane.vehicle_ids == ('r0', 'r1')
+    assert dict(perception.merge_lane.kinematics) == {'r0': (30.0, 12.0)}
+    assert perception.target_lane.vehicles() == [('m0', 20.0, 15.0), ('m1', 80.0, 16.0)]
+    assert perception.zone_a_lane(0).kinematics['a1'] == (120.0, 9.0)
+    assert perception.zone_a_lane(2) is None
+    with pytest.raises(TypeError):
+        perception.target_lane.kinematics['m0'] = (0.0, 0.0)
+
+
+def test_zone_a_info_from_perception() -> None:
+    info = zone_a_info_from_perception(_perceive(_FakeTraci(_LANES)))
+    assert info is not None
+    assert info.lane_vehicle_counts == {0: 3, 1: 1}
+    assert info.lane_densities == {0: 3 / 250.0 * 1000.0, 1: 1 / 250.0 * 1000.0}
+    assert info.lane_avg_speeds == {0: 8.0, 1: 20.0}
+    assert info.edge_length_m == 250.0
+
+
+def test_missing_lanes_give_empty_snapshots() -> None:
+    lanes = {'main_h3_0': _LANES['main_h3_0']}
+    perception = _perceive(_FakeTraci(lanes))
+    assert perception.zone_a_lanes == ()
+    assert zone_a_info_from_perception(perception) is None
+    assert perception.target_lane.vehicle_ids == ()
+    assert set(_collect_zone_c_cav_states(perception)) == {'r0'}
+
+
+def test_traci_errors_are_not_swallowed() -> None:
+    class _LaneError(Exception):
+        pass
+
+    traci = _FakeTraci(_LANES)
+    layout = resolve_lane_layout(traci)
+
+    def _broken(lane_id):
+        raise _LaneError(lane_id)
+
+    traci.lane._methods['getLastStepVehicleIDs'] = _broken
+    with pytest.raises(_LaneError):
+        _perceive(traci, layout=layout)
+
+
+def test_consumers_share_the_snapshot() -> None:
+    traci = _FakeTraci(_LANES)
+    perception = _perceive(traci)
+    traci.calls.clear()
+
+    cav_states = _collect_zone_c_cav_states(perception)
+    assert {vid: (s.lane_index, s.lane_pos_m) for vid, s in cav_states.items()} == {
+        'r0': (0, 30.0), 'm1': (1, 80.0),
+    }
+
+    evacuator = ZoneAEvacuator(v_limit_mps=25.0, s_threshold=0.2)
+    actions = evacuator.evaluate(
+        sim_time_s=1.0,
+        zone_a_info=zone_a_info_from_perception(perception),
+        vehicle_types={},
+        perception=perception,
+    )
+    # Slow lane 0 -> faster lane 1; a0 is only 5 m behind b0, a1 is an HDV.
+    assert actions == {'a2': (1, evacuator.lc_duration_s)}
+
+    class _LcRecorder:
+        def __init__(self) -> None:
+            self.modes: dict[str, int] = {}
+
+        def setLaneChangeMode(self, veh_id, mode) -> None:
+            self.modes[veh_id] = mode
+
+    traci.vehicle = _LcRecorder()
+    controller = Controller(traci=traci)
+    controller.apply_lane_change_modes(
+        control_zone_state={},
+        vehicle_types={'r0': 'cav', 'r1': 'hdv'},
+        merge_lane_vehicle_ids=perception.merge_lane.vehicle_ids,
+    )
+    assert traci.vehicle.modes == {'r0': 0}
+    assert traci.calls == Counter()
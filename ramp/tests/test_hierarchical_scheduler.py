@@ -20,8 +20,13 @@ from ramp.policies.hierarchical.merge_point import MergePointParams
 from ramp.policies.hierarchical.scheduler import (
     MERGE_POLICY_FIXED,
     MERGE_POLICY_FLEXIBLE,
+    ContractIndex,
     HierarchicalScheduler,
+    _build_contracts,
+    _build_contracts_reference,
 )
+from ramp.runtime.types import Plan
+from ramp.tools.bench_contracts import simulate_steps
 
 
 def test_fixed_scheduler_instantiates() -> None:
@@ -117,3 +122,74 @@ def test_default_merge_policy_is_flexible() -> None:
         main_vmax_mps=25.0, ramp_vmax_mps=20.0,
     )
     assert s.merge_policy == MERGE_POLICY_FLEXIBLE
+
+
+def _contract_inputs() -> dict:
+    state = {
+        'm1': {'stream': 'main'},
+        'r1': {'stream': 'ramp'},
+        'r2': {'stream': 'ramp'},
+        'm2': {'stream': 'main'},
+        'r3': {'stream': 'ramp'},
+        'r4': {'stream': 'ramp'},
+    }
+    return dict(
+        plan=Plan(
+            plan_time_s=0.0,
+            policy_name='hierarchical',
+            order=['m1', 'r1', 'x1', 'r2', 'm2', 'r3', 'gone', 'r4'],
+            target_cross_time_s={'r1': 5.0, 'r2': 6.0, 'r3': 8.0, 'm1': 4.0, 'm2': 7.0},
+        ),
+        control_zone_state=state,
+        vehicle_types={'m1': 'cav', 'm2': 'cav', 'r1': 'cav', 'r2': 'cav', 'r3': 'cav', 'r4': 'cav', 'x1': 'hdv'},
+        zone_c_lane1_vehicles=[('x1', 100.0, 15.0)],
+    )
+
+
+def test_build_contracts_links_nearest_partners() -> None:
+    contracts = _build_contracts(**_contract_inputs())
+    assert list(contracts) == ['r1', 'r2', 'r3']  # r4 has no target time
+    assert (contracts['r1'].target_predecessor_id, contracts['r1'].target_follower_id) == ('m1', 'x1')
+    assert (contracts['r2'].target_predecessor_id, contracts['r2'].target_follower_id) == ('x1', 'm2')
+    assert (contracts['r3'].target_predecessor_id, contracts['r3'].target_follower_id) == ('m2', None)
+    assert contracts['r2'].fallback_allowed  # x1 is an HDV
+    assert not contracts['r3'].fallback_allowed
+    assert contracts['r3'].sequence_rank == 5
+    assert contracts['r3'].merge_window_start_s == 5.0
+    assert contracts == _build_contracts_reference(**_contract_inputs())
+
+
+def test_contract_index_matches_reference_across_steps() -> None:
+    index = ContractIndex()
+    previous: dict = {}
+    for plan, state, vehicle_types, lane1 in simulate_steps(population=60, steps=80, seed=3):
+        kwargs = dict(
+            plan=plan, control_zone_state=state,
+            vehicle_types=vehicle_types, zone_c_lane1_vehicles=lane1,
+        )
+        contracts = index.update(**kwargs)
+        assert contracts == _build_contracts_reference(**kwargs)
+        assert list(contracts) == list(_build_contracts(**kwargs))
+        for veh_id, contract in contracts.items():
+            if veh_id in previous and previous[veh_id] == contract:
+                assert previous[veh_id] is contract
+        previous = contracts
+    assert index.contracts_reused > 0
+    assert index.relink_count < 80
+
+
+def test_contract_index_skips_relink_for_unchanged_order() -> None:
+    index = ContractIndex()
+    first = index.update(**_contract_inputs())
+    first.clear()  # callers prune their own copy
+    second = index.update(**_contract_inputs())
+    assert index.relink_count == 1
+    assert index.contracts_reused == 3
+    assert second == _build_contracts_reference(**_contract_inputs())
+
+    moved = _contract_inputs()
+    moved['zone_c_lane1_vehicles'] = []  # x1 leaves lane 1: r1/r2 relink
+    third = index.update(**moved)
+    assert index.relink_count == 2
+    assert third['r1'].target_follower_id == 'm2'
+    assert third['r3'] is second['r3']
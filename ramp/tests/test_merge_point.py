@@ -7,7 +7,10 @@ state machine including timeout/retry.
 
 from __future__ import annotations
 
+import gc
+import random
 import sys
+import tracemalloc
 from pathlib import Path
 
 import pytest
@@ -17,13 +20,16 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from ramp.policies.hierarchical.merge_point import (
+    Lane1Index,
     MergeEvalResult,
     MergePointManager,
     MergePointParams,
     MergeState,
     VehicleState,
+    _evaluate_contract_gap,
     evaluate_merge_point,
 )
+from ramp.runtime.types import MergeContract
 
 PARAMS = MergePointParams()
 
@@ -329,3 +335,141 @@ class TestMergePointManager:
         tracker = mgr.get_tracker('c0')
         assert tracker.last_eval is not None
         assert tracker.last_eval.is_fallback is True
+
+
+# ===================================================================
+# Lane1Index – shared per-step lane-1 ordering
+# ===================================================================
+
+def _random_lane1(rng: random.Random, ids: list[str]) -> list[tuple[str, float, float]]:
+    # Positions on a 2.5 m grid so equal positions (sort ties) occur.
+    vehicles = [(vid, rng.randrange(0, 120) * 2.5, rng.uniform(5.0, 25.0)) for vid in ids]
+    rng.shuffle(vehicles)
+    return vehicles
+
+
+class TestLane1Index:
+
+    def test_vectorised_scan_matches_loop(self, monkeypatch):
+        from ramp.policies.hierarchical import merge_point
+
+        rng = random.Random(3)
+        cases = []
+        for _ in range(300):
+            lane1 = _random_lane1(rng, [f'l1_{i}' for i in range(rng.randrange(1, 60))])
+            cases.append((rng.uniform(0.0, 260.0), rng.uniform(0.0, 25.0), lane1))
+        monkeypatch.setattr(merge_point, '_VECTOR_SCAN_MIN_GAPS', 10**9)
+        loop = [evaluate_merge_point(p, v, lane1, PARAMS) for p, v, lane1 in cases]
+        monkeypatch.setattr(merge_point, '_VECTOR_SCAN_MIN_GAPS', 1)
+        vectorised = [evaluate_merge_point(p, v, lane1, PARAMS) for p, v, lane1 in cases]
+        assert vectorised == loop
+        assert any(r.feasible for r in loop) and any(not r.feasible for r in loop)
+
+    def test_incremental_order_matches_stable_sort(self):
+        rng = random.Random(1)
+        index = Lane1Index(incremental=True)
+        ids = [f'l1_{i}' for i in range(40)]
+        for step in range(60):
+            ids = [vid for vid in ids if rng.random() > 0.05] + [f'new_{step}_{i}' for i in range(2)]
+            vehicles = _random_lane1(rng, ids)
+            index.rebuild(vehicles)
+            expected = sorted(vehicles, key=lambda x: x[1])
+            assert index.sorted_vehicles == expected
+            assert index.positions == [v[1] for v in expected]
+            assert index.by_id == {v[0]: v for v in vehicles}
+
+    @pytest.mark.parametrize('incremental', [True, False])
+    def test_manager_decisions_match_per_cav_evaluation(self, incremental):
+        """Every gap decision equals a standalone evaluate_merge_point call."""
+        rng = random.Random(7)
+        params = MergePointParams()
+        mgr = MergePointManager(params, incremental_index=incremental)
+        lane1_ids = [f'l1_{i}' for i in range(25)]
+        cav_ids = [f'c{i}' for i in range(12)]
+        checked = 0
+        for step in range(80):
+            sim_time = step * 0.5
+            lane1 = _random_lane1(rng, lane1_ids)
+            cavs = {
+                vid: VehicleState(
+                    'main_h3', 1 if rng.random() < 0.05 else 0,
+                    rng.uniform(0.0, params.lane0_length_m), rng.uniform(0.0, 25.0),
+                )
+                for vid in cav_ids
+            }
+            contracts = {}
+            if step % 3 == 0:
+                contracts['c0'] = MergeContract(
+                    vehicle_id='c0',
+                    sequence_rank=1,
+                    target_predecessor_id=rng.choice(lane1_ids + [None]),
+                    target_follower_id=rng.choice(lane1_ids + [None]),
+                    merge_window_start_s=sim_time,
+                    merge_window_end_s=sim_time + 5.0,
+                    expected_merge_time_s=sim_time + 2.0,
+                )
+            mgr.update(sim_time, cavs, lane1, contracts)
+            for event in mgr.consume_events_since_cursor():
+                if event['event_type'] not in ('lc_issued', 'fallback_lc_issued', 'gap_reject'):
+                    continue
+                vid = event['veh_id']
+                vs = cavs[vid]
+                if vid in contracts:
+                    expected = _evaluate_contract_gap(
+                        vs.lane_pos_m, vs.speed_mps, contracts[vid], lane1, params,
+                    )
+                else:
+                    expected = evaluate_merge_point(vs.lane_pos_m, vs.speed_mps, lane1, params)
+                assert mgr.get_tracker(vid).last_eval == expected
+                checked += 1
+        assert checked > 100
+
+
+# ===================================================================
+# Bounded event history
+# ===================================================================
+
+class TestBoundedHistory:
+
+    def test_consume_events_keeps_cursor_semantics(self):
+        mgr = MergePointManager(event_log_capacity=8)
+        cavs = {'c0': VehicleState('main_h3', 0, 35.0, 15.0)}
+        mgr.update(0.0, cavs, [])
+        first = mgr.consume_events_since_cursor()
+        assert [e['event_type'] for e in first] == ['merge_search_start', 'lc_issued']
+        assert mgr.consume_events_since_cursor() == []
+
+        blocker = [('blocker', 37.0, 15.0)]
+        for step in range(10):
+            cavs = {f'd{step}': VehicleState('main_h3', 0, 40.0, 15.0)}
+            mgr.update(1.0 + step, cavs, blocker)
+        events = mgr.consume_events_since_cursor()
+        assert len(events) == 8
+        assert events[-1]['veh_id'] == 'd9'
+        assert mgr.events_missed == 20 - 8
+
+    def test_two_hour_mixed_stress_flow_keeps_memory_constant(self):
+        from ramp.tools.bench_merge_point_flow import simulate_zone_c_flow
+
+        mgr = MergePointManager()
+        traced: dict[int, int] = {}
+
+        def _checkpoint(sim_time, _update_s):
+            hour = int(sim_time // 3600)
+            if sim_time % 3600 == 0 and hour in (1, 2):
+                gc.collect()
+                traced[hour] = tracemalloc.get_traced_memory()[0]
+
+        tracemalloc.start()
+        try:
+            simulate_zone_c_flow(mgr, duration_s=7200.5, step_s=0.5, on_step=_checkpoint)
+        finally:
+            tracemalloc.stop()
+
+        assert mgr.merge_history.next_seq > mgr.HISTORY_CAPACITY
+        assert mgr.merge_event_log.next_seq > 4 * mgr.EVENT_LOG_CAPACITY
+        assert len(mgr.merge_history) == mgr.HISTORY_CAPACITY
+        assert len(mgr.merge_event_log) == mgr.EVENT_LOG_CAPACITY
+        assert len(mgr.vehicle_states) < 20
+        # Unbounded logs and trackers grew by ~5 MiB per simulated hour here.
+        assert traced[2] - traced[1] < 256 * 1024
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from ramp.experiments.evidence_chain import ContractTally, FeedbackLog, percentile
+from ramp.experiments.plan_consistency import PlanConsistencyTracker
+
+_STEP_S = 0.1
+
+
+def _synthetic_run(*, steps: int, seed: int):
+    """Yield (sim_time, crossed, alive, order, targets) with a steady population."""
+    rng = random.Random(seed)
+    next_id = 0
+    in_zone: list[str] = []
+    cross_step: dict[str, int] = {}
+    arrive_step: dict[str, int] = {}
+    for step in range(steps):
+        sim_time = round((step + 1) * _STEP_S, 1)
+        if step % 5 == 0:
+            veh_id = f'veh_{next_id}'
+            next_id += 1
+            in_zone.append(veh_id)
+            cross_step[veh_id] = step + rng.randint(40, 120)
+            arrive_step[veh_id] = cross_step[veh_id] + rng.randint(-60, 80)
+        crossed = sorted(
+            v for v in in_zone if cross_step[v] == step and arrive_step[v] > step
+        )
+        for veh_id in crossed:
+            in_zone.remove(veh_id)
+        for veh_id in [v for v in in_zone if arrive_step[v] <= step]:
+            in_zone.remove(veh_id)  # left the network without crossing
+        for veh_id in [v for v, s in arrive_step.items() if s < step - 200]:
+            del arrive_step[veh_id], cross_step[veh_id]
+        alive = {v for v, s in arrive_step.items() if s > step}
+        order = list(in_zone)
+        if rng.random() < 0.3:
+            rng.shuffle(order)
+        if rng.random() < 0.05:
+            order = []
+        targets = {v: sim_time + rng.uniform(0.0, 20.0) for v in order}
+        yield sim_time, crossed, alive, order, targets
+
+
+def _batch_metrics(plan_snapshots, cross_time):
+    """Post-run computation previously done in ``ramp.experiments.run``."""
+    mismatch = 0
+    errors: list[float] = []
+    for veh_id, cross_t in sorted(cross_time.items(), key=lambda item: (float(item[1]), item[0])):
+        latest_snapshot = None
+        latest_with_vehicle = None
+        for snapshot in plan_snapshots:
+            if snapshot[0] >= cross_t - 1e-9:
+                break
+            latest_snapshot = snapshot
+            if veh_id in snapshot[2]:
+                latest_with_vehicle = snapshot
+        if latest_snapshot and latest_snapshot[1] and latest_snapshot[1][0] != veh_id:
+            mismatch += 1
+        if latest_with_vehicle is not None:
+            errors.append(cross_t - latest_with_vehicle[2][veh_id])
+    mean = sum(abs(err) for err in errors) / len(errors) if errors else 0.0
+    p95 = percentile([abs(err) for err in errors], 0.95) if errors else 0.0
+
+    churn: list[float] = []
+    for prev_snapshot, cur_snapshot in zip(plan_snapshots, plan_snapshots[1:]):
+        prev_pos = {v: i for i, v in enumerate(prev_snapshot[1])}
+        cur_pos = {v: i for i, v in enumerate(cur_snapshot[1])}
+        shared = set(prev_pos) & set(cur_pos)
+        if not shared:
+            continue
+        churn.append(sum(1 for v in shared if prev_pos[v] != cur_pos[v]) / len(shared))
+    churn_rate = sum(churn) / len(churn) if churn else 0.0
+    return mismatch, mean, p95, churn_rate
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_tracker_matches_batch_computation(seed: int) -> None:
+    tracker = PlanConsistencyTracker()
+    plan_snapshots = []
+    cross_time: dict[str, float] = {}
+    for sim_time, crossed, alive, order, targets in _synthetic_run(steps=3000, seed=seed):
+        for veh_id in crossed:
+            cross_time[veh_id] = sim_time
+            tracker.observe_cross(veh_id=veh_id, cross_time_s=sim_time)
+        tracker.retain(alive)
+        tracker.observe_plan(order=order, target_cross_time_s=targets)
+        plan_snapshots.append((sim_time, list(order), dict(targets)))
+
+    assert cross_time
+    assert (
+        tracker.merge_order_mismatch_count,
+        tracker.cross_time_error_mean_s(),
+        tracker.cross_time_error_p95_s(),
+        tracker.plan_churn_rate(),
+    ) == _batch_metrics(plan_snapshots, cross_time)
+
+
+def test_tracker_without_plans_reports_zero() -> None:
+    tracker = PlanConsistencyTracker()
+    tracker.observe_cross(veh_id='a', cross_time_s=1.0)
+    assert tracker.merge_order_mismatch_count == 0
+    assert tracker.cross_time_error_mean_s() == 0.0
+    assert tracker.cross_time_error_p95_s() == 0.0
+    assert tracker.plan_churn_rate() == 0.0
+
+
+def _online_peak_bytes(steps: int) -> int:
+    """Peak traced memory of the runner's online metric state over ``steps``."""
+    tracker = PlanConsistencyTracker()
+    contract_by_id: dict[str, dict] = {}
+    latest_contract_by_vehicle: dict[str, str] = {}
+    contract_tally = ContractTally()
+    feedback_log = FeedbackLog(sink=lambda row: None, contract_by_id=contract_by_id)
+    contract_index = 0
+    tracemalloc.start()
+    try:
+        for sim_time, crossed, alive, order, targets in _synthetic_run(steps=steps, seed=7):
+            for veh_id in crossed:
+                tracker.observe_cross(veh_id=veh_id, cross_time_s=sim_time)
+                feedback_log.append({
+                    'contract_id': latest_contract_by_vehicle.get(veh_id, ''),
+                    'ego_vehicle_id': veh_id,
+                    'execution_state': 'merge_cross',
+                    'actual_merge_time_s': sim_time,
+                    'actual_predecessor_id': '',
+                    'actual_follower_id': '',
+                    'fallback_reason': '',
+                    'replan_required': 0,
+                })
+            tracker.retain(alive)
+            for veh_id in [v for v in latest_contract_by_vehicle if v not in alive]:
+                contract_by_id.pop(latest_contract_by_vehicle.pop(veh_id), None)
+            tracker.observe_plan(order=order, target_cross_time_s=targets)
+            for veh_id in order:
+                contract_index += 1
+                contract_id = f'contract_{contract_index:08d}'
+                snapshot = {
+                    'merge_window_start_s': targets[veh_id] - 1.0,
+                    'merge_window_end_s': targets[veh_id] + 1.0,
+                    'target_predecessor_id': '',
+                    'target_follower_id': '',
+                }
+                contract_tally.add(snapshot)
+                superseded = latest_contract_by_vehicle.get(veh_id)
+                if superseded is not None:
+                    contract_by_id.pop(superseded, None)
+                contract_by_id[contract_id] = snapshot
+                latest_contract_by_vehicle[veh_id] = contract_id
+        feedback_log.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert tracker.tracked_vehicle_count < 60
+    return peak
+
+
+def test_online_metric_memory_is_flat_in_duration() -> None:
+    short_peak = _online_peak_bytes(1_000)
+    long_peak = _online_peak_bytes(8_000)
+    # Snapshotting every plan grew by ~1 KiB per step here (several MiB over
+    # the longer run); only one float per crossed vehicle is left.
+    assert long_peak - short_peak < 64 * 1024
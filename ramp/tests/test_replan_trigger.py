@@ -0,0 +1,215 @@
+"""Tests for event-driven Zone B replanning and the cached-plan projection."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.dp.scheduler import DPScheduler, _compute_plan_once
+from ramp.policies.hierarchical.scheduler import HierarchicalScheduler
+from ramp.runtime.types import Plan
+from ramp.scheduler.replan_trigger import (
+    REPLAN_REASON_ENTRY,
+    REPLAN_REASON_ETA_DRIFT,
+    REPLAN_REASON_EXIT,
+    REPLAN_REASON_INITIAL,
+    REPLAN_REASON_TIMER,
+    PlanProjector,
+    PlanSubMapping,
+    ReplanTrigger,
+)
+
+
+class _FakeVehicle:
+    def getAccel(self, veh_id: str) -> float:
+        return 2.6
+
+
+class _FakeTraci:
+    vehicle = _FakeVehicle()
+
+
+def _vehicle(stream: str, d_to_merge: float, speed: float) -> dict[str, float | str]:
+    edge_id, lane_id = ('main_h2', 'main_h2_0') if stream == 'main' else ('ramp_h6', 'ramp_h6_0')
+    return {
+        'stream': stream, 'edge_id': edge_id, 'lane_id': lane_id,
+        'lane_pos': 0.0, 'd_to_merge': d_to_merge, 'speed': speed, 'accel': 0.0,
+    }
+
+
+def _world(sim_time_s: float) -> tuple[dict, set[str], dict]:
+    """Vehicles driving at constant speed; m2 enters at 2 s, m0 crosses at 4 s."""
+    state: dict[str, dict[str, float | str]] = {}
+    entry_info: dict[str, dict[str, float | str]] = {}
+    crossed: set[str] = set()
+    for veh_id, stream, t_entry, d_entry, speed in (
+        ('m0', 'main', 0.0, 100.0, 25.0),
+        ('r0', 'ramp', 0.0, 150.0, 20.0),
+        ('m1', 'main', 0.0, 250.0, 25.0),
+        ('m2', 'main', 2.0, 290.0, 25.0),
+    ):
+        if sim_time_s < t_entry:
+            continue
+        d_to_merge = d_entry - speed * (sim_time_s - t_entry)
+        entry_info[veh_id] = {'t_entry': t_entry, 'd_entry': d_entry, 'stream': stream}
+        if d_to_merge <= 0:
+            crossed.add(veh_id)
+            continue
+        state[veh_id] = _vehicle(stream, d_to_merge, speed)
+    return state, crossed, entry_info
+
+
+def _reasons(trigger: ReplanTrigger, times: list[float]) -> list[tuple[float, str]]:
+    fired = []
+    for t in times:
+        state, crossed, _ = _world(t)
+        reason = trigger.check(
+            sim_time_s=t, control_zone_state=state, crossed_merge=crossed, has_plan=bool(fired),
+        )
+        if reason is not None:
+            trigger.mark_replanned(
+                sim_time_s=t, control_zone_state=state, crossed_merge=crossed, reason=reason,
+            )
+            fired.append((t, reason))
+    return fired
+
+
+_TIMES = [round(0.5 * i, 1) for i in range(15)]
+
+
+def test_timer_trigger_fires_on_interval_only() -> None:
+    fired = _reasons(ReplanTrigger(interval_s=2.0), _TIMES)
+    assert fired == [
+        (0.0, REPLAN_REASON_INITIAL), (2.0, REPLAN_REASON_TIMER),
+        (4.0, REPLAN_REASON_TIMER), (6.0, REPLAN_REASON_TIMER),
+    ]
+
+
+def test_event_trigger_fires_on_entry_exit_and_upper_bound() -> None:
+    trigger = ReplanTrigger(mode='event', interval_s=3.0)
+    fired = _reasons(trigger, _TIMES)
+    assert fired == [
+        (0.0, REPLAN_REASON_INITIAL), (2.0, REPLAN_REASON_ENTRY),
+        (4.0, REPLAN_REASON_EXIT), (7.0, REPLAN_REASON_TIMER),
+    ]
+    assert trigger.reason_counts[REPLAN_REASON_ENTRY] == 1
+
+
+def test_event_trigger_fires_on_eta_drift() -> None:
+    trigger = ReplanTrigger(mode='event', interval_s=10.0, eta_drift_s=0.5)
+    state = {'m0': _vehicle('main', 200.0, 20.0)}
+    trigger.mark_replanned(
+        sim_time_s=0.0, control_zone_state=state, crossed_merge=set(), reason=REPLAN_REASON_INITIAL,
+    )
+    # On schedule: 180 m left at 20 m/s after 1 s -> same ETA (10 s).
+    on_time = {'m0': _vehicle('main', 180.0, 20.0)}
+    assert trigger.check(
+        sim_time_s=1.0, control_zone_state=on_time, crossed_merge=set(), has_plan=True,
+    ) is None
+    # Braked to 15 m/s: ETA 1 + 182/15 = 13.1 s.
+    braked = {'m0': _vehicle('main', 182.0, 15.0)}
+    assert trigger.check(
+        sim_time_s=1.0, control_zone_state=braked, crossed_merge=set(), has_plan=True,
+    ) == REPLAN_REASON_ETA_DRIFT
+
+
+def test_trigger_validates_inputs() -> None:
+    with pytest.raises(ValueError, match='Unknown replan trigger'):
+        ReplanTrigger(mode='sometimes')
+    with pytest.raises(ValueError):
+        ReplanTrigger(mode='event', eta_drift_s=0.0)
+    with pytest.raises(ValueError):
+        DPScheduler(delta_1_s=1.5, delta_2_s=2.0, main_vmax_mps=25.0, ramp_vmax_mps=25.0,
+                    replan_trigger='sometimes')
+
+
+def test_projection_is_a_cached_view() -> None:
+    cached = Plan(
+        plan_time_s=1.0, policy_name='dp', order=['a', 'b', 'c'],
+        target_cross_time_s={'a': 3.0, 'b': 5.0, 'c': 7.0}, eta_s={'a': 2.0, 'c': 6.0},
+    )
+    projector = PlanProjector(policy_name='dp')
+    zone = {'a': {}, 'b': {}, 'c': {}}
+    first = projector.project(cached_plan=cached, sim_time_s=1.1, control_zone_state=zone,
+                              crossed_merge=set())
+    again = projector.project(cached_plan=cached, sim_time_s=1.2, control_zone_state=zone,
+                              crossed_merge=set())
+    assert again is first
+
+    later = projector.project(cached_plan=cached, sim_time_s=1.3, control_zone_state=zone,
+                              crossed_merge={'a'})
+    assert later.order == ['b', 'c']
+    assert isinstance(later.target_cross_time_s, PlanSubMapping)
+    assert later.target_cross_time_s == {'b': 5.0, 'c': 7.0}
+    assert list(later.eta_s.items()) == [('c', 6.0)]
+    with pytest.raises(KeyError):
+        later.target_cross_time_s['a']
+
+    empty = projector.project(cached_plan=None, sim_time_s=2.0, control_zone_state=zone,
+                              crossed_merge=set())
+    assert empty == Plan(plan_time_s=2.0, policy_name='dp')
+
+
+def _legacy_projection(cached: Plan, state: dict, crossed: set[str]) -> Plan:
+    order = [v for v in cached.order if v in state and v not in crossed]
+    return Plan(
+        plan_time_s=cached.plan_time_s,
+        policy_name=cached.policy_name,
+        order=order,
+        target_cross_time_s={v: cached.target_cross_time_s[v] for v in order},
+        eta_s={v: cached.eta_s[v] for v in order},
+    )
+
+
+def test_dp_timer_trigger_matches_fixed_interval_replans() -> None:
+    scheduler = DPScheduler(
+        delta_1_s=1.5, delta_2_s=2.0, main_vmax_mps=25.0, ramp_vmax_mps=25.0,
+        replan_interval_s=1.0,
+    )
+    cached = None
+    for t in _TIMES:
+        state, crossed, entry_info = _world(t)
+        plan = scheduler.compute_plan(
+            sim_time_s=t, control_zone_state=state, crossed_merge=crossed,
+            entry_info=entry_info, traci=_FakeTraci(),
+        )
+        if t % 1.0 == 0.0:
+            assert scheduler.replanned_last_call
+            cached = _compute_plan_once(
+                sim_time_s=t, control_zone_state=state, crossed_merge=crossed,
+                entry_info=entry_info, traci=_FakeTraci(), delta_1_s=1.5, delta_2_s=2.0,
+                main_vmax_mps=25.0, ramp_vmax_mps=25.0,
+            )
+        else:
+            assert not scheduler.replanned_last_call
+        assert plan == _legacy_projection(cached, state, crossed)
+    assert scheduler.replan_count == 8
+    assert scheduler.replan_reasons == {REPLAN_REASON_INITIAL: 1, REPLAN_REASON_TIMER: 7}
+
+
+def test_event_trigger_replans_less_often() -> None:
+    counts = {}
+    for scheduler_cls, kwargs in (
+        (DPScheduler, {}),
+        (HierarchicalScheduler, {'vehicle_types': {}}),
+    ):
+        for trigger, interval_s in (('timer', 0.5), ('event', 3.0)):
+            scheduler = scheduler_cls(
+                delta_1_s=1.5, delta_2_s=2.0, main_vmax_mps=25.0, ramp_vmax_mps=25.0,
+                replan_interval_s=interval_s, replan_trigger=trigger,
+            )
+            for t in _TIMES:
+                state, crossed, entry_info = _world(t)
+                plan = scheduler.compute_plan(
+                    sim_time_s=t, control_zone_state=state, crossed_merge=crossed,
+                    entry_info=entry_info, traci=_FakeTraci(), **kwargs,
+                )
+                assert set(plan.order) <= set(state)
+            counts[scheduler_cls.__name__, trigger] = len(scheduler.replan_latency_s)
+    assert counts['DPScheduler', 'event'] == 4 < counts['DPScheduler', 'timer']
+    assert counts['HierarchicalScheduler', 'event'] == 4 < counts['HierarchicalScheduler', 'timer']
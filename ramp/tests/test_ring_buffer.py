@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from ramp.common.ring_buffer import RingLog
+
+
+def test_ring_log_keeps_latest_items() -> None:
+    log: RingLog[int] = RingLog(3)
+    for value in range(5):
+        log.append(value)
+    assert list(log) == [2, 3, 4]
+    assert len(log) == 3
+    assert log[0] == 2 and log[-1] == 4
+    assert log.next_seq == 5
+    assert log.dropped_count == 2
+
+
+def test_ring_log_since_reports_missed_items() -> None:
+    log: RingLog[str] = RingLog(4)
+    cursor = log.next_seq
+    assert log.since(cursor) == ([], 0)
+    for value in 'abc':
+        log.append(value)
+    assert log.since(cursor) == (['a', 'b', 'c'], 0)
+    cursor = log.next_seq
+    for value in 'defghi':
+        log.append(value)
+    assert log.since(cursor) == (['f', 'g', 'h', 'i'], 2)
+    assert log.since(log.next_seq) == ([], 0)
+
+
+def test_ring_log_rejects_empty_capacity() -> None:
+    with pytest.raises(ValueError):
+        RingLog(0)
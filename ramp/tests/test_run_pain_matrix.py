@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from ramp.tools import run_pain_matrix
+
+# Stands in for ``ramp.experiments.run``: writes a deterministic metrics.json
+# derived from (world, seed), logs each invocation, and can crash or hang.
+_FAKE_CELL = '''
+import json, sys, time
+from pathlib import Path
+out_dir, world, seed, log_path = sys.argv[1], sys.argv[2], int(sys.argv[3]), sys.argv[4]
+with open(log_path, 'a', encoding='utf-8') as fp:
+    fp.write(f'{world}:{seed}\\n')
+if world == 'W_crash':
+    sys.stderr.write('boom\\n')
+    raise SystemExit(3)
+if world == 'W_hang':
+    time.sleep(30)
+time.sleep(0.05)
+k = len(world) + seed
+Path(out_dir, 'metrics.json').write_text(json.dumps({
+    'duration_s': 60.0,
+    'entered_control_count': 10 + k,
+    'pending_unfinished_count': seed,
+    'ttc_any_lt_3_0s_ratio': 0.01 * k,
+    'ttc_merge_conflict_sample_exposure_s': 0.3 * k,
+    'avg_delay_at_merge_s': 1.5 * seed,
+    'scheduler_fallback_rate': 0.0,
+    'replan_rate': 0.1 * seed,
+}))
+'''
+
+_WORLDS = {
+    'H0_normal': {'normal': 1.0},
+    'H1_aggressive': {'normal': 0.5, 'aggressive': 0.5},
+    'H1_timid': {'normal': 0.5, 'timid': 0.5},
+}
+
+
+@pytest.fixture
+def fake_cells(monkeypatch, tmp_path: Path) -> Path:
+    log_path = tmp_path / 'invocations.log'
+    log_path.touch()
+
+    def _fake_build_cmd(*, world_name, weights, seed, out_dir, params):
+        return [sys.executable, '-c', _FAKE_CELL, str(out_dir), world_name, str(seed), str(log_path)]
+
+    monkeypatch.setattr(run_pain_matrix, '_build_cmd', _fake_build_cmd)
+    return log_path
+
+
+def _invocations(log_path: Path) -> list[str]:
+    return log_path.read_text(encoding='utf-8').split()
+
+
+def _strip_out_dir(summary: dict) -> dict:
+    cells = [{k: v for k, v in cell.items() if k != 'out_dir'} for cell in summary['cell_results']]
+    return {**summary, 'cell_results': cells}
+
+
+def test_parallel_matrix_matches_serial(fake_cells: Path, tmp_path: Path) -> None:
+    serial = run_pain_matrix.run_matrix(
+        worlds=_WORLDS, seeds=[1, 2, 3], base_out_dir=tmp_path / 'serial', workers=1, use_cache=False
+    )
+    parallel = run_pain_matrix.run_matrix(
+        worlds=_WORLDS, seeds=[1, 2, 3], base_out_dir=tmp_path / 'parallel', workers=4, use_cache=False
+    )
+    assert serial['gate1_all_runnable']
+    assert len(serial['pain_summary']) == 2
+    assert _strip_out_dir(parallel) == _strip_out_dir(serial)
+    assert [(c['world'], c['seed']) for c in parallel['cell_results']] == [
+        (world, seed) for world in _WORLDS for seed in (1, 2, 3)
+    ]
+    assert (
+        (tmp_path / 'parallel' / 'pain_matrix_summary.csv').read_bytes()
+        == (tmp_path / 'serial' / 'pain_matrix_summary.csv').read_bytes()
+    )
+    execution = json.loads((tmp_path / 'parallel' / 'pain_matrix_execution.json').read_text())
+    assert execution['workers'] == 4
+    assert execution['cache_hits'] == 0
+
+
+def test_cached_cells_are_skipped(fake_cells: Path, tmp_path: Path) -> None:
+    base = tmp_path / 'matrix'
+    first = run_pain_matrix.run_matrix(worlds=_WORLDS, seeds=[1, 2], base_out_dir=base, workers=2)
+    assert len(_invocations(fake_cells)) == 6
+
+    # An interrupted run loses its cell directories but keeps the cache.
+    (base / 'H1_timid' / 'seed_2' / 'metrics.json').unlink()
+    second = run_pain_matrix.run_matrix(worlds=_WORLDS, seeds=[1, 2], base_out_dir=base, workers=2)
+    assert len(_invocations(fake_cells)) == 6
+    assert second == first
+    assert (base / 'H1_timid' / 'seed_2' / 'metrics.json').exists()
+    execution = json.loads((base / 'pain_matrix_execution.json').read_text())
+    assert execution['cache_hits'] == 6
+
+    # A parameter change is a different cache key.
+    run_pain_matrix.run_matrix(
+        worlds=_WORLDS, seeds=[1, 2], base_out_dir=base, workers=2, params={'main_vph': 1300}
+    )
+    assert len(_invocations(fake_cells)) == 12
+
+
+def test_cache_key_tracks_inputs() -> None:
+    base = dict(
+        weights={'normal': 1.0},
+        seed=1,
+        params={'a': 1},
+        scenario_files={'x.rou.xml': 'aa'},
+        revision='r1',
+    )
+    key = run_pain_matrix.cell_cache_key(**base)
+    assert key == run_pain_matrix.cell_cache_key(**dict(base, params={'a': 1}))
+    for change in (
+        {'seed': 2},
+        {'weights': {'normal': 0.9}},
+        {'params': {'a': 2}},
+        {'scenario_files': {'x.rou.xml': 'bb'}},
+        {'revision': 'r2'},
+    ):
+        assert run_pain_matrix.cell_cache_key(**{**base, **change}) != key
+
+
+def test_crash_and_timeout_are_isolated_to_their_cells(fake_cells: Path, tmp_path: Path) -> None:
+    worlds = {**_WORLDS, 'W_crash': {'crash': 1.0}, 'W_hang': {'hang': 1.0}}
+    summary = run_pain_matrix.run_matrix(
+        worlds=worlds, seeds=[1], base_out_dir=tmp_path / 'matrix', workers=3, timeout_s=1.0
+    )
+    by_world = {cell['world']: cell for cell in summary['cell_results']}
+    assert not summary['gate1_all_runnable']
+    assert by_world['W_crash']['returncode'] == 3
+    assert 'boom' in by_world['W_crash']['stderr_tail']
+    assert by_world['W_hang']['returncode'] == -1
+    assert 'timeout' in by_world['W_hang']['stderr_tail']
+    assert all(by_world[world]['success'] for world in _WORLDS)
+    assert {ps['world'] for ps in summary['pain_summary']} == {'H1_aggressive', 'H1_timid'}
+
+    # Failed cells are not cached: the next run retries only those two.
+    before = len(_invocations(fake_cells))
+    run_pain_matrix.run_matrix(
+        worlds=worlds, seeds=[1], base_out_dir=tmp_path / 'matrix', workers=3, timeout_s=1.0
+    )
+    assert sorted(_invocations(fake_cells)[before:]) == ['W_crash:1', 'W_hang:1']
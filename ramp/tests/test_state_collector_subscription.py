@@ -0,0 +1,331 @@
+"""Parity tests for the subscription-based StateCollector backend."""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.fifo.scheduler import compute_plan as compute_fifo_plan
+from ramp.runtime.state_collector import StateCollector
+from ramp.runtime.types import Plan
+from ramp.runtime.subscription import (
+    DISTANCE_REQUEST,
+    STATE_VARIABLES,
+    VAR_ACCELERATION,
+    VAR_LANE_ID,
+    VAR_LANEPOSITION,
+    VAR_ROAD_ID,
+    VAR_SPEED,
+)
+
+MAIN_ROUTE = ('main_h1', 'main_h2', 'main_h3', 'main_h4')
+RAMP_ROUTE = ('ramp_h5', 'ramp_h6', 'main_h3', 'main_h4')
+EDGE_LENGTH_M = 200.0
+
+
+class _FakeVehicleDomain:
+    def __init__(self, owner: _FakeTraci) -> None:
+        self._owner = owner
+        self._subscribed: dict[str, tuple[int, ...]] = {}
+        self._results: dict[str, dict[int, object]] = {}
+
+    def _count(self, name: str) -> None:
+        self._owner.calls[name] += 1
+
+    def _veh(self, veh_id: str) -> dict[str, object]:
+        return self._owner.vehicles[veh_id]
+
+    def getIDList(self) -> tuple[str, ...]:
+        self._count('getIDList')
+        return tuple(self._owner.vehicles)
+
+    def getRoute(self, veh_id: str) -> tuple[str, ...]:
+        self._count('getRoute')
+        return tuple(self._veh(veh_id)['route'])
+
+    def getRoadID(self, veh_id: str) -> str:
+        self._count('getRoadID')
+        return str(self._veh(veh_id)['edge'])
+
+    def getLaneID(self, veh_id: str) -> str:
+        self._count('getLaneID')
+        veh = self._veh(veh_id)
+        return f"{veh['edge']}_{veh['lane']}"
+
+    def getLanePosition(self, veh_id: str) -> float:
+        self._count('getLanePosition')
+        return float(self._veh(veh_id)['pos'])
+
+    def getSpeed(self, veh_id: str) -> float:
+        self._count('getSpeed')
+        return float(self._veh(veh_id)['speed'])
+
+    def getAcceleration(self, veh_id: str) -> float:
+        self._count('getAcceleration')
+        return float(self._veh(veh_id)['accel'])
+
+    def getLength(self, veh_id: str) -> float:
+        self._count('getLength')
+        return 5.0
+
+    def getTypeID(self, veh_id: str) -> str:
+        self._count('getTypeID')
+        return 'cav'
+
+    def getDrivingDistance(self, veh_id: str, edge_id: str, pos: float) -> float:
+        self._count('getDrivingDistance')
+        return self._owner.driving_distance(veh_id, edge_id, pos)
+
+    def subscribe(self, veh_id, var_ids, begin=None, end=None, parameters=None) -> None:
+        self._count('subscribe')
+        assert tuple(var_ids) == STATE_VARIABLES
+        assert parameters is not None and DISTANCE_REQUEST in parameters
+        self._subscribed[veh_id] = tuple(var_ids)
+        self._results[veh_id] = self._owner.subscription_values(veh_id)
+
+    def getAllSubscriptionResults(self) -> dict[str, dict[int, object]]:
+        return self._results
+
+    def on_step(self) -> None:
+        for veh_id in list(self._subscribed):
+            if veh_id not in self._owner.vehicles:
+                del self._subscribed[veh_id]
+        self._results = {
+            veh_id: self._owner.subscription_values(veh_id) for veh_id in self._subscribed
+        }
+
+
+class _FakeSimulationDomain:
+    def __init__(self) -> None:
+        self.departed: list[str] = []
+        self.arrived: list[str] = []
+
+    def getDepartedIDList(self) -> tuple[str, ...]:
+        return tuple(self.departed)
+
+    def getArrivedIDList(self) -> tuple[str, ...]:
+        return tuple(self.arrived)
+
+
+class _FakeTraci:
+    """Kinematic stand-in: vehicles move along their route at constant speed."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.vehicles: dict[str, dict[str, object]] = {}
+        self.vehicle = _FakeVehicleDomain(self)
+        self.simulation = _FakeSimulationDomain()
+        self._pending_departures: list[str] = []
+
+    def add(self, veh_id: str, route: tuple[str, ...], lane: int, speed: float) -> None:
+        self.vehicles[veh_id] = {
+            'route': route, 'route_idx': 0, 'edge': route[0], 'lane': lane,
+            'pos': 0.0, 'speed': speed, 'accel': 0.25,
+        }
+        self._pending_departures.append(veh_id)
+
+    def driving_distance(self, veh_id: str, edge_id: str, pos: float) -> float:
+        veh = self.vehicles[veh_id]
+        route = veh['route']
+        if edge_id not in route:
+            return -1073741824.0
+        target_idx = route.index(edge_id)
+        idx = int(veh['route_idx'])
+        if idx > target_idx:
+            return -1073741824.0
+        dist = (target_idx - idx) * EDGE_LENGTH_M - float(veh['pos']) + pos
+        return dist
+
+    def subscription_values(self, veh_id: str) -> dict[int, object]:
+        veh = self.vehicles[veh_id]
+        return {
+            VAR_ROAD_ID: str(veh['edge']),
+            DISTANCE_REQUEST: self.driving_distance(veh_id, 'main_h3', 0.0),
+            VAR_LANE_ID: f"{veh['edge']}_{veh['lane']}",
+            VAR_LANEPOSITION: float(veh['pos']),
+            VAR_SPEED: float(veh['speed']),
+            VAR_ACCELERATION: float(veh['accel']),
+        }
+
+    def step(self, dt: float) -> None:
+        self.simulation.departed = self._pending_departures
+        self.simulation.arrived = []
+        self._pending_departures = []
+        for veh_id in list(self.vehicles):
+            veh = self.vehicles[veh_id]
+            veh['pos'] = float(veh['pos']) + float(veh['speed']) * dt
+            while float(veh['pos']) >= EDGE_LENGTH_M:
+                veh['pos'] = float(veh['pos']) - EDGE_LENGTH_M
+                veh['route_idx'] = int(veh['route_idx']) + 1
+                if veh['route_idx'] >= len(veh['route']):
+                    del self.vehicles[veh_id]
+                    self.simulation.arrived.append(veh_id)
+                    break
+                veh['edge'] = veh['route'][veh['route_idx']]
+                if veh['edge'] == 'main_h3' and veh['route'][0].startswith('ramp_'):
+                    veh['lane'] = 0
+        self.vehicle.on_step()
+
+
+def _make_collector(backend: str, policy: str = 'fifo') -> StateCollector:
+    return StateCollector(
+        control_zone_length_m=300.0,
+        merge_edge='main_h3',
+        policy=policy,
+        main_vmax_mps=25.0,
+        ramp_vmax_mps=16.7,
+        fifo_gap_s=1.5,
+        control_mode='E-ctrl-2',
+        aux_vmax_mps=25.0,
+        backend=backend,
+    )
+
+
+def _run(backend: str, steps: int = 400) -> tuple[list, StateCollector, _FakeTraci]:
+    traci = _FakeTraci()
+    collector = _make_collector(backend)
+    outputs = []
+    for step in range(steps):
+        if step % 15 == 0:
+            traci.add(f'main_{step}', MAIN_ROUTE, lane=step % 2, speed=20.0 + (step % 7))
+        if step % 25 == 0:
+            traci.add(f'ramp_{step}', RAMP_ROUTE, lane=0, speed=12.0 + (step % 5))
+        traci.step(0.1)
+        sim_time = round((step + 1) * 0.1, 6)
+        state = collector.collect(sim_time=sim_time, traci=traci)
+        # Views are only valid for the step they were collected in.
+        outputs.append((
+            state.active_vehicle_ids,
+            state.control_zone_state.to_dict(),
+            state.ttc_observation_state.to_dict(),
+            list(collector.entry_rank.items()),
+            dict(collector.fifo_target_time),
+        ))
+    return outputs, collector, traci
+
+
+def test_subscription_backend_matches_polling_bit_for_bit() -> None:
+    polling_out, polling_collector, _ = _run('polling')
+    sub_out, sub_collector, _ = _run('subscription')
+    assert len(polling_out) == len(sub_out)
+    for expected, actual in zip(polling_out, sub_out):
+        assert actual == expected
+    assert list(sub_collector.entry_info) == list(polling_collector.entry_info)
+    assert sub_collector.cross_time == polling_collector.cross_time
+    assert sub_collector.stop_count == polling_collector.stop_count
+
+
+def test_subscription_backend_issues_no_per_vehicle_getters() -> None:
+    _, _, polling_traci = _run('polling', steps=200)
+    _, _, sub_traci = _run('subscription', steps=200)
+    per_step_getters = (
+        'getRoadID', 'getDrivingDistance', 'getLaneID',
+        'getLanePosition', 'getSpeed', 'getAcceleration',
+    )
+    vehicle_count = len({f'main_{s}' for s in range(0, 200, 15)}) + len(
+        {f'ramp_{s}' for s in range(0, 200, 25)}
+    )
+    assert sum(polling_traci.calls[name] for name in per_step_getters) > 1000
+    assert sum(sub_traci.calls[name] for name in per_step_getters) == 0
+    # One subscribe per vehicle lifetime, one ID list per step.
+    assert sub_traci.calls['getIDList'] == 200
+    assert sub_traci.calls['subscribe'] == vehicle_count
+    # Lifetime attributes come from the registry: one read per vehicle.
+    for traci in (polling_traci, sub_traci):
+        assert traci.calls['getRoute'] == vehicle_count
+        assert traci.calls['getLength'] == vehicle_count
+
+
+def test_subscription_backend_falls_back_when_value_missing() -> None:
+    traci = _FakeTraci()
+    traci.add('main_0', MAIN_ROUTE, lane=0, speed=20.0)
+    traci.step(6.0)
+    collector = _make_collector('subscription')
+    collector.collect(sim_time=6.0, traci=traci)
+    del traci.vehicle.getAllSubscriptionResults()['main_0'][VAR_SPEED]
+    state = collector.collect(sim_time=6.0, traci=traci)
+    assert state.ttc_observation_state['main_0']['speed'] == pytest.approx(20.0)
+    assert traci.calls['getSpeed'] == 1
+
+
+def test_unknown_backend_rejected() -> None:
+    with pytest.raises(ValueError, match='Unknown collector backend'):
+        _make_collector('socket')
+
+
+def _legacy_fifo_plan(
+    sim_time_s: float,
+    control_zone_state,
+    entry_order: list[str],
+    crossed_merge: set[str],
+    fifo_target_time: dict[str, float],
+    fifo_natural_eta: dict[str, float],
+) -> Plan:
+    """The FIFO plan as built before the queue: a scan of the full entry history."""
+    order = [v for v in entry_order if v in control_zone_state and v not in crossed_merge]
+    return Plan(
+        plan_time_s=sim_time_s,
+        policy_name='fifo',
+        order=order,
+        target_cross_time_s={v: fifo_target_time[v] for v in order},
+        eta_s={v: fifo_natural_eta[v] for v in order},
+    )
+
+
+def test_fifo_bookkeeping_stays_flat_over_a_long_horizon() -> None:
+    traci = _FakeTraci()
+    collector = _make_collector('polling')
+    # Unbounded reference copies of what the collector used to keep.
+    entry_order: list[str] = []
+    target_time: dict[str, float] = {}
+    natural_eta: dict[str, float] = {}
+    bookkeeping_sizes: list[int] = []
+    planned_steps = 0
+    for step in range(3000):
+        if step % 15 == 0:
+            traci.add(f'main_{step}', MAIN_ROUTE, lane=step % 2, speed=20.0 + (step % 7))
+        if step % 25 == 0:
+            traci.add(f'ramp_{step}', RAMP_ROUTE, lane=0, speed=12.0 + (step % 5))
+        traci.step(0.1)
+        sim_time = round((step + 1) * 0.1, 6)
+        state = collector.collect(sim_time=sim_time, traci=traci)
+        for veh_id in list(collector.entry_info)[len(entry_order):]:
+            entry_order.append(veh_id)
+            target_time[veh_id] = collector.fifo_target_time[veh_id]
+            natural_eta[veh_id] = collector.fifo_natural_eta[veh_id]
+
+        plan = compute_fifo_plan(
+            sim_time_s=sim_time,
+            control_zone_state=state.control_zone_state,
+            entry_order=collector.entry_rank,
+            crossed_merge=collector.crossed_merge,
+            fifo_target_time=collector.fifo_target_time,
+            fifo_natural_eta=collector.fifo_natural_eta,
+        )
+        assert plan == _legacy_fifo_plan(
+            sim_time, state.control_zone_state, entry_order, collector.crossed_merge,
+            target_time, natural_eta,
+        )
+        assert [collector.entry_rank[v] for v in plan.order] == [
+            entry_order.index(v) + 1 for v in plan.order
+        ]
+        planned_steps += bool(plan.order)
+
+        active = len(state.active_vehicle_ids)
+        for bookkeeping in (
+            collector.entry_rank, collector.fifo_target_time,
+            collector.fifo_natural_eta, collector.prev_stopped,
+        ):
+            assert len(bookkeeping) <= active
+        bookkeeping_sizes.append(len(collector.entry_rank))
+
+    assert planned_steps > 2500
+    assert collector.entry_count == len(entry_order) > 250
+    # Flat: the late part of the run holds no more state than the early part.
+    assert max(bookkeeping_sizes[2000:]) <= max(bookkeeping_sizes[:1000])
@@ -0,0 +1,121 @@
+"""Tests for the per-stage step profiler."""
+from __future__ import annotations
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.dp.scheduler import DPScheduler
+from ramp.runtime.step_profiler import (
+    STAGE_COLLECT,
+    STAGE_CONTROLLER,
+    STAGE_DP,
+    STAGE_SIM_STEP,
+    STAGE_ZONE_B,
+    STAGES,
+    StepProfiler,
+)
+from ramp.runtime.traci_counter import CountingTraci
+
+
+class _Vehicle:
+    def getIDList(self) -> tuple[str, ...]:
+        return ('a', 'b')
+
+    def getSpeed(self, veh_id: str) -> float:
+        return 10.0
+
+    def getAccel(self, veh_id: str) -> float:
+        return 2.6
+
+
+class _Traci:
+    vehicle = _Vehicle()
+
+    def simulationStep(self) -> None:
+        pass
+
+
+def _run_steps(profiler: StepProfiler, traci: CountingTraci, steps: int) -> None:
+    for step in range(steps):
+        profiler.begin_step()
+        traci.simulationStep()
+        profiler.lap(STAGE_SIM_STEP)
+        for veh_id in traci.vehicle.getIDList():
+            traci.vehicle.getSpeed(veh_id)
+        profiler.lap(STAGE_COLLECT)
+        profiler.end_step(STAGE_CONTROLLER, sim_time_s=0.1 * (step + 1))
+        traci.close_step()
+
+
+def test_laps_charge_time_and_traci_calls_to_stages() -> None:
+    traci = CountingTraci(_Traci())
+    profiler = StepProfiler(traci_counter=traci)
+    _run_steps(profiler, traci, steps=20)
+
+    summary = profiler.summary()
+    assert summary['steps'] == 20
+    assert summary['traci_calls_counted'] is True
+    stages = summary['stages']
+    assert set(stages) == set(STAGES)
+    assert stages[STAGE_SIM_STEP]['traci_calls_per_step'] == 1.0
+    assert stages[STAGE_COLLECT]['traci_calls_per_step'] == 3.0
+    assert stages[STAGE_CONTROLLER]['traci_calls_total'] == 0
+    assert stages[STAGE_DP]['total_ms'] == 0.0
+    assert sum(stage['total_ms'] for stage in stages.values()) == pytest.approx(summary['total_ms'])
+    assert abs(sum(stage['share'] for stage in stages.values()) - 1.0) < 1e-9
+    step_ms = summary['step_ms']
+    assert 0.0 < step_ms['p50'] <= step_ms['p95'] <= step_ms['p99'] <= step_ms['max']
+
+
+def test_profiler_without_counter_reports_no_calls() -> None:
+    profiler = StepProfiler()
+    profiler.begin_step()
+    profiler.lap(STAGE_SIM_STEP)
+    profiler.lap(STAGE_SIM_STEP)
+    profiler.end_step(STAGE_COLLECT, sim_time_s=0.1)
+    summary = profiler.summary()
+    assert summary['traci_calls_counted'] is False
+    assert summary['stages'][STAGE_SIM_STEP]['traci_calls_total'] == 0
+    assert StepProfiler().summary()['steps'] == 0
+
+
+def test_timeline_has_one_row_per_step(tmp_path: Path) -> None:
+    traci = CountingTraci(_Traci())
+    profiler = StepProfiler(traci_counter=traci)
+    _run_steps(profiler, traci, steps=5)
+    path = tmp_path / 'profile_timeline.csv'
+    profiler.write_timeline(path)
+    with path.open(newline='', encoding='utf-8') as fp:
+        rows = list(csv.DictReader(fp))
+    assert [float(row['time']) for row in rows] == [0.1 * (i + 1) for i in range(5)]
+    assert all(int(row['collect_calls']) == 3 for row in rows)
+    assert all(float(row['sim_step_ms']) >= 0.0 for row in rows)
+
+
+def test_dp_scheduler_laps_dp_only_on_replans() -> None:
+    profiler = StepProfiler()
+    scheduler = DPScheduler(
+        delta_1_s=1.5, delta_2_s=2.0, main_vmax_mps=25.0, ramp_vmax_mps=25.0,
+        replan_interval_s=1.0, profiler=profiler,
+    )
+    state = {
+        'm0': {'stream': 'main', 'edge_id': 'main_h2', 'lane_id': 'main_h2_0', 'lane_pos': 0.0,
+               'd_to_merge': 200.0, 'speed': 20.0, 'accel': 0.0},
+    }
+    for step in range(10):
+        sim_time = 0.5 * step
+        profiler.begin_step()
+        scheduler.compute_plan(
+            sim_time_s=sim_time, control_zone_state=state, crossed_merge=set(),
+            entry_info={'m0': {'t_entry': 0.0}}, traci=_Traci(),
+        )
+        profiler.end_step(STAGE_ZONE_B, sim_time_s=sim_time)
+    dp_ms = list(profiler.stage_ms[STAGE_DP])
+    assert [ms > 0.0 for ms in dp_ms] == [step % 2 == 0 for step in range(10)]
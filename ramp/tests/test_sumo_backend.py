@@ -0,0 +1,62 @@
+"""Tests for the selectable SUMO binding (traci socket vs in-process libsumo)."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.experiments.run import run_experiment
+from ramp.runtime.simulation_driver import SUMO_BACKENDS, import_sumo_backend
+
+_RUN_KWARGS = dict(
+    scenario='ramp__mlane_v2_mixed',
+    duration_s=60.0,
+    step_length=0.1,
+    seed=7,
+    gui=False,
+    control_zone_length_m=300.0,
+    merge_edge='main_h3',
+    main_vmax_mps=25.0,
+    ramp_vmax_mps=25.0,
+    fifo_gap_s=2.0,
+    delta_1_s=1.5,
+    delta_2_s=2.0,
+    dp_replan_interval_s=1.0,
+)
+
+
+def _sumo_available() -> bool:
+    if shutil.which('sumo') is None:
+        return False
+    return all(importlib.util.find_spec(name) is not None for name in ('traci', 'libsumo'))
+
+
+def test_unknown_sumo_backend_rejected() -> None:
+    with pytest.raises(ValueError, match='Unknown SUMO backend.*Valid: traci, libsumo, fake'):
+        import_sumo_backend('pipe')
+    assert SUMO_BACKENDS == ('traci', 'libsumo')
+
+
+def test_libsumo_rejects_gui(tmp_path: Path) -> None:
+    kwargs = {**_RUN_KWARGS, 'gui': True}
+    with pytest.raises(ValueError, match='libsumo'):
+        run_experiment(policy='fifo', out_dir=str(tmp_path), sumo_backend='libsumo', **kwargs)
+
+
+@pytest.mark.skipif(not _sumo_available(), reason='SUMO with traci and libsumo required')
+@pytest.mark.parametrize('policy', ['fifo', 'dp', 'hierarchical'])
+def test_libsumo_metrics_match_traci(tmp_path: Path, policy: str) -> None:
+    metrics: dict[str, dict] = {}
+    for backend in SUMO_BACKENDS:
+        out_dir = tmp_path / backend
+        run_experiment(policy=policy, out_dir=str(out_dir), sumo_backend=backend, **_RUN_KWARGS)
+        metrics[backend] = json.loads((out_dir / 'metrics.json').read_text(encoding='utf-8'))
+    assert metrics['libsumo'] == metrics['traci']
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import csv
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from ramp.experiments.check_plans import check_plans
+from ramp.experiments.trace_io import (
+    TRACE_FORMAT_COLUMNAR,
+    TRACE_FORMAT_CSV,
+    TRACE_WRITER_ASYNC,
+    TRACE_WRITER_SYNC,
+    AsyncTraceWriter,
+    ColumnarTraceSink,
+    QueuedTraceSink,
+    TraceSinks,
+    export_csv,
+    read_trace_rows,
+    resolve_trace_path,
+)
+
+_FIELDS = ['time', 'veh_id', 'order_index', 'target_cross_time', 'v_des', 'flag', 'detail', 'stream']
+
+
+def _rows(count: int) -> list[dict]:
+    rows = []
+    for index in range(count):
+        rows.append({
+            'time': round(0.1 * (index // 3 + 1), 1),
+            'veh_id': f'veh_{index}',
+            'order_index': index % 3 + 1,
+            'target_cross_time': 10.0 + 2.0 * index + (1e-17 if index % 5 else -0.0),
+            'v_des': 12.5 + index if index % 2 else '',
+            'flag': (True, 1, '')[index % 3],
+            'detail': ('a,b', 'quote "x"', 'line\nbreak', 'ünïcode', None)[index % 5],
+            'stream': 'main' if index % 3 else 'ramp',
+        })
+    rows[3].pop('stream')
+    return rows
+
+
+def _write(out_dir: Path, trace_format: str, trace_writer: str, rows: list[dict]) -> Path:
+    out_dir.mkdir()
+    with TraceSinks(
+        out_dir, {'plans': _FIELDS}, trace_format=trace_format, trace_writer=trace_writer
+    ) as sinks:
+        for row in rows:
+            sinks['plans'].writerow(row)
+    return out_dir
+
+
+def _dictwriter_bytes(tmp_path: Path, rows: list[dict]) -> bytes:
+    path = tmp_path / 'reference.csv'
+    with path.open('w', newline='', encoding='utf-8') as fp:
+        writer = csv.DictWriter(fp, fieldnames=_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize('trace_writer', [TRACE_WRITER_SYNC, TRACE_WRITER_ASYNC])
+def test_csv_sink_matches_dictwriter(tmp_path: Path, trace_writer: str) -> None:
+    rows = _rows(700)
+    out_dir = _write(tmp_path / 'out', TRACE_FORMAT_CSV, trace_writer, rows)
+    assert (out_dir / 'plans.csv').read_bytes() == _dictwriter_bytes(tmp_path, rows)
+
+
+@pytest.mark.parametrize('trace_writer', [TRACE_WRITER_SYNC, TRACE_WRITER_ASYNC])
+def test_columnar_round_trip(tmp_path: Path, trace_writer: str) -> None:
+    rows = _rows(9000)  # spans several chunks
+    out_dir = _write(tmp_path / 'out', TRACE_FORMAT_COLUMNAR, trace_writer, rows)
+    columnar_path = out_dir / 'plans.rtrc'
+    exported = tmp_path / 'exported.csv'
+    assert export_csv(columnar_path, exported) == len(rows)
+    reference = _dictwriter_bytes(tmp_path, rows)
+    assert exported.read_bytes() == reference
+    assert columnar_path.stat().st_size < len(reference)
+
+    with (tmp_path / 'reference.csv').open(newline='', encoding='utf-8') as fp:
+        assert list(read_trace_rows(columnar_path)) == list(csv.DictReader(fp))
+
+
+def test_loader_falls_back_to_other_format(tmp_path: Path) -> None:
+    out_dir = _write(tmp_path / 'out', TRACE_FORMAT_COLUMNAR, TRACE_WRITER_SYNC, _rows(10))
+    assert resolve_trace_path(out_dir / 'plans.csv') == out_dir / 'plans.rtrc'
+    assert len(list(read_trace_rows(out_dir / 'plans.csv'))) == 10
+    with pytest.raises(FileNotFoundError):
+        resolve_trace_path(out_dir / 'events.csv')
+
+
+def test_check_plans_reads_both_formats(tmp_path: Path) -> None:
+    rows = [
+        {'time': 1.0, 'order_index': 1, 'stream': 'main', 'target_cross_time': 5.0},
+        {'time': 1.0, 'order_index': 2, 'stream': 'ramp', 'target_cross_time': 6.0},
+        {'time': 1.1, 'order_index': 1, 'stream': 'main', 'target_cross_time': 5.0},
+    ]
+    summaries = []
+    for trace_format in (TRACE_FORMAT_CSV, TRACE_FORMAT_COLUMNAR):
+        out_dir = _write(tmp_path / trace_format, trace_format, TRACE_WRITER_SYNC, rows)
+        summary = check_plans(out_dir / 'plans.csv', delta_1_s=1.5, delta_2_s=2.0)
+        summary.pop('plans_file')
+        summaries.append(summary)
+    assert summaries[0] == summaries[1]
+    assert summaries[0]['gap_bad'] == 1
+    assert summaries[0]['snapshot_count'] == 2
+
+
+def test_columnar_sink_rejects_unknown_fields(tmp_path: Path) -> None:
+    sink = ColumnarTraceSink(tmp_path / 'x.rtrc', ['time'])
+    with pytest.raises(ValueError, match='not in fieldnames'):
+        sink.writerow({'time': 1.0, 'extra': 2})
+    sink.close()
+
+
+def test_async_writer_surfaces_sink_errors() -> None:
+    class _Broken:
+        def writerows(self, rows):
+            raise OSError('disk full')
+
+    writer = AsyncTraceWriter()
+    front = QueuedTraceSink(_Broken(), writer, batch_rows=1)
+    front.writerow({'time': 1.0})
+    with pytest.raises(RuntimeError, match='trace writer thread failed'):
+        writer.close()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import math
+import random
 import sys
 from pathlib import Path
 
@@ -9,7 +11,16 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from ramp.runtime.ttc import build_ttc_metrics, collect_ttc_samples, summarize_ttc_samples
+from ramp.runtime.ttc import (
+    TTCSketch,
+    build_ttc_metrics,
+    build_ttc_metrics_from_sketches,
+    collect_ttc_sample_arrays,
+    collect_ttc_samples,
+    collect_ttc_samples_reference,
+    summarize_ttc_samples,
+)
+from ramp.runtime.vehicle_table import VehicleTable
 
 
 def _obs(
@@ -177,3 +188,123 @@ def test_build_ttc_metrics_core_fields() -> None:
 def test_summarize_ttc_samples_invalid_step() -> None:
     with pytest.raises(ValueError):
         summarize_ttc_samples(samples=[1.0], step_length_s=0.0)
+
+
+_LANES = (
+    ('main', 'main_h2', 'main_h2_0'),
+    ('main', 'main_h2', 'main_h2_1'),
+    ('main', 'main_h3', 'main_h3_1'),
+    ('main', 'main_h3', 'main_h3_0'),
+    ('ramp', 'ramp_h6', 'ramp_h6_0'),
+    ('ramp', 'main_h3', 'main_h3_1'),
+    ('ramp', 'ramp_h5', 'ramp_h5_0'),
+)
+
+
+def _random_state(rng: random.Random, count: int) -> dict[str, dict[str, float | str]]:
+    state: dict[str, dict[str, float | str]] = {}
+    for index in range(count):
+        stream, edge_id, lane_id = rng.choice(_LANES)
+        state[f'veh_{index}'] = _obs(
+            stream=stream,
+            edge_id=edge_id,
+            lane_id=lane_id,
+            # Coarse grid so equal positions (sort ties) and overlaps occur.
+            lane_pos=float(rng.randrange(0, 60)) * 2.5,
+            d_to_merge=rng.choice([0.0, rng.uniform(-5.0, 150.0)]),
+            speed=rng.choice([0.0, 0.05, rng.uniform(0.0, 25.0)]),
+            length=rng.choice([5.0, 4.5, 12.0]),
+        )
+    return state
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_vectorised_pairing_matches_reference(seed: int) -> None:
+    rng = random.Random(seed)
+    state = _random_state(rng, rng.choice([0, 1, 2, 15, 60, 250]))
+    expected = collect_ttc_samples_reference(ttc_observation_state=state)
+    assert collect_ttc_samples(ttc_observation_state=state) == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorised_pairing_reads_table_views(seed: int) -> None:
+    rng = random.Random(100 + seed)
+    table = VehicleTable(capacity=4)
+    for _ in range(6):
+        state = _random_state(rng, 80)
+        # Vehicles persist across steps with recycled rows and lane codes
+        # interned in a different order than they appear this step.
+        visited = rng.sample(sorted(state), len(state) - 10)
+        table.begin_step()
+        for veh_id in visited:
+            table.put(veh_id, **state[veh_id])
+        table.end_step(set(visited))
+        view = table.observation_view()
+        expected = collect_ttc_samples_reference(ttc_observation_state=view.to_dict())
+        longitudinal, merge_conflict = collect_ttc_sample_arrays(view)
+        assert (longitudinal.tolist(), merge_conflict.tolist()) == expected
+
+
+def _exact_quantile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    rank = max(1, min(int(math.ceil(q * len(ordered))), len(ordered)))
+    return ordered[rank - 1]
+
+
+def test_sketch_quantiles_within_relative_accuracy() -> None:
+    rng = random.Random(3)
+    samples = [0.0] * 40 + [rng.lognormvariate(1.0, 1.5) for _ in range(20_000)]
+    rng.shuffle(samples)
+    sketch = TTCSketch()
+    for start in range(0, len(samples), 37):
+        sketch.add(samples[start:start + 37])
+
+    assert sketch.count == len(samples)
+    assert sketch.min_s == min(samples)
+    assert sketch.lt_3_0s_count == sum(1 for value in samples if value < 3.0)
+    assert sketch.lt_1_5s_count == sum(1 for value in samples if value < 1.5)
+    for q in (0.0001, 0.001, 0.002, 0.05, 0.25, 0.5, 0.9, 0.999, 1.0):
+        exact = _exact_quantile(samples, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=sketch.relative_accuracy, abs=0.0)
+
+
+def test_sketch_merge_and_fixed_memory() -> None:
+    rng = random.Random(5)
+    left, right, whole = TTCSketch(), TTCSketch(), TTCSketch()
+    buckets = whole.bucket_count
+    for _ in range(50):
+        chunk = [rng.uniform(0.0, 50.0) for _ in range(200)]
+        (left if rng.random() < 0.5 else right).add(chunk)
+        whole.add(chunk)
+    left.merge(right)
+    assert whole.bucket_count == buckets
+    assert left.stats(step_length_s=0.1) == whole.stats(step_length_s=0.1)
+    with pytest.raises(ValueError):
+        left.merge(TTCSketch(relative_accuracy=0.01))
+
+
+def test_sketch_metrics_match_exact_metrics() -> None:
+    rng = random.Random(9)
+    longitudinal = [rng.uniform(0.0, 20.0) for _ in range(3000)]
+    merge_conflict = [rng.uniform(0.5, 8.0) for _ in range(700)]
+    long_sketch, merge_sketch = TTCSketch(), TTCSketch()
+    long_sketch.add(longitudinal)
+    merge_sketch.add(merge_conflict)
+
+    exact = build_ttc_metrics(
+        longitudinal_samples=longitudinal, merge_conflict_samples=merge_conflict, step_length_s=0.1
+    )
+    sketched = build_ttc_metrics_from_sketches(
+        longitudinal=long_sketch, merge_conflict=merge_sketch, step_length_s=0.1
+    )
+    assert sketched.pop('ttc_p05_relative_accuracy') == long_sketch.relative_accuracy
+    assert set(sketched) == set(exact)
+    for key, value in exact.items():
+        if key.endswith('_p05_s'):
+            assert sketched[key] == pytest.approx(value, rel=long_sketch.relative_accuracy)
+        else:
+            assert sketched[key] == value, key
+
+
+def test_sketch_empty_stats_match_exact() -> None:
+    assert TTCSketch().stats(step_length_s=0.1) == summarize_ttc_samples(samples=[], step_length_s=0.1)
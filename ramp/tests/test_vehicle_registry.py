@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.runtime.controller import Controller
+from ramp.runtime.traci_counter import CountingTraci
+from ramp.runtime.types import ControlCommand
+from ramp.runtime.vehicle_registry import VehicleRegistry
+
+_ROUTES = {
+    'main_0': ('main_h1', 'main_h2', 'main_h3'),
+    'ramp_0': ('ramp_h5', 'ramp_h6', 'main_h3'),
+    'hdv_0': ('main_h1', 'main_h2', 'main_h3'),
+}
+
+
+class _Vehicle:
+    def __init__(self) -> None:
+        self.speed_mode: dict[str, int] = {}
+
+    def getIDList(self) -> tuple[str, ...]:
+        return tuple(_ROUTES)
+
+    def getTypeID(self, veh_id: str) -> str:
+        return 'hdv' if veh_id.startswith('hdv') else 'cav'
+
+    def getLength(self, veh_id: str) -> float:
+        return 4.5
+
+    def getRoute(self, veh_id: str) -> tuple[str, ...]:
+        return _ROUTES[veh_id]
+
+    def getRoadID(self, veh_id: str) -> str:
+        return 'main_h2'
+
+    def getSpeed(self, veh_id: str) -> float:
+        return 20.0
+
+    def getSpeedMode(self, veh_id: str) -> int:
+        return self.speed_mode.get(veh_id, 31)
+
+    def setSpeedMode(self, veh_id: str, mode: int) -> None:
+        self.speed_mode[veh_id] = mode
+
+    def setSpeed(self, veh_id: str, speed: float) -> None:
+        pass
+
+    def slowDown(self, veh_id: str, speed: float, duration: float) -> None:
+        pass
+
+
+class _Simulation:
+    def __init__(self) -> None:
+        self.departed: tuple[str, ...] = ()
+        self.arrived: tuple[str, ...] = ()
+
+    def getDepartedIDList(self) -> tuple[str, ...]:
+        return self.departed
+
+    def getArrivedIDList(self) -> tuple[str, ...]:
+        return self.arrived
+
+
+class _Traci:
+    def __init__(self) -> None:
+        self.vehicle = _Vehicle()
+        self.simulation = _Simulation()
+
+
+def test_registry_tracks_departures_and_arrivals() -> None:
+    raw = _Traci()
+    registry = VehicleRegistry(traci=raw)
+    raw.simulation.departed = ('main_0', 'ramp_0')
+    registry.sync()
+    assert set(registry.records) == {'main_0', 'ramp_0'}
+    assert registry.stream('ramp_0') == 'ramp'
+    assert registry.length('main_0') == 4.5
+
+    raw.simulation.departed = ()
+    raw.simulation.arrived = ('main_0',)
+    registry.sync()
+    assert set(registry.records) == {'ramp_0'}
+
+    # Unknown vehicles are loaded on demand.
+    assert registry.type_id('hdv_0') == 'hdv'
+    assert 'hdv_0' in registry.records
+
+
+def _controller_type_calls(*, use_registry: bool, steps: int) -> list[int]:
+    raw = _Traci()
+    traci = CountingTraci(raw)
+    registry = VehicleRegistry(traci=traci) if use_registry else None
+    controller = Controller(traci=traci, vehicle_registry=registry)
+    active = set(_ROUTES)
+    command = ControlCommand(set_speed_mps={veh_id: 15.0 for veh_id in _ROUTES})
+    raw.simulation.departed = tuple(_ROUTES)
+    for _ in range(steps):
+        if registry is not None:
+            registry.sync()
+        controller.apply(command=command, active_vehicle_ids=active)
+        raw.simulation.departed = ()
+        traci.close_step()
+    return [step['vehicle.getTypeID'] for step in traci.step_counts]
+
+
+def test_registry_removes_per_step_type_queries() -> None:
+    without = _controller_type_calls(use_registry=False, steps=20)
+    with_registry = _controller_type_calls(use_registry=True, steps=20)
+    assert all(count >= len(_ROUTES) for count in without)
+    assert with_registry[0] == len(_ROUTES)
+    assert sum(with_registry[1:]) == 0
+
+
+def test_counting_traci_summary() -> None:
+    traci = CountingTraci(_Traci())
+    traci.vehicle.getSpeed('main_0')
+    traci.vehicle.getSpeed('main_0')
+    traci.close_step()
+    traci.simulation.getDepartedIDList()
+    traci.close_step()
+    summary = traci.summary()
+    assert summary['steps'] == 2
+    assert summary['total_calls'] == 3
+    assert summary['by_call'] == {'simulation.getDepartedIDList': 1, 'vehicle.getSpeed': 2}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ramp.policies.dp.command_builder import build_command
+from ramp.runtime.types import Plan
+from ramp.runtime.vehicle_table import (
+    STREAM_MAIN,
+    STREAM_RAMP,
+    VehicleTable,
+    VehicleTableView,
+    as_vehicle_table,
+)
+
+
+def _put(table: VehicleTable, veh_id: str, *, speed: float = 20.0, in_zone: bool = True) -> int:
+    return table.put(
+        veh_id,
+        stream='ramp' if veh_id.startswith('ramp') else 'main',
+        edge_id='main_h2',
+        lane_id='main_h2_0',
+        lane_pos=10.0,
+        d_to_merge=150.0,
+        speed=speed,
+        accel=0.5,
+        length=4.5,
+        in_control_zone=in_zone,
+    )
+
+
+def test_rows_are_stable_while_active_and_recycled_after_departure() -> None:
+    table = VehicleTable(capacity=2)
+    table.begin_step()
+    row_a = _put(table, 'main_a')
+    row_b = _put(table, 'ramp_b')
+    table.end_step({'main_a', 'ramp_b'})
+
+    table.begin_step()
+    assert _put(table, 'main_a', speed=21.0) == row_a
+    table.end_step({'main_a'})
+    assert table.get_row('ramp_b') is None
+
+    table.begin_step()
+    assert _put(table, 'ramp_c') == row_b
+    assert table.speed.item(row_a) == 21.0
+    assert not table.observed[row_a]
+
+
+def test_growth_preserves_existing_rows() -> None:
+    table = VehicleTable(capacity=1)
+    table.begin_step()
+    for index in range(5):
+        _put(table, f'main_{index}', speed=float(index))
+    table.end_step({f'main_{index}' for index in range(5)})
+    assert table.capacity >= 5
+    for index in range(5):
+        row = table.row(f'main_{index}')
+        assert table.speed.item(row) == float(index)
+        assert table.stream_code[row] == STREAM_MAIN
+
+
+def test_codes_and_lane_index() -> None:
+    table = VehicleTable()
+    table.begin_step()
+    row = table.put(
+        'ramp_0', stream='ramp', edge_id='main_h3', lane_id='main_h3_1',
+        lane_pos=0.0, d_to_merge=1.0, speed=1.0, accel=0.0,
+    )
+    internal = table.put(
+        'ramp_1', stream='ramp', edge_id=':n_merge_0', lane_id=':n_merge_0_0',
+        lane_pos=0.0, d_to_merge=1.0, speed=1.0, accel=0.0,
+    )
+    table.end_step({'ramp_0', 'ramp_1'})
+    assert table.stream_code[row] == STREAM_RAMP
+    assert table.lane_index(row) == 1
+    assert table.lane_index(internal) == 0
+    assert table.edge_id(internal) == ':n_merge_0'
+
+
+def test_view_matches_legacy_dict_shape() -> None:
+    table = VehicleTable()
+    table.begin_step()
+    _put(table, 'main_a')
+    _put(table, 'main_b', in_zone=False)
+    table.end_step({'main_a', 'main_b'})
+    control = table.control_zone_view()
+    observed = table.observation_view()
+
+    assert list(control) == ['main_a']
+    assert 'main_b' not in control and 'main_b' in observed
+    assert control['main_a'] == {
+        'stream': 'main',
+        'edge_id': 'main_h2',
+        'lane_id': 'main_h2_0',
+        'lane_pos': 10.0,
+        'd_to_merge': 150.0,
+        'speed': 20.0,
+        'accel': 0.5,
+    }
+    assert observed['main_b']['length'] == 4.5
+    assert control['main_a'] is control['main_a']
+    assert control.get('missing', {}) == {}
+
+
+def test_view_rejects_uncached_access_after_next_step() -> None:
+    table = VehicleTable()
+    table.begin_step()
+    _put(table, 'main_a')
+    _put(table, 'main_b')
+    table.end_step({'main_a', 'main_b'})
+    view = table.control_zone_view()
+    cached = view['main_a']
+    table.begin_step()
+    assert view['main_a'] is cached
+    with pytest.raises(RuntimeError):
+        view['main_b']
+
+
+def test_command_builder_same_result_for_view_and_dicts() -> None:
+    table = VehicleTable()
+    table.begin_step()
+    _put(table, 'main_a', speed=18.0)
+    _put(table, 'ramp_b', speed=12.0)
+    table.end_step({'main_a', 'ramp_b'})
+    view = table.control_zone_view()
+    plain = view.to_dict()
+    assert isinstance(view, VehicleTableView)
+    assert as_vehicle_table(view) is table
+
+    plan = Plan(
+        plan_time_s=0.0,
+        policy_name='dp',
+        order=['main_a', 'ramp_b'],
+        target_cross_time_s={'main_a': 8.0, 'ramp_b': 10.0},
+        eta_s={'main_a': 6.0, 'ramp_b': 9.0},
+    )
+    kwargs = dict(sim_time_s=0.0, step_length_s=0.1, plan=plan, main_vmax_mps=25.0, ramp_vmax_mps=16.7)
+    assert (
+        build_command(control_zone_state=view, **kwargs).set_speed_mps
+        == build_command(control_zone_state=plain, **kwargs).set_speed_mps
+    )
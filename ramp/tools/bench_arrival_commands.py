@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Per-vehicle vs array arrival-time bounds and speed commands.
+
+Builds a synthetic control-zone population in a ``VehicleTable`` and times,
+per call over the whole population:
+
+* ``scalar`` — the per-vehicle loop the schedulers and command builders used
+  to run: ``minimum_arrival_time_at_on_ramp``, ``stream_vmax`` and
+  ``desired_speed`` once per vehicle;
+* ``array``  — ``minimum_arrival_times_at_on_ramp``, ``stream_vmax_rows`` and
+  ``plan_speed_targets`` over the table columns in one call each.
+
+Both paths must produce the same floats; the exit status is 1 if they differ.
+
+Usage:
+    python -m ramp.tools.bench_arrival_commands --vehicles 10,100,1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import numpy as np
+
+from ramp.experiments.evidence_chain import percentile
+from ramp.policies.speed_command import desired_speed, plan_speed_targets
+from ramp.runtime.vehicle_table import VehicleTable
+from ramp.runtime.vmax import stream_vmax, stream_vmax_rows
+from ramp.scheduler.arrival_time import (
+    minimum_arrival_time_at_on_ramp,
+    minimum_arrival_times_at_on_ramp,
+)
+
+_SIM_TIME_S = 100.0
+_STEP_LENGTH_S = 0.1
+_MAIN_VMAX_MPS = 25.0
+_RAMP_VMAX_MPS = 16.7
+_AUX_VMAX_MPS = 20.0
+_A_MAX_MPS2 = 2.6
+
+
+def _population(count: int, seed: int) -> tuple[VehicleTable, list[str], dict[str, float]]:
+    rng = random.Random(seed)
+    table = VehicleTable(capacity=max(count, 1))
+    table.begin_step()
+    veh_ids: list[str] = []
+    targets: dict[str, float] = {}
+    for index in range(count):
+        stream = 'ramp' if index % 3 == 0 else 'main'
+        if stream == 'ramp':
+            lane_id = 'main_h3_0' if index % 2 else 'ramp_h6_0'
+        else:
+            lane_id = f'main_h2_{index % 2}'
+        veh_id = f'{stream}_{index}'
+        table.put(
+            veh_id, stream=stream, edge_id=lane_id.rsplit('_', 1)[0], lane_id=lane_id,
+            lane_pos=0.0, d_to_merge=rng.uniform(1.0, 300.0), speed=rng.uniform(0.0, 25.0),
+            accel=0.0, in_control_zone=True,
+        )
+        veh_ids.append(veh_id)
+        targets[veh_id] = _SIM_TIME_S + rng.uniform(0.5, 20.0)
+    table.end_step(set(veh_ids))
+    return table, veh_ids, targets
+
+
+def _scalar_call(
+    table: VehicleTable, veh_ids: list[str], targets: dict[str, float],
+) -> tuple[list[float], dict[str, float]]:
+    t_min: list[float] = []
+    speeds: dict[str, float] = {}
+    for veh_id in veh_ids:
+        row = table.row(veh_id)
+        vmax = stream_vmax(
+            table.stream(row), _MAIN_VMAX_MPS, _RAMP_VMAX_MPS,
+            aux_vmax_mps=_AUX_VMAX_MPS, lane_id=table.lane_id(row),
+        )
+        d_to_merge = table.d_to_merge.item(row)
+        t_min.append(minimum_arrival_time_at_on_ramp(
+            t_now_s=_SIM_TIME_S, distance_m=d_to_merge, speed_mps=table.speed.item(row),
+            a_max_mps2=_A_MAX_MPS2, v_max_mps=vmax,
+        ))
+        speeds[veh_id] = desired_speed(
+            sim_time_s=_SIM_TIME_S, step_length_s=_STEP_LENGTH_S, d_to_merge_m=d_to_merge,
+            target_cross_time_s=targets[veh_id], vmax_mps=vmax,
+        )
+    return t_min, speeds
+
+
+def _array_call(
+    table: VehicleTable, veh_ids: list[str], targets: dict[str, float],
+) -> tuple[list[float], dict[str, float]]:
+    rows = table.rows(veh_ids)
+    vmax = stream_vmax_rows(
+        table, rows, _MAIN_VMAX_MPS, _RAMP_VMAX_MPS, aux_vmax_mps=_AUX_VMAX_MPS,
+    )
+    t_min = minimum_arrival_times_at_on_ramp(
+        t_now_s=_SIM_TIME_S, distance_m=table.d_to_merge[rows], speed_mps=table.speed[rows],
+        a_max_mps2=np.full(len(rows), _A_MAX_MPS2), v_max_mps=vmax,
+    )
+    speeds = plan_speed_targets(
+        sim_time_s=_SIM_TIME_S, step_length_s=_STEP_LENGTH_S, table=table, veh_ids=veh_ids,
+        target_cross_time_s=targets, main_vmax_mps=_MAIN_VMAX_MPS,
+        ramp_vmax_mps=_RAMP_VMAX_MPS, aux_vmax_mps=_AUX_VMAX_MPS,
+    )
+    return t_min.tolist(), speeds
+
+
+def _measure(call, repeats: int) -> dict[str, float]:
+    call()  # warm-up
+    call_s: list[float] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        call()
+        call_s.append(time.perf_counter() - t0)
+    return {
+        'call_us_p50': 1e6 * percentile(call_s, 0.50),
+        'call_us_p95': 1e6 * percentile(call_s, 0.95),
+    }
+
+
+def run_benchmark(*, vehicle_counts: list[int], repeats: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for count in vehicle_counts:
+        table, veh_ids, targets = _population(count, seed)
+        scalar = _measure(lambda: _scalar_call(table, veh_ids, targets), repeats)
+        array = _measure(lambda: _array_call(table, veh_ids, targets), repeats)
+        identical = _scalar_call(table, veh_ids, targets) == _array_call(table, veh_ids, targets)
+        results.append({
+            'vehicles': count,
+            'scalar': scalar,
+            'array': array,
+            'speedup_p50': scalar['call_us_p50'] / array['call_us_p50'],
+            'identical': identical,
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark array arrival-time and speed commands.')
+    parser.add_argument('--vehicles', default='10,100,1000')
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    counts = [int(v) for v in args.vehicles.split(',') if v.strip()]
+    results = run_benchmark(vehicle_counts=counts, repeats=args.repeats, seed=args.seed)
+    for row in results:
+        print(
+            f"  N={row['vehicles']:<5} scalar p50={row['scalar']['call_us_p50']:9.1f} us  "
+            f"array p50={row['array']['call_us_p50']:9.1f} us  "
+            f"speedup={row['speedup_p50']:5.1f}x  identical={row['identical']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Merge-contract construction cost per step versus control-zone population.
+
+Every step moves a synthetic control zone forward (vehicles advance, one
+crosses the merge and a new one enters every few steps), forms the plan order
+by distance to the merge and rebuilds the contracts, as the scheduler does on
+every replan with ``replan_interval_s=0``.  Three builders are timed:
+
+* ``reference`` — ``_build_contracts_reference``, the per-vehicle scans;
+* ``single``    — ``_build_contracts``, a fresh two-sweep pass each step;
+* ``index``     — one ``ContractIndex`` kept across steps (links and
+  unchanged contracts reused).
+
+All three must return equal contracts.
+
+Usage:
+    python -m ramp.tools.bench_contracts --population 10,50,100,200,400 --steps 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.evidence_chain import percentile
+from ramp.policies.hierarchical.scheduler import (
+    ContractIndex,
+    _build_contracts,
+    _build_contracts_reference,
+)
+from ramp.runtime.types import Plan
+from ramp.runtime.vehicle_table import VehicleTable
+
+_STEP_S = 0.1
+_ENTRY_EVERY_STEPS = 5
+
+
+def _new_vehicle(index: int, rng: random.Random) -> tuple[str, dict[str, Any]]:
+    stream = 'ramp' if rng.random() < 0.3 else 'main'
+    return f'{stream}_{index}', {
+        'stream': stream,
+        'cav': rng.random() < 0.5,
+        'd_to_merge': rng.uniform(0.0, 400.0),
+        'speed': rng.uniform(10.0, 20.0),
+        'lane1': stream == 'main' and rng.random() < 0.5,
+    }
+
+
+def simulate_steps(*, population: int, steps: int, seed: int):
+    """Yield ``(plan, control_zone_state, vehicle_types, lane1_vehicles)`` per step."""
+    rng = random.Random(seed)
+    next_index = 0
+    vehicles: dict[str, dict[str, Any]] = {}
+    for _ in range(population):
+        veh_id, record = _new_vehicle(next_index, rng)
+        vehicles[veh_id] = record
+        next_index += 1
+    for step in range(steps):
+        for record in vehicles.values():
+            record['d_to_merge'] -= record['speed'] * _STEP_S
+        if step % _ENTRY_EVERY_STEPS == 0:
+            crossed = min(vehicles, key=lambda v: vehicles[v]['d_to_merge'])
+            del vehicles[crossed]
+            veh_id, record = _new_vehicle(next_index, rng)
+            record['d_to_merge'] = 400.0
+            vehicles[veh_id] = record
+            next_index += 1
+        table = VehicleTable(capacity=len(vehicles))
+        table.begin_step()
+        for veh_id, record in vehicles.items():
+            lane_id = 'main_h3_1' if record['lane1'] else f"{record['stream']}_h2_0"
+            table.put(
+                veh_id, stream=record['stream'], edge_id=lane_id[:-2], lane_id=lane_id,
+                lane_pos=400.0 - record['d_to_merge'], d_to_merge=record['d_to_merge'],
+                speed=record['speed'], accel=0.0, length=5.0, in_control_zone=True,
+            )
+        table.end_step(set(vehicles))
+        sim_time_s = step * _STEP_S
+        order = sorted(vehicles, key=lambda v: (vehicles[v]['d_to_merge'], v))
+        plan = Plan(
+            plan_time_s=sim_time_s,
+            policy_name='hierarchical',
+            order=order,
+            target_cross_time_s={
+                v: round(sim_time_s + vehicles[v]['d_to_merge'] / vehicles[v]['speed'], 1)
+                for v in order
+            },
+        )
+        vehicle_types = {v: 'cav' if r['cav'] else 'hdv' for v, r in vehicles.items()}
+        lane1 = [
+            (v, 400.0 - r['d_to_merge'], r['speed']) for v, r in vehicles.items() if r['lane1']
+        ]
+        yield plan, table.control_zone_view(), vehicle_types, lane1
+
+
+def _bench_population(*, population: int, steps: int, seed: int) -> dict[str, Any]:
+    index = ContractIndex()
+    timings: dict[str, list[float]] = {'reference': [], 'single': [], 'index': []}
+    identical = True
+    for plan, state, vehicle_types, lane1 in simulate_steps(
+        population=population, steps=steps, seed=seed,
+    ):
+        kwargs = dict(
+            plan=plan, control_zone_state=state,
+            vehicle_types=vehicle_types, zone_c_lane1_vehicles=lane1,
+        )
+        results = {}
+        for name, build in (
+            ('reference', _build_contracts_reference),
+            ('single', _build_contracts),
+            ('index', index.update),
+        ):
+            t0 = time.perf_counter()
+            results[name] = build(**kwargs)
+            timings[name].append(time.perf_counter() - t0)
+        identical = identical and results['single'] == results['reference'] == results['index']
+    row: dict[str, Any] = {'population': population, 'steps': steps}
+    for name, values in timings.items():
+        row[f'{name}_p50_us'] = 1e6 * percentile(values, 0.50)
+        row[f'{name}_p95_us'] = 1e6 * percentile(values, 0.95)
+    row['relinks'] = index.relink_count
+    row['contracts_reused'] = index.contracts_reused
+    row['contracts_built'] = index.contracts_built
+    row['identical'] = identical
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark merge-contract construction.')
+    parser.add_argument('--population', default='10,50,100,200,400',
+                        help='Comma-separated control-zone populations')
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    results = [
+        _bench_population(population=int(n), steps=args.steps, seed=args.seed)
+        for n in args.population.split(',')
+    ]
+    for row in results:
+        print(
+            f"  n={row['population']:>4}  "
+            f"reference p50={row['reference_p50_us']:9.1f} us  "
+            f"single p50={row['single_p50_us']:8.1f} us  "
+            f"index p50={row['index_p50_us']:8.1f} us  "
+            f"relinks={row['relinks']:>4}  reused={row['contracts_reused']:>6}  "
+            f"built={row['contracts_built']:>5}  identical={row['identical']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Per-step policy cost on the fake TraCI backend (no SUMO needed).
+
+Runs ``run_experiment`` in-process with ``sumo_backend='fake'`` and
+``profile_steps`` for every (policy, density) cell.  A density is the
+``main_vph:ramp_vph`` pair handed to ``generate_mixed_rou`` (vehicles per
+hour per main lane, and on the ramp).  From each ``profile.json`` the
+harness reports the mean / p95 step time and the *policy cost*: the mean
+step time minus the fake simulator's own ``sim_step`` stage, i.e. what
+collecting state, planning, commanding and recording cost per step.
+
+Because the fake backend is deterministic, two runs of a cell see the same
+vehicles; only the timings move.  Exit status is 1 when any cell's policy
+cost exceeds ``--max-policy-ms`` (``ramp/tests/test_fake_traci.py`` checks
+the same threshold on a short run).
+
+Usage:
+    python -m ramp.tools.bench_fake_policies
+    python -m ramp.tools.bench_fake_policies --policies dp,hierarchical --densities 600:300,1800:700 --duration-s 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import sys
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.run import run_experiment
+from ramp.runtime.simulation_driver import SUMO_BACKEND_FAKE
+from ramp.runtime.step_profiler import STAGE_SIM_STEP
+
+DEFAULT_POLICIES: tuple[str, ...] = ('no_control', 'fifo', 'dp', 'hierarchical')
+DEFAULT_DENSITIES: tuple[tuple[int, int], ...] = ((600, 250), (1200, 500), (1800, 750))
+# Mean policy cost per step (ms) above which a cell counts as a regression.
+DEFAULT_MAX_POLICY_MS = 15.0
+
+_SCENARIO = 'ramp__mlane_v2_mixed'
+
+
+def parse_densities(text: str) -> list[tuple[int, int]]:
+    densities: list[tuple[int, int]] = []
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        main_vph, _, ramp_vph = item.partition(':')
+        densities.append((int(main_vph), int(ramp_vph or 0)))
+    return densities
+
+
+def run_cell(
+    *,
+    policy: str,
+    main_vph: int,
+    ramp_vph: int,
+    duration_s: float,
+    seed: int,
+    out_dir: Path,
+) -> dict[str, Any]:
+    run_experiment(
+        scenario=_SCENARIO,
+        policy=policy,
+        duration_s=duration_s,
+        step_length=0.1,
+        seed=seed,
+        gui=False,
+        out_dir=str(out_dir),
+        control_zone_length_m=300.0,
+        merge_edge='main_h3',
+        main_vmax_mps=25.0,
+        ramp_vmax_mps=25.0,
+        fifo_gap_s=1.5,
+        delta_1_s=1.5,
+        delta_2_s=2.0,
+        dp_replan_interval_s=1.0,
+        generate_rou=True,
+        main_vph=main_vph,
+        ramp_vph=ramp_vph,
+        rou_duration=int(math.ceil(duration_s)),
+        sumo_backend=SUMO_BACKEND_FAKE,
+        profile_steps=True,
+    )
+    profile = json.loads((out_dir / 'profile.json').read_text(encoding='utf-8'))
+    metrics = json.loads((out_dir / 'metrics.json').read_text(encoding='utf-8'))
+    step_ms = profile['step_ms']
+    sim_step_ms = profile['stages'][STAGE_SIM_STEP]['ms']['mean']
+    return {
+        'policy': policy,
+        'main_vph': main_vph,
+        'ramp_vph': ramp_vph,
+        'steps': profile['steps'],
+        'entered_control_count': metrics.get('entered_control_count'),
+        'step_ms_mean': step_ms['mean'],
+        'step_ms_p95': step_ms['p95'],
+        'sim_step_ms_mean': sim_step_ms,
+        'policy_ms_mean': step_ms['mean'] - sim_step_ms,
+        'stage_share': {
+            stage: values['share'] for stage, values in profile['stages'].items()
+        },
+    }
+
+
+def run_benchmark(
+    *,
+    policies: list[str],
+    densities: list[tuple[int, int]],
+    duration_s: float,
+    seed: int,
+    base_out_dir: Path,
+) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for main_vph, ramp_vph in densities:
+        for policy in policies:
+            results.append(run_cell(
+                policy=policy, main_vph=main_vph, ramp_vph=ramp_vph, duration_s=duration_s,
+                seed=seed, out_dir=base_out_dir / f'{policy}_{main_vph}_{ramp_vph}',
+            ))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Time each policy per step on the fake backend.')
+    parser.add_argument('--policies', default=','.join(DEFAULT_POLICIES))
+    parser.add_argument(
+        '--densities',
+        default=','.join(f'{main}:{ramp}' for main, ramp in DEFAULT_DENSITIES),
+        help='Comma-separated main_vph:ramp_vph pairs',
+    )
+    parser.add_argument('--duration-s', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-policy-ms', type=float, default=DEFAULT_MAX_POLICY_MS)
+    parser.add_argument('--out-dir', default='output/fake_policy_bench')
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_benchmark(
+        policies=[policy for policy in args.policies.split(',') if policy.strip()],
+        densities=parse_densities(args.densities),
+        duration_s=args.duration_s,
+        seed=args.seed,
+        base_out_dir=Path(args.out_dir),
+    )
+    for row in results:
+        print(
+            f"  {row['policy']:<13} {row['main_vph']:>5}:{row['ramp_vph']:<5} "
+            f"entered={row['entered_control_count']!s:<5} "
+            f"step mean={row['step_ms_mean']:7.3f} ms p95={row['step_ms_p95']:7.3f} ms  "
+            f"policy={row['policy_ms_mean']:7.3f} ms"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['policy_ms_mean'] <= args.max_policy_ms for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
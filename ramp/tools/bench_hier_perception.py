@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""TraCI calls and latency of the hierarchical perception step, before/after.
+
+Each mode drives its own SUMO instance (same seed, no control applied) and
+per step runs the base ``StateCollector`` plus everything the hierarchical
+policy reads about the lanes:
+
+* ``legacy``  — the previous per-consumer reads: the collector's ``main_h2``
+  densities/speeds and ``main_h3_1`` list, Zone C's own ``main_h3_0/1``
+  reads, and the controller's ``main_h3_0`` query;
+* ``unified`` — ``HierarchicalStateCollector.collect`` (one perception pass)
+  and the consumers reading its snapshot.
+
+Calls are counted with ``CountingTraci``; Zone A's gap-check reads (1 Hz,
+only when a transition scores above threshold) are not part of either
+figure.  The run checks that Zone A info, the lane-1 list, the Zone C CAV
+states and the merge-lane IDs agree step by step.
+
+Usage:
+    python -m ramp.tools.bench_hier_perception --duration-s 300
+    python -m ramp.tools.bench_hier_perception --scenarios ramp__mlane_v2_mixed_stress --backend subscription
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.common.vehicle_defs import is_hdv
+from ramp.experiments.evidence_chain import percentile
+from ramp.experiments.run import _ensure_sumo_tools_on_path, _pick_sumo_binary, _resolve_sumocfg
+from ramp.policies.hierarchical.merge_point import VehicleState
+from ramp.policies.hierarchical.scheduler import _collect_zone_c_cav_states
+from ramp.policies.hierarchical.state_collector_ext import HierarchicalStateCollector, ZoneAInfo
+from ramp.runtime.state_collector import StateCollector
+from ramp.runtime.subscription import COLLECTOR_BACKEND_POLLING, COLLECTOR_BACKENDS
+from ramp.runtime.traci_counter import CountingTraci
+
+_MIXED_SCENARIOS = 'ramp__mlane_v2_mixed,ramp__mlane_v2_mixed_hf,ramp__mlane_v2_mixed_stress'
+_MODES = ('legacy', 'unified')
+
+
+def _legacy_reads(traci: Any, registry: Any) -> tuple:
+    """The lane reads the policy made before the shared perception pass."""
+    zone_a_info = None
+    edge_id = 'main_h2'
+    lane_count = traci.edge.getLaneNumber(edge_id)
+    if lane_count > 0:
+        edge_length_m = traci.lane.getLength(f'{edge_id}_0')
+        densities: dict[int, float] = {}
+        speeds: dict[int, float] = {}
+        counts: dict[int, int] = {}
+        for lane_idx in range(lane_count):
+            veh_ids = traci.lane.getLastStepVehicleIDs(f'{edge_id}_{lane_idx}')
+            count = len(veh_ids)
+            counts[lane_idx] = count
+            densities[lane_idx] = (count / edge_length_m) * 1000.0 if edge_length_m > 0 else 0.0
+            if count > 0:
+                speeds[lane_idx] = sum(traci.vehicle.getSpeed(vid) for vid in veh_ids) / count
+            else:
+                speeds[lane_idx] = 0.0
+        zone_a_info = ZoneAInfo(
+            lane_densities=densities, lane_avg_speeds=speeds,
+            lane_vehicle_counts=counts, edge_length_m=edge_length_m,
+        )
+
+    lane1 = [
+        (vid, traci.vehicle.getLanePosition(vid), traci.vehicle.getSpeed(vid))
+        for vid in traci.lane.getLastStepVehicleIDs('main_h3_1')
+    ]
+
+    cav_states: dict[str, VehicleState] = {}
+    for lane_idx in (0, 1):
+        for veh_id in traci.lane.getLastStepVehicleIDs(f'main_h3_{lane_idx}'):
+            if is_hdv(registry.type_id(veh_id)):
+                continue
+            cav_states[veh_id] = VehicleState(
+                edge_id='main_h3',
+                lane_index=lane_idx,
+                lane_pos_m=float(traci.vehicle.getLanePosition(veh_id)),
+                speed_mps=float(traci.vehicle.getSpeed(veh_id)),
+            )
+
+    merge_lane_ids = tuple(traci.lane.getLastStepVehicleIDs('main_h3_0'))
+    return zone_a_info, lane1, cav_states, merge_lane_ids
+
+
+def _run_mode(
+    *, mode: str, sumocfg: Path, steps: int, step_length: float, seed: int, backend: str,
+) -> tuple[dict[str, Any], list[tuple]]:
+    _ensure_sumo_tools_on_path()
+    import traci as traci_module
+
+    cmd = [
+        _pick_sumo_binary(False),
+        '--configuration-file', str(sumocfg),
+        '--step-length', str(step_length),
+        '--no-step-log', 'true',
+        '--seed', str(seed),
+    ]
+    traci = CountingTraci(traci_module)
+    base = StateCollector(
+        control_zone_length_m=300.0,
+        merge_edge='main_h3',
+        policy='hierarchical',
+        main_vmax_mps=25.0,
+        ramp_vmax_mps=25.0,
+        fifo_gap_s=2.0,
+        backend=backend,
+    )
+    hier = HierarchicalStateCollector(base_collector=base, traci=traci)
+    outputs: list[tuple] = []
+    step_s: list[float] = []
+    traci.start(cmd)
+    try:
+        for _ in range(steps):
+            traci.simulationStep()
+            sim_time = float(traci.simulation.getTime())
+            traci.counts.clear()
+            t0 = time.perf_counter()
+            if mode == 'legacy':
+                base.collect(sim_time=sim_time, traci=traci)
+                output = _legacy_reads(traci, base.vehicle_registry)
+            else:
+                state = hier.collect(sim_time=sim_time, traci=traci)
+                output = (
+                    state.zone_a_info,
+                    state.zone_c_lane1_vehicles,
+                    _collect_zone_c_cav_states(state.perception),
+                    state.perception.merge_lane.vehicle_ids,
+                )
+            step_s.append(time.perf_counter() - t0)
+            traci.close_step()
+            outputs.append(output)
+    finally:
+        traci.close()
+
+    summary = traci.summary()
+    return {
+        'mode': mode,
+        'steps': steps,
+        'traci_calls_per_step': summary['calls_per_step'],
+        'step_p50_us': 1e6 * percentile(step_s, 0.50),
+        'step_p95_us': 1e6 * percentile(step_s, 0.95),
+        'by_call': summary['by_call'],
+    }, outputs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the hierarchical perception pass.')
+    parser.add_argument('--scenarios', default=_MIXED_SCENARIOS)
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--step-length', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--backend', choices=COLLECTOR_BACKENDS, default=COLLECTOR_BACKEND_POLLING)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    steps = int(round(args.duration_s / args.step_length))
+    results: list[dict[str, Any]] = []
+    for scenario in args.scenarios.split(','):
+        sumocfg = _resolve_sumocfg(_REPO_ROOT, scenario)
+        outputs: dict[str, list[tuple]] = {}
+        for mode in _MODES:
+            print(f'[BENCH] {scenario} mode={mode} backend={args.backend} steps={steps} ...')
+            row, outputs[mode] = _run_mode(
+                mode=mode, sumocfg=sumocfg, steps=steps,
+                step_length=args.step_length, seed=args.seed, backend=args.backend,
+            )
+            row['scenario'] = scenario
+            results.append(row)
+        identical = outputs['legacy'] == outputs['unified']
+        for row in results[-2:]:
+            row['identical'] = identical
+            print(
+                f"  {row['mode']:<8} calls/step={row['traci_calls_per_step']:7.1f}  "
+                f"p50={row['step_p50_us']:8.1f} us  p95={row['step_p95_us']:8.1f} us  "
+                f"identical={identical}"
+            )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
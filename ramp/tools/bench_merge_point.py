@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Gap-query cost per step as the number of simultaneously merging CAVs grows.
+
+Each step draws ``--lane1`` lane-1 vehicles (small position jitter, so the
+ordering mostly persists between steps) and ``N`` CAVs on ``main_h3`` L0 that
+all need a gap decision.  Three ways of answering the step's queries:
+
+* ``legacy``      — the pre-index code: sort lane 1 per CAV, then a Python
+  loop over the forward gaps;
+* ``per_cav``     — ``evaluate_merge_point`` per CAV (index built per call);
+* ``index``       — one ``Lane1Index.build`` per step, shared by all CAVs;
+* ``incremental`` — one ``Lane1Index`` kept across steps and re-sorted from
+  the previous order.
+
+All four must return identical results.  ``manager`` is the full
+``MergePointManager.update`` step with every CAV kept in SEARCHING.
+
+Usage:
+    python -m ramp.tools.bench_merge_point --cavs 1,4,16,64 --lane1 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.policies.hierarchical.merge_point import (
+    Lane1Index,
+    MergeEvalResult,
+    MergePointManager,
+    MergePointParams,
+    MergeState,
+    VehicleState,
+    _evaluate_gap_detail,
+    _evaluate_indexed,
+    evaluate_merge_point,
+)
+
+
+def _legacy_evaluate(cav_pos_m, cav_speed_mps, lane1_vehicles, params) -> MergeEvalResult:
+    """Pre-index ``evaluate_merge_point`` (non-fallback, non-empty lane 1)."""
+    merge_pos = cav_pos_m + cav_speed_mps * params.t_lc_s
+    sorted_vehs = sorted(lane1_vehicles, key=lambda x: x[1])
+    positions = [v[1] for v in sorted_vehs]
+    j = bisect.bisect_right(positions, cav_pos_m)
+    k = len(sorted_vehs)
+    best_reject = None
+    for gap_idx in range(j, k + 1):
+        follow = sorted_vehs[gap_idx - 1] if gap_idx > 0 else None
+        lead = sorted_vehs[gap_idx] if gap_idx < k else None
+        detail = _evaluate_gap_detail(cav_pos_m, cav_speed_mps, lead, follow, params)
+        if detail.feasible:
+            return MergeEvalResult(
+                feasible=True, merge_position_m=merge_pos, gap_front_m=detail.g_f,
+                gap_rear_m=detail.g_r, lead_id=detail.lead_id, follow_id=detail.follow_id,
+                is_fallback=False, safety_margin=detail.safety_margin,
+            )
+        if best_reject is None or (detail.safety_margin is not None and (
+            best_reject.safety_margin is None or detail.safety_margin > best_reject.safety_margin
+        )):
+            best_reject = detail
+    return MergeEvalResult(feasible=False, reject_detail=best_reject)
+
+
+def _steps(*, cavs: int, lane1: int, steps: int, seed: int, params: MergePointParams):
+    rng = random.Random(seed)
+    base = [rng.uniform(0.0, 2.0 * params.lane0_length_m) for _ in range(lane1)]
+    for step in range(steps):
+        vehicles = [
+            (f'l1_{i}', pos + 1.5 * step + rng.uniform(-0.5, 0.5), rng.uniform(10.0, 20.0))
+            for i, pos in enumerate(base)
+        ]
+        cav_states = {
+            f'cav_{i}': VehicleState(
+                'main_h3', 0,
+                rng.uniform(params.search_start_pos_m, params.lane0_length_m - params.fallback_buffer_m - 1.0),
+                rng.uniform(5.0, 20.0),
+            )
+            for i in range(cavs)
+        }
+        yield vehicles, cav_states
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run_benchmark(
+    *, cav_counts: list[int], lane1: int, steps: int, seed: int
+) -> list[dict[str, Any]]:
+    params = MergePointParams()
+    results: list[dict[str, Any]] = []
+    for cavs in cav_counts:
+        totals = {'legacy': 0.0, 'per_cav': 0.0, 'index': 0.0, 'incremental': 0.0, 'manager': 0.0}
+        identical = True
+        shared = Lane1Index(incremental=True)
+        manager = MergePointManager(params)
+        for step, (vehicles, cav_states) in enumerate(
+            _steps(cavs=cavs, lane1=lane1, steps=steps, seed=seed, params=params)
+        ):
+            queries = [(vs.lane_pos_m, vs.speed_mps) for vs in cav_states.values()]
+            out: dict[str, list] = {}
+
+            def _legacy() -> None:
+                out['legacy'] = [_legacy_evaluate(p, v, vehicles, params) for p, v in queries]
+
+            def _per_cav() -> None:
+                out['per_cav'] = [evaluate_merge_point(p, v, vehicles, params) for p, v in queries]
+
+            def _index() -> None:
+                index = Lane1Index.build(vehicles)
+                out['index'] = [_evaluate_indexed(p, v, index, params) for p, v in queries]
+
+            def _incremental() -> None:
+                shared.rebuild(vehicles)
+                out['incremental'] = [_evaluate_indexed(p, v, shared, params) for p, v in queries]
+
+            totals['legacy'] += _timed(_legacy)
+            totals['per_cav'] += _timed(_per_cav)
+            totals['index'] += _timed(_index)
+            totals['incremental'] += _timed(_incremental)
+            identical = identical and out['legacy'] == out['per_cav'] == out['index'] == out['incremental']
+
+            for tracker_id in cav_states:  # keep every CAV searching
+                tracker = manager.get_tracker(tracker_id)
+                if tracker is not None:
+                    tracker.state = MergeState.SEARCHING
+            totals['manager'] += _timed(lambda: manager.update(step * 0.1, cav_states, vehicles))
+        row: dict[str, Any] = {'cavs': cavs, 'lane1': lane1, 'identical': identical}
+        row.update({f'{name}_us': 1e6 * total / steps for name, total in totals.items()})
+        results.append(row)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark merge-point gap queries.')
+    parser.add_argument('--cavs', default='1,4,16,64')
+    parser.add_argument('--lane1', type=int, default=80)
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    counts = [int(v) for v in args.cavs.split(',') if v.strip()]
+    results = run_benchmark(cav_counts=counts, lane1=args.lane1, steps=args.steps, seed=args.seed)
+    for row in results:
+        print(
+            f"  cavs={row['cavs']:<4} lane1={row['lane1']:<4} legacy={row['legacy_us']:9.1f} us  per_cav={row['per_cav_us']:9.1f} us  "
+            f"index={row['index_us']:8.1f} us  incremental={row['incremental_us']:8.1f} us  "
+            f"manager={row['manager_us']:8.1f} us  identical={row['identical']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
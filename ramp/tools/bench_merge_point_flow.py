@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Zone C merge-point manager over a long synthetic mixed_stress-like flow.
+
+Ramp CAVs enter ``main_h3`` lane 0 at ``--ramp-cav-vph`` and lane-1 traffic
+passes at ``--lane1-vph``; a CAV changes to lane 1 ``lc_delay_s`` after the
+manager issues its lane change and is dropped once past the merge area.
+Events are consumed every step like ``ramp.experiments.run`` does.
+
+Reports mean / p95 ``MergePointManager.update`` time per step with the
+``merge_point`` logger at WARNING (records suppressed) and at DEBUG (every
+event formatted into an in-memory handler), and the manager's traced memory
+at each simulated hour.
+
+Usage:
+    python -m ramp.tools.bench_merge_point_flow --duration-s 7200
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.evidence_chain import percentile
+from ramp.policies.hierarchical import merge_point
+from ramp.policies.hierarchical.merge_point import MergePointManager, VehicleState
+
+_LC_DELAY_S = 1.5
+_EXIT_POS_M = 360.0
+
+
+def simulate_zone_c_flow(
+    manager: MergePointManager,
+    *,
+    duration_s: float,
+    step_s: float = 0.1,
+    ramp_cav_vph: float = 600.0,
+    lane1_vph: float = 500.0,
+    seed: int = 1,
+    on_step: Callable[[float, float], None] | None = None,
+) -> int:
+    """Drive ``manager`` for ``duration_s``; ``on_step(sim_time, update_s)`` per step.
+
+    Returns the number of events consumed.
+    """
+    rng = random.Random(seed)
+    cavs: dict[str, list[float]] = {}  # veh_id -> [pos, speed, lane, lc_at]
+    lane1: dict[str, list[float]] = {}  # veh_id -> [pos, speed]
+    next_cav_s = 0.0
+    next_lane1_s = 0.0
+    counter = 0
+    consumed = 0
+    steps = int(round(duration_s / step_s))
+    for step in range(steps):
+        sim_time = round(step * step_s, 6)
+        if sim_time >= next_cav_s:
+            counter += 1
+            cavs[f'ramp_cav_{counter}'] = [0.0, rng.uniform(11.0, 15.0), 0.0, -1.0]
+            next_cav_s += rng.expovariate(ramp_cav_vph / 3600.0)
+        if sim_time >= next_lane1_s:
+            counter += 1
+            lane1[f'main_L1_{counter}'] = [0.0, rng.uniform(12.0, 17.0)]
+            next_lane1_s += rng.expovariate(lane1_vph / 3600.0)
+
+        for veh_id in list(cavs):
+            state = cavs[veh_id]
+            state[0] += state[1] * step_s
+            if state[3] >= 0.0 and sim_time >= state[3]:
+                state[2] = 1.0
+            if state[0] > _EXIT_POS_M:
+                del cavs[veh_id]
+        for veh_id in list(lane1):
+            state = lane1[veh_id]
+            state[0] += state[1] * step_s
+            if state[0] > _EXIT_POS_M:
+                del lane1[veh_id]
+
+        cav_states = {
+            veh_id: VehicleState('main_h3', int(state[2]), state[0], state[1])
+            for veh_id, state in cavs.items()
+        }
+        lane1_vehicles = [(veh_id, state[0], state[1]) for veh_id, state in lane1.items()]
+        lane1_vehicles.extend(
+            (veh_id, state[0], state[1]) for veh_id, state in cavs.items() if state[2] == 1.0
+        )
+
+        t0 = time.perf_counter()
+        actions = manager.update(sim_time, cav_states, lane1_vehicles)
+        update_s = time.perf_counter() - t0
+        for veh_id in actions:
+            if veh_id in cavs and cavs[veh_id][3] < 0.0:
+                cavs[veh_id][3] = sim_time + _LC_DELAY_S
+        consumed += len(manager.consume_events_since_cursor())
+        if on_step is not None:
+            on_step(sim_time, update_s)
+    return consumed
+
+
+def _timed_run(*, duration_s: float, step_s: float, seed: int, level: int) -> dict[str, Any]:
+    log = logging.getLogger(merge_point.__name__)
+    handler = logging.StreamHandler(io.StringIO())
+    old_level, old_propagate = log.level, log.propagate
+    log.addHandler(handler)
+    log.setLevel(level)
+    log.propagate = False
+    update_s: list[float] = []
+    try:
+        simulate_zone_c_flow(
+            MergePointManager(), duration_s=duration_s, step_s=step_s, seed=seed,
+            on_step=lambda _t, dt: update_s.append(dt),
+        )
+    finally:
+        log.removeHandler(handler)
+        log.setLevel(old_level)
+        log.propagate = old_propagate
+    return {
+        'logging': logging.getLevelName(level),
+        'update_us_mean': 1e6 * sum(update_s) / len(update_s),
+        'update_us_p95': 1e6 * percentile(update_s, 0.95),
+        'log_bytes': len(handler.stream.getvalue()),
+    }
+
+
+def memory_by_hour(*, duration_s: float, step_s: float, seed: int) -> list[dict[str, Any]]:
+    """Traced bytes held by the manager (and flow state) at each simulated hour."""
+    manager = MergePointManager()
+    rows: list[dict[str, Any]] = []
+
+    def _checkpoint(sim_time: float, _dt: float) -> None:
+        if sim_time > 0 and abs(sim_time % 3600.0) < step_s / 2:
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            rows.append({
+                'sim_time_s': sim_time,
+                'traced_bytes': current,
+                'trackers': len(manager.vehicle_states),
+                'events_held': len(manager.merge_event_log),
+                'events_total': manager.merge_event_log.next_seq,
+                'merges_total': manager.merge_history.next_seq,
+            })
+
+    tracemalloc.start()
+    try:
+        simulate_zone_c_flow(
+            manager, duration_s=duration_s + step_s, step_s=step_s, seed=seed, on_step=_checkpoint,
+        )
+    finally:
+        tracemalloc.stop()
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the merge-point manager over a long flow.')
+    parser.add_argument('--duration-s', type=float, default=7200.0)
+    parser.add_argument('--step-s', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    timing = [
+        _timed_run(duration_s=args.duration_s, step_s=args.step_s, seed=args.seed, level=level)
+        for level in (logging.WARNING, logging.DEBUG)
+    ]
+    for row in timing:
+        print(
+            f"  logging={row['logging']:<7} update mean={row['update_us_mean']:7.1f} us  "
+            f"p95={row['update_us_p95']:7.1f} us  log_bytes={row['log_bytes']}"
+        )
+    memory = memory_by_hour(duration_s=args.duration_s, step_s=args.step_s, seed=args.seed)
+    for row in memory:
+        print(
+            f"  t={row['sim_time_s']:7.0f}s traced={row['traced_bytes']:>9} B  "
+            f"trackers={row['trackers']:<3} events held={row['events_held']} "
+            f"total={row['events_total']} merges={row['merges_total']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps({'timing': timing, 'memory': memory}, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
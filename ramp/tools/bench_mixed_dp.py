@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Replan latency of the hierarchical mixed DP: reference vs table engine.
+
+Each (scenario, engine) cell runs ``ramp.experiments.run --policy
+hierarchical`` as a subprocess with identical arguments except
+``--dp-engine``.  The harness reports the ``scheduler_replan_latency_ms``
+percentiles from each scheduler_timing.json, the fallback counts, and whether
+the metrics.json files are identical between the two engines.
+
+Usage:
+    python -m ramp.tools.bench_mixed_dp --duration-s 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.scheduler.dp_array import DP_ENGINES
+
+DEFAULT_SCENARIOS: list[str] = [
+    'ramp__mlane_v2_mixed_hf',
+    'ramp__mlane_v2_mixed_stress',
+]
+
+_LATENCY_KEY = 'scheduler_replan_latency_ms'
+
+
+def _build_cmd(
+    *,
+    scenario: str,
+    engine: str,
+    duration_s: float,
+    seed: int,
+    out_dir: Path,
+    sumo_backend: str,
+) -> list[str]:
+    return [
+        sys.executable, '-m', 'ramp.experiments.run',
+        '--scenario', scenario,
+        '--policy', 'hierarchical',
+        '--duration-s', str(duration_s),
+        '--step-length', '0.1',
+        '--seed', str(seed),
+        '--out-dir', str(out_dir),
+        '--control-zone-length-m', '300',
+        '--merge-edge', 'main_h3',
+        '--main-vmax-mps', '25',
+        '--ramp-vmax-mps', '25',
+        '--dp-replan-interval-s', '1.0',
+        '--sumo-backend', sumo_backend,
+        '--dp-engine', engine,
+    ]
+
+
+def run_harness(
+    *,
+    scenarios: list[str],
+    duration_s: float,
+    seed: int,
+    base_out_dir: Path,
+    sumo_backend: str,
+) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for scenario in scenarios:
+        metrics_by_engine: dict[str, dict[str, Any] | None] = {}
+        latency_by_engine: dict[str, dict[str, Any] | None] = {}
+        for engine in DP_ENGINES:
+            out_dir = base_out_dir / scenario / engine
+            cmd = _build_cmd(
+                scenario=scenario, engine=engine, duration_s=duration_s,
+                seed=seed, out_dir=out_dir, sumo_backend=sumo_backend,
+            )
+            print(f'[BENCH] {scenario} dp_engine={engine} ...')
+            result = subprocess.run(
+                cmd, check=False, capture_output=True, text=True, cwd=str(_REPO_ROOT),
+            )
+            metrics_path = out_dir / 'metrics.json'
+            timing_path = out_dir / 'scheduler_timing.json'
+            if result.returncode != 0 or not metrics_path.exists() or not timing_path.exists():
+                print(f'[BENCH]   failed: {(result.stderr or "")[-300:]}')
+                metrics_by_engine[engine] = None
+                latency_by_engine[engine] = None
+                continue
+            metrics_by_engine[engine] = json.loads(metrics_path.read_text(encoding='utf-8'))
+            timing = json.loads(timing_path.read_text(encoding='utf-8'))
+            latency_by_engine[engine] = timing.get(_LATENCY_KEY)
+
+        row: dict[str, Any] = {'scenario': scenario}
+        for engine, metrics in metrics_by_engine.items():
+            row[engine] = None if metrics is None else {
+                'replan_latency_ms': latency_by_engine[engine],
+                'scheduler_fallback_count': metrics.get('scheduler_fallback_count'),
+                'scheduler_replan_count': metrics.get('scheduler_replan_count'),
+            }
+        comparable = [metrics for metrics in metrics_by_engine.values() if metrics is not None]
+        row['metrics_identical'] = (
+            len(comparable) == len(DP_ENGINES)
+            and all(m == comparable[0] for m in comparable[1:])
+        )
+        rows.append(row)
+
+    return {
+        'duration_s': duration_s,
+        'seed': seed,
+        'sumo_backend': sumo_backend,
+        'scenarios': rows,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Mixed DP replan latency per engine.')
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS))
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--sumo-backend', default='traci')
+    parser.add_argument('--out-dir', default=None)
+    args = parser.parse_args()
+
+    base = Path(args.out_dir) if args.out_dir else _REPO_ROOT / 'output' / 'bench_mixed_dp'
+    base.mkdir(parents=True, exist_ok=True)
+    summary = run_harness(
+        scenarios=[s.strip() for s in args.scenarios.split(',') if s.strip()],
+        duration_s=args.duration_s,
+        seed=args.seed,
+        base_out_dir=base,
+        sumo_backend=args.sumo_backend,
+    )
+    summary_path = base / 'mixed_dp_latency.json'
+    summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    for row in summary['scenarios']:
+        for engine in DP_ENGINES:
+            cell = row.get(engine)
+            latency = cell['replan_latency_ms'] if cell else None
+            if not latency:
+                print(f"  {row['scenario']:<30} {engine:<9} failed")
+                continue
+            print(
+                f"  {row['scenario']:<30} {engine:<9} n={latency['count']:<5} "
+                f"p50={latency['p50']:7.2f} ms  p95={latency['p95']:7.2f} ms  "
+                f"p99={latency['p99']:7.2f} ms  max={latency['max']:7.2f} ms  "
+                f"fallbacks={cell['scheduler_fallback_count']}"
+            )
+        print(f"  {'':<30} metrics_identical={row['metrics_identical']}")
+    print(f'[BENCH] Summary written to {summary_path}')
+    return 0 if all(r['metrics_identical'] for r in summary['scenarios']) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
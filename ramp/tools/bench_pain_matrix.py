@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Wall-clock of the pain matrix at several worker counts.
+
+Runs the full matrix with the cache disabled once per ``--workers`` value,
+each into its own output directory, and checks that every run produced the
+same summary as the single-worker run (``out_dir`` paths aside).
+
+Usage:
+    python -m ramp.tools.bench_pain_matrix --scenario ramp__mlane_v2_mixed --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.tools.run_pain_matrix import DEFAULT_CELL_TIMEOUT_S, run_matrix
+
+
+def _comparable(summary: dict[str, Any]) -> dict[str, Any]:
+    cells = [{k: v for k, v in cell.items() if k != 'out_dir'} for cell in summary['cell_results']]
+    return {**summary, 'cell_results': cells}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark pain matrix worker counts.')
+    parser.add_argument('--scenario', type=str, default='ramp__mlane_v2_mixed')
+    parser.add_argument('--seeds', type=str, default='1,2,3')
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--timeout-s', type=float, default=DEFAULT_CELL_TIMEOUT_S)
+    parser.add_argument('--out-dir', type=str, default='output/pain_matrix_bench')
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    seeds = [int(s.strip()) for s in args.seeds.split(',')]
+    params = {'scenario': args.scenario, 'duration_s': args.duration_s}
+    base = Path(args.out_dir)
+
+    results: list[dict[str, Any]] = []
+    reference: dict[str, Any] | None = None
+    for workers in args.workers:
+        out_dir = base / f'workers_{workers}'
+        summary = run_matrix(
+            seeds=seeds,
+            params=params,
+            base_out_dir=out_dir,
+            workers=workers,
+            timeout_s=args.timeout_s,
+            use_cache=False,
+        )
+        execution = json.loads((out_dir / 'pain_matrix_execution.json').read_text(encoding='utf-8'))
+        if reference is None:
+            reference = _comparable(summary)
+        results.append({
+            'workers': workers,
+            'wall_clock_s': execution['wall_clock_s'],
+            'identical_to_first': _comparable(summary) == reference,
+        })
+
+    baseline_s = results[0]['wall_clock_s']
+    for row in results:
+        row['speedup'] = baseline_s / row['wall_clock_s'] if row['wall_clock_s'] > 0 else 0.0
+        print(
+            f"  workers={row['workers']:<2} wall={row['wall_clock_s']:8.1f} s  "
+            f"speedup={row['speedup']:5.2f}x  identical={row['identical_to_first']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical_to_first'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
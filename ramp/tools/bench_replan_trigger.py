@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Timer-based vs event-driven Zone B replanning across the pain-matrix worlds.
+
+Runs the pain matrix once per ``--replan-trigger`` (cache disabled, each into
+its own output directory) and reports, per world averaged over the seeds,
+the replan count, the scheduler CPU time (``scheduler_cpu_s`` from
+scheduler_timing.json, plan computation and projection on the main thread) and the safety / efficiency
+metrics: collisions, TTC minimum and sub-3 s / sub-1.5 s ratios, merge
+success, delay and planned-vs-actual crossing error.
+
+Use a longer ``--dp-replan-interval-s`` than the timer default to let the
+event trigger replace the periodic replans: in event mode the interval is
+only the upper bound between two replans.
+
+Usage:
+    python -m ramp.tools.bench_replan_trigger --scenario ramp__mlane_v2_mixed --workers 4
+    python -m ramp.tools.bench_replan_trigger --policy dp --event-interval-s 3.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.tools.run_pain_matrix import DEFAULT_CELL_TIMEOUT_S, DEFAULT_PARAMS, run_matrix
+
+_REPORTED_METRICS = (
+    'scheduler_replan_count',
+    'scheduler_cpu_s',
+    'collision_count',
+    'ttc_any_min_s',
+    'ttc_any_lt_3_0s_ratio',
+    'ttc_any_lt_1_5s_ratio',
+    'merge_success_rate',
+    'avg_delay_at_merge_s',
+    'consistency_cross_time_error_mean_s',
+)
+
+
+def summarize_cells(summary: dict[str, Any]) -> dict[str, dict[str, float | None]]:
+    """Per-world mean of ``_REPORTED_METRICS`` over the successful cells."""
+    values: dict[str, dict[str, list[float]]] = {}
+    for cell in summary['cell_results']:
+        if not cell['success']:
+            continue
+        out_dir = Path(cell['out_dir'])
+        metrics = json.loads((out_dir / 'metrics.json').read_text(encoding='utf-8'))
+        timing_path = out_dir / 'scheduler_timing.json'
+        if timing_path.exists():
+            metrics.update(json.loads(timing_path.read_text(encoding='utf-8')))
+        world = values.setdefault(cell['world'], {name: [] for name in _REPORTED_METRICS})
+        for name in _REPORTED_METRICS:
+            value = metrics.get(name)
+            if value is not None:
+                world[name].append(float(value))
+    return {
+        world: {
+            name: sum(samples) / len(samples) if samples else None
+            for name, samples in by_metric.items()
+        }
+        for world, by_metric in values.items()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare timer and event replan triggers.')
+    parser.add_argument('--scenario', type=str, default='ramp__mlane_v2_mixed')
+    parser.add_argument('--policy', choices=['dp', 'hierarchical'], default='hierarchical')
+    parser.add_argument('--seeds', type=str, default='1,2,3')
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--timer-interval-s', type=float,
+                        default=float(DEFAULT_PARAMS['dp_replan_interval_s']))
+    parser.add_argument('--event-interval-s', type=float, default=3.0,
+                        help='Upper bound between replans for the event trigger')
+    parser.add_argument('--eta-drift-s', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--timeout-s', type=float, default=DEFAULT_CELL_TIMEOUT_S)
+    parser.add_argument('--out-dir', type=str, default='output/replan_trigger_bench')
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    seeds = [int(s.strip()) for s in args.seeds.split(',')]
+    base = Path(args.out_dir)
+    interval_by_trigger = {'timer': args.timer_interval_s, 'event': args.event_interval_s}
+
+    results: dict[str, Any] = {}
+    for trigger, interval_s in interval_by_trigger.items():
+        params = {
+            'scenario': args.scenario,
+            'policy': args.policy,
+            'duration_s': args.duration_s,
+            'dp_replan_interval_s': interval_s,
+            'replan_trigger': trigger,
+            'replan_eta_drift_s': args.eta_drift_s,
+        }
+        summary = run_matrix(
+            seeds=seeds,
+            params=params,
+            base_out_dir=base / trigger,
+            workers=args.workers,
+            timeout_s=args.timeout_s,
+            use_cache=False,
+        )
+        results[trigger] = {
+            'interval_s': interval_s,
+            'all_runnable': summary['gate1_all_runnable'],
+            'worlds': summarize_cells(summary),
+        }
+
+    def fmt(value: float | None) -> str:
+        return f'{value:10.4g}' if value is not None else f'{"-":>10}'
+
+    print(f"\n{'world':<16} {'metric':<38} {'timer':>10} {'event':>10}")
+    for world in results['timer']['worlds']:
+        for name in _REPORTED_METRICS:
+            timer_value = results['timer']['worlds'][world][name]
+            event_value = results['event']['worlds'].get(world, {}).get(name)
+            print(f'{world:<16} {name:<38} {fmt(timer_value)} {fmt(event_value)}')
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['all_runnable'] for row in results.values()) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
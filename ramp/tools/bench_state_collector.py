@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark StateCollector backends (polling vs subscription) on a SUMO scenario.
+
+Each backend drives its own SUMO instance with the same seed and only runs
+``simulationStep`` + ``StateCollector.collect`` so the figure isolates
+perception cost.  The subscription run also checks that every step's
+``CollectedState`` equals the polling run.
+
+Usage:
+    python -m ramp.tools.bench_state_collector --scenario ramp__mlane_v2_mixed_stress
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.run import _ensure_sumo_tools_on_path, _pick_sumo_binary, _resolve_sumocfg
+from ramp.runtime.state_collector import StateCollector
+from ramp.runtime.subscription import COLLECTOR_BACKENDS
+
+_Snapshot = tuple[set[str], dict[str, dict[str, Any]], dict[str, dict[str, Any]]]
+
+
+def _run_backend(
+    *,
+    backend: str,
+    sumocfg: Path,
+    steps: int,
+    step_length: float,
+    seed: int,
+) -> tuple[dict[str, Any], list[_Snapshot]]:
+    _ensure_sumo_tools_on_path()
+    import traci
+
+    cmd = [
+        _pick_sumo_binary(False),
+        '--configuration-file', str(sumocfg),
+        '--step-length', str(step_length),
+        '--no-step-log', 'true',
+        '--seed', str(seed),
+    ]
+    collector = StateCollector(
+        control_zone_length_m=300.0,
+        merge_edge='main_h3',
+        policy='fifo',
+        main_vmax_mps=25.0,
+        ramp_vmax_mps=25.0,
+        fifo_gap_s=2.0,
+        backend=backend,
+    )
+    states: list[_Snapshot] = []
+    vehicle_steps = 0
+    collect_s = 0.0
+    traci.start(cmd)
+    try:
+        wall_start = time.perf_counter()
+        for _ in range(steps):
+            traci.simulationStep()
+            sim_time = float(traci.simulation.getTime())
+            t0 = time.perf_counter()
+            state = collector.collect(sim_time=sim_time, traci=traci)
+            collect_s += time.perf_counter() - t0
+            vehicle_steps += len(state.active_vehicle_ids)
+            # Views are only valid for the step they were collected in.
+            states.append((
+                state.active_vehicle_ids,
+                state.control_zone_state.to_dict(),
+                state.ttc_observation_state.to_dict(),
+            ))
+        wall_s = time.perf_counter() - wall_start
+    finally:
+        traci.close()
+
+    return {
+        'backend': backend,
+        'steps': steps,
+        'wall_s': wall_s,
+        'steps_per_s': steps / wall_s if wall_s > 0 else 0.0,
+        'collect_s': collect_s,
+        'collect_ms_per_step': 1000.0 * collect_s / steps if steps else 0.0,
+        'mean_active_vehicles': vehicle_steps / steps if steps else 0.0,
+    }, states
+
+
+def _states_equal(a: list[_Snapshot], b: list[_Snapshot]) -> bool:
+    if len(a) != len(b):
+        return False
+    return all(x == y for x, y in zip(a, b))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark StateCollector backends.')
+    parser.add_argument('--scenario', default='ramp__mlane_v2_mixed_stress')
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--step-length', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    sumocfg = _resolve_sumocfg(_REPO_ROOT, args.scenario)
+    steps = int(round(args.duration_s / args.step_length))
+    results: dict[str, dict[str, Any]] = {}
+    states_by_backend: dict[str, list[_Snapshot]] = {}
+    for backend in COLLECTOR_BACKENDS:
+        print(f'[BENCH] {args.scenario} backend={backend} steps={steps} ...')
+        results[backend], states_by_backend[backend] = _run_backend(
+            backend=backend,
+            sumocfg=sumocfg,
+            steps=steps,
+            step_length=args.step_length,
+            seed=args.seed,
+        )
+
+    polling = results['polling']
+    subscription = results['subscription']
+    summary = {
+        'scenario': args.scenario,
+        'seed': args.seed,
+        'results': results,
+        'speedup_steps_per_s': (
+            subscription['steps_per_s'] / polling['steps_per_s']
+            if polling['steps_per_s'] > 0 else None
+        ),
+        'identical_collected_state': _states_equal(
+            states_by_backend['polling'], states_by_backend['subscription'],
+        ),
+    }
+    for backend, r in results.items():
+        print(
+            f"  {backend:<13} {r['steps_per_s']:8.1f} steps/s  "
+            f"collect={r['collect_ms_per_step']:.3f} ms/step  "
+            f"vehicles={r['mean_active_vehicles']:.1f}"
+        )
+    print(f"  speedup={summary['speedup_steps_per_s']}  identical={summary['identical_collected_state']}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    return 0 if summary['identical_collected_state'] else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
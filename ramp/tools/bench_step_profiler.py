@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Overhead of ``--profile-steps`` (``ramp.runtime.step_profiler``).
+
+Two measurements:
+
+* ``synthetic`` (always) — per-step cost of the lap sites the runner and the
+  schedulers execute each step, with profiling off (``profiler is None``
+  checks only), on without a TraCI counter, and on with a ``CountingTraci``
+  tally of typical size;
+* ``end_to_end`` (``--scenario``, needs SUMO) — ``run.py`` wall time with and
+  without ``--profile-steps``, alternating ``--repeats`` times, reported as
+  the relative overhead of the medians.  This includes the ``CountingTraci``
+  wrapper the profiler turns on.  The metrics of both runs must match
+  (timing metrics excluded).
+
+Exit status is 1 when the end-to-end overhead exceeds ``--max-overhead-pct``
+or the metrics differ.
+
+Usage:
+    python -m ramp.tools.bench_step_profiler
+    python -m ramp.tools.bench_step_profiler --scenario ramp__mlane_v2_mixed --policy hierarchical
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.runtime.step_profiler import STAGES, StepProfiler
+
+# Lap sites per step in run.py plus the hierarchical scheduler's own laps.
+_LAPS_PER_STEP = 18
+# Distinct TraCI calls in a typical step's tally (size of the summed Counter).
+_TALLY_KEYS = 16
+
+
+class _Tally:
+    """Stands in for ``CountingTraci`` (the profiler only reads ``counts``)."""
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter({f'vehicle.get{i}': 40 for i in range(_TALLY_KEYS)})
+
+
+def _synthetic_step_us(profiler: StepProfiler | None, steps: int) -> float:
+    stages = [STAGES[i % len(STAGES)] for i in range(_LAPS_PER_STEP)]
+    t0 = time.perf_counter()
+    for step in range(steps):
+        if profiler is not None:
+            profiler.begin_step()
+        for stage in stages:
+            if profiler is not None:
+                profiler.lap(stage)
+        if profiler is not None:
+            profiler.end_step(stages[-1], sim_time_s=float(step))
+    return 1e6 * (time.perf_counter() - t0) / steps
+
+
+def run_synthetic(*, steps: int) -> dict[str, float]:
+    baseline = _synthetic_step_us(None, steps)
+    plain = _synthetic_step_us(StepProfiler(), steps)
+    counted = _synthetic_step_us(StepProfiler(traci_counter=_Tally()), steps)
+    return {
+        'disabled_us_per_step': baseline,
+        'enabled_us_per_step': plain - baseline,
+        'enabled_counted_us_per_step': counted - baseline,
+    }
+
+
+def _run_cmd(*, scenario: str, policy: str, duration_s: float, seed: int, out_dir: Path,
+             profile: bool) -> list[str]:
+    cmd = [
+        sys.executable, '-m', 'ramp.experiments.run',
+        '--scenario', scenario,
+        '--policy', policy,
+        '--duration-s', str(duration_s),
+        '--step-length', '0.1',
+        '--seed', str(seed),
+        '--out-dir', str(out_dir),
+        '--control-zone-length-m', '300',
+        '--merge-edge', 'main_h3',
+        '--main-vmax-mps', '25',
+        '--ramp-vmax-mps', '25',
+        '--dp-replan-interval-s', '1.0',
+    ]
+    if profile:
+        cmd.append('--profile-steps')
+    return cmd
+
+
+def run_end_to_end(
+    *, scenario: str, policy: str, duration_s: float, seed: int, repeats: int, base_out_dir: Path,
+) -> dict[str, Any]:
+    wall_s: dict[str, list[float]] = {'off': [], 'on': []}
+    metrics: dict[str, dict[str, Any] | None] = {}
+    for repeat in range(repeats):
+        for mode in ('off', 'on'):
+            out_dir = base_out_dir / f'{mode}_{repeat}'
+            cmd = _run_cmd(
+                scenario=scenario, policy=policy, duration_s=duration_s, seed=seed,
+                out_dir=out_dir, profile=mode == 'on',
+            )
+            t0 = time.perf_counter()
+            result = subprocess.run(
+                cmd, check=False, capture_output=True, text=True, cwd=str(_REPO_ROOT),
+            )
+            wall_s[mode].append(time.perf_counter() - t0)
+            metrics_path = out_dir / 'metrics.json'
+            if result.returncode != 0 or not metrics_path.exists():
+                print(f'[BENCH] {mode} run failed: {(result.stderr or "")[-300:]}')
+                metrics[mode] = None
+                continue
+            metrics[mode] = json.loads(metrics_path.read_text(encoding='utf-8'))
+    off = statistics.median(wall_s['off'])
+    on = statistics.median(wall_s['on'])
+    return {
+        'scenario': scenario,
+        'policy': policy,
+        'wall_s_off': off,
+        'wall_s_on': on,
+        'overhead_pct': 100.0 * (on - off) / off if off > 0 else None,
+        'metrics_identical': (
+            metrics.get('off') is not None and metrics.get('off') == metrics.get('on')
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Measure the step profiler overhead.')
+    parser.add_argument('--steps', type=int, default=20000, help='Synthetic steps')
+    parser.add_argument('--scenario', default=None, help='Also time run.py on this scenario')
+    parser.add_argument('--policy', default='hierarchical')
+    parser.add_argument('--duration-s', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-overhead-pct', type=float, default=3.0)
+    parser.add_argument('--out-dir', default='output/step_profiler_bench')
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {'synthetic': run_synthetic(steps=args.steps)}
+    synthetic = results['synthetic']
+    print(
+        f"  synthetic ({_LAPS_PER_STEP} laps/step): "
+        f"off={synthetic['disabled_us_per_step']:.2f} us/step  "
+        f"+on={synthetic['enabled_us_per_step']:.2f} us/step  "
+        f"+on_counted={synthetic['enabled_counted_us_per_step']:.2f} us/step"
+    )
+    ok = True
+    if args.scenario:
+        end_to_end = run_end_to_end(
+            scenario=args.scenario, policy=args.policy, duration_s=args.duration_s,
+            seed=args.seed, repeats=args.repeats, base_out_dir=Path(args.out_dir),
+        )
+        results['end_to_end'] = end_to_end
+        overhead = end_to_end['overhead_pct']
+        print(
+            f"  {args.scenario} {args.policy}: off={end_to_end['wall_s_off']:.2f}s "
+            f"on={end_to_end['wall_s_on']:.2f}s overhead={overhead:+.2f}% "
+            f"identical={end_to_end['metrics_identical']}"
+        )
+        ok = (
+            end_to_end['metrics_identical']
+            and overhead is not None
+            and overhead <= args.max_overhead_pct
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
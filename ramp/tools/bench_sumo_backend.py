@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Timing harness: traci socket vs in-process libsumo for run_experiment.
+
+Each (scenario, backend) cell runs as an isolated subprocess (libsumo keeps
+one simulation per process) with identical CLI arguments.  The harness
+records wall-clock per cell, the per-scenario speedup and whether the two
+metrics.json files are identical.
+
+Usage:
+    python -m ramp.tools.bench_sumo_backend --policy hierarchical --duration-s 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.runtime.simulation_driver import SUMO_BACKENDS
+
+DEFAULT_SCENARIOS: list[str] = [
+    'ramp__mlane_v2_mixed',
+    'ramp__mlane_v2_mixed_hf',
+    'ramp__mlane_v2_mixed_stress',
+]
+
+
+def _build_cmd(
+    *,
+    scenario: str,
+    policy: str,
+    backend: str,
+    duration_s: float,
+    seed: int,
+    out_dir: Path,
+) -> list[str]:
+    return [
+        sys.executable, '-m', 'ramp.experiments.run',
+        '--scenario', scenario,
+        '--policy', policy,
+        '--duration-s', str(duration_s),
+        '--step-length', '0.1',
+        '--seed', str(seed),
+        '--out-dir', str(out_dir),
+        '--control-zone-length-m', '300',
+        '--merge-edge', 'main_h3',
+        '--main-vmax-mps', '25',
+        '--ramp-vmax-mps', '25',
+        '--dp-replan-interval-s', '1.0',
+        '--sumo-backend', backend,
+    ]
+
+
+def run_harness(
+    *,
+    scenarios: list[str],
+    policy: str,
+    duration_s: float,
+    seed: int,
+    base_out_dir: Path,
+) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for scenario in scenarios:
+        wall_by_backend: dict[str, float] = {}
+        metrics_by_backend: dict[str, dict[str, Any] | None] = {}
+        for backend in SUMO_BACKENDS:
+            out_dir = base_out_dir / scenario / backend
+            cmd = _build_cmd(
+                scenario=scenario, policy=policy, backend=backend,
+                duration_s=duration_s, seed=seed, out_dir=out_dir,
+            )
+            print(f'[BENCH] {scenario} backend={backend} ...')
+            t0 = time.perf_counter()
+            result = subprocess.run(
+                cmd, check=False, capture_output=True, text=True, cwd=str(_REPO_ROOT),
+            )
+            wall_by_backend[backend] = time.perf_counter() - t0
+            metrics_path = out_dir / 'metrics.json'
+            if result.returncode != 0 or not metrics_path.exists():
+                print(f'[BENCH]   failed: {(result.stderr or "")[-300:]}')
+                metrics_by_backend[backend] = None
+                continue
+            metrics_by_backend[backend] = json.loads(metrics_path.read_text(encoding='utf-8'))
+
+        traci_wall = wall_by_backend['traci']
+        libsumo_wall = wall_by_backend['libsumo']
+        rows.append({
+            'scenario': scenario,
+            'traci_wall_s': traci_wall,
+            'libsumo_wall_s': libsumo_wall,
+            'speedup': traci_wall / libsumo_wall if libsumo_wall > 0 else None,
+            'metrics_identical': (
+                metrics_by_backend['traci'] is not None
+                and metrics_by_backend['traci'] == metrics_by_backend['libsumo']
+            ),
+        })
+
+    return {
+        'policy': policy,
+        'duration_s': duration_s,
+        'seed': seed,
+        'scenarios': rows,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Time traci vs libsumo per scenario.')
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS))
+    parser.add_argument('--policy', default='hierarchical')
+    parser.add_argument('--duration-s', type=float, default=300.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out-dir', default=None)
+    args = parser.parse_args()
+
+    base = Path(args.out_dir) if args.out_dir else _REPO_ROOT / 'output' / 'bench_sumo_backend'
+    base.mkdir(parents=True, exist_ok=True)
+    summary = run_harness(
+        scenarios=[s.strip() for s in args.scenarios.split(',') if s.strip()],
+        policy=args.policy,
+        duration_s=args.duration_s,
+        seed=args.seed,
+        base_out_dir=base,
+    )
+    summary_path = base / 'sumo_backend_timing.json'
+    summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    for row in summary['scenarios']:
+        speedup = row['speedup']
+        print(
+            f"  {row['scenario']:<30} traci={row['traci_wall_s']:7.1f}s "
+            f"libsumo={row['libsumo_wall_s']:7.1f}s "
+            f"speedup={speedup:.2f}x identical={row['metrics_identical']}"
+            if speedup is not None else f"  {row['scenario']}: failed"
+        )
+    print(f'[BENCH] Summary written to {summary_path}')
+    return 0 if all(r['metrics_identical'] for r in summary['scenarios']) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
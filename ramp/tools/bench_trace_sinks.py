@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Per-step trace-writing latency and bytes written, per sink configuration.
+
+Replays a synthetic run (``--vehicles`` vehicles in the control zone every
+step) through ``TraceSinks`` with the row shapes of ``control_zone_trace``,
+``plans``, ``commands``, ``control_evidence`` and ``events``, and reports
+
+* the time the step loop spends inside ``writerow`` calls (p50/p95/max);
+* the wall time including the final drain/close;
+* total bytes on disk;
+
+for csv/sync (the previous inline ``csv.DictWriter`` behaviour), csv/async,
+columnar/sync and columnar/async.  Columnar outputs are exported back to CSV
+and compared byte-for-byte with the csv/sync files.
+
+Usage:
+    python -m ramp.tools.bench_trace_sinks --steps 3000 --vehicles 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.evidence_chain import CONTROL_FIELDS, percentile
+from ramp.experiments.trace_io import (
+    TRACE_FORMAT_COLUMNAR,
+    TRACE_FORMAT_CSV,
+    TRACE_FORMATS,
+    TRACE_WRITER_SYNC,
+    TRACE_WRITERS,
+    TraceSinks,
+    export_csv,
+    trace_path,
+)
+
+_TABLES: dict[str, list[str]] = {
+    'control_zone_trace': [
+        'time', 'veh_id', 'stream', 'edge_id', 'lane_id', 'lane_pos',
+        'D_to_merge', 'speed', 'accel', 'v_des',
+    ],
+    'plans': [
+        'time', 'entry_rank', 'order_index', 'veh_id', 'stream', 't_enter_control_zone',
+        'D_to_merge', 'speed', 'natural_eta', 'target_cross_time', 'gap_from_prev', 'v_des',
+    ],
+    'commands': ['time', 'veh_id', 'stream', 'd_to_merge_m', 'v_cmd_mps', 'release_flag'],
+    'control_evidence': list(CONTROL_FIELDS),
+    'events': ['time', 'event', 'veh_id', 'detail'],
+}
+
+
+def _step_rows(step: int, vehicles: int, rng: random.Random) -> list[tuple[str, dict[str, Any]]]:
+    sim_time = round((step + 1) * 0.1, 1)
+    rows: list[tuple[str, dict[str, Any]]] = []
+    for index in range(vehicles):
+        veh_id = f'{"main" if index % 3 else "ramp"}_{step // 50 + index}'
+        stream = 'main' if index % 3 else 'ramp'
+        d_to_merge = rng.uniform(0.0, 300.0)
+        speed = rng.uniform(5.0, 25.0)
+        v_des: Any = rng.uniform(5.0, 25.0) if index % 4 else ''
+        rows.append(('control_zone_trace', {
+            'time': sim_time, 'veh_id': veh_id, 'stream': stream,
+            'edge_id': 'main_h3', 'lane_id': 'main_h3_0', 'lane_pos': rng.uniform(0.0, 500.0),
+            'D_to_merge': d_to_merge, 'speed': speed, 'accel': rng.uniform(-3.0, 3.0),
+            'v_des': v_des,
+        }))
+        rows.append(('plans', {
+            'time': sim_time, 'entry_rank': index + 1, 'order_index': index + 1,
+            'veh_id': veh_id, 'stream': stream, 't_enter_control_zone': sim_time - 5.0,
+            'D_to_merge': d_to_merge, 'speed': speed, 'natural_eta': sim_time + 4.0,
+            'target_cross_time': sim_time + 4.5, 'gap_from_prev': 1.5, 'v_des': v_des,
+        }))
+        rows.append(('commands', {
+            'time': sim_time, 'veh_id': veh_id, 'stream': stream,
+            'd_to_merge_m': d_to_merge, 'v_cmd_mps': speed, 'release_flag': 0,
+        }))
+        rows.append(('control_evidence', {
+            'time': sim_time, 'event_id': f'control_{step * vehicles + index:08d}',
+            'contract_id': f'contract_{step:08d}', 'veh_id': veh_id,
+            'commanded_speed': speed, 'actual_speed': speed - 0.3, 'speed_error': 0.3,
+            'speed_mode_applied': 32, 'lane_change_command_issued': 0,
+            'lane_change_mode_applied': 512, 'autonomous_lane_change_detected': 0,
+            'controlled_cav_step': 1,
+        }))
+    if step % 10 == 0:
+        rows.append(('events', {
+            'time': sim_time, 'event': 'plan_recompute', 'veh_id': '', 'detail': 'policy=dp',
+        }))
+    return rows
+
+
+def _run_case(
+    *, out_dir: Path, trace_format: str, trace_writer: str, steps: int, vehicles: int, seed: int
+) -> dict[str, Any]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    step_rows = [_step_rows(step, vehicles, rng) for step in range(steps)]
+    step_s: list[float] = []
+    wall_t0 = time.perf_counter()
+    with TraceSinks(
+        out_dir, _TABLES, trace_format=trace_format, trace_writer=trace_writer
+    ) as sinks:
+        writers = {name: sinks[name] for name in _TABLES}
+        for rows in step_rows:
+            t0 = time.perf_counter()
+            for name, row in rows:
+                writers[name].writerow(row)
+            step_s.append(time.perf_counter() - t0)
+    wall_s = time.perf_counter() - wall_t0
+    bytes_written = sum(trace_path(out_dir, name, trace_format).stat().st_size for name in _TABLES)
+    return {
+        'trace_format': trace_format,
+        'trace_writer': trace_writer,
+        'step_p50_us': 1e6 * percentile(step_s, 0.50),
+        'step_p95_us': 1e6 * percentile(step_s, 0.95),
+        'step_max_us': 1e6 * max(step_s),
+        'wall_ms': 1e3 * wall_s,
+        'bytes_written': bytes_written,
+    }
+
+
+def run_benchmark(*, base_dir: Path, steps: int, vehicles: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    # TRACE_FORMATS / TRACE_WRITERS start with csv / sync, the reference output.
+    reference_dir = base_dir / f'{TRACE_FORMAT_CSV}_{TRACE_WRITER_SYNC}'
+    for trace_format in TRACE_FORMATS:
+        for trace_writer in TRACE_WRITERS:
+            out_dir = base_dir / f'{trace_format}_{trace_writer}'
+            row = _run_case(
+                out_dir=out_dir, trace_format=trace_format, trace_writer=trace_writer,
+                steps=steps, vehicles=vehicles, seed=seed,
+            )
+            identical = True
+            for name in _TABLES:
+                produced = trace_path(out_dir, name, trace_format)
+                if trace_format == TRACE_FORMAT_COLUMNAR:
+                    exported = out_dir / f'{name}.exported.csv'
+                    export_csv(produced, exported)
+                    produced = exported
+                reference = trace_path(reference_dir, name, TRACE_FORMAT_CSV)
+                identical = identical and produced.read_bytes() == reference.read_bytes()
+            row['csv_identical'] = identical
+            results.append(row)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark trace sink configurations.')
+    parser.add_argument('--steps', type=int, default=3000)
+    parser.add_argument('--vehicles', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_trace_sinks_') as tmp:
+        results = run_benchmark(
+            base_dir=Path(tmp), steps=args.steps, vehicles=args.vehicles, seed=args.seed
+        )
+    for row in results:
+        print(
+            f"  {row['trace_format']:<9} {row['trace_writer']:<6} "
+            f"step p50={row['step_p50_us']:8.1f} us  p95={row['step_p95_us']:8.1f} us  "
+            f"max={row['step_max_us']:9.1f} us  wall={row['wall_ms']:8.1f} ms  "
+            f"bytes={row['bytes_written']:>10}  csv_identical={row['csv_identical']}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['csv_identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
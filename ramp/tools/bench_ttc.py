@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Per-step TTC sampling latency and run-level summary memory.
+
+For each population size a ``VehicleTable`` is filled once per step (main
+vehicles on ``main_h2``/``main_h3``, ramp vehicles on ``ramp_h6``, positions
+re-drawn every step) and the step's observation view is sampled by
+
+* ``reference`` — the loop-based v1 definition (per-lane Python sort and an
+  O(ramp x main) merge-conflict scan over materialized dict rows);
+* ``vectorised`` — ``collect_ttc_sample_arrays`` on the table columns.
+
+Both must return identical samples.  The run-level summary is then built
+from a retained sample list (sorted at the end) and from a ``TTCSketch``;
+the table reports traced peak bytes for each and the p05 difference.
+
+Usage:
+    python -m ramp.tools.bench_ttc --vehicles 50,200,800 --steps 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.runtime.ttc import (
+    TTCSketch,
+    collect_ttc_sample_arrays,
+    collect_ttc_samples_reference,
+    summarize_ttc_samples,
+)
+from ramp.runtime.vehicle_table import VehicleTable
+
+_STEP_LENGTH_S = 0.1
+_LANES = (
+    ('main', 'main_h2', 'main_h2_0'),
+    ('main', 'main_h2', 'main_h2_1'),
+    ('main', 'main_h3', 'main_h3_1'),
+    ('ramp', 'ramp_h6', 'ramp_h6_0'),
+)
+
+
+def _fill_step(table: VehicleTable, count: int, rng: random.Random) -> None:
+    table.begin_step()
+    for index in range(count):
+        stream, edge_id, lane_id = _LANES[index % len(_LANES)]
+        table.put(
+            f'{stream}_{index}', stream=stream, edge_id=edge_id, lane_id=lane_id,
+            lane_pos=rng.uniform(0.0, 40.0 * count), d_to_merge=rng.uniform(1.0, 300.0),
+            speed=rng.uniform(5.0, 25.0), accel=0.0, length=5.0,
+        )
+    table.end_step({f'{_LANES[i % len(_LANES)][0]}_{i}' for i in range(count)})
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(*, vehicle_counts: list[int], steps: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for count in vehicle_counts:
+        rng = random.Random(seed)
+        table = VehicleTable()
+        reference_s: list[float] = []
+        vectorised_s: list[float] = []
+        identical = True
+        step_samples: list[list[float]] = []
+        for _ in range(steps):
+            _fill_step(table, count, rng)
+            t0 = time.perf_counter()
+            longitudinal, merge_conflict = collect_ttc_sample_arrays(table.observation_view())
+            vectorised_s.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            expected = collect_ttc_samples_reference(ttc_observation_state=table.observation_view())
+            reference_s.append(time.perf_counter() - t0)
+            got = (longitudinal.tolist(), merge_conflict.tolist())
+            identical = identical and got == expected
+            step_samples.append(got[0] + got[1])
+
+        def _list_summary() -> float | None:
+            retained: list[float] = []
+            for samples in step_samples:
+                retained.extend(samples)
+            return summarize_ttc_samples(samples=retained, step_length_s=_STEP_LENGTH_S).p05_s
+
+        def _sketch_summary() -> float | None:
+            sketch = TTCSketch()
+            for samples in step_samples:
+                sketch.add(samples)
+            return sketch.stats(step_length_s=_STEP_LENGTH_S).p05_s
+
+        exact_p05 = _list_summary()
+        sketch_p05 = _sketch_summary()
+        results.append({
+            'vehicles': count,
+            'reference_us_mean': 1e6 * sum(reference_s) / steps,
+            'vectorised_us_mean': 1e6 * sum(vectorised_s) / steps,
+            'identical': identical,
+            'samples': sum(len(samples) for samples in step_samples),
+            'list_summary_peak_bytes': _peak_bytes(_list_summary),
+            'sketch_summary_peak_bytes': _peak_bytes(_sketch_summary),
+            'p05_exact': exact_p05,
+            'p05_sketch': sketch_p05,
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark TTC sampling and summaries.')
+    parser.add_argument('--vehicles', default='50,200,800')
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    counts = [int(v) for v in args.vehicles.split(',') if v.strip()]
+    results = run_benchmark(vehicle_counts=counts, steps=args.steps, seed=args.seed)
+    for row in results:
+        print(
+            f"  N={row['vehicles']:<5} reference={row['reference_us_mean']:9.1f} us/step  "
+            f"vectorised={row['vectorised_us_mean']:8.1f} us/step  identical={row['identical']}  "
+            f"samples={row['samples']:>7}  summary peak list={row['list_summary_peak_bytes']:>9} B "
+            f"sketch={row['sketch_summary_peak_bytes']:>7} B  "
+            f"p05 {row['p05_exact']:.4f} vs {row['p05_sketch']:.4f}"
+        )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0 if all(row['identical'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Per-step allocation / latency: legacy dict-of-dicts vs columnar VehicleTable.
+
+Replays a synthetic population through equivalent per-step pipelines:
+
+* ``dict``  — build ``{veh_id: {...}}`` rows like the pre-table collector and
+  read fields with ``float(state[veh_id]['speed'])``-style casts;
+* ``table`` — ``VehicleTable.put`` into preallocated columns and read fields
+  by row index (how the migrated per-vehicle loops read it);
+* ``table_vec`` — same writes, reads done as whole-column NumPy expressions.
+
+For each population size it records mean step latency (``perf_counter``),
+peak traced bytes per step and blocks still alive after the step
+(``tracemalloc``), so the before/after figures can be compared directly.
+
+Usage:
+    python -m ramp.tools.bench_vehicle_table --vehicles 50,200,800
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import numpy as np
+from ramp.runtime.vehicle_table import VehicleTable
+
+_Population = list[tuple[str, str, str, str, float, float, float, float, float]]
+
+
+def _population(count: int, seed: int) -> _Population:
+    rng = random.Random(seed)
+    vehicles: _Population = []
+    for index in range(count):
+        stream = 'ramp' if index % 4 == 0 else 'main'
+        edge_id = 'ramp_h6' if stream == 'ramp' else 'main_h2'
+        lane_id = f'{edge_id}_{index % 2}'
+        vehicles.append((
+            f'{stream}_{index}', stream, edge_id, lane_id,
+            rng.uniform(0.0, 200.0), rng.uniform(1.0, 300.0),
+            rng.uniform(5.0, 25.0), rng.uniform(-2.0, 2.0), 5.0,
+        ))
+    return vehicles
+
+
+def _dict_step(vehicles: _Population) -> float:
+    state: dict[str, dict[str, float | str]] = {}
+    for veh_id, stream, edge_id, lane_id, pos, dist, speed, accel, _length in vehicles:
+        state[veh_id] = {
+            'stream': stream, 'edge_id': edge_id, 'lane_id': lane_id, 'lane_pos': pos,
+            'd_to_merge': dist, 'speed': speed, 'accel': accel,
+        }
+    total = 0.0
+    for vehicle_state in state.values():
+        if str(vehicle_state['stream']) == 'ramp':
+            total += float(vehicle_state['d_to_merge']) / max(float(vehicle_state['speed']), 0.1)
+        lane_id = str(vehicle_state['lane_id'])
+        total += int(lane_id.split('_')[-1])
+    return total
+
+
+def _table_step(table: VehicleTable, vehicles: _Population, active_ids: set[str]) -> float:
+    table.begin_step()
+    for veh_id, stream, edge_id, lane_id, pos, dist, speed, accel, length in vehicles:
+        table.put(
+            veh_id, stream=stream, edge_id=edge_id, lane_id=lane_id, lane_pos=pos,
+            d_to_merge=dist, speed=speed, accel=accel, length=length, in_control_zone=True,
+        )
+    table.end_step(active_ids)
+    total = 0.0
+    for veh_id in table.control_zone_ids:
+        row = table.row(veh_id)
+        if table.stream_code[row] == 1:
+            total += table.d_to_merge.item(row) / max(table.speed.item(row), 0.1)
+        total += table.lane_index(row)
+    return total
+
+
+def _table_vec_step(table: VehicleTable, vehicles: _Population, active_ids: set[str]) -> float:
+    table.begin_step()
+    for veh_id, stream, edge_id, lane_id, pos, dist, speed, accel, length in vehicles:
+        table.put(
+            veh_id, stream=stream, edge_id=edge_id, lane_id=lane_id, lane_pos=pos,
+            d_to_merge=dist, speed=speed, accel=accel, length=length, in_control_zone=True,
+        )
+    table.end_step(active_ids)
+    rows = table.rows(table.control_zone_ids)
+    ramp = rows[table.stream_code[rows] == 1]
+    lane_index = np.asarray(table.lane_index_by_code)[table.lane_code[rows]]
+    eta = table.d_to_merge[ramp] / np.maximum(table.speed[ramp], 0.1)
+    return float(eta.sum() + lane_index.sum())
+
+
+def _measure(step_fn, steps: int) -> dict[str, float]:
+    step_fn()  # warm-up: table rows/interning allocated once here
+    latencies: list[float] = []
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        step_fn()
+        latencies.append(time.perf_counter() - t0)
+
+    peak_bytes = 0
+    retained_blocks = 0
+    tracemalloc.start()
+    try:
+        for _ in range(steps):
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            step_fn()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            peak_bytes += peak - base
+            retained_blocks += sum(
+                stat.count_diff
+                for stat in after.compare_to(before, 'filename')
+                if stat.count_diff > 0
+            )
+    finally:
+        tracemalloc.stop()
+    return {
+        'step_us_mean': 1e6 * sum(latencies) / len(latencies),
+        'peak_bytes_per_step': peak_bytes / steps,
+        'retained_blocks_per_step': retained_blocks / steps,
+    }
+
+
+def run_benchmark(*, vehicle_counts: list[int], steps: int, seed: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for count in vehicle_counts:
+        vehicles = _population(count, seed)
+        active_ids = {vehicle[0] for vehicle in vehicles}
+        table = VehicleTable()
+        legacy = _measure(lambda: _dict_step(vehicles), steps)
+        columnar = _measure(lambda: _table_step(table, vehicles, active_ids), steps)
+        vec_table = VehicleTable()
+        vectorized = _measure(lambda: _table_vec_step(vec_table, vehicles, active_ids), steps)
+        results.append({
+            'vehicles': count, 'dict': legacy, 'table': columnar, 'table_vec': vectorized,
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the columnar vehicle table.')
+    parser.add_argument('--vehicles', default='50,200,800')
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default=None, help='Optional JSON output path')
+    args = parser.parse_args()
+
+    counts = [int(v) for v in args.vehicles.split(',') if v.strip()]
+    results = run_benchmark(vehicle_counts=counts, steps=args.steps, seed=args.seed)
+    for row in results:
+        for name in ('dict', 'table', 'table_vec'):
+            r = row[name]
+            print(
+                f"  N={row['vehicles']:<5} {name:<9} {r['step_us_mean']:9.1f} us/step  "
+                f"peak={r['peak_bytes_per_step']:10.0f} B  "
+                f"retained_blocks={r['retained_blocks_per_step']:.1f}"
+            )
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
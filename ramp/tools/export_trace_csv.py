@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Convert columnar ``.rtrc`` traces back to the CSV files the runner writes.
+
+Usage:
+    python -m ramp.tools.export_trace_csv output/.../dp
+    python -m ramp.tools.export_trace_csv output/.../dp/plans.rtrc --out /tmp/plans.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from ramp.experiments.trace_io import TRACE_FORMAT_COLUMNAR, TRACE_SUFFIX_BY_FORMAT, export_csv
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Export .rtrc traces as CSV.')
+    parser.add_argument('path', help='A .rtrc file or a run output directory')
+    parser.add_argument('--out', default=None, help='Output CSV (single-file mode only)')
+    args = parser.parse_args()
+
+    src = Path(args.path)
+    if src.is_dir():
+        if args.out:
+            parser.error('--out is only valid for a single .rtrc file')
+        sources = sorted(src.glob(f'*{TRACE_SUFFIX_BY_FORMAT[TRACE_FORMAT_COLUMNAR]}'))
+    else:
+        sources = [src]
+    if not sources:
+        print(f'[export_trace_csv] no .rtrc files under {src}')
+        return 1
+
+    for source in sources:
+        dst = Path(args.out) if args.out else source.with_suffix('.csv')
+        rows = export_csv(source, dst)
+        print(f'[export_trace_csv] {source.name} -> {dst} rows={rows}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -8,17 +8,31 @@ Architecture note (Sonnet REVIEW):
     Each matrix cell runs as an **isolated subprocess** because SUMO's
     traci connection is not re-entrant within a single process.
 
+Execution:
+    Cells run on a pool of ``--workers`` threads, each driving one
+    subprocess, so a crash or timeout only fails its own cell.  Finished
+    cells are stored in a content-addressed cache (``--cache-dir``) keyed on
+    the scenario files, the run parameters, the world weights, the seed and
+    a hash of the ``ramp`` sources; re-running the matrix skips them.  The
+    summary files are assembled in grid order and are identical for any
+    worker count; timing and cache statistics go to
+    ``pain_matrix_execution.json``.
+
 Usage:
-    python -m ramp.tools.run_pain_matrix --scenario ramp__mlane_v2_mixed
+    python -m ramp.tools.run_pain_matrix --scenario ramp__mlane_v2_mixed --workers 4
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -42,6 +56,9 @@ WORLDS: dict[str, dict[str, float]] = {
 
 DEFAULT_SEEDS: list[int] = [1, 2, 3]
 
+DEFAULT_CELL_TIMEOUT_S: float = 600.0
+CACHE_DIR_NAME = '.cell_cache'
+
 DEFAULT_PARAMS: dict[str, Any] = {
     'scenario': 'ramp__mlane_v2_mixed',
     'policy': 'hierarchical',
@@ -55,6 +72,8 @@ DEFAULT_PARAMS: dict[str, Any] = {
     'delta_1_s': 1.5,
     'delta_2_s': 2.0,
     'dp_replan_interval_s': 1.0,
+    'replan_trigger': 'timer',
+    'replan_eta_drift_s': 1.0,
     'cav_ratio': 0.5,
     'generate_rou': True,
     'main_vph': 1500,
@@ -90,6 +109,8 @@ def _build_cmd(
         '--delta-1-s', str(params['delta_1_s']),
         '--delta-2-s', str(params['delta_2_s']),
         '--dp-replan-interval-s', str(params['dp_replan_interval_s']),
+        '--replan-trigger', str(params.get('replan_trigger', 'timer')),
+        '--replan-eta-drift-s', str(params.get('replan_eta_drift_s', 1.0)),
         '--cav-ratio', str(params['cav_ratio']),
         '--main-vph', str(params['main_vph']),
         '--ramp-vph', str(params['ramp_vph']),
@@ -112,58 +133,233 @@ def _load_metrics(out_dir: Path) -> dict[str, Any] | None:
     return json.loads(metrics_path.read_text(encoding='utf-8'))
 
 
+def _sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def code_revision(root: Path = _REPO_ROOT) -> str:
+    """Content hash of the ``ramp`` sources that a matrix cell executes."""
+    digest = hashlib.sha256()
+    package = root / 'ramp'
+    for path in sorted(package.rglob('*.py')):
+        rel = path.relative_to(root).as_posix()
+        if rel.startswith('ramp/tests/'):
+            continue
+        digest.update(rel.encode('utf-8') + b'\0')
+        digest.update(path.read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+def scenario_fingerprint(scenario: str, root: Path = _REPO_ROOT) -> dict[str, str]:
+    scenario_dir = root / 'ramp' / 'scenarios' / scenario
+    if not scenario_dir.is_dir():
+        return {}
+    return {
+        path.relative_to(scenario_dir).as_posix(): _sha256_file(path)
+        for path in sorted(scenario_dir.rglob('*'))
+        if path.is_file()
+    }
+
+
+def cell_cache_key(
+    *,
+    weights: dict[str, float],
+    seed: int,
+    params: dict[str, Any],
+    scenario_files: dict[str, str],
+    revision: str,
+) -> str:
+    material = {
+        'code_revision': revision,
+        'params': params,
+        'scenario_files': scenario_files,
+        'seed': seed,
+        'weights': weights,
+    }
+    blob = json.dumps(material, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()
+
+
+@dataclass(slots=True)
+class MatrixCell:
+    world_name: str
+    weights: dict[str, float]
+    seed: int
+    out_dir: Path
+    cache_key: str | None
+
+
+@dataclass(slots=True)
+class CellOutcome:
+    entry: dict[str, Any]
+    metrics: dict[str, Any] | None
+    cached: bool
+    elapsed_s: float
+
+
+def _cache_path(cache_dir: Path, key: str) -> Path:
+    return cache_dir / key[:2] / f'{key}.json'
+
+
+def _load_cached(cell: MatrixCell, cache_dir: Path | None) -> dict[str, Any] | None:
+    if cache_dir is None or cell.cache_key is None:
+        return None
+    path = _cache_path(cache_dir, cell.cache_key)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))['metrics']
+    except (OSError, ValueError, KeyError):
+        return None  # unreadable entry: rerun the cell
+
+
+def _store_cached(cell: MatrixCell, cache_dir: Path | None, metrics: dict[str, Any]) -> None:
+    if cache_dir is None or cell.cache_key is None:
+        return
+    path = _cache_path(cache_dir, cell.cache_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{time.monotonic_ns()}.tmp')
+    tmp.write_text(
+        json.dumps({'world': cell.world_name, 'seed': cell.seed, 'metrics': metrics}),
+        encoding='utf-8',
+    )
+    tmp.replace(path)
+
+
+def _decode_output(output: str | bytes | None) -> str:
+    if output is None:
+        return ''
+    if isinstance(output, bytes):
+        return output.decode('utf-8', errors='replace')
+    return output
+
+
+def _run_cell(
+    cell: MatrixCell,
+    *,
+    params: dict[str, Any],
+    timeout_s: float,
+    cache_dir: Path | None,
+) -> CellOutcome:
+    """Run (or fetch from cache) one cell; never raises for a failed cell."""
+    t0 = time.perf_counter()
+    entry: dict[str, Any] = {
+        'world': cell.world_name,
+        'seed': cell.seed,
+        'returncode': 0,
+        'success': True,
+        'out_dir': str(cell.out_dir),
+    }
+    cached_metrics = _load_cached(cell, cache_dir)
+    if cached_metrics is not None:
+        cell.out_dir.mkdir(parents=True, exist_ok=True)
+        metrics_path = cell.out_dir / 'metrics.json'
+        if not metrics_path.exists():
+            metrics_path.write_text(json.dumps(cached_metrics, indent=2), encoding='utf-8')
+        return CellOutcome(entry, cached_metrics, True, time.perf_counter() - t0)
+
+    cell.out_dir.mkdir(parents=True, exist_ok=True)
+    cmd = _build_cmd(
+        world_name=cell.world_name,
+        weights=cell.weights,
+        seed=cell.seed,
+        out_dir=cell.out_dir,
+        params=params,
+    )
+    try:
+        result = subprocess.run(
+            cmd, capture_output=True, text=True,
+            cwd=str(_REPO_ROOT), timeout=timeout_s,
+        )
+        returncode = result.returncode
+        stderr = result.stderr or ''
+    except subprocess.TimeoutExpired as exc:
+        returncode = -1
+        stderr = f'timeout after {timeout_s:g}s\n' + _decode_output(exc.stderr)
+    except OSError as exc:
+        returncode = -1
+        stderr = f'failed to start cell: {exc}'
+
+    metrics = _load_metrics(cell.out_dir)
+    success = returncode == 0 and metrics is not None
+    entry['returncode'] = returncode
+    entry['success'] = success
+    if not success:
+        entry['stderr_tail'] = stderr[-500:]
+    elif metrics is not None:
+        _store_cached(cell, cache_dir, metrics)
+    return CellOutcome(entry, metrics, False, time.perf_counter() - t0)
+
+
 def run_matrix(
     *,
     worlds: dict[str, dict[str, float]] | None = None,
     seeds: list[int] | None = None,
     params: dict[str, Any] | None = None,
     base_out_dir: Path | None = None,
+    workers: int = 1,
+    timeout_s: float = DEFAULT_CELL_TIMEOUT_S,
+    cache_dir: Path | None = None,
+    use_cache: bool = True,
 ) -> dict[str, Any]:
     """Run the full pain matrix and return summary results."""
+    if workers < 1:
+        raise ValueError('workers must be >= 1')
     w = worlds or WORLDS
     s = seeds or DEFAULT_SEEDS
     p = {**DEFAULT_PARAMS, **(params or {})}
     base = base_out_dir or (Path(_REPO_ROOT) / 'output' / 'pain_matrix')
     base.mkdir(parents=True, exist_ok=True)
+    resolved_cache_dir = (cache_dir or base / CACHE_DIR_NAME) if use_cache else None
+
+    revision = code_revision() if use_cache else ''
+    scenario_files = scenario_fingerprint(str(p['scenario'])) if use_cache else {}
+    cells = [
+        MatrixCell(
+            world_name=world_name,
+            weights=weights,
+            seed=seed,
+            out_dir=base / world_name / f'seed_{seed}',
+            cache_key=cell_cache_key(
+                weights=weights, seed=seed, params=p,
+                scenario_files=scenario_files, revision=revision,
+            ) if use_cache else None,
+        )
+        for world_name, weights in w.items()
+        for seed in s
+    ]
 
-    cell_results: list[dict[str, Any]] = []
-    all_metrics: dict[str, list[dict[str, Any]]] = {}
-
-    for world_name, weights in w.items():
-        all_metrics[world_name] = []
-        for seed in s:
-            cell_dir = base / world_name / f'seed_{seed}'
-            cell_dir.mkdir(parents=True, exist_ok=True)
-
-            cmd = _build_cmd(
-                world_name=world_name,
-                weights=weights,
-                seed=seed,
-                out_dir=cell_dir,
-                params=p,
-            )
-            print(f'[MATRIX] Running {world_name} seed={seed} ...')
-            result = subprocess.run(
-                cmd, capture_output=True, text=True,
-                cwd=str(_REPO_ROOT), timeout=600,
+    wall_t0 = time.perf_counter()
+    outcomes: list[CellOutcome | None] = [None] * len(cells)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pain-cell') as pool:
+        futures = {
+            pool.submit(
+                _run_cell, cell, params=p, timeout_s=timeout_s, cache_dir=resolved_cache_dir
+            ): index
+            for index, cell in enumerate(cells)
+        }
+        print(f'[MATRIX] {len(cells)} cells, workers={workers}')
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            outcome = future.result()
+            outcomes[index] = outcome
+            cell = cells[index]
+            entry = outcome.entry
+            status = 'ok' if entry['success'] else f"FAILED rc={entry['returncode']}"
+            origin = ' (cached)' if outcome.cached else ''
+            print(
+                f'[MATRIX] [{done}/{len(cells)}] {cell.world_name} seed={cell.seed} '
+                f'{status} {outcome.elapsed_s:.1f}s{origin}'
             )
+    wall_clock_s = time.perf_counter() - wall_t0
 
-            metrics = _load_metrics(cell_dir)
-            success = result.returncode == 0 and metrics is not None
-
-            cell_entry = {
-                'world': world_name,
-                'seed': seed,
-                'returncode': result.returncode,
-                'success': success,
-                'out_dir': str(cell_dir),
-            }
-            if not success:
-                cell_entry['stderr_tail'] = (result.stderr or '')[-500:]
-            cell_results.append(cell_entry)
-
-            if metrics is not None:
-                all_metrics[world_name].append(metrics)
+    cell_results: list[dict[str, Any]] = []
+    all_metrics: dict[str, list[dict[str, Any]]] = {world_name: [] for world_name in w}
+    for cell, outcome in zip(cells, outcomes):
+        assert outcome is not None
+        cell_results.append(outcome.entry)
+        if outcome.metrics is not None:
+            all_metrics[cell.world_name].append(outcome.metrics)
 
     h0_name = 'H0_normal'
     h0_metrics_list = all_metrics.get(h0_name, [])
@@ -203,6 +399,31 @@ def run_matrix(
 
     _write_csv_summary(base / 'pain_matrix_summary.csv', cell_results, pain_summary)
 
+    execution = {
+        'workers': workers,
+        'wall_clock_s': wall_clock_s,
+        'cache_dir': str(resolved_cache_dir) if resolved_cache_dir is not None else None,
+        'cache_hits': sum(1 for o in outcomes if o is not None and o.cached),
+        'cells': [
+            {
+                'world': cell.world_name,
+                'seed': cell.seed,
+                'cached': outcome.cached,
+                'elapsed_s': outcome.elapsed_s,
+                'cache_key': cell.cache_key,
+            }
+            for cell, outcome in zip(cells, outcomes)
+            if outcome is not None
+        ],
+    }
+    (base / 'pain_matrix_execution.json').write_text(
+        json.dumps(execution, indent=2), encoding='utf-8'
+    )
+    print(
+        f"[MATRIX] wall_clock={wall_clock_s:.1f}s workers={workers} "
+        f"cache_hits={execution['cache_hits']}/{len(cells)}"
+    )
+
     return summary
 
 
@@ -245,6 +466,16 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--cav-ratio', type=float, default=0.5)
     parser.add_argument('--main-vph', type=int, default=1500)
     parser.add_argument('--ramp-vph', type=int, default=600)
+    parser.add_argument('--replan-trigger', choices=['timer', 'event'], default='timer',
+                        help='Zone B replan trigger passed to every cell')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cells run concurrently (one SUMO subprocess each)')
+    parser.add_argument('--timeout-s', type=float, default=DEFAULT_CELL_TIMEOUT_S,
+                        help='Per-cell timeout; a timed-out cell fails alone')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Cell result cache (default: <out-dir>/.cell_cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Run every cell even if a cached result exists')
     return parser.parse_args()
 
 
@@ -257,9 +488,18 @@ def main() -> None:
     params['cav_ratio'] = args.cav_ratio
     params['main_vph'] = args.main_vph
     params['ramp_vph'] = args.ramp_vph
+    params['replan_trigger'] = args.replan_trigger
 
     base_out = Path(args.out_dir) if args.out_dir else None
-    summary = run_matrix(seeds=seeds, params=params, base_out_dir=base_out)
+    summary = run_matrix(
+        seeds=seeds,
+        params=params,
+        base_out_dir=base_out,
+        workers=args.workers,
+        timeout_s=args.timeout_s,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        use_cache=not args.no_cache,
+    )
 
     print('\n' + '=' * 60)
     print('PAIN MATRIX RESULTS')